@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.common.metrics import METRICS
+
+POOL_SIZE = 16
+
+_local = threading.local()
+_adapter_lock = threading.Lock()
+_adapter: HTTPAdapter | None = None
+
+
+def _shared_adapter() -> HTTPAdapter:
+    # 커넥션 풀(urllib3 PoolManager)은 스레드 안전 → 프로세스에 하나만 두고 세션들이 공유
+    # 파이프라인 워커 스레드가 실행마다 새로 생겨도 keep-alive 연결은 그대로 재사용됨 (daemon 모드)
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            _adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        return _adapter
+
+
+def get_session() -> requests.Session:
+    # requests.Session은 스레드 간 공유가 보장되지 않으므로 스레드별로 하나씩
+    s = getattr(_local, "session", None)
+    if s is None:
+        s = requests.Session()
+        adapter = _shared_adapter()
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+        _local.session = s
+    return s
+
+
+class ResponseCache:
+    """
+    url -> 디코딩된 JSON (TTL). 기본 ttl=0 이면 꺼짐.
+    daemon 처럼 프로세스가 계속 살아 있을 때 짧은 간격의 재실행이 같은 API를 다시 치지 않게.
+    """
+
+    def __init__(self, ttl: float = 0.0, max_entries: int = 5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def get(self, url: str):
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            hit = self._data.get(url)
+        if hit is None or time.monotonic() - hit[0] > self.ttl:
+            METRICS.record_cache("http_response", False)
+            return None
+        METRICS.record_cache("http_response", True)
+        return hit[1]
+
+    def put(self, url: str, value):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if len(self._data) >= self.max_entries:
+                # 가장 오래된 절반을 버림
+                for k, _ in sorted(self._data.items(), key=lambda kv: kv[1][0])[: self.max_entries // 2]:
+                    del self._data[k]
+            self._data[url] = (time.monotonic(), value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+RESPONSE_CACHE = ResponseCache()
+
+
+def http_get(url: str, timeout: float = 20, label: str | None = None, **kwargs) -> requests.Response:
+    """
+    requests.get + 지표 기록 (라벨별 요청 수/지연/바이트). label 없으면 호스트 이름.
+    stream=True 면 바이트는 0 으로 기록 → 읽은 쪽이 METRICS.add_http_bytes 로 더함
+    """
+    label = label or urlsplit(url).netloc
+    t0 = time.perf_counter()
+    try:
+        r = get_session().get(url, timeout=timeout, **kwargs)
+    except requests.RequestException:
+        METRICS.record_http(label, None, time.perf_counter() - t0)
+        raise
+    nbytes = len(r.content) if not kwargs.get("stream") else 0
+    METRICS.record_http(label, r.status_code, time.perf_counter() - t0, nbytes)
+    return r
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+JSON_PATH = Path("reports/run_metrics.json")
+PROM_PATH = Path("reports/run_metrics.prom")
+# node_exporter --collector.textfile.directory 로 지정한 폴더 (있으면 거기에도 기록)
+TEXTFILE_DIR_ENV = "NODE_EXPORTER_TEXTFILE_DIR"
+
+PREFIX = "hn_pipeline"
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RunMetrics:
+    """한 번의 파이프라인 실행 동안 쌓이는 지표 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.stages = {}   # name -> {group, wall, cpu, calls}
+            self.http = {}     # host -> {requests, errors, bytes, status{}, buckets[], sum}
+            self.caches = {}   # name -> {hits, misses}
+
+    @contextmanager
+    def stage(self, name: str, group: str | None = None):
+        # cpu는 thread_time: 병렬 스테이지끼리 섞이지 않도록 현재 스레드 기준
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.thread_time() - cpu0
+            with self._lock:
+                s = self.stages.setdefault(name, {"group": group or name, "wall": 0.0, "cpu": 0.0, "calls": 0})
+                s["wall"] += wall
+                s["cpu"] += cpu
+                s["calls"] += 1
+
+    def record_http(self, host: str, status: int | None, latency: float, nbytes: int = 0):
+        with self._lock:
+            h = self.http.setdefault(host, {
+                "requests": 0, "errors": 0, "bytes": 0, "status": {},
+                "buckets": [0] * len(LATENCY_BUCKETS), "latency_sum": 0.0,
+            })
+            h["requests"] += 1
+            h["bytes"] += nbytes
+            h["latency_sum"] += latency
+            code = str(status) if status is not None else "error"
+            h["status"][code] = h["status"].get(code, 0) + 1
+            if status is None or status >= 400:
+                h["errors"] += 1
+            for i, le in enumerate(LATENCY_BUCKETS):
+                if latency <= le:
+                    h["buckets"][i] += 1
+
+    def add_http_bytes(self, host: str, nbytes: int):
+        """스트리밍 응답: 요청은 record_http 로 이미 셌고, 실제로 읽은 바이트만 더함"""
+        with self._lock:
+            h = self.http.get(host)
+            if h is not None:
+                h["bytes"] += nbytes
+
+    def record_cache(self, name: str, hit: bool):
+        with self._lock:
+            c = self.caches.setdefault(name, {"hits": 0, "misses": 0})
+            c["hits" if hit else "misses"] += 1
+
+    # -------------------------
+    # 출력
+    # -------------------------
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            caches = {
+                k: {**v, "hit_rate": round(v["hits"] / max(1, v["hits"] + v["misses"]), 4)}
+                for k, v in self.caches.items()
+            }
+            http = {}
+            for host, h in self.http.items():
+                http[host] = {
+                    "requests": h["requests"],
+                    "errors": h["errors"],
+                    "bytes": h["bytes"],
+                    "status": dict(h["status"]),
+                    "latency_sum": round(h["latency_sum"], 4),
+                    "latency_avg": round(h["latency_sum"] / max(1, h["requests"]), 4),
+                    "latency_buckets": dict(zip([str(b) for b in LATENCY_BUCKETS], h["buckets"])),
+                }
+            return {
+                "started_at": self.started_at,
+                "finished_at": time.time(),
+                "stages": {
+                    k: {**v, "wall": round(v["wall"], 4), "cpu": round(v["cpu"], 4)}
+                    for k, v in self.stages.items()
+                },
+                "http": http,
+                "caches": caches,
+            }
+
+    def to_prometheus(self) -> str:
+        d = self.to_dict()
+        out = []
+
+        def metric(name, mtype, help_text, samples):
+            out.append(f"# HELP {PREFIX}_{name} {help_text}")
+            out.append(f"# TYPE {PREFIX}_{name} {mtype}")
+            for labels, value in samples:
+                lbl = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                out.append(f"{PREFIX}_{name}{{{lbl}}} {value}" if lbl else f"{PREFIX}_{name} {value}")
+
+        stages = d["stages"]
+        metric("stage_wall_seconds", "gauge", "Wall-clock time per stage",
+               [({"stage": k, "group": v["group"]}, v["wall"]) for k, v in stages.items()])
+        metric("stage_cpu_seconds", "gauge", "Thread CPU time per stage",
+               [({"stage": k, "group": v["group"]}, v["cpu"]) for k, v in stages.items()])
+
+        metric("http_requests_total", "counter", "HTTP requests by host and status",
+               [({"host": host, "status": code}, n)
+                for host, h in d["http"].items() for code, n in h["status"].items()])
+        metric("http_response_bytes_total", "counter", "Response bytes received",
+               [({"host": host}, h["bytes"]) for host, h in d["http"].items()])
+
+        out.append(f"# HELP {PREFIX}_http_request_duration_seconds HTTP request latency")
+        out.append(f"# TYPE {PREFIX}_http_request_duration_seconds histogram")
+        for host, h in d["http"].items():
+            # 버킷은 record_http에서 이미 누적(le 이하) 카운트
+            for le, n in h["latency_buckets"].items():
+                out.append(f'{PREFIX}_http_request_duration_seconds_bucket{{host="{_escape(host)}",le="{le}"}} {n}')
+            out.append(f'{PREFIX}_http_request_duration_seconds_bucket{{host="{_escape(host)}",le="+Inf"}} {h["requests"]}')
+            out.append(f'{PREFIX}_http_request_duration_seconds_sum{{host="{_escape(host)}"}} {h["latency_sum"]}')
+            out.append(f'{PREFIX}_http_request_duration_seconds_count{{host="{_escape(host)}"}} {h["requests"]}')
+
+        metric("cache_hits_total", "counter", "Cache hits",
+               [({"cache": k}, v["hits"]) for k, v in d["caches"].items()])
+        metric("cache_misses_total", "counter", "Cache misses",
+               [({"cache": k}, v["misses"]) for k, v in d["caches"].items()])
+        metric("cache_hit_ratio", "gauge", "Cache hit ratio",
+               [({"cache": k}, v["hit_rate"]) for k, v in d["caches"].items()])
+
+        metric("last_run_timestamp_seconds", "gauge", "Unix time the run finished",
+               [({}, round(d["finished_at"], 3))])
+        return "\n".join(out) + "\n"
+
+    def write(self, json_path: str | Path = JSON_PATH, prom_path: str | Path = PROM_PATH) -> list[str]:
+        written = []
+        json_path, prom_path = Path(json_path), Path(prom_path)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        json_path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        written.append(str(json_path))
+
+        prom = self.to_prometheus()
+        targets = [prom_path]
+        textfile_dir = os.environ.get(TEXTFILE_DIR_ENV)
+        if textfile_dir:
+            targets.append(Path(textfile_dir) / prom_path.name)
+        for p in targets:
+            # textfile collector가 반쯤 쓰인 파일을 읽지 않도록 rename으로 교체
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_suffix(p.suffix + ".tmp")
+            tmp.write_text(prom, encoding="utf-8")
+            tmp.replace(p)
+            written.append(str(p))
+        return written
+
+    def print_summary(self):
+        d = self.to_dict()
+        print("\n=== Run Metrics ===")
+        for name, s in d["stages"].items():
+            print(f"- {name:<10} wall={s['wall']:.2f}s cpu={s['cpu']:.2f}s")
+        for host, h in d["http"].items():
+            print(f"- http {host}: {h['requests']} req, {h['bytes']/1024:.1f} KiB, avg {h['latency_avg']*1000:.0f}ms")
+        for name, c in d["caches"].items():
+            print(f"- cache {name}: hit_rate={c['hit_rate']:.2f} ({c['hits']}/{c['hits'] + c['misses']})")
+
+
+def _escape(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# 프로세스 전역 인스턴스
+METRICS = RunMetrics()
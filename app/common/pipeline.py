@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from app.common.metrics import METRICS
+from app.common import profiling
+
+CACHE_DIR = Path(".cache/pipeline")
+
+
+@dataclass
+class Stage:
+    """
+    name    : 스테이지 이름 = 출력 artifact 이름
+    func    : func(**{input_name: value}) -> output
+    inputs  : 의존하는 스테이지 이름들
+    params  : fingerprint에 들어가는 설정값 (날짜, 쿼리 목록 등)
+    code    : 소스가 바뀌면 캐시를 무효화할 모듈들
+    files   : skip 하려면 존재해야 하는 산출 파일들
+    group   : 지표 집계용 상위 단계 (fetch/tag/aggregate/graph/score/export)
+    """
+    name: str
+    func: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    params: dict = field(default_factory=dict)
+    code: tuple[str, ...] = ()
+    files: tuple[str, ...] = ()
+    group: str = ""
+
+
+def _hash_bytes(*chunks: bytes) -> str:
+    h = hashlib.sha256()
+    for c in chunks:
+        h.update(c)
+        h.update(b"\0")
+    return h.hexdigest()[:32]
+
+
+def _module_source_hash(name: str) -> bytes:
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.origin or not os.path.exists(spec.origin):
+        return name.encode()
+    return Path(spec.origin).read_bytes()
+
+
+class Pipeline:
+    def __init__(self, stages: list[Stage], cache_dir: Path = CACHE_DIR, max_workers: int = 4,
+                 memo: dict | None = None):
+        """
+        memo: 스테이지 출력을 메모리에도 보관할 dict {name: (output_fp, output)}.
+              daemon 처럼 여러 실행이 같은 dict 를 넘기면 skip 된 스테이지를 pickle 에서 다시 읽지 않음
+        """
+        self.stages = {s.name: s for s in stages}
+        self._memo = memo
+        for s in stages:
+            for dep in s.inputs:
+                if dep not in self.stages:
+                    raise ValueError(f"stage '{s.name}' depends on unknown stage '{dep}'")
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers
+        self._order = self._toposort()
+
+    def _toposort(self) -> list[str]:
+        order, state = [], {}
+
+        def visit(n):
+            if state.get(n) == 1:
+                raise ValueError(f"cycle at stage '{n}'")
+            if state.get(n) == 2:
+                return
+            state[n] = 1
+            for dep in self.stages[n].inputs:
+                visit(dep)
+            state[n] = 2
+            order.append(n)
+
+        for n in self.stages:
+            visit(n)
+        return order
+
+    def _closure(self, targets) -> set[str]:
+        need, stack = set(), list(targets)
+        while stack:
+            n = stack.pop()
+            if n in need:
+                continue
+            need.add(n)
+            stack.extend(self.stages[n].inputs)
+        return need
+
+    # -------------------------
+    # 캐시 (meta json + output pickle)
+    # -------------------------
+
+    def _meta_path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.json"
+
+    def _out_path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.pkl"
+
+    def _load_meta(self, name: str) -> dict | None:
+        p = self._meta_path(name)
+        if not p.exists() or not self._out_path(name).exists():
+            return None
+        try:
+            return json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def _save(self, name: str, fingerprint: str, output) -> str:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        blob = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+        out_fp = _hash_bytes(blob)
+        tmp = self._out_path(name).with_suffix(".pkl.tmp")
+        tmp.write_bytes(blob)
+        tmp.replace(self._out_path(name))
+        self._meta_path(name).write_text(
+            json.dumps({"fingerprint": fingerprint, "output_fp": out_fp, "saved_at": time.time()}),
+            encoding="utf-8",
+        )
+        if self._memo is not None:
+            self._memo[name] = (out_fp, output)
+        return out_fp
+
+    def _load_output(self, name: str):
+        return pickle.loads(self._out_path(name).read_bytes())
+
+    def fingerprint(self, stage: Stage, dep_fps: dict) -> str:
+        return _hash_bytes(
+            stage.name.encode(),
+            json.dumps(stage.params, sort_keys=True, default=str).encode(),
+            *[_module_source_hash(m) for m in stage.code],
+            *[f"{d}={dep_fps[d]}".encode() for d in stage.inputs],
+        )
+
+    # -------------------------
+    # 실행
+    # -------------------------
+
+    def run(self, targets=None, force=(), pinned_upstream: bool = False, serial: bool = False) -> dict:
+        """
+        targets         : 실행할 스테이지들 (None이면 전체). 의존 스테이지는 자동 포함.
+        force           : fingerprint와 상관없이 다시 돌릴 스테이지들
+        pinned_upstream : True면 targets 밖의 상류 스테이지는 캐시가 있으면 (오래됐어도) 그대로 재사용
+                          → `--only cards,export` 같은 재채점에서 fetch를 절대 다시 안 함
+        반환: {stage: output} — targets는 항상 포함, skip된 상류 스테이지는 필요했을 때만 포함
+        """
+        targets = set(targets or self.stages)
+        unknown = targets - set(self.stages)
+        if unknown:
+            raise ValueError(f"unknown stages: {sorted(unknown)}")
+        force = set(force)
+        need = self._closure(targets)
+        order = [n for n in self._order if n in need]
+
+        outputs: dict[str, Any] = {}
+        out_fps: dict[str, str] = {}
+        status: dict[str, str] = {}
+        pending = list(order)
+        running = {}
+
+        def get_input(name):
+            if name not in outputs:
+                memo = self._memo.get(name) if self._memo is not None else None
+                if memo is not None and memo[0] == out_fps.get(name):
+                    outputs[name] = memo[1]
+                else:
+                    outputs[name] = self._load_output(name)
+            return outputs[name]
+
+        def decide(name) -> bool:
+            """True면 skip (캐시 재사용)"""
+            stage = self.stages[name]
+            meta = self._load_meta(name)
+            files_ok = all(os.path.exists(f) for f in stage.files)
+            if name in force or meta is None or not files_ok:
+                return False
+            if pinned_upstream and name not in targets:
+                out_fps[name] = meta["output_fp"]
+                return True
+            if meta["fingerprint"] == self.fingerprint(stage, out_fps):
+                out_fps[name] = meta["output_fp"]
+                return True
+            return False
+
+        def execute(name):
+            stage = self.stages[name]
+            kwargs = {dep: get_input(dep) for dep in stage.inputs}
+            t0 = time.perf_counter()
+            with METRICS.stage(name, group=stage.group or name), profiling.profile_stage(name):
+                output = stage.func(**kwargs)
+            return output, time.perf_counter() - t0
+
+        # 프로파일링 중엔 직렬 실행 (cProfile/tracemalloc 는 스테이지별로 분리되지 않음)
+        workers = 1 if serial or profiling.is_enabled() else self.max_workers
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending or running:
+                # 의존성이 모두 끝난 스테이지부터 제출
+                for name in list(pending):
+                    if any(dep not in status for dep in self.stages[name].inputs):
+                        continue
+                    pending.remove(name)
+                    skip = decide(name)
+                    METRICS.record_cache("pipeline_stage", skip)
+                    if skip:
+                        status[name] = "skipped"
+                        print(f"[pipeline] {name}: skipped (unchanged)")
+                        continue
+                    # 입력 로드는 메인 스레드에서 (lazy 로드 경합 방지)
+                    for dep in self.stages[name].inputs:
+                        get_input(dep)
+                    running[pool.submit(execute, name)] = name
+
+                if not running:
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    output, elapsed = fut.result()
+                    stage = self.stages[name]
+                    fp = self.fingerprint(stage, out_fps)
+                    outputs[name] = output
+                    out_fps[name] = self._save(name, fp, output)
+                    status[name] = "ran"
+                    print(f"[pipeline] {name}: done in {elapsed:.2f}s")
+
+        for name in targets:
+            get_input(name)
+        self.last_status = status
+        return outputs
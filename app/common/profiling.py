@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_ENV = "APP_PROFILE"          # 예: APP_PROFILE=1 / cpu / mem / cpu,mem
+PROFILE_DIR = Path("reports/profiles")
+SAMPLE_INTERVAL_SEC = 0.005          # folded stack 샘플링 간격
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 10
+
+_modes: set[str] | None = None
+
+
+def _parse_modes(value: str | None) -> set[str]:
+    if not value:
+        return set()
+    v = value.strip().lower()
+    if v in ("0", "false", "off", "no"):
+        return set()
+    if v in ("1", "true", "on", "yes", "all"):
+        return {"cpu", "mem"}
+    return {m.strip() for m in v.split(",") if m.strip() in ("cpu", "mem")}
+
+
+def enable(modes: str | None = "cpu,mem"):
+    """CLI 플래그용. None/"" 이면 끔"""
+    global _modes
+    _modes = _parse_modes(modes)
+
+
+def active_modes() -> set[str]:
+    global _modes
+    if _modes is None:
+        _modes = _parse_modes(os.environ.get(PROFILE_ENV))
+    return _modes
+
+
+def is_enabled() -> bool:
+    return bool(active_modes())
+
+
+def output_dir() -> Path:
+    # 날짜별 리포트 옆에 모음: reports/profiles/<YYYY-MM-DD>/
+    return PROFILE_DIR / datetime.now().strftime("%Y-%m-%d")
+
+
+class _StackSampler(threading.Thread):
+    """
+    대상 스레드의 콜스택을 주기적으로 떠서 folded 포맷으로 누적.
+    (flamegraph.pl, speedscope, inferno 가 그대로 읽음)
+    """
+
+    def __init__(self, target_ident: int, interval: float = SAMPLE_INTERVAL_SEC):
+        super().__init__(daemon=True)
+        self.target_ident = target_ident
+        self.interval = interval
+        self.stacks = Counter()
+        self._halt = threading.Event()
+
+    def run(self):
+        while not self._halt.wait(self.interval):
+            frame = sys._current_frames().get(self.target_ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                mod = Path(code.co_filename).stem
+                stack.append(f"{mod}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+
+    def write(self, path: Path):
+        with path.open("w", encoding="utf-8") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+
+def _safe_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name)
+
+
+@contextmanager
+def profile_stage(name: str):
+    """
+    비활성화 상태면 아무 것도 하지 않는다 (set 조회 1번).
+    cpu: <stage>.prof (snakeviz/pstats) + <stage>.folded (flamegraph)
+    mem: <stage>.mem.txt / <stage>.mem.json (tracemalloc 증가분 상위 N)
+    """
+    modes = active_modes()
+    if not modes:
+        yield
+        return
+
+    out = output_dir()
+    out.mkdir(parents=True, exist_ok=True)
+    base = out / _safe_name(name)
+
+    prof = sampler = None
+    own_tracemalloc = False
+    mem_before = None
+
+    if "mem" in modes:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            own_tracemalloc = True
+        tracemalloc.reset_peak()
+        mem_before = tracemalloc.take_snapshot()
+    if "cpu" in modes:
+        sampler = _StackSampler(threading.get_ident())
+        sampler.start()
+        prof = cProfile.Profile()
+        prof.enable()
+
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        if prof is not None:
+            prof.disable()
+            sampler.stop()
+            prof.dump_stats(f"{base}.prof")
+            sampler.write(Path(f"{base}.folded"))
+            print(f"[profile] {name}: cpu -> {base}.prof, {base}.folded")
+
+        if mem_before is not None:
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if own_tracemalloc:
+                tracemalloc.stop()
+            _write_memory_report(name, base, mem_before, after, peak, elapsed)
+            print(f"[profile] {name}: mem -> {base}.mem.txt (peak {peak / 1024 / 1024:.1f} MiB)")
+
+
+def _write_memory_report(name, base: Path, before, after, peak: int, elapsed: float):
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    top = [d for d in diff if d.size_diff > 0][:TOP_ALLOCATIONS]
+
+    lines = [
+        f"# {name} — tracemalloc top {len(top)} (size growth during stage)",
+        f"# peak={peak} bytes, elapsed={elapsed:.3f}s",
+    ]
+    rows = []
+    for d in top:
+        frame = d.traceback[0]
+        lines.append(f"{d.size_diff / 1024:10.1f} KiB  {d.count_diff:+8d} blocks  {frame.filename}:{frame.lineno}")
+        rows.append({
+            "file": frame.filename,
+            "line": frame.lineno,
+            "size_diff": d.size_diff,
+            "count_diff": d.count_diff,
+        })
+    Path(f"{base}.mem.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    Path(f"{base}.mem.json").write_text(
+        json.dumps({"stage": name, "peak_bytes": peak, "elapsed": round(elapsed, 4), "top": rows}, indent=2),
+        encoding="utf-8",
+    )
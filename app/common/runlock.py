@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+LOCK_PATH = Path(".cache/pipeline.lock")
+STALE_LOCK_SEC = 6 * 3600   # 이보다 오래된 잠금은 죽은 실행이 남긴 것으로 간주
+
+
+class RunLockBusy(RuntimeError):
+    pass
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # Windows 의 os.kill(pid, 0) 은 신호 확인이 아니라 CTRL_C 전송 → 나이로만 판단
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class RunLock:
+    """
+    프로세스 간 파이프라인 중복 실행 방지 (O_EXCL 로 잠금 파일 생성).
+    cron/bat 로 띄운 실행과 daemon 실행이 같은 산출물을 동시에 쓰지 않게 한다.
+    """
+
+    def __init__(self, path: Path = LOCK_PATH):
+        self.path = Path(path)
+        self._held = False
+
+    def _is_stale(self) -> bool:
+        try:
+            info = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return True
+        except (OSError, ValueError):
+            # 비었거나 깨진 잠금 파일: 주인이 막 쓰는 중일 수 있음 → 파일 나이로만 판단
+            try:
+                return time.time() - self.path.stat().st_mtime > STALE_LOCK_SEC
+            except FileNotFoundError:
+                return True
+        if time.time() - info.get("started", 0) > STALE_LOCK_SEC:
+            return True
+        return not _pid_alive(int(info.get("pid", 0)))
+
+    def acquire(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 내용을 다 쓴 임시 파일을 link 로 붙임 → 잠금 파일은 생기는 순간부터 pid/started 가 들어 있음
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"pid": os.getpid(), "started": time.time()}), encoding="utf-8")
+        try:
+            for _ in range(2):
+                try:
+                    os.link(tmp, self.path)
+                except FileExistsError:
+                    if self._is_stale():
+                        self.path.unlink(missing_ok=True)
+                        continue
+                    raise RunLockBusy(f"pipeline already running ({self.path})")
+                self._held = True
+                return self
+        finally:
+            tmp.unlink(missing_ok=True)
+        raise RunLockBusy(f"could not acquire {self.path}")
+
+    def release(self):
+        if self._held:
+            self.path.unlink(missing_ok=True)
+            self._held = False
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,285 @@
+"""
+상주 실행 모드: 프로세스를 띄워 둔 채 cron 식 스케줄로 파이프라인을 돌린다.
+
+    python -m app.daemon --cron "0 9 * * *"          # 매일 09:00 (로컬 시간)
+    python -m app.daemon --send "run"                 # 지금 한 번 (백그라운드)
+    python -m app.daemon --send "run --wait --only cards,export"
+    python -m app.daemon --send status
+    python -m app.daemon --send stop
+
+실행 사이에 유지되는 것:
+- import 된 무거운 모듈 (pandas/networkx/matplotlib/pydantic/scipy)
+- HTTP 커넥션 풀 (app.common.http 공유 adapter) + 짧은 TTL 응답 캐시
+- 스테이지 출력 메모 (skip 된 스테이지를 pickle 에서 다시 읽지 않음)
+- similarity 색인, 그래프 레이아웃 좌표
+실행 중복은 in-process Lock + 잠금 파일(RunLock, cron/bat 실행과도 공유)로 막는다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import socketserver
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+DEFAULT_CRON = "0 9 * * *"
+HOST = "127.0.0.1"
+PORT = 8766
+RESPONSE_CACHE_TTL = 600     # 같은 API 응답은 10분 동안 재사용 (수동 재실행 대비)
+MAX_TICK_SEC = 60            # 스케줄 확인 주기 상한 (시계 변경/절전 복귀 대비)
+
+
+# -------------------------
+# cron 식
+# -------------------------
+
+_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+
+def _parse_field(spec: str, lo: int, hi: int) -> set[int]:
+    out = set()
+    for part in spec.split(","):
+        step = 1
+        if "/" in part:
+            part, step_s = part.split("/", 1)
+            step = int(step_s)
+            if step <= 0:
+                raise ValueError(f"bad step in cron field: {spec}")
+        if part == "*":
+            a, b = lo, hi
+        elif "-" in part:
+            a_s, b_s = part.split("-", 1)
+            a, b = int(a_s), int(b_s)
+        else:
+            a = int(part)
+            b = hi if step > 1 else a
+        if a < lo or b > hi or a > b:
+            raise ValueError(f"cron field out of range: {spec}")
+        out.update(range(a, b + 1, step))
+    return out
+
+
+class CronSchedule:
+    """표준 5필드 cron (분 시 일 월 요일). 일/요일이 둘 다 지정되면 OR (vixie cron 과 동일)"""
+
+    def __init__(self, expr: str):
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expr!r}")
+        self.expr = expr
+        (self.minutes, self.hours, self.days, self.months, self.weekdays) = (
+            _parse_field(p, lo, hi) for p, (_, lo, hi) in zip(parts, _FIELDS)
+        )
+        if 7 in self.weekdays:   # 일요일은 0, 7 둘 다 허용
+            self.weekdays = (self.weekdays - {7}) | {0}
+        self._day_any = parts[2] == "*"
+        self._wday_any = parts[4] == "*"
+
+    def _day_ok(self, d: datetime) -> bool:
+        wd = (d.weekday() + 1) % 7   # cron: 0 = 일요일
+        dom, dow = d.day in self.days, wd in self.weekdays
+        if self._day_any and self._wday_any:
+            return True
+        if self._day_any:
+            return dow
+        if self._wday_any:
+            return dom
+        return dom or dow
+
+    def next_after(self, now: datetime) -> datetime:
+        t = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 4)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_ok(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+                continue
+            if t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+                continue
+            return t
+        raise ValueError(f"cron expression never fires: {self.expr!r}")
+
+
+# -------------------------
+# daemon
+# -------------------------
+
+def warm_imports():
+    """첫 실행 전에 무거운 모듈을 미리 올려 둔다"""
+    t0 = time.perf_counter()
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    import networkx  # noqa: F401
+    import pandas  # noqa: F401
+    import app.presentation.idea_card  # noqa: F401  (pydantic)
+    import app.presentation.plot_graph  # noqa: F401
+    import app.ingestion.hn_fetch  # noqa: F401
+    import app.knowledge.clustering  # noqa: F401  (numpy/scipy)
+    import app.knowledge.trends  # noqa: F401
+    print(f"[daemon] warm imports in {time.perf_counter() - t0:.2f}s")
+
+
+class Daemon:
+    def __init__(self, cron: str = DEFAULT_CRON, host: str = HOST, port: int = PORT):
+        self.schedule = CronSchedule(cron)
+        self.host, self.port = host, port
+        self.memo = {}                       # 스테이지 출력 메모 (실행 간 공유)
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.state = {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "cron": cron,
+            "running": False,
+            "runs": 0,
+            "last_run": None,
+            "next_run": None,
+        }
+
+    # --- 실행 ---
+
+    def run_once(self, only=(), force=(), source: str = "manual") -> dict:
+        from app.main import build_pipeline, run
+        from app.common.runlock import RunLockBusy
+
+        if not self._run_lock.acquire(blocking=False):
+            return {"ok": False, "error": "busy"}
+        t0 = time.perf_counter()
+        self.state["running"] = True
+        result = {"source": source, "started_at": datetime.now().isoformat(timespec="seconds")}
+        try:
+            # 날짜가 fingerprint 에 들어가므로 파이프라인 정의는 매번 새로, 메모만 공유
+            run(build_pipeline(memo=self.memo), only=only, force=force)
+            result["ok"] = True
+        except RunLockBusy as e:
+            result.update(ok=False, error=str(e))
+        except Exception as e:
+            traceback.print_exc()
+            result.update(ok=False, error=f"{type(e).__name__}: {e}")
+        finally:
+            result["seconds"] = round(time.perf_counter() - t0, 2)
+            self.state.update(running=False, last_run=result, runs=self.state["runs"] + 1)
+            self._run_lock.release()
+        print(f"[daemon] run ({source}) -> {result}")
+        return result
+
+    def trigger(self, only=(), force=(), source: str = "manual") -> dict:
+        if self._run_lock.locked():
+            return {"ok": False, "error": "busy"}
+        threading.Thread(target=self.run_once, args=(only, force, source), daemon=True).start()
+        return {"ok": True, "queued": True}
+
+    # --- 소켓 명령 ---
+
+    def handle(self, line: str) -> dict:
+        parts = line.split()
+        if not parts:
+            return {"ok": False, "error": "empty command"}
+        cmd, args = parts[0], parts[1:]
+        if cmd == "status":
+            return {"ok": True, **self.state}
+        if cmd == "stop":
+            self._stop.set()
+            return {"ok": True, "stopping": True}
+        if cmd == "run":
+            wait = "--wait" in args
+            only = force = ()
+            for flag, val in zip(args, args[1:] + [""]):
+                if flag == "--only":
+                    only = [x for x in val.split(",") if x]
+                elif flag == "--force":
+                    force = [x for x in val.split(",") if x]
+            if wait:
+                return self.run_once(only, force, source="socket")
+            return self.trigger(only, force, source="socket")
+        return {"ok": False, "error": f"unknown command: {cmd}"}
+
+    def _serve(self) -> socketserver.ThreadingTCPServer:
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline(4096).decode("utf-8", errors="replace").strip()
+                reply = daemon.handle(line)
+                self.wfile.write((json.dumps(reply, ensure_ascii=False) + "\n").encode("utf-8"))
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        server = socketserver.ThreadingTCPServer((self.host, self.port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"[daemon] listening on {self.host}:{self.port}")
+        return server
+
+    # --- 메인 루프 ---
+
+    def serve_forever(self):
+        from app.common.http import RESPONSE_CACHE
+
+        warm_imports()
+        RESPONSE_CACHE.ttl = RESPONSE_CACHE_TTL
+        server = self._serve()
+        try:
+            next_run = self.schedule.next_after(datetime.now())
+            while not self._stop.is_set():
+                self.state["next_run"] = next_run.isoformat(timespec="minutes")
+                wait = (next_run - datetime.now()).total_seconds()
+                if wait > 0:
+                    self._stop.wait(min(wait, MAX_TICK_SEC))
+                    continue
+                self.trigger(source="cron")
+                next_run = self.schedule.next_after(datetime.now())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+            print("[daemon] stopped")
+
+
+def send(command: str, host: str = HOST, port: int = PORT, timeout: float | None = None) -> dict:
+    with socket.create_connection((host, port), timeout=timeout) as s:
+        s.sendall((command.strip() + "\n").encode("utf-8"))
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    return json.loads(buf.decode("utf-8") or "{}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m app.daemon", description="scheduled pipeline daemon")
+    ap.add_argument("--cron", default=DEFAULT_CRON, help=f'cron 식 (기본 "{DEFAULT_CRON}", 로컬 시간)')
+    ap.add_argument("--host", default=HOST)
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--send", metavar="CMD", help="실행 중인 daemon 에 명령 전송 (run [--wait] [--only a,b] [--force a,b] | status | stop)")
+    ap.add_argument("--run-now", action="store_true", help="시작하자마자 한 번 실행")
+    args = ap.parse_args(argv)
+
+    if args.send:
+        try:
+            reply = send(args.send, args.host, args.port)
+        except OSError as e:
+            print(f"[daemon] not reachable on {args.host}:{args.port} ({e})")
+            return 1
+        print(json.dumps(reply, ensure_ascii=False, indent=2))
+        return 0 if reply.get("ok") else 1
+
+    d = Daemon(args.cron, args.host, args.port)
+    if args.run_now:
+        threading.Timer(1.0, d.trigger, kwargs={"source": "startup"}).start()
+    d.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+"""
+과거 구간 백필: 날짜 범위를 창(window)으로 나눠 Algolia search_by_date 를 병렬로 훑고,
+그날 잡이 돌았던 것처럼 일별 케이스/엣지/지표를 만든다.
+
+    python -m app.ingestion.backfill --start 2025-10-01 --end 2026-09-30
+    python -m app.ingestion.backfill --start 2026-01-01 --end 2026-01-31 --comments --workers 4
+
+- (창 × 쿼리) 작업을 AlgoliaSource 풀에서 동시에 → 요청 속도는 소스 하나의 토큰 버킷을 공유 (--rate)
+- 창이 가득 차면(page_size × max_pages) 반으로 나눠 다시 (하루 단위까지)
+- hit 은 created_at(UTC) 날짜로 나눠 그날 안에서 중복 제거 → points 순 상위 --per-day 개
+- 출력 (날짜마다 tmp → 교체)
+    data/partitions/date=YYYY-MM-DD/cases.csv, edges.csv, metrics.json
+    daily_interest_metrics.csv 는 해당 날짜 행만 교체(upsert) → 롤업은 끝에서 한 번 다시 계산
+- 이미 파티션이 있는 날짜는 건너뜀 (--force 로 다시) → 중간에 끊겨도 다시 돌리면 남은 날짜만
+- 댓글 트리는 글마다 요청 1번이라 기본은 끔 (제목/본문만으로 태깅). --comments 로 켜면
+  1년 × 하루 30건 ≈ 11k 요청 → 기본 rate(2.5/s)로 약 1시간
+- trends.json 은 과거 날짜를 받지 않으므로(trends.update_trends) 건드리지 않음
+"""
+from __future__ import annotations
+
+import argparse
+import calendar
+import json
+import os
+import time
+from concurrent.futures import as_completed
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from app.common.metrics import METRICS
+from app.ingestion import hn_fetch
+from app.ingestion.dedupe import collapse_hits
+from app.ingestion.sources import AlgoliaSource
+from app.knowledge.rollup import rebuild_rollups
+
+PARTITION_DIR = Path("data/partitions")
+WINDOW_DAYS = 7
+WORKERS = 8
+PAGE_SIZE = 100
+MAX_PAGES = 10          # 창 하나 × 쿼리 하나에 받는 최대 페이지 (Algolia 는 1000건까지)
+DAY_SEC = 86400
+
+
+# -------------------------
+# 창 나누기 / 크롤
+# -------------------------
+
+def _ts(d: date) -> int:
+    return calendar.timegm(d.timetuple())
+
+
+def _days_in(lo: int, hi: int) -> list[str]:
+    return [datetime.fromtimestamp(t, tz=timezone.utc).date().isoformat() for t in range(lo, hi, DAY_SEC)]
+
+
+def windows(start: date, end: date, days: int = WINDOW_DAYS) -> list[tuple[int, int]]:
+    """[start, end] (양 끝 포함) → [lo, hi) created_at_i 창들"""
+    out, d = [], start
+    while d <= end:
+        nxt = min(d + timedelta(days=days), end + timedelta(days=1))
+        out.append((_ts(d), _ts(nxt)))
+        d = nxt
+    return out
+
+
+def crawl(src: AlgoliaSource, query: str, lo: int, hi: int,
+          page_size: int = PAGE_SIZE, max_pages: int = MAX_PAGES) -> list[dict]:
+    hits = src.search_range(query, lo, hi, page_size, max_pages)
+    if len(hits) >= page_size * max_pages and hi - lo > DAY_SEC:
+        # 창이 가득 참 → 잘린 부분이 있을 수 있으니 (하루 경계로) 반씩 다시
+        mid = lo + max(1, (hi - lo) // DAY_SEC // 2) * DAY_SEC
+        return (crawl(src, query, lo, mid, page_size, max_pages)
+                + crawl(src, query, mid, hi, page_size, max_pages))
+    return hits
+
+
+def group_by_day(hits, days: set[str], per_day: int, dedupe: bool = hn_fetch.DEDUPE_ENABLED) -> dict:
+    """hit → {날짜: 그날 상위 per_day 개 (points 내림차순)}"""
+    seen, by_day = set(), {d: [] for d in days}
+    for h in hits:
+        oid = h.get("objectID")
+        day = (h.get("created_at") or "")[:10]
+        if not oid or oid in seen or day not in by_day:
+            continue
+        seen.add(oid)
+        by_day[day].append(h)
+    out = {}
+    for day, day_hits in by_day.items():
+        if dedupe:
+            day_hits = collapse_hits(day_hits)
+        day_hits.sort(key=lambda h: (-(h.get("points") or 0), h["objectID"]))
+        out[day] = day_hits[:per_day]
+    return out
+
+
+# -------------------------
+# 출력
+# -------------------------
+
+def partition_dir(day: str, root: Path = PARTITION_DIR) -> Path:
+    return Path(root) / f"date={day}"
+
+
+def _done(day: str, root: Path) -> bool:
+    # metrics.json 은 마지막에 쓰므로 이게 있으면 그날 파티션은 완성
+    return (partition_dir(day, root) / "metrics.json").exists()
+
+
+def write_partition(day: str, cases: list, root: Path = PARTITION_DIR) -> dict:
+    out = partition_dir(day, root)
+    out.mkdir(parents=True, exist_ok=True)
+    hn_fetch.write_cases_csv(cases, str(out / "cases.csv"))
+    hn_fetch.write_edges_csv(hn_fetch.edge_rows(hn_fetch.build_edge_counter(cases), day), str(out / "edges.csv"))
+    row = hn_fetch.compute_daily_row(cases, day)
+    tmp = out / "metrics.json.tmp"
+    tmp.write_text(json.dumps(row, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, out / "metrics.json")
+    return row
+
+
+# -------------------------
+# 실행
+# -------------------------
+
+def run_backfill(start: date, end: date, queries=None, window_days: int = WINDOW_DAYS,
+                 workers: int = WORKERS, rate: float | None = None, per_day: int = hn_fetch.MAX_RESULTS,
+                 comments: bool = False, force: bool = False, root: Path = PARTITION_DIR,
+                 daily_path: str = hn_fetch.DAILY_PATH) -> dict:
+    queries = list(queries or hn_fetch.QUERIES)
+    all_days = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+    todo = {d for d in all_days if force or not _done(d, root)}
+    if not todo:
+        print(f"[backfill] {start}..{end}: all {len(all_days)} days already backfilled (--force to redo)")
+        return {"days": 0, "cases": 0}
+
+    budget = hn_fetch.SOURCE_BUDGETS.get("algolia", {})
+    src = AlgoliaSource(hn_fetch.ALGOLIA_SEARCH, hn_fetch.ALGOLIA_ITEM,
+                        concurrency=workers, rate=rate if rate is not None else budget.get("rate"),
+                        burst=budget.get("burst"))
+    # 할 날짜가 하나도 없는 창은 요청하지 않음
+    wins = [(lo, hi) for lo, hi in windows(start, end, window_days) if todo.intersection(_days_in(lo, hi))]
+    t0 = time.perf_counter()
+    try:
+        with METRICS.stage("backfill_fetch", group="fetch"):
+            futures = {src.submit(crawl, src, q, lo, hi): (q, lo, hi) for lo, hi in wins for q in queries}
+            hits, failed = [], set()
+            for fut in as_completed(futures):
+                try:
+                    hits.extend(fut.result())
+                except Exception as e:
+                    q, lo, hi = futures[fut]
+                    failed.update(_days_in(lo, hi))
+                    print(f"[backfill] window {_days_in(lo, hi)[0]} {q!r} failed: {type(e).__name__}: {e}")
+            if failed:
+                # 실패한 창의 날짜는 파티션을 쓰지 않음 → 다시 돌리면 그 날짜만 다시 가져옴
+                print(f"[backfill] {len(failed & todo)} day(s) left for the next run (failed requests)")
+            by_day = group_by_day(hits, todo - failed, per_day)
+            selected = [h for day_hits in by_day.values() for h in day_hits]
+            threads = {}
+            if comments and selected:
+                futs = {src.submit(src.comments, h): h["objectID"] for h in selected}
+                for fut in as_completed(futs):
+                    try:
+                        threads[futs[fut]] = fut.result()
+                    except Exception:
+                        threads[futs[fut]] = []
+        t1 = time.perf_counter()
+        print(f"[backfill] fetched {len(hits)} hits over {len(wins)} windows x {len(queries)} queries "
+              f"({len(threads)} threads) in {t1 - t0:.1f}s")
+    finally:
+        src.close()
+
+    rows, n_cases = [], 0
+    with METRICS.stage("backfill_tag", group="tag"):
+        for day in sorted(by_day):
+            cases = hn_fetch.tag_cases(by_day[day], threads)
+            rows.append(write_partition(day, cases, root))
+            n_cases += len(cases)
+    if rows:
+        hn_fetch.upsert_daily_rows(rows, daily_path)
+        rebuild_rollups(daily_path)
+    print(f"[backfill] {len(rows)} days, {n_cases} cases -> {root}, {daily_path} "
+          f"(total {time.perf_counter() - t0:.1f}s)")
+    return {"days": len(rows), "cases": n_cases}
+
+
+def _date(s: str) -> date:
+    return datetime.strptime(s, "%Y-%m-%d").date()
+
+
+def main(argv=None):
+    yesterday = date.today() - timedelta(days=1)
+    ap = argparse.ArgumentParser(prog="python -m app.ingestion.backfill",
+                                 description="historical backfill over created_at_i windows")
+    ap.add_argument("--start", type=_date, default=yesterday - timedelta(days=364))
+    ap.add_argument("--end", type=_date, default=yesterday)
+    ap.add_argument("--window-days", type=int, default=WINDOW_DAYS)
+    ap.add_argument("--workers", type=int, default=WORKERS, help="동시에 보내는 요청 수")
+    ap.add_argument("--rate", type=float, default=None, help="초당 요청 수 (기본: algolia 소스 예산)")
+    ap.add_argument("--per-day", type=int, default=hn_fetch.MAX_RESULTS, help="하루에 남길 케이스 수")
+    ap.add_argument("--comments", action="store_true", help="댓글 트리도 가져와 태깅 (요청 수가 크게 늘어남)")
+    ap.add_argument("--force", action="store_true", help="이미 있는 파티션도 다시")
+    args = ap.parse_args(argv)
+    if args.start > args.end:
+        print("[backfill] --start must be <= --end")
+        return 2
+
+    METRICS.reset()
+    run_backfill(args.start, args.end, window_days=args.window_days, workers=args.workers,
+                 rate=args.rate, per_day=args.per_day, comments=args.comments, force=args.force)
+    METRICS.write()
+    METRICS.print_summary()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+"""
+수집 체크포인트: 중간에 죽은 실행(timeout, rate limit, pod eviction)을 같은 날 이어서 돌리기 위한 append-only 저널.
+
+data/checkpoints/<date>.jsonl 한 줄 = 레코드 하나
+    {"kind": "meta",   "key": ...}                                  실행 설정 해시 (다르면 저널을 버리고 새로 시작)
+    {"kind": "search", "query", "source", "page", "hits": [...]}    (쿼리, 소스, 페이지) 커서별 검색 결과
+    {"kind": "thread", "object_id", "comments": [[text, depth, id]...]}  댓글 트리
+    {"kind": "case",   "object_id", "tagger", "case": {...}, "hits": {...}}
+                                                                   태깅된 케이스 (+ hit_index 항목), tagger = 규칙/코드 해시
+    {"kind": "done"}
+
+- 레코드는 바로 파일 버퍼에 쓰고, FLUSH_EVERY_SEC 마다 flush + fsync (죽어도 그 이전까지는 남음)
+- 재실행 시 저널을 읽어 이미 받은 커서/스레드/케이스는 건너뜀
+  (마지막 줄이 쓰다 만 줄이면 그 앞까지 잘라내고 이어 씀)
+- 실행이 끝나면 complete() → "done" 기록 후 <date>.done.jsonl 로 옮김 → 다음 실행은 새로 시작
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from app.ingestion.sources import Comment, comment_depth, comment_id
+
+CHECKPOINT_DIR = Path("data/checkpoints")
+FLUSH_EVERY_SEC = 2.0
+
+
+def run_key(params: dict) -> str:
+    """실행 설정(쿼리, 소스, 개수 ...) 해시 — 설정이 바뀌면 이전 저널은 재사용하지 않음"""
+    blob = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def journal_path(day: str, root: Path = CHECKPOINT_DIR) -> Path:
+    return Path(root) / f"{day}.jsonl"
+
+
+def discard(day: str, root: Path = CHECKPOINT_DIR) -> bool:
+    """--refresh 처럼 처음부터 다시 받을 때 오늘 저널 삭제"""
+    path = journal_path(day, root)
+    if path.exists():
+        path.unlink()
+        return True
+    return False
+
+
+def _read(path: Path) -> tuple[list[dict], int]:
+    """(레코드들, 마지막으로 온전한 줄의 끝 offset)"""
+    records, good = [], 0
+    with path.open("rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            good += len(line)
+    return records, good
+
+
+class Journal:
+    def __init__(self, path: Path, key: str, flush_every: float = FLUSH_EVERY_SEC):
+        self.path = Path(path)
+        self.key = key
+        self.flush_every = flush_every
+        self.searches: dict[tuple, list] = {}   # (query, source, page) -> hits
+        self.threads: dict[str, list] = {}      # objectID -> [Comment]
+        self.cases: dict[str, dict] = {}        # objectID -> case
+        self.case_hits: dict[str, dict] = {}    # objectID -> hit_index 항목 (라벨별 매치 위치)
+        self.case_keys: dict[str, str] = {}     # objectID -> 태깅한 규칙/코드 해시 (hn_fetch.tagger_key)
+        self.resumed = 0
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        records, good = _read(self.path) if self.path.exists() else ([], 0)
+        if records and records[0].get("kind") == "meta" and records[0].get("key") == key:
+            for rec in records[1:]:
+                self._apply(rec)
+            self.resumed = len(records) - 1
+            self._f = self.path.open("r+b")
+            self._f.truncate(good)
+            self._f.seek(good)
+        else:
+            # 저널이 없거나 설정이 바뀜 → 새로 시작
+            self._f = self.path.open("wb")
+            self._write({"kind": "meta", "key": key})
+            self._sync()
+
+    def _apply(self, rec: dict):
+        kind = rec.get("kind")
+        if kind == "search":
+            self.searches[(rec["query"], rec["source"], rec.get("page", 0))] = rec["hits"]
+        elif kind == "thread":
+            self.threads[rec["object_id"]] = [Comment(*c) for c in rec["comments"]]
+        elif kind == "case":
+            self.cases[rec["object_id"]] = rec["case"]
+            self.case_keys[rec["object_id"]] = rec.get("tagger")
+            if rec.get("hits") is not None:
+                self.case_hits[rec["object_id"]] = rec["hits"]
+            else:
+                self.case_hits.pop(rec["object_id"], None)
+
+    def _write(self, rec: dict):
+        self._f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    def _sync(self):
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._last_flush = time.monotonic()
+
+    def append(self, rec: dict):
+        with self._lock:
+            self._write(rec)
+            self._apply(rec)
+            if time.monotonic() - self._last_flush >= self.flush_every:
+                self._sync()
+
+    # --- 레코드 ---
+
+    def search_hits(self, query: str, source: str, page: int = 0) -> list | None:
+        return self.searches.get((query, source, page))
+
+    def record_search(self, query: str, source: str, hits: list, page: int = 0):
+        self.append({"kind": "search", "query": query, "source": source, "page": page, "hits": hits})
+
+    def record_thread(self, object_id: str, comments: list):
+        self.append({
+            "kind": "thread",
+            "object_id": object_id,
+            "comments": [[str(c), comment_depth(c), comment_id(c)] for c in comments],
+        })
+
+    def cases_for(self, tagger: str) -> dict:
+        """같은 규칙/코드(tagger 키)로 태깅된 케이스만 — 다르면 다시 태깅"""
+        return {oid: c for oid, c in self.cases.items() if self.case_keys.get(oid) == tagger}
+
+    def record_case(self, case: dict, hits: dict | None = None, tagger: str | None = None):
+        rec = {"kind": "case", "object_id": case["object_id"], "tagger": tagger, "case": case}
+        if hits is not None:
+            rec["hits"] = hits
+        self.append(rec)
+
+    # --- 종료 ---
+
+    def close(self):
+        with self._lock:
+            if not self._f.closed:
+                self._sync()
+                self._f.close()
+
+    def complete(self) -> Path:
+        """실행 완료: done 기록 후 <date>.done.jsonl 로 옮김 (다음 실행은 새 저널)"""
+        self.close()
+        return _finish(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def summary(self) -> str:
+        return f"{len(self.searches)} searches, {len(self.threads)} threads, {len(self.cases)} cases"
+
+
+def open_journal(day: str, params: dict, root: Path = CHECKPOINT_DIR, quiet: bool = False) -> Journal:
+    """quiet: 같은 실행에서 이미 연 저널을 다시 열 때 (resuming 메시지 생략)"""
+    j = Journal(journal_path(day, root), run_key(params))
+    if j.resumed and not quiet:
+        print(f"[checkpoint] resuming {j.path} ({j.summary()})")
+    return j
+
+
+def _finish(path: Path) -> Path:
+    with path.open("ab") as f:
+        f.write(b'{"kind":"done"}\n')
+    done = path.with_name(path.stem + ".done.jsonl")
+    os.replace(path, done)
+    return done
+
+
+def complete(day: str, root: Path = CHECKPOINT_DIR) -> Path | None:
+    """저널 객체 없이 오늘 저널을 완료 처리 (파이프라인 실행이 끝났을 때)"""
+    path = journal_path(day, root)
+    return _finish(path) if path.exists() else None
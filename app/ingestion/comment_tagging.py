@@ -0,0 +1,256 @@
+"""
+댓글 단위 태깅: 스레드 전체를 자르지 않고 댓글마다 라벨 hit 수를 세서 케이스 신호 강도로 합친다.
+
+- 라벨 규칙은 {"feature:x" | "risk:x" | "pattern:x": 정규식} (hn_fetch.LABEL_RULES)
+- 댓글 CHUNK_SIZE 개를 한 문자열로 이어(소문자) 규칙마다 한 번에 찾고 → 매치 위치를 댓글 번호로 되돌림
+- 규칙이 \\b(a|b|c)\\b 꼴이면 대안의 앞쪽 리터럴로 str.find 후보만 찾고 그 위치에서만 정규식 확인
+  (re.I 정규식으로 전체를 훑는 것보다 수십 배 빠름, 결과는 같음 — 겹치는 매치는 finditer 처럼 버림)
+- 댓글 하나의 라벨 hit 은 HIT_CAP 까지만 셈 (같은 단어를 반복하는 댓글 하나가 신호를 독점하지 않게)
+- 깊이 가중치: 글 본문/최상위 댓글 1.0, 답글은 깊어질수록 1 / (1 + DEPTH_DECAY * (depth - 1))
+- strength = 1 - exp(-가중 hit 합 / STRENGTH_SCALE) → 0~1
+- 댓글이 PARALLEL_MIN_COMMENTS 개 이상이고 workers > 0 이면 청크를 프로세스 풀에서 처리 (정규식은 GIL 을 안 놓음)
+- 훑는 김에 셈에 들어간 매치 위치도 남김: 라벨마다 깊이 가중치가 큰 POSITIONS_PER_LABEL 개
+  "at": [[댓글 번호 (-1 = 본문), 시작, 끝], ...] → hit_index 가 정규식을 다시 돌리지 않고 evidence 스니펫을 자름
+"""
+from __future__ import annotations
+
+import math
+import re
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from app.ingestion.sources import comment_depth
+
+CHUNK_SIZE = 256
+HIT_CAP = 3
+DEPTH_DECAY = 0.5
+STRENGTH_SCALE = 3.0
+# 처리량 하한 (댓글/초, 단일 코어). 측정값: 합성 코퍼스 1k/10k 에서 17,000~20,000/s (라벨 66개 리터럴 후보를
+# 텍스트마다 str.find 로 훑는 비용이 대부분) → 측정값보다 조금 낮게 잡아 느려졌을 때만 걸리게.
+# 이 정도면 1만 댓글 스레드도 1초 안 → 자를 이유가 없음. benchmarks.run --check 의 tag 스테이지가 확인
+TARGET_COMMENTS_PER_SEC = 15_000
+PARALLEL_MIN_COMMENTS = 20_000   # 이보다 적으면 프로세스 기동 비용이 더 큼
+POSITIONS_PER_LABEL = 3
+SEP = "\n"                       # 정리된 댓글에는 개행이 없으므로 경계로 사용
+
+_MATCHER = None                  # 워커 프로세스용 (initializer 로 한 번만 전달)
+
+_GROUP_RE = re.compile(r"^\\b\((?P<body>[^()]*)\)\\b$")
+_META = set(".^$*+?{}[]\\|()")
+
+
+def _anchors(pattern: str) -> list[str] | None:
+    """\\b(alt|alt)\\b 의 대안별 리터럴 접두어 (소문자). 뽑을 수 없으면 None → 정규식으로 전체 탐색"""
+    m = _GROUP_RE.match(pattern)
+    if not m:
+        return None
+    out = []
+    for alt in m.group("body").split("|"):
+        prefix = ""
+        for ch in alt:
+            if ch in _META:
+                break
+            prefix += ch
+        if not prefix:
+            return None
+        out.append(prefix.lower())
+    # 다른 후보로 시작하는 후보는 중복 탐색이므로 제외 ("speaker" 가 "speaker label" 을 포함)
+    out = sorted(set(out))
+    return [a for a in out if not any(a != b and a.startswith(b) for b in out)]
+
+
+class LabelMatcher:
+    """라벨 규칙 묶음 → 텍스트에서 라벨별 매치 시작 위치"""
+
+    def __init__(self, rules: dict):
+        self.rules = rules
+        self._lower = {}   # label -> (re.I 를 뺀 정규식, 리터럴 후보)
+        for label, rx in rules.items():
+            anchors = _anchors(rx.pattern) if rx.flags & re.I else None
+            if anchors:
+                self._lower[label] = (re.compile(rx.pattern, rx.flags & ~re.I), anchors)
+
+    def __reduce__(self):
+        return (LabelMatcher, (self.rules,))
+
+    def find(self, text: str):
+        """(label, start, end) — 라벨마다 finditer 와 같은 (겹치지 않는) 매치"""
+        low = text.lower()
+        if len(low) != len(text):
+            # 소문자 변환으로 길이가 바뀌는 문자(İ 등)가 있으면 위치가 어긋나므로 원문 정규식으로
+            for label, rx in self.rules.items():
+                for m in rx.finditer(text):
+                    yield label, m.start(), m.end()
+            return
+        for label, rx in self.rules.items():
+            fast = self._lower.get(label)
+            if fast is None:
+                for m in rx.finditer(text):
+                    yield label, m.start(), m.end()
+                continue
+            lrx, anchors = fast
+            spans = []
+            for a in anchors:
+                i = low.find(a)
+                while i != -1:
+                    m = lrx.match(low, i)
+                    if m:
+                        spans.append((i, m.end()))
+                    i = low.find(a, i + 1)
+            end = -1
+            for start, stop in sorted(spans):
+                if start >= end:
+                    yield label, start, stop
+                    end = stop if stop > start else start + 1
+
+
+_MATCHERS: dict = {}
+
+
+def matcher_for(rules: dict | LabelMatcher) -> LabelMatcher:
+    # 규칙 dict 는 모듈 상수라 id 로 캐시 (streaming 처럼 케이스마다 부르는 경우 재컴파일 방지)
+    if isinstance(rules, LabelMatcher):
+        return rules
+    hit = _MATCHERS.get(id(rules))
+    if hit is None or hit.rules is not rules:
+        hit = _MATCHERS[id(rules)] = LabelMatcher(rules)
+    return hit
+
+
+def depth_weight(depth: int) -> float:
+    return 1.0 if depth <= 1 else 1.0 / (1.0 + DEPTH_DECAY * (depth - 1))
+
+
+def count_hits(texts: list[str], matcher: LabelMatcher, spans: list | None = None) -> list[Counter]:
+    """
+    댓글별 {label: hit 수 (HIT_CAP 까지)}.
+    spans 를 주면 셈에 들어간 매치마다 (label, 댓글 번호, 댓글 안 시작, 끝) 를 덧붙임
+    """
+    out = [Counter() for _ in texts]
+    if not texts:
+        return out
+    starts, pos = [], 0
+    for t in texts:
+        starts.append(pos)
+        pos += len(t) + len(SEP)
+    for label, start, end in matcher.find(SEP.join(texts)):
+        i = bisect_right(starts, start) - 1
+        c = out[i]
+        if c[label] < HIT_CAP:
+            c[label] += 1
+            if spans is not None:
+                spans.append((label, i, start - starts[i], end - starts[i]))
+    return out
+
+
+def _count_chunk(job):
+    case_idx, texts, depths, base = job
+    spans = []
+    return case_idx, _weigh(count_hits(texts, _MATCHER, spans), depths, spans, base)
+
+
+def _init_worker(matcher):
+    global _MATCHER
+    _MATCHER = matcher
+
+
+def _top_positions(positions: list) -> list:
+    # 깊이 가중치 큰 순, 같으면 앞쪽 댓글 먼저
+    positions.sort(key=lambda p: (-p[0], p[1], p[2]))
+    return positions[:POSITIONS_PER_LABEL]
+
+
+def _weigh(per_comment: list[Counter], depths: list[int], spans=(), base: int = 0) -> dict:
+    """
+    청크 → {label: [hits, 댓글 수, 가중 합, 위치]} (청크끼리 더할 수 있는 형태)
+    위치: [(가중치, 댓글 번호, 시작, 끝)] 상위 POSITIONS_PER_LABEL 개. base = 청크 첫 텍스트의 댓글 번호
+    """
+    acc = {}
+    weights = [depth_weight(d) for d in depths]
+    for counts, w in zip(per_comment, weights):
+        for label, n in counts.items():
+            a = acc.setdefault(label, [0, 0, 0.0, []])
+            a[0] += n
+            a[1] += 1
+            a[2] += w * n
+    for label, i, start, end in spans:
+        acc[label][3].append((weights[i], base + i, start, end))
+    for a in acc.values():
+        if len(a[3]) > POSITIONS_PER_LABEL:
+            a[3] = _top_positions(a[3])
+    return acc
+
+
+def _merge(into: dict, part: dict):
+    for label, (hits, comments, weight, positions) in part.items():
+        a = into.setdefault(label, [0, 0, 0.0, []])
+        a[0] += hits
+        a[1] += comments
+        a[2] += weight
+        a[3] += positions
+        if len(a[3]) > POSITIONS_PER_LABEL:
+            a[3] = _top_positions(a[3])
+
+
+def _finish(acc: dict) -> dict:
+    return {
+        label: {
+            "hits": hits,
+            "comments": comments,
+            "strength": round(1.0 - math.exp(-weight / STRENGTH_SCALE), 4),
+            "at": [[ci, start, end] for _, ci, start, end in _top_positions(positions)],
+        }
+        for label, (hits, comments, weight, positions) in acc.items()
+    }
+
+
+def _jobs(items):
+    # (케이스 번호, 텍스트 청크, 깊이 청크, 청크 첫 텍스트의 댓글 번호)
+    # 본문(header)은 깊이 0, 댓글 번호 -1 인 댓글로 취급
+    for i, (header, comments) in enumerate(items):
+        texts = ([header] if header else []) + list(comments)
+        depths = ([0] if header else []) + [comment_depth(c) for c in comments]
+        first = -1 if header else 0
+        for s in range(0, len(texts), CHUNK_SIZE):
+            yield i, [str(t) for t in texts[s:s + CHUNK_SIZE]], depths[s:s + CHUNK_SIZE], first + s
+
+
+def tag_threads(items, rules: dict | LabelMatcher, workers: int = 0) -> list[dict]:
+    """
+    items: [(본문 텍스트, 댓글 리스트)] → 케이스별 {label: {"hits", "comments", "strength", "at"}}.
+    workers > 0 이고 전체 댓글이 PARALLEL_MIN_COMMENTS 이상이면 프로세스 풀 사용.
+    """
+    matcher = matcher_for(rules)
+    items = list(items)
+    accs = [{} for _ in items]
+    total = sum(len(c) for _, c in items)
+    if workers > 0 and total >= PARALLEL_MIN_COMMENTS:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matcher,)) as pool:
+            for i, part in pool.map(_count_chunk, _jobs(items), chunksize=4):
+                _merge(accs[i], part)
+    else:
+        for i, texts, depths, base in _jobs(items):
+            spans = []
+            _merge(accs[i], _weigh(count_hits(texts, matcher, spans), depths, spans, base))
+    return [_finish(a) for a in accs]
+
+
+def format_signals(signals: dict) -> str:
+    """CSV 용: 'feature:action_items=0.82;risk:latency=0.40' (강도 내림차순)"""
+    ordered = sorted(signals.items(), key=lambda kv: (-kv[1]["strength"], kv[0]))
+    return ";".join(f"{label}={s['strength']:.2f}" for label, s in ordered) or "-"
+
+
+def parse_signals(s: str | None) -> dict:
+    out = {}
+    if not s or s == "-":
+        return out
+    for part in s.split(";"):
+        label, _, v = part.rpartition("=")
+        if label:
+            try:
+                out[label] = float(v)
+            except ValueError:
+                continue
+    return out
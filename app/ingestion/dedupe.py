@@ -0,0 +1,199 @@
+"""
+댓글 트리를 가져오기 전에 같은 제품의 재게시글을 묶는다.
+
+- URL 정규화: scheme/www/추적 파라미터/끝 슬래시/fragment 제거 → 같은 키면 같은 제품
+- 제목 SimHash(64bit) + 밴드 인덱스: 해밍 거리 ≤ MAX_HAMMING 이면 같은 제품
+묶인 클러스터는 대표 글 1개만 fetch 하고, points/comments 는 모든 글을 합산해서 크레딧한다.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+SIMHASH_BITS = 64
+BANDS = 4                 # 64bit / 4 = 16bit 밴드 → 거리 ≤3 이면 최소 한 밴드는 완전히 같음 (비둘기집)
+MAX_HAMMING = 3
+MIN_TITLE_TOKENS = 4      # 너무 짧은 제목은 SimHash 충돌이 많아서 URL로만 묶음
+
+TRACKING_PARAMS = {
+    "ref", "ref_src", "source", "src", "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid",
+    "igshid", "si", "trk", "_hsenc", "_hsmi", "yclid",
+}
+# 게시글마다 다른 URL이라 정규화 키로 쓰면 안 되는 호스트
+PER_POST_HOSTS = {"news.ycombinator.com"}
+
+TITLE_PREFIX_RE = re.compile(r"^\s*(show|ask|launch|tell)\s+hn\s*[:\-–]\s*", re.I)
+TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def canonicalize_url(url: str | None) -> str | None:
+    if not url:
+        return None
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+    host = (parts.hostname or "").lower()
+    if not host:
+        return None
+    if host.startswith("www."):
+        host = host[4:]
+    if host in PER_POST_HOSTS:
+        return None
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path or "")
+    path = re.sub(r"/(index|default)\.(html?|php|aspx?)$", "/", path, flags=re.I)
+    path = path.rstrip("/")
+
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=False)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+    qs = f"?{urlencode(query)}" if query else ""
+    return f"{host}{path}{qs}"
+
+
+def title_tokens(title: str) -> list[str]:
+    t = TITLE_PREFIX_RE.sub("", title or "")
+    return TOKEN_RE.findall(t.lower())
+
+
+def _h64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(tokens: list[str]) -> int:
+    # unigram + bigram 특징 (단어 순서가 조금 바뀌어도 가깝게)
+    feats = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    v = [0] * SIMHASH_BITS
+    for f in feats:
+        h = _h64(f)
+        for i in range(SIMHASH_BITS):
+            v[i] += 1 if (h >> i) & 1 else -1
+    out = 0
+    for i in range(SIMHASH_BITS):
+        if v[i] > 0:
+            out |= 1 << i
+    return out
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class HammingIndex:
+    """밴드별 해시 버킷 → 후보만 정확한 해밍 거리로 확인"""
+
+    def __init__(self, bands: int = BANDS, max_distance: int = MAX_HAMMING):
+        self.bands = bands
+        self.width = SIMHASH_BITS // bands
+        self.mask = (1 << self.width) - 1
+        self.max_distance = max_distance
+        self.buckets = [dict() for _ in range(bands)]
+
+    def _keys(self, h: int):
+        for b in range(self.bands):
+            yield b, (h >> (b * self.width)) & self.mask
+
+    def query(self, h: int) -> set:
+        found = set()
+        for b, key in self._keys(h):
+            for other_h, item in self.buckets[b].get(key, ()):
+                if item not in found and hamming(h, other_h) <= self.max_distance:
+                    found.add(item)
+        return found
+
+    def add(self, h: int, item):
+        for b, key in self._keys(h):
+            self.buckets[b].setdefault(key, []).append((h, item))
+
+
+class HitDeduper:
+    """
+    hit를 하나씩 넣으면서 온라인으로 클러스터링 (union-find).
+    새 hit가 기존 클러스터 두 개를 잇게 되면 두 클러스터를 합친다.
+    """
+
+    def __init__(self):
+        self.parent = {}
+        self.hits = {}            # objectID -> hit
+        self.order = []           # 입력 순서
+        self.rank = {}            # objectID -> 입력 순번
+        self.by_url = {}          # canonical url -> objectID
+        self.index = HammingIndex()
+        self.num_clusters = 0
+
+    def _find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def _union(self, a, b):
+        ra, rb = self._find(a), self._find(b)
+        if ra != rb:
+            # 먼저 들어온 쪽을 루트로 (클러스터 순서 = 첫 등장 순서)
+            if self.rank[ra] > self.rank[rb]:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+    def add(self, hit: dict) -> bool:
+        """새 클러스터가 생겼으면 True"""
+        oid = hit["objectID"]
+        if oid in self.hits:
+            return False
+        self.hits[oid] = hit
+        self.parent[oid] = oid
+        self.rank[oid] = len(self.order)
+        self.order.append(oid)
+
+        links = set()
+        key = canonicalize_url(hit.get("url"))
+        if key:
+            if key in self.by_url:
+                links.add(self.by_url[key])
+            else:
+                self.by_url[key] = oid
+
+        toks = title_tokens(hit.get("title") or "")
+        if len(toks) >= MIN_TITLE_TOKENS:
+            h = simhash(toks)
+            links |= self.index.query(h)
+            self.index.add(h, oid)
+
+        roots = {self._find(x) for x in links}
+        for other in links:
+            self._union(oid, other)
+        # 새 클러스터 +1, 기존 클러스터 k개와 합쳐지면 -k
+        self.num_clusters += 1 - len(roots)
+        return not roots
+
+    def clusters(self) -> list[list[dict]]:
+        groups = {}
+        for oid in self.order:
+            groups.setdefault(self._find(oid), []).append(self.hits[oid])
+        return list(groups.values())
+
+
+def merge_cluster(members: list[dict]) -> dict:
+    """
+    대표 글 = 댓글이 가장 많은 글 (fetch 할 스레드), 동률이면 points.
+    points/num_comments 는 클러스터 전체 합으로 크레딧.
+    """
+    rep = max(members, key=lambda h: (h.get("num_comments") or 0, h.get("points") or 0))
+    merged = dict(rep)
+    merged["points"] = sum(h.get("points") or 0 for h in members)
+    merged["num_comments"] = sum(h.get("num_comments") or 0 for h in members)
+    merged["dup_object_ids"] = [h["objectID"] for h in members if h["objectID"] != rep["objectID"]]
+    return merged
+
+
+def collapse_hits(hits: list[dict]) -> list[dict]:
+    d = HitDeduper()
+    for h in hits:
+        d.add(h)
+    return [merge_cluster(c) for c in d.clusters()]
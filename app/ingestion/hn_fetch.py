@@ -1,16 +1,22 @@
 import csv
 import re
 import time
-import requests
 import os
 from datetime import datetime, timezone
 from urllib.parse import urlencode
 from collections import Counter, defaultdict
 from contextlib import redirect_stdout
-from app.presentation.plot_graph import main as plot_graph_main
-
-ALGOLIA_SEARCH = "https://hn.algolia.com/api/v1/search"
-ALGOLIA_ITEM = "https://hn.algolia.com/api/v1/items"  # items/<id> 로 댓글 트리 조회
+from app.knowledge.rollup import root_for, update_rollups
+from app.common.http import RESPONSE_CACHE, http_get
+from app.common.metrics import METRICS
+from app.common.profiling import profile_stage
+from app.ingestion.sources import HIT_FIELDS, SourceScheduler, build_sources, collect_comments_text
+from app.ingestion.linked_content import fetch_linked
+
+# 벤치마크/테스트용 대역 서버를 쓸 땐 HN_ALGOLIA_BASE=http://127.0.0.1:8765/api/v1
+ALGOLIA_BASE = os.environ.get("HN_ALGOLIA_BASE", "https://hn.algolia.com/api/v1").rstrip("/")
+ALGOLIA_SEARCH = f"{ALGOLIA_BASE}/search"
+ALGOLIA_ITEM = f"{ALGOLIA_BASE}/items"  # items/<id> 로 댓글 트리 조회
 
 # 회의/콜 요약 (사후 업로드) 관련 검색어
 QUERIES = [
@@ -28,8 +34,20 @@ QUERIES = [
 
 MAX_RESULTS = 30
 HITS_PER_QUERY = 20
-COMMENT_TEXT_LIMIT = 12000  # 너무 길면 잘라서 태깅 (속도/안정)
-REQUEST_SLEEP_SEC = 0.15     # HN API 과도호출 방지
+QUERY_PLANNER_ENABLED = True  # 검색어별 수확률로 예산(검색어 수 × HITS_PER_QUERY)을 배분 (app.ingestion.query_planner)
+COMMENT_TEXT_LIMIT = 12000  # blob 모드: 너무 길면 잘라서 태깅 (속도/안정)
+# "comment": 댓글마다 태깅 후 깊이 가중 신호 강도로 합산 (스레드 전체, 자르지 않음 — app.ingestion.comment_tagging)
+# "blob"   : 댓글을 이어 붙여 COMMENT_TEXT_LIMIT 까지만 태깅 (이전 방식)
+TAG_MODE = "comment"
+TAG_WORKERS = 0              # >0 이면 큰 배치의 댓글 태깅을 프로세스 풀에서
+REQUEST_SLEEP_SEC = 0.15     # fetch_search/fetch_item_tree 직접 호출(streaming) 시 과도호출 방지
+DEDUPE_ENABLED = True        # 재게시글을 묶어서 댓글 트리는 제품당 1번만 조회
+LINKED_CONTENT_ENABLED = True  # 케이스 url 본문도 태깅에 사용 (app.ingestion.linked_content)
+
+# 수집 소스 (app.ingestion.sources): algolia, firebase, rss — 소스마다 동시성/초당 요청 예산이 따로
+SOURCES = ["algolia"]
+RSS_FEEDS = []               # rss 소스가 읽을 피드 url
+SOURCE_BUDGETS = {}          # {"algolia": {"concurrency": 4, "rate": 2.5, "burst": 60}, ...} 기본값 덮어쓰기
 
 # 패턴 추정 (초기 휴리스틱)
 PATTERN_RULES = {
@@ -58,34 +76,36 @@ RISK_RULES = {
     "privacy": re.compile(r"\b(privacy|pii|gdpr|hipaa|confidential)\b", re.I),
 }
 
-def fetch_search(query: str, hits_per_page: int = 20):
-    params = {"query": query, "tags": "story", "hitsPerPage": hits_per_page}
-    url = f"{ALGOLIA_SEARCH}?{urlencode(params)}"
-    r = requests.get(url, timeout=20)
+# 댓글 단위 태깅용 라벨 규칙 (라벨 = "<종류>:<이름>")
+LABEL_RULES = {
+    **{f"pattern:{k}": rx for k, rx in PATTERN_RULES.items()},
+    **{f"feature:{k}": rx for k, rx in FEATURE_RULES.items()},
+    **{f"risk:{k}": rx for k, rx in RISK_RULES.items()},
+}
+
+def _get_json(url: str):
+    # daemon 모드에선 RESPONSE_CACHE(TTL)에 있으면 요청/sleep 생략
+    data = RESPONSE_CACHE.get(url)
+    if data is not None:
+        return data
+    r = http_get(url, timeout=20)
     r.raise_for_status()
     time.sleep(REQUEST_SLEEP_SEC)
-    return r.json().get("hits", [])
+    data = r.json()
+    RESPONSE_CACHE.put(url, data)
+    return data
+
+def fetch_search(query: str, hits_per_page: int = 20, page: int = 0):
+    params = {"query": query, "tags": "story", "hitsPerPage": hits_per_page}
+    if page:
+        params["page"] = page
+    url = f"{ALGOLIA_SEARCH}?{urlencode(params)}"
+    return _get_json(url).get("hits", [])
 
 def fetch_item_tree(object_id: str) -> dict:
     # 댓글 포함 트리 조회
     url = f"{ALGOLIA_ITEM}/{object_id}"
-    r = requests.get(url, timeout=20)
-    r.raise_for_status()
-    time.sleep(REQUEST_SLEEP_SEC)
-    return r.json()
-
-def collect_comments_text(node: dict, acc: list, depth: int = 0, max_depth: int = 6):
-    if depth > max_depth:
-        return
-    text = node.get("text")
-    if text:
-        # HTML 태그 아주 대충 제거(완전 정교할 필요 없음)
-        clean = re.sub(r"<[^>]+>", " ", text)
-        clean = re.sub(r"\s+", " ", clean).strip()
-        if clean:
-            acc.append(clean)
-    for child in node.get("children", []) or []:
-        collect_comments_text(child, acc, depth + 1, max_depth=max_depth)
+    return _get_json(url)
 
 def infer_pattern(text: str) -> str:
     for name, rx in PATTERN_RULES.items():
@@ -107,65 +127,209 @@ def safe_date(d):
     except Exception:
         return datetime.min
     
-def collect_cases():
-    seen = set()
-    cases = []
-
-    # --- A) 케이스 수집 + 댓글 텍스트 결합 ---
-    for q in QUERIES:
-        for hit in fetch_search(q, hits_per_page=HITS_PER_QUERY):
-            obj_id = hit.get("objectID")
-            if not obj_id or obj_id in seen:
-                continue
-            seen.add(obj_id)
-
-            title = hit.get("title") or ""
-            author = hit.get("author") or ""
-            points = hit.get("points") or 0
-            comments = hit.get("num_comments") or 0
-            created_at = hit.get("created_at") or ""
-            created_date = created_at.split("T")[0] if "T" in created_at else created_at
-
-            url = hit.get("url") or f"https://news.ycombinator.com/item?id={obj_id}"
-
-            # 댓글 트리 가져오기
-            comment_texts = []
-            try:
-                tree = fetch_item_tree(obj_id)
-                collect_comments_text(tree, comment_texts)
-            except Exception:
-                comment_texts = []
-
-            comments_blob = " ".join(comment_texts)
-            if len(comments_blob) > COMMENT_TEXT_LIMIT:
-                comments_blob = comments_blob[:COMMENT_TEXT_LIMIT]
-
-            blob = f"{title} {hit.get('story_text') or ''} {comments_blob} {url}"
-            pattern = infer_pattern(blob)
-            features = infer_features(blob)
-            risks = infer_risks(blob)
-
-            cases.append({
-                "object_id": obj_id,
-                "date": created_date,
-                "title": title[:140],
-                "url": url,
-                "author": author,
-                "points": points,
-                "comments": comments,
-                "pattern": pattern,
-                "core_ai_features": ",".join(features) if features else "-",
-                "risks": ",".join(risks) if risks else "-"
-            })
-
-            if len(cases) >= MAX_RESULTS:
-                break
-        if len(cases) >= MAX_RESULTS:
-            break
+CASES_PATH = "hn_meeting_summary_cases.csv"
+EDGES_PATH = "graph_edges_snapshot.csv"
+DAILY_PATH = "daily_interest_metrics.csv"
+CASE_FIELDS = ["object_id","date","title","url","author","points","comments","pattern","core_ai_features","risks","dup_object_ids","signals"]
+
+def make_scheduler() -> SourceScheduler:
+    return SourceScheduler(build_sources(
+        SOURCES, SOURCE_BUDGETS,
+        algolia_search_url=ALGOLIA_SEARCH, algolia_item_url=ALGOLIA_ITEM, rss_feeds=RSS_FEEDS,
+    ))
+
+def search_hits(queries=QUERIES, max_results=MAX_RESULTS, hits_per_query=HITS_PER_QUERY, dedupe=DEDUPE_ENABLED,
+                scheduler: SourceScheduler | None = None, journal=None, stats: dict | None = None):
+    # 쿼리 순서대로 (소스별 병렬) 검색 → objectID 기준 중복 제거, max_results 채우면 나머지 검색 취소
+    # dedupe=True면 같은 제품 재게시글(URL/제목 유사)을 묶어서 제품 수로 max_results를 센다
+    # hits_per_query: 숫자 또는 {쿼리: 개수} (plan_queries 결과)
+    # journal(checkpoint.Journal): 이미 받은 (쿼리, 소스) 결과는 재사용, 새 결과는 기록
+    # stats: 쿼리별 요청 수/새 objectID (query_planner 수확률 기록용, 전날까지의 실행들에서 본 objectID 는 새 것이 아님)
+    known = None
+    if stats is not None and QUERY_PLANNER_ENABLED:
+        from app.knowledge.similarity import known_doc_ids
+
+        known = known_doc_ids()
+    if scheduler is None:
+        with make_scheduler() as sched:
+            return sched.search(queries, max_results, hits_per_query, dedupe, journal, stats, known)
+    return scheduler.search(queries, max_results, hits_per_query, dedupe, journal, stats, known)
+
+def plan_queries(queries=QUERIES, budget: int | None = None) -> dict:
+    """{"queries": 검색 순서, "limits": {쿼리: hit 수}, "skipped", "probed"}"""
+    queries = list(queries)
+    if not QUERY_PLANNER_ENABLED:
+        return {"queries": queries, "limits": {q: HITS_PER_QUERY for q in queries}, "skipped": [], "probed": []}
+    from app.ingestion import query_planner
+
+    budget = budget or len(queries) * HITS_PER_QUERY
+    plan = query_planner.plan(queries, budget)
+    print(query_planner.describe(plan, budget))
+    return plan
+
+def record_query_yield(plan: dict, stats: dict, cases, run_id: str):
+    # 태깅까지 끝난 뒤 쿼리별 수확률 기록 (새 objectID 비율 + 라벨 붙은 비율)
+    # 검색을 하나도 안 했어도 (stats 가 비어도) 건너뛴 횟수는 기록해야 PROBE_EVERY 에 도달함
+    if not QUERY_PLANNER_ENABLED or not plan:
+        return
+    from app.ingestion import query_planner
+
+    query_planner.record(plan, stats, cases, run_id)
 
+def fetch_thread_texts(object_id: str) -> list:
+    comment_texts = []
+    try:
+        tree = fetch_item_tree(object_id)
+        collect_comments_text(tree, comment_texts)
+    except Exception:
+        comment_texts = []
+    return comment_texts
+
+def fetch_threads(hits, scheduler: SourceScheduler | None = None, journal=None) -> dict:
+    # objectID -> 댓글 텍스트 리스트 (hit 을 가져온 소스의 예산 안에서 병렬 조회)
+    if scheduler is None:
+        with make_scheduler() as sched:
+            return sched.threads(hits, journal)
+    return scheduler.threads(hits, journal)
+
+def header_text(hit: dict, linked_text: str = "") -> str:
+    # 댓글을 뺀 케이스 본문: 제목 + 글 본문 + 링크 본문 + url
+    url = hit.get("url") or f"https://news.ycombinator.com/item?id={hit.get('objectID')}"
+    return f"{hit.get('title') or ''} {hit.get('story_text') or ''} {linked_text} {url}"
+
+def _labels_from_signals(signals: dict):
+    # 패턴은 기존 우선순위(PATTERN_RULES 순서) 유지, 기능/리스크는 강도 내림차순
+    pattern = next((k for k in PATTERN_RULES if f"pattern:{k}" in signals), "Generator(Prompt-only)")
+    def ranked(kind):
+        found = [(lbl.split(":", 1)[1], s["strength"]) for lbl, s in signals.items() if lbl.startswith(kind + ":")]
+        return [name for name, _ in sorted(found, key=lambda x: -x[1])][:10]
+    return pattern, ranked("feature"), ranked("risk")
+
+def tag_case(hit: dict, comment_texts: list, linked_text: str = "", signals: dict | None = None,
+             mode: str | None = None) -> dict:
+    """
+    mode="comment": signals(comment_tagging.tag_threads 결과)로 라벨 결정, 없으면 이 케이스만 바로 계산
+    mode="blob"   : 이어 붙인 텍스트(COMMENT_TEXT_LIMIT 까지)로 라벨 결정
+    """
+    mode = mode or TAG_MODE
+    obj_id = hit.get("objectID")
+    title = hit.get("title") or ""
+    author = hit.get("author") or ""
+    points = hit.get("points") or 0
+    comments = hit.get("num_comments") or 0
+    created_at = hit.get("created_at") or ""
+    created_date = created_at.split("T")[0] if "T" in created_at else created_at
+
+    url = hit.get("url") or f"https://news.ycombinator.com/item?id={obj_id}"
+
+    if mode == "comment":
+        if signals is None:
+            from app.ingestion.comment_tagging import tag_threads
+            signals = tag_threads([(header_text(hit, linked_text), comment_texts)], LABEL_RULES)[0]
+        pattern, features, risks = _labels_from_signals(signals)
+    else:
+        comments_blob = " ".join(comment_texts)
+        if len(comments_blob) > COMMENT_TEXT_LIMIT:
+            comments_blob = comments_blob[:COMMENT_TEXT_LIMIT]
+
+        # linked_text: 링크된 페이지 본문 (linked_content), 없으면 빈 문자열
+        blob = f"{title} {hit.get('story_text') or ''} {comments_blob} {linked_text} {url}"
+        pattern = infer_pattern(blob)
+        features = infer_features(blob)
+        risks = infer_risks(blob)
+
+    if signals is not None:
+        from app.ingestion.comment_tagging import format_signals
+        signals_str = format_signals(signals)
+    else:
+        signals_str = "-"
+
+    return {
+        "object_id": obj_id,
+        "date": created_date,
+        "title": title[:140],
+        "url": url,
+        "author": author,
+        "points": points,
+        "comments": comments,
+        "pattern": pattern,
+        "core_ai_features": ",".join(features) if features else "-",
+        "risks": ",".join(risks) if risks else "-",
+        # 같은 제품으로 묶여 points/comments가 합산된 다른 글들
+        "dup_object_ids": ",".join(hit.get("dup_object_ids") or []) or "-",
+        # 댓글 단위 태깅의 라벨별 강도 (blob 모드는 "-")
+        "signals": signals_str,
+    }
+
+def tagger_key(mode: str | None = None) -> str:
+    """
+    저널 케이스 레코드 키: 라벨 규칙/태깅 모드/태깅 코드 해시.
+    규칙이나 태거를 고친 뒤 같은 날 다시 돌리면 저널의 케이스를 버리고 다시 태깅 (수집 데이터는 재사용)
+    """
+    import hashlib
+    import inspect
+    from app.ingestion import comment_tagging
+    from app.knowledge import hit_index
+
+    parts = [
+        mode or TAG_MODE,
+        *(f"{k}={rx.pattern}/{rx.flags}" for k, rx in sorted(LABEL_RULES.items())),
+        inspect.getsource(comment_tagging),
+        inspect.getsource(hit_index.entry_from_signals),   # 저널 케이스 레코드에 같이 남는 hit_index 항목 형식
+        *(inspect.getsource(f) for f in (header_text, _labels_from_signals, tag_case,
+                                        infer_pattern, infer_features, infer_risks)),
+    ]
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+def tag_cases(hits, threads: dict, linked: dict | None = None, mode: str | None = None,
+              workers: int | None = None, journal=None, index: dict | None = None) -> list:
+    """
+    index 를 주면 comment 모드 태깅의 라벨별 매치 위치를 objectID 마다 채움 (app.knowledge.hit_index 형식)
+    """
+    linked = linked or {}
+    mode = mode or TAG_MODE
+    done = {}
+    if journal is not None:
+        # 저널에 있는 케이스는 (같은 규칙/코드로 태깅한 것만) 다시 태깅하지 않고,
+        # 새로 태깅한 케이스는 (매치 위치와 함께) 기록
+        key = tagger_key(mode)
+        done = journal.cases_for(key)
+        todo = [hit for hit in hits if hit["objectID"] not in done]
+        fresh = {}
+        for c in tag_cases(todo, threads, linked, mode, workers, index=fresh):
+            journal.record_case(c, fresh.get(c["object_id"]), key)
+            done[c["object_id"]] = c
+        if index is not None:
+            index.update({h["objectID"]: journal.case_hits[h["objectID"]]
+                          for h in hits if h["objectID"] in journal.case_hits})
+        cases = [done[hit["objectID"]] for hit in hits]
+        cases.sort(key=lambda r: safe_date(r["date"]), reverse=True)
+        return cases
+    if mode == "comment":
+        from app.ingestion.comment_tagging import tag_threads
+
+        # 모든 케이스의 댓글을 한 번에 청크로 나눠 태깅 (workers > 0 이면 프로세스 풀)
+        headers = [header_text(hit, linked.get(hit["objectID"], "")) for hit in hits]
+        all_signals = tag_threads(
+            [(header, threads.get(hit["objectID"], [])) for header, hit in zip(headers, hits)],
+            LABEL_RULES,
+            TAG_WORKERS if workers is None else workers,
+        )
+        if index is not None:
+            from app.knowledge.hit_index import entry_from_signals
+
+            for hit, header, signals in zip(hits, headers, all_signals):
+                index[hit["objectID"]] = entry_from_signals(signals, threads.get(hit["objectID"], []), header)
+    else:
+        all_signals = [None] * len(hits)
+    cases = [
+        tag_case(hit, threads.get(hit["objectID"], []), linked.get(hit["objectID"], ""), signals, mode)
+        for hit, signals in zip(hits, all_signals)
+    ]
     cases.sort(key=lambda r: safe_date(r["date"]), reverse=True)
+    return cases
 
-    # --- 출력 ---
+def print_cases(cases):
     print("\n=== HN Meeting/Call Summary Cases (Top) - with Comments ===")
     for i, r in enumerate(cases, 1):
         print(f"\n[{i}] {r['date']} | {r['pattern']} | pts:{r['points']} com:{r['comments']}")
@@ -174,92 +338,190 @@ def collect_cases():
         print(f"    risks:    {r['risks']}")
         print(f"    url: {r['url']}")
 
-    # --- 저장 1) 케이스 CSV ---
-    out_cases = "hn_meeting_summary_cases.csv"
-    with open(out_cases, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=list(cases[0].keys()) if cases else [
-            "date","title","url","author","points","comments","pattern","core_ai_features","risks"
-        ])
+def _replace_atomic(path: str, write):
+    # tmp 에 다 쓴 뒤 교체 → 중간에 죽어도 이전 파일이 그대로 남음
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        write(f)
+    os.replace(tmp, path)
+
+def write_cases_csv(cases, out_cases: str = CASES_PATH) -> str:
+    def write(f):
+        w = csv.DictWriter(f, fieldnames=list(cases[0].keys()) if cases else CASE_FIELDS)
         w.writeheader()
         w.writerows(cases)
-    print(f"\nSaved: {out_cases}")
-    print(">>> STEP B START (graph edges)")
-
-    # --- B) 그래프 엣지 스냅샷 ---
+    _replace_atomic(out_cases, write)
+    return out_cases
+
+def case_edges(c: dict):
+    """케이스 1건이 만드는 (from, relation, to) 엣지들"""
+    case_id = f"case_{c['object_id']}"
+    pattern = c["pattern"]
+    yield (case_id, "has_pattern", pattern)
+
+    feats = [] if c["core_ai_features"] == "-" else c["core_ai_features"].split(",")
+    for ft in feats:
+        yield (pattern, "uses_feature", ft)
+        yield (case_id, "mentions_feature", ft)
+
+    rks = [] if c["risks"] == "-" else c["risks"].split(",")
+    for rk in rks:
+        yield (pattern, "has_risk_signal", rk)
+        yield (case_id, "mentions_risk", rk)
+
+def build_edge_counter(cases) -> Counter:
     edge_counter = Counter()
-
-    def add_edge(frm, rel, to):
-        edge_counter[(frm, rel, to)] += 1
-
     for c in cases:
-        case_id = f"case_{c['object_id']}"
-        pattern = c["pattern"]
-        add_edge(case_id, "has_pattern", pattern)
+        edge_counter.update(case_edges(c))
+    return edge_counter
 
-        feats = [] if c["core_ai_features"] == "-" else c["core_ai_features"].split(",")
-        for ft in feats:
-            add_edge(pattern, "uses_feature", ft)
-            add_edge(case_id, "mentions_feature", ft)
+def edge_rows(edge_counter: Counter, today: str) -> list:
+    return [
+        {"date": today, "from": frm, "relation": rel, "to": to, "weight": wgt}
+        for (frm, rel, to), wgt in edge_counter.most_common()
+    ]
 
-        rks = [] if c["risks"] == "-" else c["risks"].split(",")
-        for rk in rks:
-            add_edge(pattern, "has_risk_signal", rk)
-            add_edge(case_id, "mentions_risk", rk)
-
-    out_edges = "graph_edges_snapshot.csv"
-    today = datetime.now().strftime("%Y-%m-%d")
-    with open(out_edges, "w", newline="", encoding="utf-8") as f:
+def write_edges_csv(rows, out_edges: str = EDGES_PATH) -> str:
+    def write(f):
         w = csv.DictWriter(f, fieldnames=["date","from","relation","to","weight"])
         w.writeheader()
-        for (frm, rel, to), wgt in edge_counter.most_common():
-            w.writerow({"date": today, "from": frm, "relation": rel, "to": to, "weight": wgt})
-    print(f"Saved: {out_edges}")
-    print(">>> STEP C START (daily metrics)")
-
-    # --- C) daily metrics ---
-    mentions = len(cases)
-    total_points = sum(c["points"] for c in cases)
-    total_comments = sum(c["comments"] for c in cases)
-
-    pattern_counts = Counter(c["pattern"] for c in cases)
-    def share(name):
-        return round(pattern_counts.get(name, 0) / mentions, 4) if mentions else 0
-
-    all_feats, all_risks = [], []
-    for c in cases:
+        w.writerows(rows)
+    _replace_atomic(out_edges, write)
+    return out_edges
+
+class DailyAccumulator:
+    """daily metrics용 카운터 — 케이스를 하나씩 흘려 넣어도 메모리가 일정"""
+
+    def __init__(self):
+        self.mentions = 0
+        self.total_points = 0
+        self.total_comments = 0
+        self.pattern_counts = Counter()
+        self.feat_counts = Counter()
+        self.risk_counts = Counter()
+
+    def add(self, c: dict):
+        self.mentions += 1
+        self.total_points += int(c["points"] or 0)
+        self.total_comments += int(c["comments"] or 0)
+        self.pattern_counts[c["pattern"]] += 1
         if c["core_ai_features"] != "-":
-            all_feats += c["core_ai_features"].split(",")
+            self.feat_counts.update(c["core_ai_features"].split(","))
         if c["risks"] != "-":
-            all_risks += c["risks"].split(",")
-
-    top_feat = Counter(all_feats).most_common(1)
-    top_risk = Counter(all_risks).most_common(1)
-
-    interest_score = total_points + (2 * total_comments) + (5 * mentions)
-
-    out_daily = "daily_interest_metrics.csv"
-    row = {
-        "date": today,
-        "usecase": "meeting_call_summary_post_upload",
-        "mentions": mentions,
-        "total_points": total_points,
-        "total_comments": total_comments,
-        "interest_score": interest_score,
-        "share_generator": share("Generator(Prompt-only)"),
-        "share_hybrid_rag": share("Hybrid/RAG"),
-        "share_agent": share("Agent"),
-        "top_feature": top_feat[0][0] if top_feat else "-",
-        "top_risk": top_risk[0][0] if top_risk else "-",
+            self.risk_counts.update(c["risks"].split(","))
+
+    def row(self, today: str) -> dict:
+        mentions = self.mentions
+        def share(name):
+            return round(self.pattern_counts.get(name, 0) / mentions, 4) if mentions else 0
+
+        top_feat = self.feat_counts.most_common(1)
+        top_risk = self.risk_counts.most_common(1)
+
+        interest_score = self.total_points + (2 * self.total_comments) + (5 * mentions)
+
+        return {
+            "date": today,
+            "usecase": "meeting_call_summary_post_upload",
+            "mentions": mentions,
+            "total_points": self.total_points,
+            "total_comments": self.total_comments,
+            "interest_score": interest_score,
+            "share_generator": share("Generator(Prompt-only)"),
+            "share_hybrid_rag": share("Hybrid/RAG"),
+            "share_agent": share("Agent"),
+            "top_feature": top_feat[0][0] if top_feat else "-",
+            "top_risk": top_risk[0][0] if top_risk else "-",
+        }
+
+def compute_daily_row(cases, today: str) -> dict:
+    acc = DailyAccumulator()
+    for c in cases:
+        acc.add(c)
+    return acc.row(today)
+
+def upsert_daily_rows(rows: list[dict], path: str = DAILY_PATH) -> str:
+    """같은 날짜의 기존 행은 교체, 나머지는 그대로 두고 날짜순으로 다시 씀 (하루 한 줄이라 파일이 작음)"""
+    days = {r["date"] for r in rows}
+    kept, fields = [], list(rows[0].keys()) if rows else []
+    if os.path.exists(path):
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            fields = list(reader.fieldnames or fields)
+            kept = [r for r in reader if r["date"] not in days]
+    for k in (rows[0].keys() if rows else []):
+        if k not in fields:
+            fields.append(k)
+    merged = sorted(kept + rows, key=lambda r: r["date"])   # 정렬은 안정적 → 같은 날 여러 행은 순서 유지
+    def write(f):
+        w = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        w.writeheader()
+        w.writerows(merged)
+    _replace_atomic(path, write)
+    return path
+
+def append_daily_row(row: dict, out_daily: str = DAILY_PATH) -> str:
+    # 같은 날 재실행(--force/--refresh/재개/daemon)은 그날 행을 교체 → 롤업(날짜별 교체)과 어긋나지 않음
+    upsert_daily_rows([row], out_daily)
+
+    # 주/월 롤업 + rolling mean (들어온 row만 반영, 이 daily 파일에 딸린 롤업 디렉터리에)
+    update_rollups(row, root_for(out_daily))
+    return out_daily
+
+def run_params() -> dict:
+    # 체크포인트 저널 키: 이 값이 바뀌면 같은 날이라도 처음부터 다시 수집
+    return {
+        "queries": QUERIES, "max_results": MAX_RESULTS, "hits_per_query": HITS_PER_QUERY,
+        "dedupe": DEDUPE_ENABLED, "sources": SOURCES, "feeds": RSS_FEEDS,
+        "linked": LINKED_CONTENT_ENABLED, "tag_mode": TAG_MODE,
     }
 
-    exists = os.path.exists(out_daily)
+def collect_cases():
+    from app.ingestion import checkpoint
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    # --- A) 케이스 수집 + 댓글 텍스트 결합 (중간 결과는 data/checkpoints/<date>.jsonl 에 저널링) ---
+    journal = checkpoint.open_journal(today, run_params())
+    with journal:
+        with METRICS.stage("fetch"), profile_stage("fetch"), make_scheduler() as sched:
+            plan, stats = plan_queries(), {}
+            hits = search_hits(plan["queries"], hits_per_query=plan["limits"], scheduler=sched,
+                               journal=journal, stats=stats)
+            threads = fetch_threads(hits, scheduler=sched, journal=journal)
+        if LINKED_CONTENT_ENABLED:
+            with METRICS.stage("linked", group="fetch"), profile_stage("linked"):
+                linked = fetch_linked(hits)
+        else:
+            linked = {}
+        with METRICS.stage("tag"), profile_stage("tag"):
+            cases = tag_cases(hits, threads, linked, journal=journal)
+        record_query_yield(plan, stats, cases, f"{today}/{datetime.now().isoformat(timespec='seconds')}")
+
+    # --- 출력 ---
+    print_cases(cases)
+
+    # --- 저장 1) 케이스 CSV ---
+    out_cases = write_cases_csv(cases)
+    print(f"\nSaved: {out_cases}")
+    print(">>> STEP B START (graph edges)")
+
+    # --- B) 그래프 엣지 스냅샷 ---
+    with METRICS.stage("edges", group="aggregate"), profile_stage("edges"):
+        out_edges = write_edges_csv(edge_rows(build_edge_counter(cases), today))
+    print(f"Saved: {out_edges}")
+    print(">>> STEP C START (daily metrics)")
 
-   
+    # --- C) daily metrics ---
+    with METRICS.stage("metrics", group="aggregate"), profile_stage("metrics"):
+        row = compute_daily_row(cases, today)
+        out_daily = append_daily_row(row)
 
     print(f"Saved: {out_daily}")
     print("=== Daily Metrics ===")
     print(row)
 
+    # 모든 산출물을 쓴 뒤에만 저널 완료 → 다음 실행은 새로 수집
+    journal.complete()
     return cases
 from collections import Counter
 
@@ -421,11 +683,18 @@ def print_decision_brief(cases):
     print("="*72)
     
 def main():
+    METRICS.reset()
     cases = run_pipeline()
     generate_mvp_report(cases)
+    METRICS.write()
+    METRICS.print_summary()
     
 def run_plot():
-    plot_graph_main()
+    # pandas/networkx/matplotlib 은 그래프를 그릴 때만 로드 (fetch 만 하는 실행의 시작 시간 절약)
+    from app.presentation.plot_graph import main as plot_graph_main
+
+    with METRICS.stage("graph"), profile_stage("graph"):
+        plot_graph_main()
 
     
 def run_pipeline():
@@ -450,6 +719,7 @@ def generate_mvp_report(cases):
             print(f"- snapshots/reference_graph_{today}.png")
 
     print(f"📄 Report saved -> {report_path}")
+    return report_path
 
 def export_idea_payload():
     """
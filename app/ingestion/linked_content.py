@@ -0,0 +1,287 @@
+"""
+케이스 url(제품 페이지/블로그)의 본문을 가져와 태깅 텍스트에 붙인다.
+
+- 호스트별 동시 연결 수 제한 + 응답 크기 상한 (스트리밍으로 읽다가 자름)
+- BeautifulSoup 으로 script/nav/footer 등을 걷어내고 본문만 추출
+- 추출 텍스트는 내용 해시(sha256)로 디스크 캐시: objects/<aa>/<hash>.txt + url→hash 인덱스
+  (같은 페이지를 여러 url/여러 날이 가리켜도 한 번만 저장)
+- 실행 전체에 시간 예산이 있어서 느린 호스트가 daily job 을 붙잡지 못함. 예산을 넘기면 남은 url은 건너뜀
+- 실패는 확정적인 것(4xx, HTML 아님, 추출 오류)만 캐시 → 예산 초과/timeout/연결 오류/5xx/429 는 다음 실행에서 다시 시도
+"""
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+
+from app.common.http import http_get
+from app.common.metrics import METRICS
+
+CACHE_DIR = Path("data/cache/linked")
+MAX_WORKERS = 8
+PER_HOST_LIMIT = 2            # 같은 호스트에 동시에 여는 연결 수
+MAX_BYTES = 2 * 1024 * 1024   # 이보다 큰 응답은 앞부분만 사용
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 10
+RUN_BUDGET_SEC = 60           # 실행당 전체 시간 예산
+TEXT_LIMIT = 8000             # 태깅에 넘기는 본문 길이
+RETRY_FAILED_AFTER_DAYS = 3   # 실패한 url 은 며칠 뒤에 다시 시도
+METRICS_LABEL = "linked"      # 링크 페이지는 호스트가 제각각 → 지표는 라벨 하나로 (API 호스트만 호스트별)
+
+SKIP_HOSTS = {"news.ycombinator.com", "github.com", "youtube.com", "www.youtube.com", "youtu.be"}
+SKIP_EXT_RE = re.compile(r"\.(pdf|zip|gz|tar|png|jpe?g|gif|svg|mp4|mp3|webm|dmg|exe)$", re.I)
+DROP_TAGS = ["script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "iframe"]
+WS_RE = re.compile(r"\s+")
+HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+SNIFF_BYTES = 4096            # <meta charset> 는 문서 앞부분에서만 찾음
+BUDGET = "budget"             # 실행 예산에 걸려 못 가져옴 (캐시하지 않음)
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def should_fetch(url: str | None) -> bool:
+    if not url:
+        return False
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return False
+    if parts.hostname.lower() in SKIP_HOSTS:
+        return False
+    return not SKIP_EXT_RE.search(parts.path or "")
+
+
+def extract_text(html: str) -> str:
+    """본문 추출: <article> → <main> → <body> 순으로 가장 그럴듯한 영역의 블록 텍스트"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(DROP_TAGS):
+        tag.decompose()
+
+    root = soup.find("article") or soup.find("main") or soup.body or soup
+    blocks = []
+    for el in root.find_all(["h1", "h2", "h3", "p", "li", "blockquote", "pre"]):
+        t = WS_RE.sub(" ", el.get_text(" ", strip=True))
+        if len(t) >= 20 or el.name.startswith("h"):
+            blocks.append(t)
+    text = " ".join(blocks) if blocks else WS_RE.sub(" ", root.get_text(" ", strip=True))
+
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    return f"{title} {text}".strip()
+
+
+def _codec(name) -> str | None:
+    try:
+        return codecs.lookup(name.decode("ascii") if isinstance(name, bytes) else name).name
+    except (LookupError, UnicodeDecodeError):
+        return None
+
+
+def page_encoding(ctype: str, data: bytes) -> str:
+    """
+    헤더에 charset 이 명시됐을 때만 헤더를 믿음 (requests 는 text/* 에 charset 이 없으면 ISO-8859-1 로 가정).
+    없으면 <meta charset> → UTF-8 로 읽히면 UTF-8 → 추정 (requests 의 apparent_encoding 과 같은 detector)
+    """
+    for m in (HEADER_CHARSET_RE.search(ctype), META_CHARSET_RE.search(data[:SNIFF_BYTES])):
+        if m and _codec(m.group(1)):
+            return _codec(m.group(1))
+    try:
+        data.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        if e.start >= len(data) - 3:
+            return "utf-8"   # 상한에서 자르면서 마지막 글자가 잘린 경우
+    from requests.compat import chardet
+
+    return _codec((chardet.detect(data[:SNIFF_BYTES * 16]) or {}).get("encoding") or "") or "utf-8"
+
+
+def fetch_page(url: str, deadline: float) -> str | None:
+    """HTML이 아니면 None, 시작 전에 예산을 넘겼으면 BudgetExceeded. 크기 상한까지만 읽는다"""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise BudgetExceeded(url)
+    timeout = (min(CONNECT_TIMEOUT, remaining), min(READ_TIMEOUT, remaining))
+    r = http_get(url, timeout=timeout, label=METRICS_LABEL, stream=True,
+                 headers={"User-Agent": "hn-insights/1.0"})
+    buf = bytearray()
+    try:
+        r.raise_for_status()
+        ctype = r.headers.get("Content-Type", "")
+        if "html" not in ctype.lower():
+            return None
+        for chunk in r.iter_content(chunk_size=64 * 1024):
+            buf.extend(chunk)
+            if len(buf) >= MAX_BYTES or time.monotonic() > deadline:
+                break
+        data = bytes(buf[:MAX_BYTES])
+        return data.decode(page_encoding(ctype, data), errors="replace")
+    finally:
+        METRICS.add_http_bytes(METRICS_LABEL, len(buf))
+        r.close()
+
+
+def _transient(e: Exception) -> bool:
+    """다음 실행에서 다시 시도할 오류 (timeout, 연결 오류, 5xx, 429)"""
+    if isinstance(e, (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError)):
+        return True
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        return e.response.status_code >= 500 or e.response.status_code == 429
+    return False
+
+
+def fetch_error(e: Exception, deadline: float) -> tuple[str, bool]:
+    """fetch_page 예외 → (error, 캐시할지). 예산 때문에 잘린 timeout 은 BUDGET"""
+    if isinstance(e, BudgetExceeded) or (_transient(e) and time.monotonic() >= deadline):
+        return BUDGET, False
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        return f"http_{e.response.status_code}", not _transient(e)
+    return type(e).__name__, not _transient(e)
+
+
+class ContentCache:
+    """
+    objects/<hash[:2]>/<hash>.txt : 추출된 본문 (내용 주소 방식이라 중복 저장 없음)
+    index.json                   : url -> {hash, fetched_at} 또는 {error, fetched_at}
+    """
+
+    def __init__(self, root: Path = CACHE_DIR):
+        self.root = Path(root)
+        self.index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+        self.index = {}
+        if self.index_path.exists():
+            self.index = json.loads(self.index_path.read_text(encoding="utf-8"))
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.txt"
+
+    def lookup(self, url: str):
+        """(hit 여부, text). 최근 실패한 url 도 hit 으로 보고 None 을 돌려준다"""
+        entry = self.index.get(url)
+        if not entry:
+            return False, None
+        if entry.get("hash"):
+            p = self._object_path(entry["hash"])
+            if p.exists():
+                return True, p.read_text(encoding="utf-8")
+            return False, None
+        fetched = datetime.fromisoformat(entry["fetched_at"])
+        if datetime.now() - fetched < timedelta(days=RETRY_FAILED_AFTER_DAYS):
+            return True, None
+        return False, None
+
+    def put(self, url: str, text: str | None, error: str | None = None):
+        now = datetime.now().isoformat(timespec="seconds")
+        if text:
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            p = self._object_path(digest)
+            if not p.exists():
+                p.parent.mkdir(parents=True, exist_ok=True)
+                tmp = p.with_suffix(".tmp")
+                tmp.write_text(text, encoding="utf-8")
+                os.replace(tmp, p)
+            entry = {"hash": digest, "fetched_at": now}
+        else:
+            entry = {"error": error or "empty", "fetched_at": now}
+        with self._lock:
+            self.index[url] = entry
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with self._lock:
+            tmp.write_text(json.dumps(self.index, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+
+class _HostLimiter:
+    def __init__(self, limit: int = PER_HOST_LIMIT):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._sems = {}
+
+    def get(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._sems:
+                self._sems[host] = threading.Semaphore(self.limit)
+            return self._sems[host]
+
+
+def fetch_linked(hits, budget_sec: float = RUN_BUDGET_SEC, cache: ContentCache | None = None,
+                 max_workers: int = MAX_WORKERS) -> dict:
+    """objectID -> 본문 텍스트 (없으면 키 없음). 캐시 hit 은 예산을 쓰지 않는다"""
+    cache = cache or ContentCache()
+    texts, todo = {}, {}
+    for hit in hits:
+        url = hit.get("url")
+        if not should_fetch(url):
+            continue
+        hit_, text = cache.lookup(url)
+        METRICS.record_cache("linked_content", hit_)
+        if hit_:
+            if text:
+                texts[hit["objectID"]] = text[:TEXT_LIMIT]
+        else:
+            todo.setdefault(url, []).append(hit["objectID"])
+
+    if todo:
+        deadline = time.monotonic() + budget_sec
+        limiter = _HostLimiter()
+
+        def work(url):
+            # → (url, text, error, 캐시할지)
+            host = urlsplit(url).hostname.lower()
+            with limiter.get(host):
+                if time.monotonic() >= deadline:
+                    return url, None, BUDGET, False
+                try:
+                    html = fetch_page(url, deadline)
+                except Exception as e:
+                    return (url, None, *fetch_error(e, deadline))
+            if not html:
+                return url, None, "not_html", True
+            try:
+                return url, extract_text(html), None, True
+            except Exception as e:
+                return url, None, type(e).__name__, True
+
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        futures = [pool.submit(work, url) for url in todo]
+        done, pending = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        # 예산 초과: 아직 시작 안 한 작업은 취소, 진행 중인 요청은 timeout 으로 곧 끝나므로 기다리지 않음
+        pool.shutdown(wait=False, cancel_futures=True)
+
+        fetched, skipped, retry = 0, len(pending), 0
+        for fut in done:
+            url, text, error, cacheable = fut.result()
+            if error == BUDGET:
+                skipped += 1
+                continue
+            fetched += 1
+            if not cacheable:
+                retry += 1   # 일시적 오류 → 캐시하지 않고 다음 실행에서 다시
+                continue
+            cache.put(url, text, error)
+            if text:
+                for oid in todo[url]:
+                    texts[oid] = text[:TEXT_LIMIT]
+        cache.save()
+        print(f"[linked] fetched {fetched}/{len(todo)} urls"
+              + (f", {retry} transient errors (retry next run)" if retry else "")
+              + (f", {skipped} skipped (budget {budget_sec:.0f}s)" if skipped else ""))
+
+    return texts
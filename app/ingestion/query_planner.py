@@ -0,0 +1,186 @@
+"""
+검색어별 수확률(yield)을 실행마다 기록하고, 다음 실행의 검색 예산을 나눈다.
+
+- 기록 (data/knowledge/query_yield.json, 검색어마다)
+    new_rate : 받은 hit 중 앞선 검색어에도, 전날까지의 실행들(similarity 색인)에도 없던 새 objectID 비율 (EWMA)
+    tag_rate : 그 새 케이스 중 기능/리스크 라벨이 하나라도 붙은 비율 (EWMA)
+    zero_streak : 새 objectID 를 하나도 못 가져온 연속 실행 수
+- 계획
+    score = new_rate × (TAG_FLOOR + (1 - TAG_FLOOR) × tag_rate)   (기록 없는 검색어는 가장 높은 점수로 시작)
+    예산(hit 수 합, 기본 = 검색어 수 × HITS_PER_QUERY) 중 검색어마다 EXPLORE_FLOOR 는 보장하고
+    나머지를 score 비례로 배분 (MAX_PER_QUERY, 지난번에 요청보다 적게 돌려준 검색어는 그 1.5배로 상한)
+    기록 없는 검색어/재확인 검색어를 먼저, 그다음 점수 높은 순서로 검색 → MAX_RESULTS 가 빨리 차서
+    뒤쪽(수확률 낮은) 검색은 요청하지 않음
+- zero_streak >= DEMOTE_AFTER 인 검색어는 건너뛰고, PROBE_EVERY 번에 한 번만 EXPLORE_FLOOR 로 다시 확인
+  모든 검색어가 밀려나도 빈 실행이 되지 않도록 점수가 가장 높은 MIN_PROBES 개는 매번 재확인
+  (건너뛴 횟수는 검색을 하나도 안 한 실행에서도 셈)
+- 같은 fetch 결과로 tag 를 다시 돌려도 두 번 기록하지 않도록 run_id 로 구분
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+STATE_PATH = Path("data/knowledge/query_yield.json")
+STATE_VERSION = 1
+
+ALPHA = 0.4             # EWMA 가중치 (최근 실행 비중)
+TAG_FLOOR = 0.3         # 라벨이 안 붙어도 새 케이스 자체의 가치
+EXPLORE_FLOOR = 5       # 검색어마다 최소 hit 수
+MAX_PER_QUERY = 100
+DEMOTE_AFTER = 3
+PROBE_EVERY = 5
+MIN_PROBES = 2          # 검색할 검색어가 하나도 없을 때 재확인할 개수
+RECENT_RUNS = 20
+
+
+def _empty_state() -> dict:
+    return {"version": STATE_VERSION, "runs": [], "queries": {}}
+
+
+def load_state(path: Path = STATE_PATH) -> dict:
+    path = Path(path)
+    if not path.exists():
+        return _empty_state()
+    st = json.loads(path.read_text(encoding="utf-8"))
+    if st.get("version") != STATE_VERSION:
+        return _empty_state()
+    return st
+
+
+def save_state(st: dict, path: Path = STATE_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(st, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def score_of(rec: dict) -> float:
+    return rec["new_rate"] * (TAG_FLOOR + (1 - TAG_FLOOR) * rec["tag_rate"])
+
+
+def _cap(rec: dict | None) -> int:
+    # 지난번에 요청한 것보다 적게 돌려줬으면 결과가 바닥난 검색어 → 더 줘도 소용없음
+    if rec and rec.get("last_hits", 0) < rec.get("last_limit", 0):
+        return max(EXPLORE_FLOOR, min(MAX_PER_QUERY, int(rec["last_hits"] * 1.5) + 1))
+    return MAX_PER_QUERY
+
+
+def plan(queries, budget: int, state: dict | None = None) -> dict:
+    """
+    → {"queries": [점수 순 검색어], "limits": {검색어: hit 수}, "skipped": [...], "probed": [...]}
+    """
+    queries = list(queries)
+    state = state if state is not None else load_state()
+    recs = state["queries"]
+    known = [score_of(r) for r in recs.values() if r.get("runs")]
+    prior = max(known) if known else 1.0
+
+    active, skipped, probed, scores = [], [], [], {}
+    for q in queries:
+        rec = recs.get(q)
+        if rec and rec.get("zero_streak", 0) >= DEMOTE_AFTER:
+            if rec.get("skipped", 0) + 1 < PROBE_EVERY:
+                skipped.append(q)
+                continue
+            probed.append(q)
+            scores[q] = 0.0            # 탐색만: EXPLORE_FLOOR 만 받음
+        else:
+            scores[q] = score_of(rec) if rec and rec.get("runs") else prior
+        active.append(q)
+    if not active and skipped:
+        # 전부 밀려남 → 한 번도 검색하지 않으면 기록이 바뀌지 않아 영영 빈 실행이 됨
+        best = sorted(skipped, key=lambda q: (-score_of(recs[q]), -recs[q].get("skipped", 0), queries.index(q)))
+        for q in best[:MIN_PROBES]:
+            skipped.remove(q)
+            probed.append(q)
+            scores[q] = 0.0
+            active.append(q)
+
+    limits = {q: EXPLORE_FLOOR for q in active}
+    caps = {q: EXPLORE_FLOOR if q in probed else _cap(recs.get(q)) for q in active}
+    rest = max(0, budget - EXPLORE_FLOOR * len(active))
+    # 상한에 걸린 검색어 몫은 남은 검색어에 다시 배분 (몇 번이면 수렴)
+    for _ in range(len(active)):
+        open_qs = [q for q in active if limits[q] < caps[q] and scores[q] > 0]
+        total = sum(scores[q] for q in open_qs)
+        if rest <= 0 or total <= 0:
+            break
+        used = 0
+        for q in open_qs:
+            add = min(caps[q] - limits[q], int(rest * scores[q] / total))
+            limits[q] += add
+            used += add
+        if used == 0:
+            break
+        rest -= used
+
+    # 다시 확인할 검색어와 기록 없는 검색어를 먼저 (MAX_RESULTS 가 차서 취소되면 영영 배우지 못하므로), 그다음 점수 순
+    fresh = {q for q in active if q in probed or not (recs.get(q) or {}).get("runs")}
+    ordered = sorted(active, key=lambda q: (q not in fresh, -scores[q], queries.index(q)))
+    return {"queries": ordered, "limits": {q: limits[q] for q in ordered}, "skipped": skipped, "probed": probed}
+
+
+def _has_labels(case: dict) -> bool:
+    return case.get("core_ai_features", "-") != "-" or case.get("risks", "-") != "-"
+
+
+def record(query_plan: dict, stats: dict, cases, run_id: str, path: Path = STATE_PATH) -> dict:
+    """
+    stats: SourceScheduler.search 가 채운 {검색어: {"requests", "hits", "new_ids"}}
+    cases: 태깅된 케이스 (dup_object_ids 로 묶인 글도 같은 케이스로 봄)
+    """
+    st = load_state(path)
+    if run_id in st["runs"]:
+        return st
+    by_id = {}
+    for c in cases:
+        by_id[c["object_id"]] = c
+        for oid in (c.get("dup_object_ids") or "-").split(","):
+            if oid and oid != "-":
+                by_id[oid] = c
+
+    for q in query_plan.get("skipped", []):
+        rec = st["queries"].get(q)
+        if rec:
+            rec["skipped"] = rec.get("skipped", 0) + 1
+
+    for q, s in stats.items():
+        if not s.get("requests"):
+            continue   # 저널에서 재사용했거나 취소된 검색 → 수확률 정보 없음
+        new_ids = s["new_ids"]
+        found = [by_id[o] for o in new_ids if o in by_id]
+        new_rate = len(new_ids) / max(1, s["hits"])
+        tag_rate = sum(_has_labels(c) for c in found) / len(found) if found else 0.0
+        rec = st["queries"].get(q)
+        if rec is None or not rec.get("runs"):
+            rec = {"new_rate": new_rate, "tag_rate": tag_rate, "runs": 0, "requests": 0, "new": 0}
+        else:
+            rec["new_rate"] += ALPHA * (new_rate - rec["new_rate"])
+            rec["tag_rate"] += ALPHA * (tag_rate - rec["tag_rate"])
+        rec["runs"] += 1
+        rec["requests"] += s["requests"]
+        rec["new"] += len(new_ids)
+        rec["new_per_request"] = round(rec["new"] / max(1, rec["requests"]), 3)
+        rec["zero_streak"] = 0 if new_ids else rec.get("zero_streak", 0) + 1
+        rec["skipped"] = 0
+        rec["last_hits"] = s["hits"] // max(1, s["requests"])   # 소스 하나당 받은 hit 수
+        rec["last_limit"] = query_plan.get("limits", {}).get(q, s.get("limit", 0))
+        rec["new_rate"] = round(rec["new_rate"], 4)
+        rec["tag_rate"] = round(rec["tag_rate"], 4)
+        st["queries"][q] = rec
+
+    st["runs"] = (st["runs"] + [run_id])[-RECENT_RUNS:]
+    save_state(st, path)
+    return st
+
+
+def describe(query_plan: dict, budget: int) -> str:
+    parts = [f"{q}={n}" for q, n in query_plan["limits"].items()]
+    line = f"[planner] {len(query_plan['queries'])} queries, {sum(query_plan['limits'].values())}/{budget} hits: "
+    line += ", ".join(parts)
+    if query_plan["skipped"]:
+        line += f" | skipped: {', '.join(query_plan['skipped'])}"
+    return line
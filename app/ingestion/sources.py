@@ -0,0 +1,515 @@
+"""
+수집 소스 어댑터 + 소스별 동시성/속도 예산 스케줄러.
+
+- 어댑터는 모두 같은 hit(HIT 필드 + "source")와 댓글 텍스트 리스트를 돌려준다
+  → hn_fetch.tag_case 가 소스와 무관하게 같은 케이스 레코드를 만든다
+    algolia  : HN Algolia 검색 + items/<id> 댓글 트리
+    firebase : HN Firebase 목록(newstories/showstories) 을 훑어 검색어로 거름, 댓글은 kids 를 따라감
+    rss      : RSS/Atom 피드 항목을 검색어로 거름 (댓글 없음)
+- 소스마다 자기 스레드 풀(concurrency)과 토큰 버킷(rate/burst)을 가진다
+  → 느리거나 요청이 많은 소스가 다른 소스의 작업 큐를 막지 않고, 소스별 API 제한을 따로 지킨다
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+import requests
+
+from app.common.http import RESPONSE_CACHE, http_get
+from app.common.ratelimit import TokenBucket
+from app.ingestion.dedupe import HitDeduper, merge_cluster
+
+ALGOLIA_BASE = "https://hn.algolia.com/api/v1"
+FIREBASE_BASE = "https://hacker-news.firebaseio.com/v0"
+
+HIT_FIELDS = ["objectID", "title", "url", "author", "points", "num_comments", "created_at", "story_text", "source"]
+MAX_COMMENT_DEPTH = 6
+PREFETCH_FACTOR = 2      # 검색 미리 제출량: 남은 개수의 몇 배 hit 까지 (중복을 감안)
+TAG_RE = re.compile(r"<[^>]+>")
+WS_RE = re.compile(r"\s+")
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def clean_html(text: str | None) -> str:
+    # HTML 태그 아주 대충 제거(완전 정교할 필요 없음)
+    return WS_RE.sub(" ", TAG_RE.sub(" ", text or "")).strip()
+
+
+class Comment(str):
+    """
+    댓글 텍스트 + 트리 깊이 (0 = 글 본문, 1 = 최상위 댓글) + 댓글 id (evidence 링크용, 없으면 None).
+    그 외 코드에는 그냥 문자열
+    """
+
+    def __new__(cls, text: str, depth: int = 1, cid: str | None = None):
+        obj = super().__new__(cls, text)
+        obj.depth = depth
+        obj.cid = cid
+        return obj
+
+
+def comment_depth(text: str) -> int:
+    return getattr(text, "depth", 1)
+
+
+def comment_id(text: str) -> str | None:
+    return getattr(text, "cid", None)
+
+
+def collect_comments_text(node: dict, acc: list, depth: int = 0, max_depth: int = MAX_COMMENT_DEPTH):
+    """Algolia items 트리 → 댓글 텍스트 (깊이 우선, 각 항목은 깊이를 가진 Comment)"""
+    if depth > max_depth:
+        return
+    clean = clean_html(node.get("text"))
+    if clean:
+        cid = node.get("id")
+        acc.append(Comment(clean, depth, str(cid) if cid is not None else None))
+    for child in node.get("children", []) or []:
+        collect_comments_text(child, acc, depth + 1, max_depth=max_depth)
+
+
+def matches(query: str, text: str) -> bool:
+    """검색어의 단어가 모두 들어 있으면 True (검색 API 가 없는 소스용)"""
+    words = set(WORD_RE.findall(text.lower()))
+    return all(w in words for w in WORD_RE.findall(query.lower()))
+
+
+def _iso(ts: float | None) -> str:
+    if not ts:
+        return ""
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+# -------------------------
+# 어댑터
+# -------------------------
+
+class Source:
+    """
+    어댑터 공통부. 하위 클래스는 search(query, limit) / comments(hit) 를 구현하고,
+    목록을 미리 받아야 하는 소스는 prepare(queries) 에서 self.map 으로 병렬 조회.
+    HTTP 는 반드시 self.get / self.get_json 으로 (소스 예산 적용).
+    """
+
+    name = "base"
+    concurrency = 4       # 이 소스에 동시에 열어 두는 요청 수
+    rate = 5.0            # 초당 요청 수 (0 이면 제한 없음)
+    burst = 5
+
+    def __init__(self, concurrency: int | None = None, rate: float | None = None, burst: float | None = None):
+        self.concurrency = int(concurrency or self.concurrency)
+        self.rate = self.rate if rate is None else float(rate)
+        self.burst = self.burst if burst is None else burst
+        self.bucket = TokenBucket(self.rate, self.burst)
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    # --- 실행 자원 ---
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.concurrency,
+                                                thread_name_prefix=f"src-{self.name}")
+            return self._pool
+
+    def submit(self, fn, *args):
+        return self.pool.submit(fn, *args)
+
+    def map(self, fn, items) -> list:
+        """이 소스의 풀에서 병렬 실행 (prepare 안에서만 — 풀 작업 안에서 부르면 교착)"""
+        return [f.result() for f in [self.submit(fn, x) for x in items]]
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    # --- HTTP ---
+
+    def get(self, url: str, timeout: float = 20):
+        self.bucket.acquire()
+        r = http_get(url, timeout=timeout)
+        r.raise_for_status()
+        return r
+
+    def get_json(self, url: str):
+        # daemon 모드에선 RESPONSE_CACHE(TTL)에 있으면 요청/토큰 소모 없음
+        data = RESPONSE_CACHE.get(url)
+        if data is not None:
+            return data
+        data = self.get(url).json()
+        RESPONSE_CACHE.put(url, data)
+        return data
+
+    # --- 어댑터 인터페이스 ---
+
+    def prepare(self, queries: list[str]):
+        pass
+
+    def search(self, query: str, limit: int) -> list[dict]:
+        raise NotImplementedError
+
+    def comments(self, hit: dict) -> list[str]:
+        return []
+
+    def hit(self, **fields) -> dict:
+        out = {k: fields.get(k) for k in HIT_FIELDS}
+        out["source"] = self.name
+        return out
+
+
+class AlgoliaSource(Source):
+    name = "algolia"
+    concurrency = 4
+    rate = 2.5            # Algolia HN API: IP 당 시간당 10,000 요청 → 지속 속도는 그 아래 (9,000/시간)
+    burst = 60            # 하루 실행(30건 ≈ 36 요청)은 버킷 안에서 바로 (한 시간에 최대 60 + 9,000)
+
+    def __init__(self, search_url: str | None = None, item_url: str | None = None, **budget):
+        super().__init__(**budget)
+        self.search_url = search_url or f"{ALGOLIA_BASE}/search"
+        self.item_url = item_url or f"{ALGOLIA_BASE}/items"
+        self.by_date_url = f"{self.search_url}_by_date"
+
+    def search(self, query: str, limit: int) -> list[dict]:
+        params = {"query": query, "tags": "story", "hitsPerPage": limit}
+        data = self.get_json(f"{self.search_url}?{urlencode(params)}")
+        return [self.hit(**{k: h.get(k) for k in HIT_FIELDS}) for h in data.get("hits", [])]
+
+    def search_range(self, query: str, start_ts: int, end_ts: int, page_size: int = 100,
+                     max_pages: int = 10) -> list[dict]:
+        """created_at_i 가 [start_ts, end_ts) 인 글 (search_by_date, 최신순으로 max_pages 까지)"""
+        out = []
+        for page in range(max_pages):
+            params = {
+                "query": query, "tags": "story", "hitsPerPage": page_size, "page": page,
+                "numericFilters": f"created_at_i>={start_ts},created_at_i<{end_ts}",
+            }
+            data = self.get_json(f"{self.by_date_url}?{urlencode(params)}")
+            hits = data.get("hits", [])
+            out.extend(self.hit(**{k: h.get(k) for k in HIT_FIELDS}) for h in hits)
+            if len(hits) < page_size or page + 1 >= (data.get("nbPages") or 0):
+                break
+        return out
+
+    def comments(self, hit: dict) -> list[str]:
+        acc = []
+        collect_comments_text(self.get_json(f"{self.item_url}/{hit['objectID']}"), acc)
+        return acc
+
+
+class FirebaseSource(Source):
+    name = "firebase"
+    concurrency = 8
+    rate = 10.0           # 공식 제한은 없지만 item 단위 요청이라 수가 많음
+    burst = 20
+
+    LISTS = ("newstories", "showstories")
+    SCAN_LIMIT = 200      # 목록마다 훑는 최신 글 수
+    MAX_COMMENTS = 60     # 스레드당 따라가는 댓글 수 (item 1개 = 요청 1번)
+
+    def __init__(self, base: str = FIREBASE_BASE, lists=None, scan_limit: int | None = None, **budget):
+        super().__init__(**budget)
+        self.base = base.rstrip("/")
+        self.lists = tuple(lists or self.LISTS)
+        self.scan_limit = scan_limit or self.SCAN_LIMIT
+        self._stories = []
+        self._kids = {}       # objectID -> 최상위 댓글 id (prepare 에서 받아 둔 것)
+
+    def _item(self, item_id) -> dict | None:
+        """없는 item(404, 본문 null)만 None. 전송/HTTP 오류는 그대로 올림 → 실패한 스레드가 빈 스레드로 기록되지 않음"""
+        try:
+            return self.get_json(f"{self.base}/item/{item_id}.json")
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+    def _listed_item(self, item_id) -> dict | None:
+        # 목록 훑기: 글 하나가 실패해도 나머지 글은 사용 (건너뛴 수만 알림)
+        try:
+            return self._item(item_id)
+        except requests.RequestException:
+            return {"_failed": True}
+
+    def prepare(self, queries: list[str]):
+        ids = []
+        for name in self.lists:
+            ids.extend((self.get_json(f"{self.base}/{name}.json") or [])[: self.scan_limit])
+        ids = list(dict.fromkeys(ids))   # 목록끼리 겹치는 글은 한 번만
+        self._stories, self._kids = [], {}
+        items = self.map(self._listed_item, ids)
+        failed = sum(1 for it in items if it and it.get("_failed"))
+        if failed:
+            print(f"[sources] firebase: skipped {failed}/{len(ids)} stories (fetch failed)")
+        for it in items:
+            if not it or it.get("type") != "story" or it.get("deleted") or it.get("dead"):
+                continue
+            oid = str(it["id"])
+            self._kids[oid] = it.get("kids") or []
+            self._stories.append(self.hit(
+                objectID=oid,
+                title=it.get("title") or "",
+                url=it.get("url"),
+                author=it.get("by"),
+                points=it.get("score") or 0,
+                num_comments=it.get("descendants") or 0,
+                created_at=_iso(it.get("time")),
+                story_text=clean_html(it.get("text")),
+            ))
+
+    def search(self, query: str, limit: int) -> list[dict]:
+        return [h for h in self._stories if matches(query, f"{h['title']} {h['story_text']}")][:limit]
+
+    def comments(self, hit: dict) -> list[str]:
+        # 너비 우선으로 MAX_COMMENTS 개까지 (스레드 하나가 예산을 독차지하지 않게)
+        kids = self._kids.get(hit["objectID"])
+        if kids is None:
+            kids = (self._item(hit["objectID"]) or {}).get("kids") or []
+        frontier = [(k, 1) for k in kids]
+        texts, seen = [], 0
+        while frontier and seen < self.MAX_COMMENTS:
+            kid, depth = frontier.pop(0)
+            seen += 1
+            it = self._item(kid)
+            if not it or it.get("deleted") or it.get("dead"):
+                continue
+            text = clean_html(it.get("text"))
+            if text:
+                texts.append(Comment(text, depth, str(kid)))
+            if depth < MAX_COMMENT_DEPTH:
+                frontier.extend((k, depth + 1) for k in it.get("kids") or [])
+        return texts
+
+
+class RSSSource(Source):
+    name = "rss"
+    concurrency = 4
+    rate = 2.0
+    burst = 4
+
+    def __init__(self, feeds: list[str], **budget):
+        super().__init__(**budget)
+        self.feeds = list(feeds)
+        self._entries = []
+
+    def _feed(self, url: str) -> list[dict]:
+        import feedparser  # RSS 소스를 쓸 때만 로드
+
+        try:
+            parsed = feedparser.parse(self.get(url).content)
+        except Exception as e:
+            print(f"[sources] rss {url} failed: {type(e).__name__}")
+            return []
+        out = []
+        for e in parsed.entries:
+            link = e.get("link")
+            key = e.get("id") or link or e.get("title")
+            if not key:
+                continue
+            ts = e.get("published_parsed") or e.get("updated_parsed")
+            out.append(self.hit(
+                objectID="rss:" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16],
+                title=clean_html(e.get("title")),
+                url=link,
+                author=e.get("author"),
+                points=0,
+                num_comments=0,
+                created_at=datetime(*ts[:6], tzinfo=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z") if ts else "",
+                story_text=clean_html(e.get("summary")),
+            ))
+        return out
+
+    def prepare(self, queries: list[str]):
+        self._entries = [h for hits in self.map(self._feed, self.feeds) for h in hits]
+
+    def search(self, query: str, limit: int) -> list[dict]:
+        return [h for h in self._entries if matches(query, f"{h['title']} {h['story_text']}")][:limit]
+
+
+SOURCE_TYPES = {cls.name: cls for cls in (AlgoliaSource, FirebaseSource, RSSSource)}
+
+
+# -------------------------
+# 스케줄러
+# -------------------------
+
+class SourceScheduler:
+    """
+    여러 소스를 동시에 돌린다. 작업은 항상 해당 소스의 풀에 제출되므로
+    소스 간에는 큐를 공유하지 않고, 각 소스의 요청 속도는 그 소스의 토큰 버킷이 정한다.
+    """
+
+    def __init__(self, sources: list[Source]):
+        if not sources:
+            raise ValueError("at least one source is required")
+        self.sources = {s.name: s for s in sources}
+
+    def close(self):
+        for s in self.sources.values():
+            s.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _prepare(self, queries, names=None):
+        # 소스별 prepare 도 동시에 (Firebase 목록 훑기가 RSS 를 기다리게 하지 않음)
+        def run(src):
+            try:
+                src.prepare(queries)
+            except Exception as e:
+                print(f"[sources] {src.name} prepare failed: {type(e).__name__}: {e}")
+
+        threads = [threading.Thread(target=run, args=(s,)) for s in self.sources.values()
+                   if names is None or s.name in names]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def search(self, queries, max_results: int, hits_per_query: int | dict, dedupe: bool = True,
+               journal=None, stats: dict | None = None, known=None) -> list[dict]:
+        """
+        (쿼리 × 소스) 검색을 쿼리 순서 → 소스 순서로 합친다.
+        아직 안 읽은 검색들의 hit 수 합이 남은 개수의 PREFETCH_FACTOR 배가 될 때까지만 미리 제출하고
+        (최대 소스 동시성만큼), max_results(dedupe 면 제품 수)를 채우면 나머지 쿼리는 요청하지 않음.
+        hits_per_query: 숫자 또는 {쿼리: 개수} (query_planner 배분)
+        journal(checkpoint.Journal)에 이미 있는 (쿼리, 소스) 결과는 다시 요청하지 않음.
+        stats 를 주면 쿼리별 {"requests", "hits", "new_ids"} 를 채움
+        (앞선 쿼리에도, known(지난 실행들에서 본 objectID 집합)에도 없던 objectID)
+        """
+        known = known or set()
+        queries = list(queries)
+        limits = hits_per_query if isinstance(hits_per_query, dict) else {q: hits_per_query for q in queries}
+        cached = {}
+        if journal is not None:
+            cached = {
+                (q, name): hits for q in queries for name in self.sources
+                if (hits := journal.search_hits(q, name)) is not None
+            }
+        # 저널에 없는 (쿼리, 소스)가 있는 소스만 prepare (Firebase/RSS 목록 다시 받지 않게)
+        pending = {name for q in queries for name in self.sources if (q, name) not in cached}
+        if pending:
+            self._prepare(queries, pending)
+
+        def submit(q):
+            return [(s.name, None if (q, s.name) in cached else s.submit(s.search, q, limits[q]))
+                    for s in self.sources.values()]
+
+        ahead = max(s.concurrency for s in self.sources.values())
+        futures, nxt = {}, 0
+        deduper = HitDeduper()
+        done = False
+        for i, q in enumerate(queries):
+            if done:
+                break
+            found = deduper.num_clusters if dedupe else len(deduper.order)
+            need = PREFETCH_FACTOR * (max_results - found)
+            while nxt < len(queries) and nxt - i < ahead and (
+                    nxt <= i or sum(limits[queries[j]] for j in range(i, nxt)) < need):
+                futures[nxt] = submit(queries[nxt])
+                nxt += 1
+            st = stats.setdefault(q, {"requests": 0, "hits": 0, "new_ids": []}) if stats is not None else None
+            st_new = set(st["new_ids"]) if st is not None else None   # new_ids 멤버십 확인용
+            for name, fut in futures.pop(i):
+                if done:
+                    if fut is not None:
+                        fut.cancel()
+                    continue
+                if fut is None:
+                    hits = cached[(q, name)]
+                else:
+                    try:
+                        hits = fut.result()
+                    except Exception as e:
+                        print(f"[sources] {name} search failed: {type(e).__name__}: {e}")
+                        continue
+                    if journal is not None:
+                        journal.record_search(q, name, hits)
+                    if st is not None:
+                        st["requests"] += 1
+                        st["hits"] += len(hits)
+                        # 잘리기 전 페이지 전체 기준 (max_results 에 걸려도 수확률은 온전히)
+                        for h in hits:
+                            oid = h.get("objectID")
+                            if oid and oid not in deduper.hits and oid not in known and oid not in st_new:
+                                st_new.add(oid)
+                                st["new_ids"].append(oid)
+                for hit in hits:
+                    obj_id = hit.get("objectID")
+                    if not obj_id or obj_id in deduper.hits:
+                        continue
+                    deduper.add({k: hit.get(k) for k in HIT_FIELDS})
+                    found = deduper.num_clusters if dedupe else len(deduper.order)
+                    if found >= max_results:
+                        done = True
+                        break
+        for row in futures.values():
+            for _, fut in row:
+                if fut is not None:
+                    fut.cancel()
+
+        if not dedupe:
+            return [deduper.hits[oid] for oid in deduper.order]
+
+        hits = [merge_cluster(c) for c in deduper.clusters()]
+        saved = len(deduper.order) - len(hits)
+        if saved:
+            print(f"[dedupe] {len(deduper.order)} posts -> {len(hits)} products ({saved} item fetches saved)")
+        return hits
+
+    def threads(self, hits, journal=None) -> dict:
+        """
+        objectID -> 댓글 텍스트 리스트. 댓글은 hit 을 가져온 소스에서 (실패하면 빈 리스트).
+        journal 에 있는 스레드는 건너뛰고, 새로 받은 스레드는 끝나는 대로 기록.
+        """
+        done = dict(journal.threads) if journal is not None else {}
+        futures = {}
+        for hit in hits:
+            if hit["objectID"] in done:
+                continue
+            src = self.sources.get(hit.get("source") or "") or next(iter(self.sources.values()))
+            futures[src.submit(src.comments, hit)] = hit["objectID"]
+        for fut in as_completed(futures):
+            oid = futures[fut]
+            try:
+                done[oid] = fut.result()
+            except Exception:
+                # 실패한 스레드는 기록하지 않음 → 재실행 때 다시 시도
+                done[oid] = []
+                continue
+            if journal is not None:
+                journal.record_thread(oid, done[oid])
+        return {hit["objectID"]: done[hit["objectID"]] for hit in hits}
+
+
+def build_sources(names, budgets: dict | None = None, **options) -> list[Source]:
+    """
+    이름 목록 → 어댑터. budgets[name] = {"concurrency", "rate", "burst"} 로 기본 예산을 덮어씀.
+    options: algolia_search_url, algolia_item_url, rss_feeds
+    """
+    budgets = budgets or {}
+    out = []
+    for name in names:
+        budget = budgets.get(name, {})
+        if name == "algolia":
+            out.append(AlgoliaSource(options.get("algolia_search_url"), options.get("algolia_item_url"), **budget))
+        elif name == "firebase":
+            out.append(FirebaseSource(**budget))
+        elif name == "rss":
+            feeds = options.get("rss_feeds") or []
+            if feeds:
+                out.append(RSSSource(feeds, **budget))
+        else:
+            raise ValueError(f"unknown source: {name} (available: {', '.join(SOURCE_TYPES)})")
+    return out
@@ -0,0 +1,136 @@
+"""
+메모리 고정형 스트리밍 수집: fetch → tag → CSV 를 제너레이터로 연결한다.
+
+    python -m app.ingestion.streaming --max-results 300000
+
+- 케이스는 태깅 즉시 케이스 CSV에 한 줄씩 기록 (리스트로 모으지 않음)
+- 댓글 텍스트는 태깅 직후 버림
+- 케이스 단위 엣지(case_* → …)는 바로 엣지 파일로, 패턴 단위 엣지와 daily 지표는 작은 카운터로 누적
+메모리에 남는 건 중복 제거용 objectID 집합과 카운터뿐이라 30건이든 30만 건이든 거의 같다.
+(일괄 모드와 달리 케이스 CSV는 날짜순 정렬이 아니라 수집 순서)
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+from collections import Counter
+from datetime import datetime
+from itertools import count
+
+from app.ingestion import hn_fetch
+from app.common.metrics import METRICS
+
+MAX_PAGES_PER_QUERY = 50   # Algolia는 쿼리당 1000건까지만 페이지를 준다
+PAGE_SIZE = 100
+PROGRESS_EVERY = 1000
+
+
+def iter_hits(queries=None, max_results: int | None = None, page_size: int = PAGE_SIZE,
+              max_pages: int = MAX_PAGES_PER_QUERY):
+    """쿼리 × 페이지를 돌며 처음 보는 hit만 흘려보낸다"""
+    queries = queries or hn_fetch.QUERIES
+    seen = set()
+    for q in queries:
+        for page in count():
+            if page >= max_pages:
+                break
+            hits = hn_fetch.fetch_search(q, hits_per_page=page_size, page=page)
+            if not hits:
+                break
+            for hit in hits:
+                obj_id = hit.get("objectID")
+                if not obj_id or obj_id in seen:
+                    continue
+                seen.add(obj_id)
+                yield {k: hit.get(k) for k in hn_fetch.HIT_FIELDS}
+                if max_results and len(seen) >= max_results:
+                    return
+            if len(hits) < page_size:
+                break
+
+
+def iter_tagged(hits):
+    for hit in hits:
+        texts = hn_fetch.fetch_thread_texts(hit["objectID"])
+        case = hn_fetch.tag_case(hit, texts)
+        del texts  # 댓글 원문은 여기서 끝
+        yield case
+
+
+class EdgeSink:
+    """
+    case_* 로 시작하는 엣지는 케이스마다 유일하므로 weight=1 로 바로 기록,
+    패턴 → 기능/리스크 엣지만 카운터에 누적 (패턴 수 × 라벨 수로 상한)
+    """
+
+    def __init__(self, f, today: str):
+        self.today = today
+        self.w = csv.DictWriter(f, fieldnames=["date", "from", "relation", "to", "weight"])
+        self.w.writeheader()
+        self.shared = Counter()
+
+    def add(self, case: dict):
+        for frm, rel, to in hn_fetch.case_edges(case):
+            if frm.startswith("case_"):
+                self.w.writerow({"date": self.today, "from": frm, "relation": rel, "to": to, "weight": 1})
+            else:
+                self.shared[(frm, rel, to)] += 1
+
+    def close(self):
+        for row in hn_fetch.edge_rows(self.shared, self.today):
+            self.w.writerow(row)
+
+
+def run_streaming(max_results: int | None = None, queries=None,
+                  cases_path: str = hn_fetch.CASES_PATH,
+                  edges_path: str = hn_fetch.EDGES_PATH,
+                  daily_path: str = hn_fetch.DAILY_PATH) -> dict:
+    today = datetime.now().strftime("%Y-%m-%d")
+    acc = hn_fetch.DailyAccumulator()
+
+    # 중간에 죽어도 이전 산출물이 깨지지 않도록 임시 파일에 쓰고 마지막에 교체
+    cases_tmp, edges_tmp = f"{cases_path}.partial", f"{edges_path}.partial"
+    with METRICS.stage("stream", group="fetch"), \
+            open(cases_tmp, "w", newline="", encoding="utf-8") as cf, \
+            open(edges_tmp, "w", newline="", encoding="utf-8") as ef:
+        cw = csv.DictWriter(cf, fieldnames=hn_fetch.CASE_FIELDS)
+        cw.writeheader()
+        edges = EdgeSink(ef, today)
+
+        for i, case in enumerate(iter_tagged(iter_hits(queries, max_results)), 1):
+            cw.writerow(case)
+            edges.add(case)
+            acc.add(case)
+            if i % PROGRESS_EVERY == 0:
+                cf.flush()
+                print(f"[stream] {i} cases")
+        edges.close()
+
+    os.replace(cases_tmp, cases_path)
+    os.replace(edges_tmp, edges_path)
+    print(f"Saved: {cases_path}")
+    print(f"Saved: {edges_path}")
+
+    row = acc.row(today)
+    hn_fetch.append_daily_row(row, daily_path)
+    print(f"Saved: {daily_path}")
+    print("=== Daily Metrics ===")
+    print(row)
+    return row
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m app.ingestion.streaming",
+                                 description="bounded-memory streaming ingestion")
+    ap.add_argument("--max-results", type=int, default=None, help="최대 케이스 수 (기본: 쿼리 결과 전부)")
+    args = ap.parse_args(argv)
+
+    METRICS.reset()
+    run_streaming(max_results=args.max_results)
+    METRICS.write()
+    METRICS.print_summary()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+카드 SQLite 저장소: idea_cards.json 을 통째로 읽지 않고 조건 조회 (태그/리스크/priority/기간/클러스터).
+
+data/reports/card_store.sqlite
+    cards      (idea_id PK, title, cluster_id, priority, novelty, momentum, evidence, feasibility, confidence,
+                created_date, updated_at, body = 카드 JSON)
+    card_tags  (idea_id, tag, priority, created_date)    태그 junction
+    card_risks (idea_id, risk, priority, created_date)   리스크 junction
+
+- 인덱스: priority, created_date, (cluster_id, priority),
+  junction 은 (tag|risk, priority, created_date, idea_id) — priority/날짜를 junction 에도 복사해 둠
+  → "risk=privacy AND priority > 0.7 AND 최근 30일" 은 그 junction 인덱스 범위만 읽음 (개수 세기는 cards 를 보지 않음)
+  → 태그/리스크 조건이 여럿이면 카드 수가 가장 적은 값이 driver, 나머지는 PK 로 EXISTS
+  → 클러스터 조건이 있으면 (cluster_id, priority) 인덱스가 driver
+- export 스테이지가 실행마다 카드 전체를 트랜잭션 하나로 upsert (idea_id 가 같으면 최신 카드로 교체)
+- created_date: 카드의 케이스 날짜 (meta.date), 없으면 created_at 의 날짜
+- 읽는 쪽(API 스레드, dashboard)은 query_cards/count_cards 마다 읽기 전용 연결 (WAL 이라 쓰는 중에도 읽음)
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+STORE_PATH = Path("data/reports/card_store.sqlite")
+SCHEMA_VERSION = 1
+
+SCORE_COLUMNS = ("priority", "novelty", "momentum", "evidence", "feasibility", "confidence")
+MAX_LIMIT = 1000
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS cards (
+    idea_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    cluster_id TEXT,
+    {", ".join(f"{c} REAL NOT NULL DEFAULT 0" for c in SCORE_COLUMNS)},
+    created_date TEXT,
+    updated_at TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cards_priority ON cards (priority DESC);
+CREATE INDEX IF NOT EXISTS cards_created ON cards (created_date);
+CREATE INDEX IF NOT EXISTS cards_cluster ON cards (cluster_id, priority DESC);
+CREATE TABLE IF NOT EXISTS card_tags (
+    idea_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    created_date TEXT,
+    PRIMARY KEY (idea_id, tag)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS card_tags_tag ON card_tags (tag, priority, created_date, idea_id);
+CREATE TABLE IF NOT EXISTS card_risks (
+    idea_id TEXT NOT NULL,
+    risk TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    created_date TEXT,
+    PRIMARY KEY (idea_id, risk)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS card_risks_risk ON card_risks (risk, priority, created_date, idea_id);
+"""
+
+# junction 테이블: 카드 필드 -> (테이블, 값 컬럼)
+JUNCTIONS = {"tags": ("card_tags", "tag"), "risks": ("card_risks", "risk")}
+
+
+def connect(path: Path = STORE_PATH, readonly: bool = False) -> sqlite3.Connection:
+    path = Path(path)
+    if readonly:
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        # 스키마가 바뀌면 다시 만듦 (카드는 다음 export 에서 다시 채워짐)
+        conn.executescript("DROP TABLE IF EXISTS cards; DROP TABLE IF EXISTS card_tags; "
+                           "DROP TABLE IF EXISTS card_risks;")
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    return conn
+
+
+def _score(card: dict, key: str) -> float:
+    try:
+        return float((card.get("scores") or {}).get(key) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _values(card: dict, field: str) -> list[str]:
+    v = card.get(field) or []
+    if isinstance(v, str):
+        v = [x.strip() for x in v.split(",")]
+    return sorted({str(x) for x in v if x and x != "-"})
+
+
+def created_date(card: dict) -> str | None:
+    d = (card.get("meta") or {}).get("date") or (card.get("created_at") or "")[:10]
+    return d or None
+
+
+def upsert_cards(cards: list[dict], path: Path = STORE_PATH) -> str:
+    """카드(dict) 전체를 트랜잭션 하나로 upsert + junction 교체"""
+    now = datetime.now().isoformat(timespec="seconds")
+    rows, ids, links = [], [], {table: [] for table, _ in JUNCTIONS.values()}
+    for c in cards:
+        idea_id, day, priority = str(c.get("idea_id")), created_date(c), _score(c, "priority")
+        ids.append((idea_id,))
+        rows.append((
+            idea_id, c.get("title") or "", c.get("cluster_id"),
+            *(_score(c, k) for k in SCORE_COLUMNS),
+            day, now, json.dumps(c, ensure_ascii=False, separators=(",", ":")),
+        ))
+        for field, (table, _) in JUNCTIONS.items():
+            links[table] += [(idea_id, v, priority, day) for v in _values(c, field)]
+
+    cols = ("idea_id", "title", "cluster_id", *SCORE_COLUMNS, "created_date", "updated_at", "body")
+    sql = (f"INSERT INTO cards ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+           f"ON CONFLICT(idea_id) DO UPDATE SET "
+           + ", ".join(f"{c}=excluded.{c}" for c in cols[1:]))
+    conn = connect(path)
+    try:
+        with conn:   # 트랜잭션 하나 (중간에 실패하면 이전 상태 그대로)
+            conn.executemany(sql, rows)
+            for table, col in JUNCTIONS.values():
+                conn.executemany(f"DELETE FROM {table} WHERE idea_id = ?", ids)
+                conn.executemany(f"INSERT OR IGNORE INTO {table} (idea_id, {col}, priority, created_date) "
+                                 f"VALUES (?, ?, ?, ?)", links[table])
+    finally:
+        conn.close()
+    return str(path)
+
+
+def _from_where(conn, tags=(), risks=(), min_priority=None, since=None, until=None,
+                cluster_id=None) -> tuple[str, str, list]:
+    """
+    → (FROM 절, WHERE 절, 인자). 태그/리스크는 모두 만족 (AND).
+    태그/리스크 조건이 있고 클러스터 조건이 없으면 junction 하나가 driver (t) → priority/날짜 범위도 그 인덱스에서 거름.
+    아니면 cards 가 driver. 어느 쪽이든 t.idea_id / t.priority / t.created_date 로 참조
+    """
+    filters = [(table, col, v) for values, (table, col) in ((tags, JUNCTIONS["tags"]), (risks, JUNCTIONS["risks"]))
+               for v in values or ()]
+    if len(filters) > 1:
+        # 카드 수가 적은 값부터 (인덱스 범위 개수만 셈)
+        filters.sort(key=lambda f: conn.execute(f"SELECT COUNT(*) FROM {f[0]} WHERE {f[1]} = ?", (f[2],)).fetchone()[0])
+    clauses, args = [], []
+    if filters and not cluster_id:
+        table, col, v = filters.pop(0)
+        source = f"{table} t"
+        clauses.append(f"t.{col} = ?")
+        args.append(v)
+    else:
+        source = "cards t"
+    for table, col, v in filters:
+        clauses.append(f"EXISTS (SELECT 1 FROM {table} j WHERE j.idea_id = t.idea_id AND j.{col} = ?)")
+        args.append(v)
+    if min_priority is not None:
+        clauses.append("t.priority >= ?")
+        args.append(float(min_priority))
+    if since:
+        clauses.append("t.created_date >= ?")
+        args.append(str(since))
+    if until:
+        clauses.append("t.created_date <= ?")
+        args.append(str(until))
+    if cluster_id:
+        clauses.append("t.cluster_id = ?")
+        args.append(cluster_id)
+    where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    return source, where, args
+
+
+def query_cards(path: Path = STORE_PATH, tags=(), risks=(), min_priority=None, since=None, until=None,
+                cluster_id=None, order: str = "priority", limit: int = 50, offset: int = 0) -> list[dict]:
+    """조건에 맞는 카드 (order 점수 내림차순, 같으면 idea_id). since/until: YYYY-MM-DD (양 끝 포함)"""
+    if order not in SCORE_COLUMNS:
+        raise ValueError(f"order must be one of {', '.join(SCORE_COLUMNS)}")
+    limit = max(1, min(MAX_LIMIT, int(limit)))
+    sql = ("SELECT cards.body FROM cards WHERE cards.idea_id IN (SELECT t.idea_id FROM {source}{where}) "
+           f"ORDER BY cards.{order} DESC, cards.idea_id LIMIT ? OFFSET ?")
+    if order == "priority":
+        # priority 순이면 driver 인덱스 순서 그대로 → 앞쪽 limit 개만 cards 에서 읽음
+        sql = ("SELECT cards.body FROM (SELECT t.idea_id, t.priority FROM {source}{where} "
+               "ORDER BY t.priority DESC, t.idea_id LIMIT ? OFFSET ?) p "
+               "JOIN cards ON cards.idea_id = p.idea_id ORDER BY p.priority DESC, p.idea_id")
+    conn = connect(path, readonly=True)
+    try:
+        source, where, args = _from_where(conn, tags, risks, min_priority, since, until, cluster_id)
+        sql = sql.format(source=source, where=where)
+        return [json.loads(b) for (b,) in conn.execute(sql, [*args, limit, max(0, int(offset))])]
+    finally:
+        conn.close()
+
+
+def count_cards(path: Path = STORE_PATH, tags=(), risks=(), min_priority=None, since=None, until=None,
+                cluster_id=None) -> int:
+    conn = connect(path, readonly=True)
+    try:
+        source, where, args = _from_where(conn, tags, risks, min_priority, since, until, cluster_id)
+        return conn.execute(f"SELECT COUNT(*) FROM {source}{where}", args).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def facets(field: str, path: Path = STORE_PATH, limit: int = 100) -> list[tuple[str, int]]:
+    """tags/risks 값별 카드 수 (많은 순) — 대시보드 필터 선택지"""
+    table, col = JUNCTIONS[field]
+    conn = connect(path, readonly=True)
+    try:
+        sql = f"SELECT {col}, COUNT(*) AS n FROM {table} GROUP BY {col} ORDER BY n DESC, {col} LIMIT ?"
+        return [(v, n) for v, n in conn.execute(sql, (limit,))]
+    finally:
+        conn.close()
@@ -0,0 +1,192 @@
+"""
+케이스 온라인 클러스터링 (incremental threshold / leader clustering).
+
+- 새 케이스 벡터(similarity 색인의 TF-IDF)를 가장 가까운 centroid 에 붙이고,
+  코사인 유사도가 JOIN_THRESHOLD 미만이면 새 클러스터를 만든다
+- centroid 는 상위 CENTROID_TERMS 개 토큰만 유지하고, 토큰 → 클러스터 역색인으로 후보만 비교
+  (전체 클러스터를 훑지 않으므로 클러스터 수가 늘어도 할당 비용이 거의 일정)
+- centroid/할당은 data/knowledge/clusters.json 에 누적 — 이미 할당된 케이스는 다시 돌려도 그대로
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from app.knowledge.similarity import SIM_DIR, STOPWORDS, load_index
+
+CLUSTERS_PATH = SIM_DIR / "clusters.json"
+SUMMARY_PATH = Path("data/reports/cluster_summary.json")
+STATE_VERSION = 1
+
+JOIN_THRESHOLD = 0.30     # centroid 와의 코사인 유사도가 이 이상이면 합류
+CENTROID_TERMS = 64       # centroid 에 남기는 토큰 수
+QUERY_TERMS = 12          # 후보 클러스터를 찾을 때 쓰는 케이스의 상위 토큰 수
+LABEL_TERMS = 4
+
+
+class ClusterState:
+    def __init__(self):
+        self.clusters = {}        # cid -> {"size": n, "sums": {token: w}}
+        self.assignments = {}     # objectID -> cid
+        self.next_id = 0
+        self._postings = defaultdict(set)   # token -> {cid}
+
+    # -------------------------
+    # centroid
+    # -------------------------
+
+    def _index(self, cid: str):
+        for tok in self.clusters[cid]["sums"]:
+            self._postings[tok].add(cid)
+
+    def _unindex(self, cid: str):
+        for tok in self.clusters[cid]["sums"]:
+            self._postings[tok].discard(cid)
+
+    def _cosine(self, vec: dict, cid: str) -> float:
+        c = self.clusters[cid]
+        sums = c["sums"]
+        norm = c.get("_norm")
+        if norm is None:
+            norm = c["_norm"] = math.sqrt(sum(w * w for w in sums.values())) or 1.0
+        return sum(w * sums.get(tok, 0.0) for tok, w in vec.items()) / norm
+
+    def nearest(self, vec: dict) -> tuple[str | None, float]:
+        top = sorted(vec.items(), key=lambda x: x[1], reverse=True)[:QUERY_TERMS]
+        candidates = set()
+        for tok, _ in top:
+            candidates |= self._postings.get(tok, set())
+        best, best_sim = None, 0.0
+        for cid in candidates:
+            sim = self._cosine(vec, cid)
+            if sim > best_sim:
+                best, best_sim = cid, sim
+        return best, best_sim
+
+    def assign(self, doc_id: str, vec: dict) -> str:
+        if doc_id in self.assignments:
+            return self.assignments[doc_id]
+        cid, sim = self.nearest(vec) if vec else (None, 0.0)
+        if cid is None or sim < JOIN_THRESHOLD:
+            cid = f"c{self.next_id:05d}"
+            self.next_id += 1
+            self.clusters[cid] = {"size": 0, "sums": {}}
+        c = self.clusters[cid]
+        self._unindex(cid)
+        sums = Counter(c["sums"])
+        sums.update(vec)
+        c["sums"] = dict(sums.most_common(CENTROID_TERMS))
+        c["size"] += 1
+        c.pop("_norm", None)
+        self._index(cid)
+        self.assignments[doc_id] = cid
+        return cid
+
+    def label(self, cid: str) -> str:
+        # 기능어는 빼고 (기능어 필터 이전에 쌓인 centroid 에도 남아 있을 수 있음)
+        sums = self.clusters[cid]["sums"]
+        ranked = sorted(sums.items(), key=lambda x: x[1], reverse=True)
+        return " ".join([tok for tok, _ in ranked if tok not in STOPWORDS][:LABEL_TERMS])
+
+    # -------------------------
+    # 저장
+    # -------------------------
+
+    def save(self, path: Path = CLUSTERS_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": STATE_VERSION,
+            "next_id": self.next_id,
+            "clusters": {
+                cid: {"size": c["size"], "sums": {t: round(w, 5) for t, w in c["sums"].items()}}
+                for cid, c in self.clusters.items()
+            },
+            "assignments": self.assignments,
+        }
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path = CLUSTERS_PATH) -> "ClusterState":
+        st = cls()
+        path = Path(path)
+        if not path.exists():
+            return st
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("version") != STATE_VERSION:
+            return st
+        st.next_id = payload["next_id"]
+        st.clusters = payload["clusters"]
+        st.assignments = payload["assignments"]
+        for cid in st.clusters:
+            st._index(cid)
+        return st
+
+
+def assign_clusters(hits, root: Path = SIM_DIR) -> dict:
+    """
+    objectID -> cluster_id. similarity 색인(score_novelty 가 갱신)에 있는 벡터를 사용.
+    게시일 순으로 넣어서 클러스터가 시간 순서대로 자라게 한다.
+    """
+    root = Path(root)
+    state_path = root / CLUSTERS_PATH.name
+    state = ClusterState.load(state_path)
+    ordered = sorted(hits, key=lambda h: h.get("created_at") or "")
+    new = [h["objectID"] for h in ordered if h["objectID"] not in state.assignments]
+    if new:
+        index = load_index(root)
+        for oid, vec in zip(new, index.term_vectors(new)):
+            state.assign(oid, vec)
+        state.save(state_path)
+    return {h["objectID"]: state.assignments[h["objectID"]] for h in hits}
+
+
+def summarize_clusters(cards: list[dict], path: Path = CLUSTERS_PATH) -> list[dict]:
+    """
+    카드(dict) → 클러스터별 집계. 랭킹은 카드가 아니라 클러스터 단위:
+    cluster_priority = 0.7 * max + 0.3 * mean (대표 카드 + 전반적인 수준)
+    """
+    state = ClusterState.load(path)
+    groups = defaultdict(list)
+    for card in cards:
+        if card.get("cluster_id"):
+            groups[card["cluster_id"]].append(card)
+
+    out = []
+    for cid, members in groups.items():
+        prios = [float((m.get("scores") or {}).get("priority") or 0) for m in members]
+        rep = members[prios.index(max(prios))]
+        tags = Counter(t for m in members for t in m.get("tags") or [])
+        risks = Counter(r for m in members for r in m.get("risks") or [])
+        meta = [m.get("meta") or {} for m in members]
+        out.append({
+            "cluster_id": cid,
+            "label": state.label(cid) if cid in state.clusters else "",
+            "size_total": state.clusters.get(cid, {}).get("size", len(members)),
+            "size_today": len(members),
+            "priority": round(0.7 * max(prios) + 0.3 * sum(prios) / len(prios), 4),
+            "max_priority": round(max(prios), 4),
+            "mean_priority": round(sum(prios) / len(prios), 4),
+            "novelty": round(sum(float((m.get("scores") or {}).get("novelty") or 0) for m in members) / len(members), 4),
+            "points": sum(int(x.get("points") or 0) for x in meta),
+            "comments": sum(int(x.get("comments") or 0) for x in meta),
+            "top_tags": [t for t, _ in tags.most_common(5)],
+            "top_risks": [r for r, _ in risks.most_common(3)],
+            "representative": {"idea_id": rep.get("idea_id"), "title": rep.get("title")},
+            "idea_ids": [m.get("idea_id") for m in members],
+        })
+    out.sort(key=lambda x: x["priority"], reverse=True)
+    return out
+
+
+def write_cluster_summary(cards: list[dict], out_path: str | Path = SUMMARY_PATH) -> str:
+    path = Path(out_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"clusters": summarize_clusters(cards)}
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return str(path)
@@ -0,0 +1,127 @@
+"""
+라벨 매치 위치 색인: 태깅(comment_tagging)이 훑으면서 남긴 매치 위치로 카드 evidence 스니펫을 만든다.
+
+data/knowledge/hit_index.json
+    {"version": 2, "cases": {objectID: {label: [[댓글 번호, 댓글 id, 시작, 끝, 텍스트 crc32], ...]}}}
+    댓글 번호 -1 = 케이스 본문 (hn_fetch.header_text), 그 외 = fetch 스레드의 댓글 순서
+    crc32 = 색인할 때의 그 텍스트 → 카드 만들 때 텍스트가 다르면 (다른 실행의 스레드) 그 위치는 버림
+
+- 라벨마다 깊이 가중치가 큰 매치 POSITIONS_PER_LABEL 개만 (comment_tagging 에서 이미 추림)
+- 카드 만들 때 저장된 텍스트에서 위치 주변만 잘라냄 → 정규식을 다시 돌리지 않음
+- 케이스가 실제로 단 라벨(pattern/features/risks)만, 강도 순으로 라벨을 돌아가며 MAX_EVIDENCE 개
+"""
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from pathlib import Path
+
+from app.ingestion.comment_tagging import depth_weight
+from app.ingestion.sources import comment_depth, comment_id
+
+HIT_INDEX_PATH = Path("data/knowledge/hit_index.json")
+INDEX_VERSION = 2
+
+SNIPPET_CONTEXT = 80    # 매치 앞뒤로 붙이는 글자 수 (단어 경계까지 줄임)
+MAX_EVIDENCE = 5
+HN_ITEM_URL = "https://news.ycombinator.com/item?id={}"
+
+
+def text_crc(text: str) -> int:
+    return zlib.crc32(str(text).encode("utf-8"))
+
+
+def entry_from_signals(signals: dict, comments: list, header: str = "") -> dict:
+    """tag_threads 결과 하나 → {label: [[댓글 번호, 댓글 id, 시작, 끝, crc32], ...]} (header = 태깅한 본문)"""
+    entry, crcs = {}, {}
+    for label, s in signals.items():
+        rows = []
+        for ci, start, end in s.get("at") or []:
+            cid = comment_id(comments[ci]) if 0 <= ci < len(comments) else None
+            if ci not in crcs:
+                crcs[ci] = text_crc(header if ci < 0 else comments[ci] if ci < len(comments) else "")
+            rows.append([ci, cid, start, end, crcs[ci]])
+        if rows:
+            entry[label] = rows
+    return entry
+
+
+def write_hit_index(index: dict, path: Path = HIT_INDEX_PATH) -> str:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    payload = {"version": INDEX_VERSION, "cases": index}
+    tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+    return str(path)
+
+
+def load_hit_index(path: Path = HIT_INDEX_PATH) -> dict:
+    path = Path(path)
+    if not path.exists():
+        return {}
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("version") != INDEX_VERSION:
+        return {}
+    return payload.get("cases") or {}
+
+
+def snippet(text: str, start: int, end: int, context: int = SNIPPET_CONTEXT) -> str:
+    """text[start:end] 앞뒤로 context 글자 (단어 중간에서 자르지 않음), 잘린 쪽은 …"""
+    lo, hi = max(0, start - context), min(len(text), end + context)
+    if lo > 0:
+        cut = text.find(" ", lo, start)
+        lo = cut + 1 if cut != -1 else lo
+    if hi < len(text):
+        cut = text.rfind(" ", end, hi)
+        hi = cut if cut != -1 else hi
+    out = text[lo:hi].strip()
+    return ("…" if lo > 0 else "") + out + ("…" if hi < len(text) else "")
+
+
+def case_labels(case: dict) -> list[str]:
+    labels = [f"pattern:{case.get('pattern')}"]
+    for kind, key in (("feature", "core_ai_features"), ("risk", "risks")):
+        v = case.get(key) or "-"
+        if v != "-":
+            labels += [f"{kind}:{x}" for x in v.split(",") if x]
+    return labels
+
+
+def evidence(case: dict, entry: dict, header: str, comments: list, strengths: dict | None = None,
+             limit: int = MAX_EVIDENCE, source: str | None = None) -> list[dict]:
+    """
+    케이스 하나의 색인 항목 + 저장된 텍스트 → EvidenceItem 모양 dict 리스트.
+    strengths: {label: 강도} (cases.csv 의 signals). 라벨을 강도 순으로 돌아가며 하나씩
+    source: hit 을 가져온 소스 (algolia/firebase/rss) → "<source>:story" | "<source>:comment"
+    """
+    source = source or "hn"
+    strengths = strengths or {}
+    labels = [l for l in case_labels(case) if entry.get(l)]
+    labels.sort(key=lambda l: -strengths.get(l, 0.0))
+    out, seen = [], set()
+    for rank in range(max((len(entry[l]) for l in labels), default=0)):
+        for label in labels:
+            if len(out) >= limit:
+                return out
+            if rank >= len(entry[label]):
+                continue
+            ci, cid, start, end, crc = entry[label][rank]
+            text = header if ci < 0 else (str(comments[ci]) if ci < len(comments) else "")
+            if text_crc(text) != crc:
+                continue   # 텍스트가 색인과 다름 (다른 실행의 스레드) → 건너뜀
+            cut = snippet(text, start, end)
+            if (ci, cut) in seen:
+                continue   # 짧은 댓글은 라벨이 달라도 같은 스니펫
+            seen.add((ci, cut))
+            weight = depth_weight(0 if ci < 0 else comment_depth(comments[ci]))
+            out.append({
+                "title": f"[{label}] {case.get('title') or ''}",
+                "source": f"{source}:{'story' if ci < 0 else 'comment'}",
+                "published_at": case.get("date"),
+                "url": HN_ITEM_URL.format(cid) if cid else case.get("url"),
+                "snippet": cut,
+                "relevance": round(strengths.get(label, 0.0) * weight, 4),
+            })
+    return out
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import csv
+import json
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+DAILY_PATH = "daily_interest_metrics.csv"
+ROLLUP_DIR = Path("data/rollups")
+
+RECENT_DAYS = 120          # 일 단위 해상도로 바로 그릴 수 있는 최근 구간
+ROLLING_WINDOWS = (7, 28)  # rolling mean 윈도우 (일)
+MAX_POINTS = 90            # 차트 하나에 그릴 최대 포인트 수
+
+# 합계가 의미 있는 컬럼 (나머지는 평균만)
+ADDITIVE_COLS = {"mentions", "total_points", "total_comments", "interest_score"}
+NON_NUMERIC_COLS = {"date", "usecase", "top_feature", "top_risk"}
+
+
+def _to_date(d) -> date:
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, date):
+        return d
+    return datetime.strptime(str(d)[:10], "%Y-%m-%d").date()
+
+
+def week_key(d: date) -> str:
+    y, w, _ = d.isocalendar()
+    return f"{y}-W{w:02d}"
+
+
+def week_start(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+def month_key(d: date) -> str:
+    return f"{d.year}-{d.month:02d}"
+
+
+def _numeric_values(row: dict) -> dict:
+    out = {}
+    for k, v in row.items():
+        if k in NON_NUMERIC_COLS:
+            continue
+        try:
+            out[k] = float(v)
+        except (TypeError, ValueError):
+            continue
+    return out
+
+
+# -------------------------
+# 저장소: 월별 파티션 + 상태 파일
+# -------------------------
+
+def root_for(daily_path: str = DAILY_PATH) -> Path:
+    """daily CSV 에 딸린 롤업 디렉터리: 기본 파일이면 ROLLUP_DIR, 아니면 그 파일 옆 <이름>_rollups/"""
+    p = Path(daily_path)
+    if p.resolve() == Path(DAILY_PATH).resolve():
+        return ROLLUP_DIR
+    return p.with_name(f"{p.stem}_rollups")
+
+
+def _partition_path(root: Path, mkey: str) -> Path:
+    return root / "days" / f"{mkey}.json"
+
+
+def _load_json(path: Path, default):
+    if not path.exists():
+        return default
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _save_json(path: Path, payload) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(path)
+
+
+def load_state(root: Path = ROLLUP_DIR) -> dict:
+    return _load_json(root / "state.json", {
+        "columns": [],
+        "weekly": {},
+        "monthly": {},
+        "recent": {},
+        "rolling": {},
+        "min_date": None,
+        "max_date": None,
+    })
+
+
+def _aggregate(days: dict, columns: list[str]) -> dict:
+    """{date: {col: v}} → {days, <col>, <col>_sum}"""
+    agg = {"days": len(days)}
+    for col in columns:
+        vals = [v[col] for v in days.values() if col in v]
+        if not vals:
+            continue
+        agg[col] = round(sum(vals) / len(vals), 4)
+        if col in ADDITIVE_COLS:
+            agg[f"{col}_sum"] = round(sum(vals), 4)
+    return agg
+
+
+def _rolling(recent: dict, end: date, columns: list[str]) -> dict:
+    out = {}
+    hi = end.isoformat()
+    for w in ROLLING_WINDOWS:
+        lo = (end - timedelta(days=w - 1)).isoformat()
+        window = [v for d, v in recent.items() if lo <= d <= hi]
+        means = {}
+        for col in columns:
+            vals = [v[col] for v in window if col in v]
+            if vals:
+                means[col] = round(sum(vals) / len(vals), 4)
+        out[str(w)] = means
+    return out
+
+
+def update_rollups(row: dict, root: Path = ROLLUP_DIR, write_csv: bool = True) -> dict:
+    """
+    일별 row 1개를 반영한다 (같은 날짜 재실행이면 교체).
+    건드리는 건 해당 월 파티션, 그 주/월 버킷, 최근 윈도우뿐이라 히스토리 길이와 무관.
+    """
+    d = _to_date(row["date"])
+    dkey = d.isoformat()
+    values = _numeric_values(row)
+    state = load_state(root)
+
+    columns = list(state["columns"])
+    for col in values:
+        if col not in columns:
+            columns.append(col)
+    state["columns"] = columns
+
+    # 1) 월 파티션 upsert
+    mkey = month_key(d)
+    part_path = _partition_path(root, mkey)
+    part = _load_json(part_path, {})
+    part[dkey] = values
+    _save_json(part_path, part)
+
+    # 2) 월 버킷 재계산 (≤31일)
+    state["monthly"][mkey] = {"start": f"{mkey}-01", **_aggregate(part, columns)}
+
+    # 3) 주 버킷 재계산 — ISO 주가 두 달에 걸칠 수 있음
+    ws = week_start(d)
+    week_days = {}
+    parts = {mkey: part}
+    for i in range(7):
+        wd = ws + timedelta(days=i)
+        mk = month_key(wd)
+        if mk not in parts:
+            parts[mk] = _load_json(_partition_path(root, mk), {})
+        if wd.isoformat() in parts[mk]:
+            week_days[wd.isoformat()] = parts[mk][wd.isoformat()]
+    state["weekly"][week_key(d)] = {"start": ws.isoformat(), **_aggregate(week_days, columns)}
+
+    # 4) 최근 윈도우 + rolling mean
+    state["min_date"] = min(filter(None, [state["min_date"], dkey]))
+    state["max_date"] = max(filter(None, [state["max_date"], dkey]))
+    max_d = _to_date(state["max_date"])
+    cutoff = (max_d - timedelta(days=RECENT_DAYS - 1)).isoformat()
+    recent = state["recent"]
+    if dkey >= cutoff:
+        recent[dkey] = values
+    state["recent"] = {k: v for k, v in sorted(recent.items()) if k >= cutoff}
+    state["rolling"] = _rolling(state["recent"], max_d, columns)
+
+    _save_json(root / "state.json", state)
+    if write_csv:
+        write_rollup_csvs(state, root)
+    return state
+
+
+def write_rollup_csvs(state: dict, root: Path = ROLLUP_DIR) -> None:
+    columns = state["columns"]
+
+    def dump(path: Path, rows: list[dict], extra: list[str]):
+        fields = ["date"] + extra
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            w.writeheader()
+            w.writerows(rows)
+
+    agg_cols = ["days"]
+    for col in columns:
+        agg_cols.append(col)
+        if col in ADDITIVE_COLS:
+            agg_cols.append(f"{col}_sum")
+
+    for level in ("weekly", "monthly"):
+        rows = [
+            {"date": b["start"], **b}
+            for _, b in sorted(state[level].items(), key=lambda x: x[1]["start"])
+        ]
+        dump(root / f"{level}.csv", rows, agg_cols)
+
+    # 최근 일별 + rolling mean 컬럼
+    recent = state["recent"]
+    rows = []
+    for dkey in sorted(recent):
+        r = {"date": dkey, **recent[dkey]}
+        roll = _rolling(recent, _to_date(dkey), columns)
+        for w, means in roll.items():
+            for col, v in means.items():
+                r[f"{col}_r{w}"] = v
+        rows.append(r)
+    roll_cols = [f"{c}_r{w}" for w in ROLLING_WINDOWS for c in columns]
+    dump(root / "daily_recent.csv", rows, columns + roll_cols)
+
+
+def rebuild_rollups(daily_path: str = DAILY_PATH, root: Path | None = None) -> dict:
+    """daily CSV 전체로부터 처음부터 다시 만든다 (백필/복구용). root 없으면 root_for(daily_path)"""
+    root = Path(root) if root is not None else root_for(daily_path)
+    for p in (root / "days").glob("*.json") if (root / "days").exists() else []:
+        p.unlink()
+    state_path = root / "state.json"
+    if state_path.exists():
+        state_path.unlink()
+
+    state = load_state(root)
+    if not Path(daily_path).exists():
+        return state
+    with open(daily_path, newline="", encoding="utf-8") as f:
+        rows = sorted(csv.DictReader(f), key=lambda r: r["date"])
+    for r in rows:
+        state = update_rollups(r, root, write_csv=False)
+    write_rollup_csvs(state, root)
+    return state
+
+
+# -------------------------
+# 조회: 범위에 맞는 해상도 선택
+# -------------------------
+
+def pick_resolution(start, end, max_points: int = MAX_POINTS) -> str:
+    span = (_to_date(end) - _to_date(start)).days + 1
+    if span <= max_points:
+        return "daily"
+    if span / 7 <= max_points:
+        return "weekly"
+    return "monthly"
+
+
+def _read_csv(path: Path) -> list[dict]:
+    """rollup CSV → date 는 문자열, 나머지는 float (빈 칸은 None) — 파티션 경로와 같은 타입"""
+    if not path.exists():
+        return []
+    with path.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    out = []
+    for r in rows:
+        row = {"date": r["date"]}
+        for k, v in r.items():
+            if k == "date":
+                continue
+            try:
+                row[k] = float(v) if v not in (None, "") else None
+            except ValueError:
+                row[k] = v
+        out.append(row)
+    return out
+
+
+def load_series(start=None, end=None, resolution: str | None = None,
+                root: Path = ROLLUP_DIR) -> tuple[str, list[dict]]:
+    """
+    (resolution, rows) 반환. rows 는 date 오름차순 dict 리스트.
+    daily 는 최근 윈도우 or 해당 월 파티션만 읽는다.
+    """
+    state = load_state(root)
+    if not state["max_date"]:
+        return "daily", []
+
+    start = _to_date(start or state["min_date"])
+    end = _to_date(end or state["max_date"])
+    resolution = resolution or pick_resolution(start, end)
+    lo, hi = start.isoformat(), end.isoformat()
+
+    if resolution == "daily":
+        recent_lo = min(state["recent"]) if state["recent"] else None
+        if recent_lo and lo >= recent_lo:
+            rows = _read_csv(root / "daily_recent.csv")
+        else:
+            rows = []
+            d = date(start.year, start.month, 1)
+            while d <= end:
+                part = _load_json(_partition_path(root, month_key(d)), {})
+                rows += [{"date": k, **v} for k, v in part.items()]
+                d = (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+            rows.sort(key=lambda r: r["date"])
+        return resolution, [r for r in rows if lo <= r["date"] <= hi]
+
+    # 버킷 시작일이 범위 앞에 걸쳐도 포함
+    rows = _read_csv(root / f"{resolution}.csv")
+    if resolution == "weekly":
+        lo = week_start(start).isoformat()
+    else:
+        lo = f"{month_key(start)}-01"
+    return resolution, [r for r in rows if lo <= r["date"] <= hi]
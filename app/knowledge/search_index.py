@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+
+INDEX_PATH = Path("data/reports/search_index.json")
+INDEX_VERSION = 1
+
+# 필드별 가중치 (제목/태그 매치를 요약보다 높게)
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "tags": 2.0,
+    "risks": 2.0,
+    "summary": 1.0,
+}
+
+# 밑줄은 구분자로 취급 → "action_items" 는 "action", "items" 두 토큰
+TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+PREFIX_PENALTY = 0.6  # 접두어 확장 매치는 정확 매치보다 낮게
+MAX_PREFIX_EXPANSION = 64
+
+
+def tokenize(text: str) -> list[str]:
+    if not text:
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+def _field_text(card: dict, field: str) -> str:
+    v = card.get(field)
+    if v is None:
+        return ""
+    if isinstance(v, list):
+        return " ".join(str(x) for x in v)
+    return str(v)
+
+
+def _priority(card: dict) -> float:
+    s = card.get("scores") or {}
+    try:
+        return float(s.get("priority") or 0)
+    except Exception:
+        return 0.0
+
+
+def build_index(cards: list[dict]) -> dict:
+    """
+    카드 리스트(dict) → 역색인 payload.
+    postings[i] 는 vocab[i] 토큰의 [[doc, weight], ...] (doc 순서 정렬)
+    """
+    docs = []
+    inverted = defaultdict(dict)  # token -> {doc: weight}
+
+    for doc, card in enumerate(cards):
+        docs.append({
+            "idea_id": str(card.get("idea_id") or f"idea_{doc}"),
+            "priority": round(_priority(card), 6),
+        })
+        for field, fw in FIELD_WEIGHTS.items():
+            for tok in tokenize(_field_text(card, field)):
+                inverted[tok][doc] = inverted[tok].get(doc, 0.0) + fw
+
+    vocab = sorted(inverted)
+    postings = [
+        [[d, round(w, 3)] for d, w in sorted(inverted[tok].items())]
+        for tok in vocab
+    ]
+    return {
+        "version": INDEX_VERSION,
+        "docs": docs,
+        "vocab": vocab,
+        "postings": postings,
+    }
+
+
+def write_index(cards: list[dict], out_path: str | Path = INDEX_PATH) -> str:
+    path = Path(out_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = build_index(cards)
+    path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    return str(path)
+
+
+class SearchIndex:
+    def __init__(self, payload: dict):
+        self.docs = payload.get("docs", [])
+        self.vocab = payload.get("vocab", [])
+        self.postings = payload.get("postings", [])
+        self._pos = {tok: i for i, tok in enumerate(self.vocab)}
+        n = max(1, len(self.docs))
+        # BM25 스타일 idf (df가 작을수록 큼)
+        self._idf = [
+            math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+            for p in self.postings
+        ]
+
+    @classmethod
+    def load(cls, path: str | Path = INDEX_PATH) -> "SearchIndex | None":
+        p = Path(path)
+        if not p.exists():
+            return None
+        payload = json.loads(p.read_text(encoding="utf-8"))
+        if payload.get("version") != INDEX_VERSION:
+            return None
+        return cls(payload)
+
+    def _expand(self, term: str, prefix: bool) -> list[tuple[int, float]]:
+        """term → [(vocab_idx, factor)]"""
+        out = []
+        exact = self._pos.get(term)
+        if exact is not None:
+            out.append((exact, 1.0))
+        if prefix:
+            i = bisect_left(self.vocab, term)
+            while i < len(self.vocab) and self.vocab[i].startswith(term):
+                if i != exact:
+                    out.append((i, PREFIX_PENALTY))
+                    if len(out) >= MAX_PREFIX_EXPANSION:
+                        break
+                i += 1
+        return out
+
+    def search(self, query: str, limit: int | None = None) -> list[tuple[str, float]]:
+        """
+        모든 질의 토큰이 매치되는 문서만 반환 (AND).
+        마지막 토큰과 `*` 로 끝나는 토큰은 접두어 검색.
+        결과: [(idea_id, score)] — score 내림차순, 동점이면 priority 순
+        """
+        raw = query.strip().lower()
+        if not raw:
+            return []
+
+        parts = raw.split()
+        terms = []
+        for j, part in enumerate(parts):
+            star = part.endswith("*")
+            toks = tokenize(part)
+            for k, tok in enumerate(toks):
+                is_last = (j == len(parts) - 1 and k == len(toks) - 1)
+                terms.append((tok, star or is_last))
+        if not terms:
+            return []
+
+        scores = None
+        for tok, prefix in terms:
+            term_scores = {}
+            for vi, factor in self._expand(tok, prefix):
+                idf = self._idf[vi]
+                for doc, w in self.postings[vi]:
+                    s = factor * idf * (1.0 + math.log(w))
+                    if s > term_scores.get(doc, 0.0):
+                        term_scores[doc] = s
+            if not term_scores:
+                return []
+            if scores is None:
+                scores = term_scores
+            else:
+                # 교집합 — 작은 쪽 기준으로 순회
+                small, big = (scores, term_scores) if len(scores) <= len(term_scores) else (term_scores, scores)
+                scores = {d: s + big[d] for d, s in small.items() if d in big}
+                if not scores:
+                    return []
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda x: (x[1], self.docs[x[0]]["priority"]),
+            reverse=True,
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self.docs[d]["idea_id"], round(s, 4)) for d, s in ranked]
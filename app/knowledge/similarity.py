@@ -0,0 +1,397 @@
+"""
+케이스 텍스트의 TF-IDF 유사도 색인 → novelty 점수.
+
+- 행렬에는 (1 + log tf) 만 저장하고 idf 는 질의 시점의 df 로 계산 → 새 케이스를 넣어도 전체 refit 없음
+- vocab 은 새 토큰이 나오면 열을 덧붙이는 방식 (기존 열 번호는 그대로)
+- 정규화된 TF-IDF 행렬은 lazy 로 유지: 추가된 문서가 적으면 새 행만 현재 idf 로 붙이고,
+  마지막 전체 갱신 이후 문서 수가 STALE_RATIO 이상 늘었을 때만 전체 재계산
+- 질의는 전치 행렬(색인이 바뀔 때만 다시 만듦)과 희소 곱 → 행마다 0 이 아닌 유사도만 보고 top-k
+- 저장은 append: 새로 추가된 행만 세그먼트 파일 하나로 쓰고, 세그먼트가 MAX_SEGMENTS 개가 되면 하나로 합침
+- novelty = 1 - (이전에 올라온 케이스 중 코사인 유사도 상위 k개의 평균)
+"""
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.knowledge.search_index import tokenize
+
+SIM_DIR = Path("data/knowledge")
+MATRIX_FILE = "similarity_tf.npz"             # META_VERSION 1 (세그먼트 이전) 의 단일 행렬
+SEGMENT_FILE = "similarity_tf.{:08d}.npz"     # 행 번호 start 부터의 세그먼트
+META_FILE = "similarity_meta.json"
+META_VERSION = 2
+MAX_SEGMENTS = 32
+
+NOVELTY_K = 5
+STALE_RATIO = 0.05        # idf/정규화 전체 재계산 기준 (문서 수 증가 비율)
+QUERY_CHUNK = 256         # 한 번에 곱하는 질의 행 수
+LINKED_TEXT_CHARS = 3000  # 링크 본문은 앞부분만 (제목/본문 신호가 묻히지 않게)
+
+# 유사도/클러스터 라벨에서 빼는 영어 기능어 (검색 색인은 그대로 — 구절 검색에 필요)
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his how
+i if in into is it its itself just me more most my no nor not now of off on once only or other our ours out over own
+same she should so some such than that the their theirs them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you your yours
+""".split())
+
+
+def case_text(hit: dict, linked_text: str = "") -> str:
+    title = hit.get("title") or ""
+    # 제목이 가장 정보가 많으므로 두 번 넣어 가중
+    return f"{title} {title} {hit.get('story_text') or ''} {linked_text[:LINKED_TEXT_CHARS]}"
+
+
+def _terms(text: str) -> Counter:
+    return Counter(t for t in tokenize(text) if len(t) > 1 and not t.isdigit() and t not in STOPWORDS)
+
+
+def _day(d) -> int:
+    if isinstance(d, int):
+        return d
+    if not d:
+        return date.today().toordinal()
+    try:
+        return datetime.strptime(str(d)[:10], "%Y-%m-%d").date().toordinal()
+    except ValueError:
+        return date.today().toordinal()
+
+
+class SimilarityIndex:
+    def __init__(self):
+        self.vocab = {}          # token -> 열 번호
+        self.df = []             # 열 번호 -> 문서 빈도
+        self.doc_ids = []
+        self.doc_days = []       # 게시일 (ordinal) — "이전 케이스" 필터용
+        self.doc_added = []      # 색인에 들어간 날 (ordinal) — 같은 날 재실행은 "지난 실행" 으로 보지 않음
+        self._pos = {}           # doc_id -> 행 번호
+        self._tf = sp.csr_matrix((0, 0), dtype=np.float32)
+        self._pending = []       # 아직 행렬에 합치지 않은 (cols, vals)
+
+        # lazy 캐시
+        self._weighted = None    # 행 정규화된 TF-IDF
+        self._idf = None
+        self._refreshed_at = 0   # 전체 재계산 당시 문서 수
+        self._weighted_T = None  # _weighted 의 전치 (CSR), _weighted 가 바뀌면 None
+
+        # 저장 상태: 어느 디렉터리에 몇 행까지 어떤 세그먼트로 썼는지
+        self._saved_root = None
+        self._segments = []      # [[파일 이름, 시작 행, 끝 행], ...]
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._pos
+
+    # -------------------------
+    # 추가
+    # -------------------------
+
+    def add(self, doc_id: str, text: str, day=None, added=None) -> bool:
+        """이미 있는 doc_id 면 무시 (False). added: 색인에 넣은 날 (기본 오늘)"""
+        if doc_id in self._pos:
+            return False
+        counts = _terms(text)
+        cols, vals = [], []
+        for tok, c in counts.items():
+            col = self.vocab.get(tok)
+            if col is None:
+                col = len(self.df)
+                self.vocab[tok] = col
+                self.df.append(0)
+            self.df[col] += 1
+            cols.append(col)
+            vals.append(1.0 + np.log(c))
+        self._pos[doc_id] = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.doc_days.append(_day(day))
+        self.doc_added.append(_day(added))
+        self._pending.append((cols, vals))
+        return True
+
+    def _flush(self):
+        n_old = self._tf.shape[0]
+        V = len(self.df)
+        if self._pending:
+            indptr, indices, data = [0], [], []
+            for cols, vals in self._pending:
+                indices.extend(cols)
+                data.extend(vals)
+                indptr.append(len(indices))
+            new = sp.csr_matrix(
+                (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), indptr),
+                shape=(len(self._pending), V),
+            )
+            old = self._tf
+            old.resize((n_old, V))
+            self._tf = sp.vstack([old, new], format="csr")
+            self._pending = []
+        elif self._tf.shape[1] != V:
+            self._tf.resize((n_old, V))
+
+    def _compute_idf(self) -> np.ndarray:
+        df = np.asarray(self.df, dtype=np.float64)
+        n = len(self.doc_ids)
+        return (np.log((1.0 + n) / (1.0 + df)) + 1.0).astype(np.float32)
+
+    @staticmethod
+    def _weight_rows(tf: sp.csr_matrix, idf: np.ndarray) -> sp.csr_matrix:
+        w = tf.multiply(idf[: tf.shape[1]]).tocsr()
+        norms = np.sqrt(np.asarray(w.multiply(w).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sp.diags(1.0 / norms).dot(w).tocsr().astype(np.float32)
+
+    def _sync(self):
+        self._flush()
+        n, V = len(self.doc_ids), len(self.df)
+        if self._weighted is not None and self._weighted.shape == (n, V):
+            return
+        self._weighted_T = None
+
+        n_done = 0 if self._weighted is None else self._weighted.shape[0]
+        stale = n - self._refreshed_at > STALE_RATIO * max(1, self._refreshed_at)
+        if self._weighted is None or stale:
+            self._idf = self._compute_idf()
+            self._weighted = self._weight_rows(self._tf, self._idf)
+            self._refreshed_at = n
+            return
+
+        # 새 행만 기존 idf 로 가중 (새 열은 현재 df 로 idf 를 채움)
+        if len(self._idf) < V:
+            self._idf = np.concatenate([self._idf, self._compute_idf()[len(self._idf):]])
+        self._weighted.resize((n_done, V))
+        new = self._weight_rows(self._tf[n_done:], self._idf)
+        self._weighted = sp.vstack([self._weighted, new], format="csr")
+
+    # -------------------------
+    # 조회
+    # -------------------------
+
+    def _query_matrix(self, texts: list[str]) -> sp.csr_matrix:
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            for tok, c in _terms(text).items():
+                col = self.vocab.get(tok)
+                if col is not None:  # 색인에 없는 토큰은 어떤 문서와도 겹치지 않음
+                    indices.append(col)
+                    data.append(1.0 + np.log(c))
+            indptr.append(len(indices))
+        q = sp.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), indptr),
+            shape=(len(texts), len(self.df)),
+        )
+        return self._weight_rows(q, self._idf)
+
+    def _transposed(self) -> sp.csr_matrix:
+        if self._weighted_T is None:
+            self._weighted_T = self._weighted.T.tocsr()
+        return self._weighted_T
+
+    def top_k_many(self, texts: list[str], k: int = NOVELTY_K, exclude: list | None = None,
+                   max_days: list | None = None) -> list[list[tuple[str, float]]]:
+        """
+        질의마다 코사인 유사도 상위 k개 [(doc_id, sim)].
+        exclude[i]  : 결과에서 뺄 doc_id (자기 자신)
+        max_days[i] : 이 날짜(ordinal) 이후에 올라온 문서는 제외
+        겹치는 토큰이 있는 문서가 k개보다 적으면 남은 자리는 유사도 0 인 (조건에 맞는) 문서로 채움
+        """
+        self._sync()
+        out = []
+        if not len(self.doc_ids) or not texts:
+            return [[] for _ in texts]
+        days = np.asarray(self.doc_days)
+        W_T = self._transposed()
+        for start in range(0, len(texts), QUERY_CHUNK):
+            chunk = texts[start:start + QUERY_CHUNK]
+            sims = (self._query_matrix(chunk) @ W_T).tocsr()
+            for j in range(len(chunk)):
+                i = start + j
+                lo, hi = sims.indptr[j], sims.indptr[j + 1]
+                cols, vals = sims.indices[lo:hi], sims.data[lo:hi]
+                keep = np.ones(len(cols), dtype=bool)
+                limit = max_days[i] if max_days is not None else None
+                if limit is not None:
+                    keep &= days[cols] <= limit
+                skip = self._pos.get(exclude[i]) if exclude is not None else None
+                if skip is not None:
+                    keep &= cols != skip
+                cols, vals = cols[keep], vals[keep]
+                if len(cols) > k:
+                    idx = np.argpartition(-vals, k - 1)[:k]
+                    cols, vals = cols[idx], vals[idx]
+                order = np.argsort(-vals, kind="stable")
+                row = [(self.doc_ids[d], float(v)) for d, v in zip(cols[order], vals[order])]
+                if len(row) < k:
+                    row += self._zero_fill(k - len(row), set(cols.tolist()), skip, limit)
+                out.append(row)
+        return out
+
+    def _zero_fill(self, need: int, taken: set, skip, limit) -> list[tuple[str, float]]:
+        out = []
+        for d, day in enumerate(self.doc_days):
+            if len(out) >= need:
+                break
+            if d in taken or d == skip or (limit is not None and day > limit):
+                continue
+            out.append((self.doc_ids[d], 0.0))
+        return out
+
+    def top_k(self, text: str, k: int = NOVELTY_K) -> list[tuple[str, float]]:
+        return self.top_k_many([text], k)[0]
+
+    def term_vectors(self, doc_ids: list[str]) -> list[dict]:
+        """문서별 정규화된 TF-IDF 벡터 {token: weight} (색인에 없는 문서는 빈 dict)"""
+        self._sync()
+        tokens = sorted(self.vocab, key=self.vocab.get)
+        out = []
+        for d in doc_ids:
+            i = self._pos.get(d)
+            if i is None:
+                out.append({})
+                continue
+            row = self._weighted.getrow(i)
+            out.append({tokens[c]: float(w) for c, w in zip(row.indices, row.data)})
+        return out
+
+    # -------------------------
+    # 저장
+    # -------------------------
+
+    def save(self, root: Path = SIM_DIR):
+        """새로 추가된 행만 세그먼트로 추가 (다른 디렉터리거나 세그먼트가 많으면 전체를 하나로 다시 씀)"""
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        self._flush()
+        n = self._tf.shape[0]
+        saved = self._segments[-1][2] if self._segments else 0
+        rewrite = self._saved_root != root.resolve() or len(self._segments) >= MAX_SEGMENTS or saved > n
+        if rewrite:
+            self._segments, saved = [], 0
+        if n > saved or not self._segments:
+            name = SEGMENT_FILE.format(saved)
+            tmp_m = root / f"{name}.tmp.npz"
+            sp.save_npz(tmp_m, self._tf[saved:n])
+            os.replace(tmp_m, root / name)
+            self._segments.append([name, saved, n])
+        meta = {
+            "version": META_VERSION,
+            "vocab": sorted(self.vocab, key=self.vocab.get),
+            "df": self.df,
+            "doc_ids": self.doc_ids,
+            "doc_days": self.doc_days,
+            "doc_added": self.doc_added,
+            "segments": self._segments,
+        }
+        tmp = root / f"{META_FILE}.tmp"
+        tmp.write_text(json.dumps(meta, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, root / META_FILE)
+        self._saved_root = root.resolve()
+        if rewrite:
+            # 합치기 전 세그먼트 / 이전 형식 파일은 meta 가 바뀐 뒤에 지움
+            live = {f for f, _, _ in self._segments}
+            for p in [*root.glob("similarity_tf.*.npz"), root / MATRIX_FILE]:
+                if p.name not in live:
+                    p.unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, root: Path = SIM_DIR) -> "SimilarityIndex":
+        root = Path(root)
+        idx = cls()
+        meta_path = root / META_FILE
+        if not meta_path.exists():
+            return idx
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("version") == 1 and (root / MATRIX_FILE).exists():
+            segments, parts = [], [sp.load_npz(root / MATRIX_FILE).tocsr()]   # 다음 save 에서 세그먼트로 옮김
+        elif meta.get("version") == META_VERSION:
+            segments = meta.get("segments") or []
+            parts = [sp.load_npz(root / f).tocsr() for f, _, _ in segments]
+        else:
+            return idx
+        idx.vocab = {tok: i for i, tok in enumerate(meta["vocab"])}
+        idx.df = meta["df"]
+        idx.doc_ids = meta["doc_ids"]
+        idx.doc_days = meta["doc_days"]
+        idx.doc_added = meta.get("doc_added") or [0] * len(idx.doc_ids)   # 기록 전 문서는 오래전에 본 것으로
+        idx._pos = {d: i for i, d in enumerate(idx.doc_ids)}
+        V = len(idx.df)
+        for m in parts:
+            m.resize((m.shape[0], V))   # 앞선 세그먼트는 그때의 vocab 크기
+        tf = sp.vstack(parts, format="csr") if parts else sp.csr_matrix((0, V))
+        idx._tf = tf.astype(np.float32)
+        idx._segments = segments
+        idx._saved_root = root.resolve() if segments else None
+        return idx
+
+
+def known_doc_ids(root: Path = SIM_DIR, before=None) -> set:
+    """
+    before(기본 오늘) 전에 색인에 들어간 objectID (지난 날의 실행들에서 본 케이스) — 행렬은 읽지 않고 meta 만.
+    오늘 처음 들어간 것은 빼므로 같은 날 재실행해도 그 케이스들이 "이미 본 것" 이 되지 않음
+    """
+    meta_path = Path(root) / META_FILE
+    if not meta_path.exists():
+        return set()
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    if meta.get("version") not in (1, META_VERSION):
+        return set()
+    ids = meta.get("doc_ids") or []
+    added = meta.get("doc_added") or [0] * len(ids)
+    cutoff = _day(before)
+    return {d for d, a in zip(ids, added) if a < cutoff}
+
+
+# 프로세스 안에서 마지막으로 저장한 색인 (daemon 모드: 매 실행 npz 재로드/정규화 생략)
+_CACHED: dict = {}
+
+
+def _meta_mtime(root: Path):
+    p = Path(root) / META_FILE
+    return p.stat().st_mtime if p.exists() else None
+
+
+def load_index(root: Path) -> SimilarityIndex:
+    key = str(Path(root).resolve())
+    hit = _CACHED.get(key)
+    if hit is not None and hit[0] == _meta_mtime(root):
+        return hit[1]
+    return SimilarityIndex.load(root)
+
+
+def _remember(root: Path, index: SimilarityIndex):
+    _CACHED[str(Path(root).resolve())] = (_meta_mtime(root), index)
+
+
+def score_novelty(hits, linked: dict | None = None, root: Path = SIM_DIR, k: int = NOVELTY_K) -> dict:
+    """
+    objectID -> novelty (0~1).
+    새 케이스를 색인에 추가한 뒤, 각 케이스를 자기보다 먼저(같은 날 포함) 올라온 케이스들과 비교.
+    비교 대상이 없으면 1.0. 게시일로 거르므로 같은 날 재실행해도 결과가 같다.
+    """
+    linked = linked or {}
+    index = load_index(root)
+    texts, ids, days = [], [], []
+    for hit in hits:
+        oid = hit["objectID"]
+        text = case_text(hit, linked.get(oid, ""))
+        day = _day(hit.get("created_at"))
+        index.add(oid, text, day)
+        texts.append(text)
+        ids.append(oid)
+        days.append(day)
+    index.save(root)
+    _remember(root, index)
+
+    novelty = {}
+    for oid, nn in zip(ids, index.top_k_many(texts, k, exclude=ids, max_days=days)):
+        novelty[oid] = round(1.0 - float(np.mean([s for _, s in nn])), 4) if nn else 1.0
+    return novelty
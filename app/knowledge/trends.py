@@ -0,0 +1,156 @@
+"""
+기능/리스크/패턴별 추세 상태 (IdeaCard.trend 용).
+
+키: "feature:<name>", "risk:<name>", "pattern:<name>" → 하루 언급 수의
+  - EWMA fast/slow (3일/14일 span), 전일 대비 delta, 최근 SPARK_LEN 일 sparkline
+새 daily 스냅샷은 이전 상태에서 키마다 O(1) 로 갱신 — 과거 CSV 를 다시 읽지 않는다.
+같은 날 재실행하면 전날 상태(base)에서 다시 계산해 오늘 값을 교체한다.
+"""
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+
+TRENDS_PATH = Path("data/knowledge/trends.json")
+STATE_VERSION = 1
+
+FAST_SPAN = 3
+SLOW_SPAN = 14
+SPARK_LEN = 14
+
+
+def _alpha(span: int) -> float:
+    return 2.0 / (span + 1)
+
+
+def _split(s) -> list[str]:
+    if not s or s == "-":
+        return []
+    if isinstance(s, list):
+        return s
+    return [x.strip() for x in str(s).split(",") if x.strip()]
+
+
+def case_counts(cases) -> Counter:
+    """케이스 리스트 → 키별 오늘 언급 수"""
+    counts = Counter()
+    for c in cases:
+        counts[f"pattern:{c['pattern']}"] += 1
+        counts.update(f"feature:{f}" for f in _split(c.get("core_ai_features")))
+        counts.update(f"risk:{r}" for r in _split(c.get("risks")))
+    return counts
+
+
+def momentum_of(rec: dict) -> float:
+    """fast / (fast + slow): 0.5 = 평소 수준, 1 에 가까울수록 최근 급증"""
+    fast, slow = rec["fast"], rec["slow"]
+    if fast + slow <= 0:
+        return 0.5
+    return round(fast / (fast + slow), 4)
+
+
+def _step(rec: dict | None, value: float, gap: int) -> dict:
+    a_f, a_s = _alpha(FAST_SPAN), _alpha(SLOW_SPAN)
+    if rec is None:
+        # 처음 보는 키: 과거는 0 이었던 것으로 본다
+        rec = {"fast": 0.0, "slow": 0.0, "value": 0.0, "spark": []}
+    fast, slow = rec["fast"], rec["slow"]
+    spark = list(rec["spark"])
+
+    # 빈 날(gap-1 일)은 값 0 으로 감쇠
+    missing = max(0, gap - 1)
+    if missing:
+        fast *= (1 - a_f) ** missing
+        slow *= (1 - a_s) ** missing
+        spark.extend([0.0] * min(missing, SPARK_LEN))
+    prev = 0.0 if missing else rec["value"]
+
+    fast += a_f * (value - fast)
+    slow += a_s * (value - slow)
+    spark.append(value)
+    out = {
+        "fast": round(fast, 5),
+        "slow": round(slow, 5),
+        "value": value,
+        "delta": value - prev,
+        "spark": spark[-SPARK_LEN:],
+    }
+    out["momentum"] = momentum_of(out)
+    return out
+
+
+def _empty_state() -> dict:
+    return {"version": STATE_VERSION, "date": None, "base_date": None, "base": {}, "series": {}}
+
+
+def load_state(path: Path = TRENDS_PATH) -> dict:
+    path = Path(path)
+    if not path.exists():
+        return _empty_state()
+    st = json.loads(path.read_text(encoding="utf-8"))
+    if st.get("version") != STATE_VERSION:
+        return _empty_state()
+    return st
+
+
+def save_state(st: dict, path: Path = TRENDS_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(st, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _ordinal(d: str | None) -> int | None:
+    return datetime.strptime(d, "%Y-%m-%d").date().toordinal() if d else None
+
+
+def update_trends(counts: dict, today: str, path: Path = TRENDS_PATH) -> dict:
+    """
+    오늘 스냅샷(키 → 언급 수)을 반영하고 series 를 반환.
+    오늘 이전 날짜가 들어오면(backfill) 상태를 건드리지 않는다.
+    """
+    st = load_state(path)
+    if st["date"] and today < st["date"]:
+        return st["series"]
+
+    if st["date"] == today:
+        prev, prev_date = st["base"], st["base_date"]   # 같은 날 재실행: 오늘 값 교체
+    else:
+        prev, prev_date = st["series"], st["date"]
+
+    today_ord = date.fromisoformat(today).toordinal()
+    prev_ord = _ordinal(prev_date)
+    gap = today_ord - prev_ord if prev_ord is not None else 1
+
+    series = {}
+    for key in set(prev) | set(counts):
+        value = float(counts.get(key, 0))
+        rec = prev.get(key)
+        if prev_date is None:
+            # 첫 스냅샷: 오늘 값을 평소 수준으로 시작 (모든 키가 급증으로 보이지 않게)
+            rec = {"fast": value, "slow": value, "value": value, "spark": []}
+        series[key] = _step(rec, value, gap)
+
+    st.update({"date": today, "base_date": prev_date, "base": prev, "series": series})
+    save_state(st, path)
+    return series
+
+
+def card_trend(series: dict, pattern: str | None, features: list[str], risks: list[str]) -> dict:
+    """
+    카드 한 장에 붙일 trend: 관련 키들의 기록 + 평균 momentum.
+    (sparkline 은 IdeaCard.trend 에 그대로 실어서 대시보드가 다시 계산하지 않게)
+    """
+    keys = ([f"pattern:{pattern}"] if pattern else []) + \
+        [f"feature:{f}" for f in features] + [f"risk:{r}" for r in risks]
+    items = {k: series[k] for k in keys if k in series}
+    if not items:
+        return {}
+    return {
+        "momentum": round(sum(v["momentum"] for v in items.values()) / len(items), 4),
+        "series": items,
+    }
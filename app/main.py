@@ -1,18 +1,26 @@
 from __future__ import annotations
-import json
+import argparse
 from pathlib import Path
 import csv
-from pathlib import Path
-
+from datetime import datetime
 
-from app.presentation.idea_card import IdeaCard, EvidenceItem
-from app.presentation.export import export_cards_json
+# 무거운 의존성(pydantic/pandas/networkx/matplotlib/numpy)은 쓰는 함수 안에서 import
+# → --help, --list, fetch 만 하는 실행은 가볍게 시작 (benchmarks.startup_guard 로 감시)
+from app.presentation.export import export_cards_json, publish_manifest
 from app.scoring.priority import compute_raw_priority, apply_priority_normalization
-from app.ingestion.hn_fetch import main as hn_fetch_main
-from app.presentation.plot_daily import main as plot_daily_main
-from app.presentation.plot_graph import main as plot_graph_main
+from app.knowledge.search_index import write_index
+from app.common.pipeline import Pipeline, Stage
+from app.common.metrics import METRICS
+from app.common.runlock import RunLock, RunLockBusy
+from app.common import profiling
 
 REPORT_PATH = Path("data/reports/idea_cards.json")
+SEARCH_INDEX_PATH = REPORT_PATH.parent / "search_index.json"
+CLUSTER_SUMMARY_PATH = REPORT_PATH.parent / "cluster_summary.json"
+SCORE_MATRIX_PATH = REPORT_PATH.parent / "score_matrix.npz"
+MANIFEST_PATH = REPORT_PATH.parent / "manifest.json"
+GRAPH_EXPORT_PATH = REPORT_PATH.parent / "graph.json"
+CARD_STORE_PATH = REPORT_PATH.parent / "card_store.sqlite"
 
 def ensure_list(x):
     if x is None:
@@ -20,6 +28,9 @@ def ensure_list(x):
     if isinstance(x, list):
         return x
     if isinstance(x, str):
+        # CSV의 빈 값 표기
+        if x.strip() in ("", "-"):
+            return []
         # "a,b,c" 형태도 안전 처리
         if "," in x:
             return [s.strip() for s in x.split(",") if s.strip()]
@@ -31,6 +42,8 @@ def load_hn_results():
     hn_fetch.py를 실행하고,
     결과가 return되지 않으면 저장된 CSV에서 다시 로드한다.
     """
+    from app.ingestion.hn_fetch import main as hn_fetch_main
+
     result = hn_fetch_main()
 
     # 1) hn_fetch_main이 리스트를 반환하면 그걸 사용
@@ -56,6 +69,8 @@ def load_hn_results():
 
 
 def to_cards(raw_results):
+    from app.presentation.idea_card import IdeaCard, EvidenceItem
+
     cards = []
     for i, r in enumerate(raw_results):
         # r이 dict라고 가정 (대부분 이렇게 되어있음)
@@ -72,6 +87,10 @@ def to_cards(raw_results):
 
         evidence = min(1.0, mentions / 10.0)
         momentum = min(1.0, (points + comments) / 200.0)
+        # 기능/리스크/패턴 추세(EWMA fast vs slow)가 있으면 하루치 반응과 반반 섞음
+        trend = r.get("trend") or {}
+        if "momentum" in trend:
+            momentum = 0.5 * momentum + 0.5 * float(trend["momentum"])
         novelty = float(r.get("novelty", 0.5))
 
         raw_priority = compute_raw_priority(
@@ -106,10 +125,11 @@ def to_cards(raw_results):
                     ))
 
         card = IdeaCard(
-            idea_id=str(r.get("id") or r.get("idea_id") or f"idea_{i}"),
+            # HN 케이스는 objectID → 실행이 바뀌어도 같은 카드 (card_store upsert 키)
+            idea_id=str(r.get("id") or r.get("idea_id") or r.get("object_id") or f"idea_{i}"),
             title=title,
             summary=summary,
-            tags=r.get("keywords", r.get("tags", [])) or [],
+            tags=r.get("keywords", r.get("tags", [])) or ensure_list(r.get("core_ai_features")),
             cluster_id=r.get("cluster_id"),
             scores={
                 "feasibility": feasibility,
@@ -123,11 +143,12 @@ def to_cards(raw_results):
             drivers=drivers,               
             risks=ensure_list(r.get("risks")),
             evidence=evidence_items,
-            trend=r.get("trend", {}),
+            trend=trend,
             meta={
                 "mentions": mentions,
                 "points": points,
                 "comments": comments,
+                "date": r.get("date"),
             }
         )
         cards.append(card)
@@ -136,17 +157,367 @@ def to_cards(raw_results):
     return cards
 
 
-def main():
-    raw = load_hn_results()
-    cards = to_cards(raw)
+def finalize_priorities(cards):
     raw_ps = [c.scores.priority for c in cards]  # 현재는 raw_priority가 들어있음
     norm_ps = apply_priority_normalization(raw_ps)
-    
+
     for c, p in zip(cards, norm_ps):
         c.scores.priority = p  # 최종 priority로 덮어쓰기
+    return cards
+
+
+def export_cards(cards):
     out = export_cards_json(cards, str(REPORT_PATH))
     print(f"[OK] Exported {len(cards)} cards -> {out}")
 
+    # 대시보드 검색용 역색인 (카드 export와 같은 폴더)
+    dumped = [c.model_dump() for c in cards]
+    idx = write_index(dumped, SEARCH_INDEX_PATH)
+    print(f"[OK] Search index -> {idx}")
+
+    # 클러스터 단위 집계/랭킹 (numpy/scipy 를 쓰므로 여기서 import)
+    from app.knowledge.clustering import write_cluster_summary
+    summary = write_cluster_summary(dumped, CLUSTER_SUMMARY_PATH)
+    print(f"[OK] Cluster summary -> {summary}")
+
+    # what-if 재채점용 입력 점수 행렬 (python -m app.scoring.rescore)
+    from app.scoring.rescore import write_score_matrix
+    matrix = write_score_matrix(dumped, SCORE_MATRIX_PATH)
+    print(f"[OK] Score matrix -> {matrix}")
+
+    # 조건 조회용 SQLite (태그/리스크/priority/기간 인덱스), 실행마다 트랜잭션 하나로 upsert
+    from app.knowledge.card_store import upsert_cards
+    store = upsert_cards(dumped, CARD_STORE_PATH)
+    print(f"[OK] Card store -> {store}")
+    return [out, idx, summary, matrix, store]
+
+
+# -------------------------
+# Pipeline stages
+#   fetch → linked → tag → {edges → graph → graph_export → render, metrics, brief, cards → export}
+#   fetch, linked → novelty → clusters → cards,  tag → trends → cards,  fetch, linked → cards (evidence)
+#   스테이지 간 데이터는 메모리로 전달, CSV/리포트는 부수 산출물로만 기록
+#   무거운 모듈(pandas/networkx/matplotlib)은 해당 스테이지 안에서만 import
+# -------------------------
+
+def _today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def stage_fetch():
+    from app.ingestion import checkpoint, hn_fetch
+
+    # 중간에 죽어도 같은 날 재실행은 저널(data/checkpoints/<date>.jsonl)에서 이어서 수집
+    with checkpoint.open_journal(_today(), hn_fetch.run_params()) as journal, hn_fetch.make_scheduler() as sched:
+        # 검색어별 예산은 지난 실행들의 수확률로 배분 (tag 스테이지가 기록)
+        plan, stats = hn_fetch.plan_queries(), {}
+        hits = hn_fetch.search_hits(plan["queries"], hits_per_query=plan["limits"], scheduler=sched,
+                                    journal=journal, stats=stats)
+        threads = hn_fetch.fetch_threads(hits, scheduler=sched, journal=journal)
+    return {
+        "hits": hits,
+        "threads": threads,
+        "query_plan": plan,
+        "query_stats": stats,
+        "run_id": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def stage_linked(fetch):
+    from app.ingestion import hn_fetch, linked_content
+
+    if not hn_fetch.LINKED_CONTENT_ENABLED:
+        return {}
+    return linked_content.fetch_linked(fetch["hits"])
+
+
+def stage_tag(fetch, linked):
+    from app.ingestion import checkpoint, hn_fetch
+    from app.knowledge.hit_index import write_hit_index
+
+    # 태깅하면서 라벨 매치 위치를 모아 둠 → cards 스테이지가 evidence 스니펫을 바로 자름
+    index = {}
+    # 저널은 fetch 스테이지가 이미 열었던 것 (resuming 메시지는 거기서 한 번만)
+    with checkpoint.open_journal(_today(), hn_fetch.run_params(), quiet=True) as journal:
+        cases = hn_fetch.tag_cases(fetch["hits"], fetch["threads"], linked, journal=journal, index=index)
+    write_hit_index(index)
+    if "query_stats" in fetch:
+        hn_fetch.record_query_yield(fetch["query_plan"], fetch["query_stats"], cases, fetch["run_id"])
+    hn_fetch.print_cases(cases)
+    out = hn_fetch.write_cases_csv(cases)
+    print(f"\nSaved: {out}")
+    return cases
+
+
+def stage_edges(tag):
+    from app.ingestion import hn_fetch
+
+    rows = hn_fetch.edge_rows(hn_fetch.build_edge_counter(tag), _today())
+    out = hn_fetch.write_edges_csv(rows)
+    print(f"Saved: {out}")
+    return rows
+
+
+def stage_metrics(tag):
+    from app.ingestion import hn_fetch
+
+    row = hn_fetch.compute_daily_row(tag, _today())
+    out = hn_fetch.append_daily_row(row)
+    print(f"Saved: {out}")
+    return row
+
+
+def stage_brief(tag):
+    from app.ingestion import hn_fetch
+
+    return hn_fetch.generate_mvp_report(tag)
+
+
+def stage_graph(edges):
+    from app.presentation import graph_delta, plot_graph
+
+    G = plot_graph.build_graph((r["from"], r["to"]) for r in edges)
+    # 이전 스냅샷과 비교해 바뀐 엣지에 닿는 부분만 다시 계산 (data/knowledge/graph_state.json)
+    ins = graph_delta.update_insights(G, _today())
+    plot_graph.write_insights_report(ins, _today())
+    return {"graph": G, "insights": ins}
+
+
+def stage_graph_export(graph, edges):
+    # 좌표 + 노드 지표를 한 번 계산해 파일로 → API/dashboard 는 ego subgraph 만 읽어 그림
+    from app.presentation import graph_export
+
+    export, out = graph_export.export_graph(graph["graph"], graph["insights"], edges, _today(),
+                                           GRAPH_EXPORT_PATH)
+    for path in out:
+        print(f"[OK] Graph export -> {path}")
+    return export
+
+
+def stage_render(graph, graph_export):
+    import matplotlib.pyplot as plt
+    from app.presentation import plot_graph
+    from app.presentation.graph_export import positions
+
+    plt.switch_backend("Agg")  # 워커 스레드에서 그리므로 GUI 백엔드 사용 안 함
+    # 레이아웃은 graph_export 가 계산한 좌표를 그대로 사용
+    return list(plot_graph.render_graph(graph["graph"], graph["insights"], _today(), show=False,
+                                        pos=positions(graph_export)))
+
+
+def stage_novelty(fetch, linked):
+    from app.knowledge import similarity
+
+    return similarity.score_novelty(fetch["hits"], linked)
+
+
+def stage_clusters(fetch, novelty):
+    # novelty 스테이지가 similarity 색인에 오늘 케이스를 넣은 뒤에 실행되어야 함
+    from app.knowledge import clustering
+
+    return clustering.assign_clusters(fetch["hits"])
+
+
+def stage_trends(tag):
+    from app.knowledge import trends
+
+    return trends.update_trends(trends.case_counts(tag), _today())
+
+
+def evidence_articles(cases, fetch, linked) -> dict:
+    """objectID -> EvidenceItem 모양 dict 리스트 (태깅 때 남긴 매치 위치 주변을 저장된 본문/댓글에서 잘라냄)"""
+    from app.ingestion.comment_tagging import parse_signals
+    from app.ingestion.hn_fetch import header_text
+    from app.knowledge import hit_index
+
+    index = hit_index.load_hit_index()
+    hits = {h["objectID"]: h for h in fetch["hits"]}
+    out = {}
+    for c in cases:
+        oid = c["object_id"]
+        entry = index.get(oid)
+        if not entry or oid not in hits:
+            continue
+        header = header_text(hits[oid], (linked or {}).get(oid, ""))
+        out[oid] = hit_index.evidence(c, entry, header, fetch["threads"].get(oid, []),
+                                      parse_signals(c.get("signals")), source=hits[oid].get("source"))
+    return out
+
+
+def stage_cards(tag, novelty, clusters, trends, fetch, linked):
+    # novelty: objectID -> 이전 케이스 대비 거리 (similarity 색인), clusters: objectID -> cluster_id
+    # trends: "feature:<x>" 등 키별 EWMA/sparkline 상태
+    from app.knowledge.trends import card_trend
+
+    evidence = evidence_articles(tag, fetch, linked)
+
+    rows = [
+        {
+            **c,
+            "novelty": novelty.get(c["object_id"], 0.5),
+            "cluster_id": clusters.get(c["object_id"]),
+            "trend": card_trend(trends, c["pattern"], ensure_list(c["core_ai_features"]), ensure_list(c["risks"])),
+            "evidence_articles": evidence.get(c["object_id"], []),
+        }
+        for c in tag
+    ]
+    return finalize_priorities(to_cards(rows))
+
+
+def stage_export(cards):
+    return export_cards(cards)
+
+
+def build_pipeline(memo: dict | None = None) -> Pipeline:
+    from app.ingestion import hn_fetch
+    from app.knowledge.hit_index import HIT_INDEX_PATH
+
+    today = _today()
+    daily = {"date": today}
+    return Pipeline([
+        Stage("fetch", stage_fetch, group="fetch", params={
+            **daily,
+            "queries": hn_fetch.QUERIES,
+            "max_results": hn_fetch.MAX_RESULTS,
+            "hits_per_query": hn_fetch.HITS_PER_QUERY,
+            "dedupe": hn_fetch.DEDUPE_ENABLED,
+            "sources": hn_fetch.SOURCES,
+            "planner": hn_fetch.QUERY_PLANNER_ENABLED,
+            "feeds": hn_fetch.RSS_FEEDS,
+        }, code=("app.ingestion.dedupe", "app.ingestion.sources", "app.ingestion.query_planner")),
+        # 본문은 url 단위로 디스크 캐시되므로 fetch 결과가 바뀐 날만 새 url 을 가져온다
+        Stage("linked", stage_linked, inputs=("fetch",), group="fetch", params={
+            "enabled": hn_fetch.LINKED_CONTENT_ENABLED,
+        }, code=("app.ingestion.linked_content",)),
+        Stage("tag", stage_tag, inputs=("fetch", "linked"), group="tag", params={
+            "mode": hn_fetch.TAG_MODE,
+        }, code=("app.ingestion.hn_fetch", "app.ingestion.comment_tagging", "app.knowledge.hit_index"),
+              files=(hn_fetch.CASES_PATH, str(HIT_INDEX_PATH))),
+        Stage("edges", stage_edges, inputs=("tag",), params=daily, group="aggregate",
+              files=(hn_fetch.EDGES_PATH,)),
+        Stage("metrics", stage_metrics, inputs=("tag",), params=daily, group="aggregate",
+              files=(hn_fetch.DAILY_PATH,)),
+        Stage("brief", stage_brief, inputs=("tag",), params=daily, group="export",
+              files=(f"reports/{today}_mvp_brief.txt",)),
+        Stage("graph", stage_graph, inputs=("edges",), params=daily, group="graph",
+              code=("app.presentation.plot_graph", "app.presentation.graph_delta"),
+              files=(f"reports/{today}_graph_insights.md",)),
+        Stage("graph_export", stage_graph_export, inputs=("graph", "edges"), params=daily, group="graph",
+              code=("app.presentation.graph_export",),
+              files=(str(GRAPH_EXPORT_PATH), str(GRAPH_EXPORT_PATH.parent / "graph_nodes.arrow"),
+                     str(GRAPH_EXPORT_PATH.parent / "graph_edges.arrow"))),
+        Stage("render", stage_render, inputs=("graph", "graph_export"), params=daily, group="graph",
+              files=(f"snapshots/reference_graph_{today}.png",)),
+        Stage("novelty", stage_novelty, inputs=("fetch", "linked"), group="score",
+              code=("app.knowledge.similarity",)),
+        Stage("clusters", stage_clusters, inputs=("fetch", "novelty"), group="score",
+              code=("app.knowledge.clustering",)),
+        Stage("trends", stage_trends, inputs=("tag",), params=daily, group="aggregate",
+              code=("app.knowledge.trends",)),
+        Stage("cards", stage_cards, inputs=("tag", "novelty", "clusters", "trends", "fetch", "linked"),
+              group="score", code=("app.main", "app.scoring.priority", "app.presentation.idea_card",
+                                   "app.knowledge.hit_index")),
+        Stage("export", stage_export, inputs=("cards",), group="export",
+              code=("app.presentation.export", "app.knowledge.search_index", "app.knowledge.clustering",
+                    "app.scoring.rescore", "app.knowledge.card_store"),
+              files=(str(REPORT_PATH), str(SEARCH_INDEX_PATH), str(CLUSTER_SUMMARY_PATH),
+                     str(SCORE_MATRIX_PATH), str(CARD_STORE_PATH))),
+    ], memo=memo)
+
+
+def _stage_list(s: str | None) -> list[str]:
+    return [x.strip() for x in (s or "").split(",") if x.strip()]
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m app.main",
+        description="HN 수집 → 태깅 → 그래프/지표 → 카드 export 파이프라인",
+    )
+    ap.add_argument("--only", help="실행할 스테이지 (쉼표 구분). 상류 스테이지는 캐시를 그대로 재사용")
+    ap.add_argument("--force", help="fingerprint와 무관하게 다시 돌릴 스테이지 (쉼표 구분)")
+    ap.add_argument("--refresh", action="store_true", help="같은 날이라도 fetch를 다시 수행")
+    ap.add_argument("--serial", action="store_true", help="스테이지를 병렬 없이 순서대로 실행")
+    ap.add_argument("--list", action="store_true", help="스테이지 목록만 출력")
+    ap.add_argument("--profile", nargs="?", const="cpu,mem", metavar="MODES",
+                    help=f"스테이지별 cProfile/tracemalloc 기록 (cpu,mem). 환경변수 {profiling.PROFILE_ENV} 와 동일")
+    return ap.parse_args(argv)
+
+
+def publish() -> str:
+    # 읽기 전용 API(app.ui.api)가 manifest generation 이 바뀌면 스냅샷을 다시 로드
+    from app.ingestion import hn_fetch
+
+    return publish_manifest({
+        "cards": REPORT_PATH,
+        "search_index": SEARCH_INDEX_PATH,
+        "cluster_summary": CLUSTER_SUMMARY_PATH,
+        "score_matrix": SCORE_MATRIX_PATH,
+        "card_store": CARD_STORE_PATH,
+        "graph": GRAPH_EXPORT_PATH,
+        "edges": hn_fetch.EDGES_PATH,
+        "daily": hn_fetch.DAILY_PATH,
+    }, str(MANIFEST_PATH))
+
+
+def run(pipeline: Pipeline, only=(), force=(), serial: bool = False) -> dict:
+    """
+    잠금 → 파이프라인 실행 → manifest publish → 지표 기록.
+    CLI 와 daemon(app.daemon) 이 같이 쓴다. 다른 실행이 잡고 있으면 RunLockBusy.
+    """
+    with RunLock():
+        METRICS.reset()
+        try:
+            outputs = pipeline.run(
+                targets=list(only) or None,
+                force=force,
+                pinned_upstream=bool(only),
+                serial=serial,
+            )
+            out = publish()
+            print(f"[OK] Manifest -> {out}")
+            # 산출물이 모두 publish 된 뒤에만 수집 저널 완료 (다음 실행은 새로 수집)
+            from app.ingestion import checkpoint
+
+            done = checkpoint.complete(_today())
+            if done:
+                print(f"[checkpoint] completed -> {done}")
+            return outputs
+        finally:
+            # 실패한 실행도 어디서 시간이 갔는지 남김
+            for path in METRICS.write():
+                print(f"[metrics] saved -> {path}")
+            METRICS.print_summary()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pipeline = build_pipeline()
+
+    if args.list:
+        for name in pipeline.stages:
+            st = pipeline.stages[name]
+            deps = ", ".join(st.inputs) or "-"
+            print(f"{name:<12} <- {deps}")
+        return
+
+    if args.profile:
+        profiling.enable(args.profile)
+
+    only = _stage_list(args.only)
+    force = _stage_list(args.force)
+    if args.refresh:
+        force.append("fetch")
+        from app.ingestion import checkpoint
+
+        checkpoint.discard(_today())
+
+    try:
+        run(pipeline, only=only, force=force, serial=args.serial)
+    except RunLockBusy as e:
+        print(f"[main] {e}")
+        return 1
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
@@ -1,12 +1,42 @@
 from __future__ import annotations
+import hashlib
 import json
+import os
+from datetime import datetime
 from pathlib import Path
-from typing import List
-from .idea_card import IdeaCard
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:  # pydantic 은 카드를 만드는 쪽에서만 로드
+    from .idea_card import IdeaCard
+
 
 def export_cards_json(cards: List[IdeaCard], out_path: str) -> str:
     path = Path(out_path)
     path.parent.mkdir(parents=True, exist_ok=True)
     payload = [c.model_dump() for c in cards]
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    return str(path)
\ No newline at end of file
+    return str(path)
+def publish_manifest(files: dict, out_path: str) -> str:
+    """
+    파이프라인 산출물 목록 + 버전(generation)을 마지막에 기록.
+    API 등 읽는 쪽은 이 파일만 보고 새 스냅샷이 나왔는지 판단한다.
+    """
+    entries = {}
+    for name, p in files.items():
+        fp = Path(p)
+        if fp.exists():
+            st = fp.stat()
+            entries[name] = {"path": str(fp), "size": st.st_size, "mtime": st.st_mtime}
+    generation = hashlib.sha1(json.dumps(entries, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    payload = {
+        "generation": generation,
+        "published_at": datetime.now().isoformat(timespec="seconds"),
+        "files": entries,
+    }
+    path = Path(out_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 rename 으로 교체
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    return str(path)
@@ -0,0 +1,252 @@
+"""
+그래프 증분 분석: 이전 엣지 스냅샷과 비교해 바뀐 엣지의 영향을 받는 부분만 다시 계산.
+
+- 상태(data/knowledge/graph_state.json): 엣지 목록, 출발 노드별 betweenness 기여분, PageRank, 리스크 영향 구역
+- betweenness (Brandes) = 출발 노드 s 마다 구한 의존도 δ_s(v) 의 합 → 기여분을 s 별로 저장해 두고
+  바뀐 엣지 (u, v) 의 u 에 (이전 또는 지금 그래프에서) 도달할 수 있는 s 만 다시 계산, 나머지 s 는 재사용
+  (u 에 닿지 못하는 s 는 최단 경로 DAG 가 그대로). 합친 뒤 전체 노드 수로 정규화 → nx.betweenness_centrality(G) 와 같은 값
+  파이프라인 그래프는 case → pattern → feature/risk 방향이라 무방향으로는 한 컴포넌트지만,
+  case 는 들어오는 엣지가 없으므로 새/바뀐 케이스와 바뀐 pattern 에 닿는 케이스만 다시 계산됨
+- 리스크 1·2-hop 구역은 바뀐 엣지의 끝점에서 (무방향) 2 hop 안에 있는 리스크만 다시 계산
+- PageRank 는 전역 값이라 전체를 돌리되 이전 벡터를 nstart 로 줘서 적은 반복으로 수렴
+- 엣지 변화가 없으면 아무것도 다시 계산하지 않음
+- "What Changed" 는 전날 스냅샷(base) 기준 — 같은 날 재실행해도 하루치 변화가 보이도록 (trends.py 와 같은 방식)
+"""
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import networkx as nx
+
+from app.presentation import plot_graph
+
+STATE_PATH = Path("data/knowledge/graph_state.json")
+STATE_VERSION = 2
+TOP_MOVERS = 5
+MIN_PR_MOVE = 1e-4      # 이보다 작은 PageRank 변화는 수렴 오차 수준이라 리포트에서 제외
+PAGERANK_TOL = 1e-06
+
+
+def _empty_state() -> dict:
+    return {"version": STATE_VERSION, "date": None, "current": None, "base_date": None, "base": None}
+
+
+def load_state(path: Path = STATE_PATH) -> dict:
+    path = Path(path)
+    if not path.exists():
+        return _empty_state()
+    st = json.loads(path.read_text(encoding="utf-8"))
+    if st.get("version") != STATE_VERSION:
+        return _empty_state()
+    return st
+
+
+def save_state(st: dict, path: Path = STATE_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(st, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _edge_set(snap: dict | None) -> set:
+    return {tuple(e) for e in (snap or {}).get("edges", [])}
+
+
+def _nodes_of(edges: set) -> set:
+    return {n for e in edges for n in e}
+
+
+def _adjacency(edges: set) -> tuple[dict, dict]:
+    """엣지 집합 → (successors, predecessors)"""
+    succ, pred = {}, {}
+    for u, v in edges:
+        succ.setdefault(u, set()).add(v)
+        pred.setdefault(v, set()).add(u)
+    return succ, pred
+
+
+def _reach(adj: dict, start: set, depth: int | None = None) -> set:
+    """start 에서 adj 를 따라 depth hop 안에 닿는 노드 (start 포함, depth=None 이면 끝까지)"""
+    seen, frontier, hop = set(start), set(start), 0
+    while frontier and (depth is None or hop < depth):
+        frontier = {w for u in frontier for w in adj.get(u, ()) if w not in seen}
+        seen |= frontier
+        hop += 1
+    return seen
+
+
+def source_dependencies(G, s) -> dict:
+    """Brandes 한 출발점: s 에서 시작하는 최단 경로들이 각 노드를 지나는 비율의 합 δ_s(v) (0 이 아닌 것만)"""
+    order, preds, sigma, dist = [], {s: []}, {s: 1}, {s: 0}
+    frontier = [s]
+    while frontier:
+        nxt = []
+        for u in frontier:
+            order.append(u)
+            for w in G.successors(u):
+                if w not in dist:
+                    dist[w] = dist[u] + 1
+                    sigma[w] = 0
+                    preds[w] = []
+                    nxt.append(w)
+                if dist[w] == dist[u] + 1:
+                    sigma[w] += sigma[u]
+                    preds[w].append(u)
+        frontier = nxt
+    delta = dict.fromkeys(order, 0.0)
+    for w in reversed(order):
+        coeff = (1.0 + delta[w]) / sigma[w]
+        for u in preds[w]:
+            delta[u] += sigma[u] * coeff
+    return {v: d for v, d in delta.items() if v != s and d}
+
+
+def _rescale_betweenness(raw: dict, n: int) -> dict:
+    # nx.betweenness_centrality(DiGraph, normalized=True) 와 같은 스케일
+    if n <= 2:
+        return dict(raw)
+    scale = 1.0 / ((n - 1) * (n - 2))
+    return {k: v * scale for k, v in raw.items()}
+
+
+def _pagerank(G, prev_pr: dict | None) -> dict:
+    if G.number_of_nodes() == 0:
+        return {}
+    nstart = None
+    if prev_pr:
+        fill = 1.0 / G.number_of_nodes()
+        nstart = {n: prev_pr.get(n, fill) for n in G}   # pagerank 가 합 1 로 다시 정규화
+    return nx.pagerank(G, nstart=nstart, tol=PAGERANK_TOL)
+
+
+def _movers(before: dict, after: dict, nodes, min_move: float = 0, top: int = TOP_MOVERS) -> list:
+    rows = [(n, before.get(n, 0), after.get(n, 0)) for n in nodes]
+    rows = [r for r in rows if abs(r[2] - r[1]) > min_move]
+    rows.sort(key=lambda r: (-abs(r[2] - r[1]), r[0]))
+    return rows[:top]
+
+
+def compute_delta(G, prev: dict | None) -> dict:
+    """
+    prev(이전 스냅샷) 대비 bet(unnormalized)/pr/risk_impact 재계산.
+    반환: {"bet_raw", "bet_src", "pr", "risk_impact", "stats"}
+    """
+    edges = set(G.edges())
+    prev_edges = _edge_set(prev)
+    risk_nodes = [n for n in G.nodes() if plot_graph.safe_node_type(n) == "risk"]
+    prev_src = (prev or {}).get("bet_src", {})
+    prev_zones = (prev or {}).get("risk_impact", {})
+
+    if prev is None:
+        sources, dirty_risks, mode = set(G), set(risk_nodes), "full"
+    elif edges == prev_edges:
+        sources, dirty_risks, mode = set(), set(), "unchanged"
+    else:
+        changed = edges ^ prev_edges
+        old_succ, old_pred = _adjacency(prev_edges)
+        new_pred = {n: set(G.predecessors(n)) for n in G}
+        # 바뀐 엣지의 출발점에 닿는 노드 = 최단 경로 DAG 가 바뀔 수 있는 출발 노드
+        tails = {u for u, _ in changed}
+        sources = (_reach(old_pred, tails) | _reach(new_pred, tails & set(G))) & set(G)
+        sources |= set(G) - set(prev_src)   # 기여분이 저장되지 않은 노드 (새 노드)
+        # 리스크 구역: 끝점에서 무방향 2 hop 안 (끝점의 degree 가 바뀌면 정렬도 바뀜)
+        ends = {n for e in changed for n in e}
+        old_und = {n: old_succ.get(n, set()) | old_pred.get(n, set()) for n in set(old_succ) | set(old_pred)}
+        new_und = {n: set(G.successors(n)) | new_pred[n] for n in G}
+        dirty_risks = _reach(old_und, ends, 2) | _reach(new_und, ends & set(G), 2)
+        mode = "incremental"
+
+    bet_src = {s: prev_src[s] for s in G if s not in sources and s in prev_src}
+    for s in sources:
+        bet_src[s] = source_dependencies(G, s)
+    bet_raw = dict.fromkeys(G, 0.0)
+    for deps in bet_src.values():
+        for v, d in deps.items():
+            bet_raw[v] += d
+
+    deg = dict(G.degree())
+    UG = None
+    risk_impact, recomputed_risks = {}, 0
+    for r in risk_nodes:
+        if r in dirty_risks or r not in prev_zones:
+            UG = UG if UG is not None else G.to_undirected(as_view=True)
+            risk_impact[r] = plot_graph.risk_zone(UG, r, deg)
+            recomputed_risks += 1
+        else:
+            risk_impact[r] = prev_zones[r]
+
+    prev_pr = (prev or {}).get("pr")
+    pr = prev_pr if mode == "unchanged" else _pagerank(G, prev_pr)
+
+    return {
+        "bet_raw": bet_raw,
+        "bet_src": bet_src,
+        "pr": pr,
+        "risk_impact": risk_impact,
+        "stats": {
+            "mode": mode,
+            "nodes": G.number_of_nodes(),
+            "recomputed_sources": len(sources),
+            "risks": len(risk_nodes),
+            "recomputed_risks": recomputed_risks,
+        },
+    }
+
+
+def describe_changes(G, base: dict | None, pr: dict, impact: dict) -> dict:
+    """전날 스냅샷(base) 대비 엣지/노드 증감과 PageRank·영향 점수 변화 상위"""
+    edges = set(G.edges())
+    base_edges = _edge_set(base)
+    nodes, base_nodes = set(G), _nodes_of(base_edges)
+    base_pr = (base or {}).get("pr", {})
+    base_impact = (base or {}).get("impact", {})
+    common = nodes & base_nodes
+    return {
+        "added_edges": sorted(edges - base_edges),
+        "removed_edges": sorted(base_edges - edges),
+        "added_nodes": sorted(nodes - base_nodes),
+        "removed_nodes": sorted(base_nodes - nodes),
+        "pagerank_movers": _movers(base_pr, pr, common, MIN_PR_MOVE) if base else [],
+        "impact_changes": _movers(base_impact, impact, set(impact) | set(base_impact)) if base else [],
+    }
+
+
+def update_insights(G, today: str | None = None, path: Path = STATE_PATH) -> dict:
+    """compute_insights 와 같은 dict + "delta" (What Changed 섹션용). 상태 파일을 갱신한다."""
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    st = load_state(path)
+    if st["date"] and today < st["date"]:
+        # 과거 날짜(backfill)는 상태를 건드리지 않고 전체 계산
+        return plot_graph.compute_insights(G)
+
+    if st["date"] == today:
+        base, base_date = st["base"], st["base_date"]   # 같은 날 재실행: 전날 기준 유지
+    else:
+        base, base_date = st["current"], st["date"]
+
+    d = compute_delta(G, st["current"])
+    bet = _rescale_betweenness(d["bet_raw"], G.number_of_nodes())
+    ins = plot_graph.compute_insights(G, bet=bet, pr=d["pr"], risk_impact=d["risk_impact"])
+
+    delta = describe_changes(G, base, d["pr"], ins["impact_scores"])
+    delta.update(d["stats"], base_date=base_date)
+    ins["delta"] = delta
+
+    current = {
+        "edges": sorted(list(e) for e in G.edges()),
+        "bet_src": d["bet_src"],
+        "pr": d["pr"],
+        "risk_impact": d["risk_impact"],
+        "impact": ins["impact_scores"],
+    }
+    st.update({"date": today, "current": current, "base_date": base_date, "base": base})
+    save_state(st, path)
+    print(
+        f"[graph] {delta['mode']}: betweenness from {delta['recomputed_sources']}/{delta['nodes']} sources, "
+        f"{delta['recomputed_risks']}/{delta['risks']} risk zones recomputed"
+    )
+    return ins
@@ -0,0 +1,181 @@
+"""
+대화형 그래프용 export: 레이아웃 좌표 + 노드 지표를 한 번만 계산해 파일로 남기고,
+보는 쪽(API/dashboard)은 고른 노드 주변(k-hop ego subgraph)만 읽어 그린다.
+
+data/reports/graph.json (열 단위, 노드 참조는 번호)
+    {"version": 1, "date",
+     "nodes": {"id": [...], "type": [...], "x": [...], "y": [...],
+               "degree": [...], "betweenness": [...], "pagerank": [...], "impact": [...]},
+     "edges": {"source": [노드 번호...], "target": [...], "relation": [...], "weight": [...]}}
+data/reports/graph_nodes.arrow, graph_edges.arrow  같은 내용의 Arrow IPC (pyarrow 는 쓸 때만 import)
+
+- 좌표는 plot_graph.layout (spring_layout), 이전 export 의 좌표로 warm start → 날마다 배치가 크게 바뀌지 않음
+  render 스테이지는 이 좌표를 그대로 받아 PNG 를 그림 (레이아웃 한 번)
+- 지표는 graph 스테이지가 계산한 insights(deg/bet/pr/impact_scores)를 그대로 사용 → 다시 계산하지 않음
+- ego_subgraph 는 networkx 없이 export dict 만으로 BFS (API 프로세스는 가볍게)
+"""
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from pathlib import Path
+
+GRAPH_EXPORT_PATH = Path("data/reports/graph.json")
+GRAPH_ARROW_DIR = GRAPH_EXPORT_PATH.parent
+EXPORT_VERSION = 1
+
+MAX_EGO_HOPS = 3
+MAX_EGO_NODES = 500           # 허브 주변 2~3 hop 은 그래프 전체일 수 있으므로 상한 (가까운 hop 부터)
+ROUND = 4
+
+
+def load_export(path: Path = GRAPH_EXPORT_PATH) -> dict | None:
+    path = Path(path)
+    if not path.exists():
+        return None
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return data if data.get("version") == EXPORT_VERSION else None
+
+
+def _previous_positions(prev: dict | None) -> dict:
+    if not prev:
+        return {}
+    n = prev["nodes"]
+    return {i: (x, y) for i, x, y in zip(n["id"], n["x"], n["y"])}
+
+
+def build_export(G, ins: dict, pos: dict, edge_rows=None, today: str | None = None) -> dict:
+    from app.presentation.plot_graph import safe_node_type
+
+    ids = sorted(G.nodes())
+    index = {n: i for i, n in enumerate(ids)}
+    # 엣지 관계/가중치는 edges 스테이지 행에서 (없으면 그래프 엣지만)
+    rel = {}
+    for r in edge_rows or ():
+        key = (str(r["from"]), str(r["to"]))
+        rel.setdefault(key, (r.get("relation", ""), int(float(r.get("weight") or 1))))
+    edges = sorted(G.edges(), key=lambda e: (index[e[0]], index[e[1]]))
+    deg, bet, pr, impact = ins["deg"], ins["bet"], ins["pr"], ins["impact_scores"]
+    return {
+        "version": EXPORT_VERSION,
+        "date": today,
+        "nodes": {
+            "id": ids,
+            "type": [safe_node_type(n) for n in ids],
+            "x": [round(float(pos[n][0]), ROUND) for n in ids],
+            "y": [round(float(pos[n][1]), ROUND) for n in ids],
+            "degree": [deg.get(n, 0) for n in ids],
+            "betweenness": [round(bet.get(n, 0.0), 6) for n in ids],
+            "pagerank": [round(pr.get(n, 0.0), 6) for n in ids],
+            "impact": [impact.get(n, 0) for n in ids],
+        },
+        "edges": {
+            "source": [index[s] for s, _ in edges],
+            "target": [index[t] for _, t in edges],
+            "relation": [rel.get(e, ("", 1))[0] for e in edges],
+            "weight": [rel.get(e, ("", 1))[1] for e in edges],
+        },
+    }
+
+
+def write_arrow(export: dict, out_dir: Path = GRAPH_ARROW_DIR) -> list[str]:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    out_dir = Path(out_dir)
+    out = []
+    for name in ("nodes", "edges"):
+        path = out_dir / f"graph_{name}.arrow"
+        tmp = path.with_suffix(".tmp")
+        feather.write_feather(pa.table(export[name]), str(tmp), compression="zstd")
+        os.replace(tmp, path)
+        out.append(str(path))
+    return out
+
+
+def export_graph(G, ins: dict, edge_rows=None, today: str | None = None,
+                 path: Path = GRAPH_EXPORT_PATH, arrow: bool = True) -> tuple[dict, list[str]]:
+    """좌표 계산(이전 export 로 warm start) → graph.json (+ Arrow). (export dict, 쓴 파일들)"""
+    from app.presentation import plot_graph
+
+    path = Path(path)
+    pos = plot_graph.layout(G, prev=_previous_positions(load_export(path))) if G.number_of_nodes() else {}
+    export = build_export(G, ins, pos, edge_rows, today)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(export, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+    out = [str(path)]
+    if arrow:
+        out += write_arrow(export, path.parent)
+    return export, out
+
+
+def positions(export: dict) -> dict:
+    """노드 -> (x, y) — render 스테이지가 레이아웃을 다시 계산하지 않도록"""
+    return _previous_positions(export)
+
+
+def adjacency(export: dict) -> tuple[dict, list[list[tuple[int, int]]]]:
+    """(노드 -> 번호, 번호별 무방향 이웃 [(이웃 번호, 엣지 번호)]). API 는 스냅샷마다 한 번 만들어 재사용"""
+    e = export["edges"]
+    ids = export["nodes"]["id"]
+    adj = [[] for _ in ids]
+    for ei, (s, t) in enumerate(zip(e["source"], e["target"])):
+        adj[s].append((t, ei))
+        adj[t].append((s, ei))
+    return {n: i for i, n in enumerate(ids)}, adj
+
+
+def ego_subgraph(export: dict, node: str, k: int = 1, graph_index: tuple | None = None,
+                 max_nodes: int = MAX_EGO_NODES) -> dict | None:
+    """
+    node 에서 k hop 안의 노드/엣지 (방향 무시로 탐색, 엣지는 원래 방향). 방문한 노드의 이웃만 봄.
+    graph_index: adjacency(export) 결과 (없으면 새로 만듦)
+    → {"center", "hops", "truncated", "nodes": [{id, type, x, y, degree, ..., hop}], "edges": [{source, target, ...}]}
+    모르는 노드면 None
+    """
+    index, adj = graph_index or adjacency(export)
+    start = index.get(node)
+    if start is None:
+        return None
+    k = max(0, min(MAX_EGO_HOPS, int(k)))
+
+    hop = {start: 0}
+    queue, truncated = deque([start]), False
+    while queue and not truncated:
+        u = queue.popleft()
+        if hop[u] >= k:
+            continue
+        for v, _ in adj[u]:
+            if v in hop:
+                continue
+            if len(hop) >= max_nodes:
+                truncated = True
+                break
+            hop[v] = hop[u] + 1
+            queue.append(v)
+
+    nodes, e = export["nodes"], export["edges"]
+    cols = [c for c in nodes if c != "id"]
+    out_nodes = [
+        {"id": nodes["id"][i], **{c: nodes[c][i] for c in cols}, "hop": h}
+        for i, h in sorted(hop.items(), key=lambda x: (x[1], x[0]))
+    ]
+    edge_ids = sorted({ei for u in hop for v, ei in adj[u] if v in hop})
+    out_edges = [
+        {"source": nodes["id"][e["source"][ei]], "target": nodes["id"][e["target"][ei]],
+         "relation": e["relation"][ei], "weight": e["weight"][ei]}
+        for ei in edge_ids
+    ]
+    return {"center": node, "hops": k, "truncated": truncated, "nodes": out_nodes, "edges": out_edges}
+
+
+def default_center(export: dict) -> str | None:
+    """대시보드 첫 화면: 리스크 영향 점수(없으면 degree)가 가장 큰 노드"""
+    n = export["nodes"]
+    if not n["id"]:
+        return None
+    best = max(range(len(n["id"])), key=lambda i: (n["impact"][i], n["degree"][i]))
+    return n["id"][best]
@@ -1,19 +1,52 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 
-PATH = "daily_interest_metrics.csv"
+from app.knowledge.rollup import (
+    DAILY_PATH, ROLLING_WINDOWS, load_series, load_state, rebuild_rollups,
+)
 
-def main():
-    df = pd.read_csv(PATH)
+PATH = DAILY_PATH
+
+
+def load_frame(start=None, end=None, resolution=None):
+    """
+    범위에 맞는 해상도(daily/weekly/monthly)의 롤업을 DataFrame으로.
+    포인트 수가 MAX_POINTS 안쪽이라 히스토리가 길어져도 그리는 비용은 같다.
+    """
+    if not load_state()["max_date"]:
+        # 롤업이 아직 없으면 기존 CSV로 한 번 만들어 둔다
+        rebuild_rollups(PATH)
+
+    resolution, rows = load_series(start, end, resolution)
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return resolution, df
 
-    # date 정렬
     df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date")
+    for c in df.columns:
+        if c != "date":
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+    return resolution, df.sort_values("date")
+
+
+def main(start=None, end=None, resolution=None):
+    resolution, df = load_frame(start, end, resolution)
+    if df.empty:
+        print(f"[plot_daily] no rows ({PATH})")
+        return
+
+    marker = "o" if len(df) <= 60 else None
 
     # interest_score 라인 차트
     plt.figure()
-    plt.plot(df["date"], df["interest_score"], marker="o")
-    plt.title("Daily Interest Score")
+    plt.plot(df["date"], df["interest_score"], marker=marker, label="interest_score")
+    if resolution == "daily":
+        for w in ROLLING_WINDOWS:
+            col = f"interest_score_r{w}"
+            if col in df.columns:
+                plt.plot(df["date"], df[col], linestyle="--", label=f"{w}d mean")
+        plt.legend()
+    plt.title(f"Daily Interest Score ({resolution})")
     plt.xlabel("date")
     plt.ylabel("interest_score")
     plt.xticks(rotation=45)
@@ -21,12 +54,16 @@ def main():
     plt.show()
 
     # 패턴 점유율 라인 차트 (generator/hybrid/agent)
-    pattern_cols = [c for c in df.columns if c.startswith("share_")]
+    rolling_suffixes = tuple(f"_r{w}" for w in ROLLING_WINDOWS)
+    pattern_cols = [
+        c for c in df.columns
+        if c.startswith("share_") and not c.endswith(rolling_suffixes)
+    ]
     if pattern_cols:
         plt.figure()
         for c in pattern_cols:
-            plt.plot(df["date"], df[c], marker="o", label=c)
-        plt.title("Architecture Share Over Time")
+            plt.plot(df["date"], df[c], marker=marker, label=c)
+        plt.title(f"Architecture Share Over Time ({resolution})")
         plt.xlabel("date")
         plt.ylabel("share")
         plt.xticks(rotation=45)
@@ -35,4 +72,4 @@ def main():
         plt.show()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
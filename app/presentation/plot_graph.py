@@ -6,6 +6,12 @@ from datetime import datetime
 
 PATH = "graph_edges_snapshot.csv"
 
+# 이전 렌더의 노드 좌표 (같은 프로세스에서 다시 그릴 때 spring_layout warm start)
+_LAYOUT_CACHE = {}
+LAYOUT_ITERATIONS = 50
+WARM_LAYOUT_ITERATIONS = 15
+WARM_LAYOUT_MIN_SHARE = 0.8   # 이 비율 이상의 노드가 이전 좌표를 가지면 반복 횟수를 줄임
+
 def node_type(name: str) -> str:
     s = name.lower().strip()
     
@@ -40,8 +46,23 @@ def hop_neighbors(graph, start, depth: int):
     return visited
 
 
-def main():
-    df = pd.read_csv(PATH)
+def safe_node_type(n: str) -> str:
+    try:
+        return node_type(n)
+    except Exception:
+        return "unknown"
+
+
+def build_graph(edges):
+    """edges: (source, target) 튜플들 → DiGraph"""
+    G = nx.DiGraph()
+    for s, t in edges:
+        G.add_edge(str(s), str(t))
+    return G
+
+
+def graph_from_csv(path: str = PATH):
+    df = pd.read_csv(path)
 
     # 컬럼명 자동 탐지
     cols = [c.lower() for c in df.columns]
@@ -54,36 +75,54 @@ def main():
     else:
         source_col, target_col = df.columns[0], df.columns[1]
 
-    # 그래프 구성
-    G = nx.DiGraph()
-    for _, r in df.iterrows():
-        s = str(r[source_col])
-        t = str(r[target_col])
-        G.add_edge(s, t)
+    return build_graph(zip(df[source_col], df[target_col]))
+
+
+def risk_zone(UG, r, deg) -> dict:
+    hop1 = hop_neighbors(UG, r, depth=1)
+    hop2 = hop_neighbors(UG, r, depth=2)
+
+    # 보기 좋게 degree 높은 순 정렬
+    hop1_sorted = sorted(hop1, key=lambda n: deg.get(n, 0), reverse=True)
+    hop2_sorted = sorted(hop2, key=lambda n: deg.get(n, 0), reverse=True)
+
+    return {
+        "hop1": hop1_sorted,
+        "hop2": hop2_sorted,
+        "hop1_count": len(hop1_sorted),
+        "hop2_count": len(hop2_sorted),
+    }
+
+
+def impact_from_zones(risk_impact: dict) -> dict:
+    impact_scores = {}  # node -> score
+    for info in risk_impact.values():
+        # 가중치: 1-hop=2점, 2-hop=1점
+        for n in info["hop1"]:
+            impact_scores[n] = impact_scores.get(n, 0) + 2
+        for n in info["hop2"]:
+            impact_scores[n] = impact_scores.get(n, 0) + 1
+    return impact_scores
 
-    
 
+def compute_insights(G, bet=None, pr=None, risk_impact=None) -> dict:
+    """bet/pr/risk_impact 를 넘기면 그대로 사용 (graph_delta 가 바뀐 부분만 다시 계산한 값)"""
     # ✅ 1단계 핵심: 연결 수(중요도) 기반 노드 크기
     deg = dict(G.degree())  # in+out degree
     UG = G.to_undirected()
     # B) Centrality (병목 / 중요 노드)
-    bet = nx.betweenness_centrality(G)
-    pr  = nx.pagerank(G)
+    if bet is None:
+        bet = nx.betweenness_centrality(G)
+    if pr is None:
+        pr = nx.pagerank(G)
 
     TOP_CENT_N = 10
     top_bet = sorted(bet.items(), key=lambda x: x[1], reverse=True)[:TOP_CENT_N]
     top_pr  = sorted(pr.items(),  key=lambda x: x[1], reverse=True)[:TOP_CENT_N]
-    
-    def safe_node_type(n: str) -> str:
-        try:
-            return node_type(n)
-        except Exception:
-            return "unknown"
-    
+
     TOP_N = 5
     top_hubs = sorted(deg.items(), key=lambda x: x[1], reverse=True)[:TOP_N]
-    
-    
+
     # 2) Risk Nodes & Neighbors
     risk_nodes = [n for n in G.nodes() if safe_node_type(n) == "risk"]
     risk_links = {}
@@ -91,85 +130,87 @@ def main():
         neigh = list(UG.neighbors(r))
         neigh_sorted = sorted(neigh, key=lambda n: deg.get(n, 0), reverse=True)
         risk_links[r] = neigh_sorted
-        
-        risk_edge_1hop = set()
-        risk_edge_2hop = set()
-
-        for r in risk_nodes:
-            hop1 = set(hop_neighbors(UG, r, depth=1))
-            hop2 = set(hop_neighbors(UG, r, depth=2))
-
-            zone1 = hop1 | {r}
-            zone2 = hop2 | {r}
-
-            # 1-hop zone 내부 edge들
-            for u, v in G.edges():
-                if u in zone1 and v in zone1:
-                    risk_edge_1hop.add((u, v))
-
-            # 2-hop zone 내부 edge들 (1-hop은 제외)
-            for u, v in G.edges():
-                if (u in zone2 and v in zone2) and ((u, v) not in risk_edge_1hop):
-                    risk_edge_2hop.add((u, v))
-
-        risk_edge_1hop = list(risk_edge_1hop)
-        risk_edge_2hop = list(risk_edge_2hop)
 
     # 3) Feature → Connected Cases
+    def case_index(name):
+        try:
+            return int(name.split("_")[1])
+        except Exception:
+            return 9999
+
     feature_nodes = [n for n in G.nodes() if safe_node_type(n) == "feature"]
     feature_case_map = {}
     for f in feature_nodes:
         cases = [n for n in UG.neighbors(f) if safe_node_type(n) == "case"]
-
-        def case_index(name):
-            try:
-                return int(name.split("_")[1])
-            except Exception:
-                return 9999
-
         feature_case_map[f] = sorted(cases, key=case_index)
-          # -------------------------
+
+    # -------------------------
     # 4) Risk Impact Zone (1-hop / 2-hop)
     # -------------------------
-
-
-    risk_impact = {}
-    for r in risk_nodes:
-        hop1 = hop_neighbors(UG, r, depth=1)
-        hop2 = hop_neighbors(UG, r, depth=2)
-
-        # 보기 좋게 degree 높은 순 정렬
-        hop1_sorted = sorted(hop1, key=lambda n: deg.get(n, 0), reverse=True)
-        hop2_sorted = sorted(hop2, key=lambda n: deg.get(n, 0), reverse=True)
-
-        risk_impact[r] = {
-            "hop1": hop1_sorted,
-            "hop2": hop2_sorted,
-            "hop1_count": len(hop1_sorted),
-            "hop2_count": len(hop2_sorted),
-        }
-    impact_scores = {}  # node -> score
-
-    for r, info in risk_impact.items():
-        # 가중치: 1-hop=2점, 2-hop=1점
-        for n in info["hop1"]:
-            impact_scores[n] = impact_scores.get(n, 0) + 2
-        for n in info["hop2"]:
-            impact_scores[n] = impact_scores.get(n, 0) + 1
+    if risk_impact is None:
+        risk_impact = {r: risk_zone(UG, r, deg) for r in risk_nodes}
+    impact_scores = impact_from_zones(risk_impact)
 
     # 상위 N개
     TOP_SCORE_N = 10
     impact_top = sorted(
-        impact_scores.items(), 
-        key=lambda x: x[1], 
+        impact_scores.items(),
+        key=lambda x: x[1],
         reverse=True
         )[:TOP_SCORE_N]
-    
-    impact_top_nodes = [n for (n, score) in impact_top]
-    
+
+    return {
+        "deg": deg,
+        "bet": bet,
+        "pr": pr,
+        "top_bet": top_bet,
+        "top_pr": top_pr,
+        "top_hubs": top_hubs,
+        "risk_nodes": risk_nodes,
+        "risk_links": risk_links,
+        "feature_nodes": feature_nodes,
+        "feature_case_map": feature_case_map,
+        "risk_impact": risk_impact,
+        "impact_scores": impact_scores,
+        "impact_top": impact_top,
+    }
+
+
+def delta_lines(delta: dict) -> list[str]:
+    lines = []
+    since = delta.get("base_date") or "first snapshot"
+    lines.append(f"## What Changed (since {since})\n")
+    lines.append(
+        f"- edges: +{len(delta['added_edges'])} / -{len(delta['removed_edges'])}, "
+        f"nodes: +{len(delta['added_nodes'])} / -{len(delta['removed_nodes'])}\n"
+    )
+    for key, label in (("added_nodes", "new nodes"), ("removed_nodes", "removed nodes")):
+        names = delta[key]
+        if names:
+            more = f" (+{len(names) - 10} more)" if len(names) > 10 else ""
+            lines.append(f"- {label}: {', '.join(names[:10])}{more}\n")
+    if delta.get("pagerank_movers"):
+        lines.append("- PageRank movers:\n")
+        for n, before, after in delta["pagerank_movers"]:
+            lines.append(f"  - **{n}** {before:.4f} → {after:.4f} ({after - before:+.4f})\n")
+    if delta.get("impact_changes"):
+        lines.append("- Impact score changes:\n")
+        for n, before, after in delta["impact_changes"]:
+            lines.append(f"  - **{n}** {before} → {after} ({after - before:+d})\n")
+    lines.append(
+        f"- recomputed: betweenness from {delta['recomputed_sources']}/{delta['nodes']} sources, "
+        f"{delta['recomputed_risks']}/{delta['risks']} risk zones ({delta['mode']})\n\n"
+    )
+    return lines
+
+
+def write_insights_report(ins: dict, today: str):
+    deg = ins["deg"]
+    risk_nodes = ins["risk_nodes"]
+    feature_nodes = ins["feature_nodes"]
+    impact_top = ins["impact_top"]
 
     # 리포트 저장 (Markdown)
-    today = datetime.now().strftime("%Y-%m-%d")
     os.makedirs("reports", exist_ok=True)
 
     md_path = os.path.join("reports", f"{today}_graph_insights.md")
@@ -178,15 +219,19 @@ def main():
     lines = []
     lines.append(f"# Graph Insights ({today})\n\n")
 
+    # 0) 이전 스냅샷 대비 변화 (graph_delta 로 계산했을 때만)
+    if ins.get("delta"):
+        lines.extend(delta_lines(ins["delta"]))
+
     lines.append("## 1) Top Hub Nodes (by Degree)\n")
-    for i, (n, d) in enumerate(top_hubs, 1):
+    for i, (n, d) in enumerate(ins["top_hubs"], 1):
         lines.append(f"- {i}. **{n}** — degree={d}, type={safe_node_type(n)}\n")
 
     lines.append("\n## 2) Risk Nodes & Direct Neighbors\n")
     if not risk_nodes:
         lines.append("- (no risk nodes found)\n")
     else:
-        for r, neigh in risk_links.items():
+        for r, neigh in ins["risk_links"].items():
             text = ", ".join(neigh) if neigh else "(none)"
             lines.append(f"- **{r}** → {text}\n")
 
@@ -194,21 +239,21 @@ def main():
     if not feature_nodes:
         lines.append("- (no feature nodes found)\n")
     else:
-        for f, cases in feature_case_map.items():
+        for f, cases in ins["feature_case_map"].items():
             text = ", ".join(cases) if cases else "(none)"
             lines.append(f"- **{f}** → cases({len(cases)}): {text}\n")
-            
+
     lines.append("\n## 4) Risk Impact Zone (1-hop / 2-hop)\n")
     if not risk_nodes:
         lines.append("- (no risk nodes found)\n")
     else:
-        for r, info in risk_impact.items():
+        for r, info in ins["risk_impact"].items():
             lines.append(f"- **{r}**\n")
             h1 = ", ".join(info["hop1"]) if info["hop1"] else "(none)"
             h2 = ", ".join(info["hop2"]) if info["hop2"] else "(none)"
             lines.append(f"  - 1-hop({info['hop1_count']}): {h1}\n")
             lines.append(f"  - 2-hop({info['hop2_count']}): {h2}\n")
-            
+
     lines.append("\n## 5) Impact Score Top Nodes\n")
 
     if not impact_top:
@@ -218,18 +263,17 @@ def main():
             lines.append(
                 f"- {i}. **{node}** — score={score}, degree={deg.get(node, 0)}, type={safe_node_type(node)}\n"
             )
-    
+
     lines.append("\n## 6) Centrality (Betweenness / PageRank)\n")
 
     lines.append("### 6.1 Betweenness Centrality (Top 10)\n")
-    for i, (n, v) in enumerate(top_bet, 1):
+    for i, (n, v) in enumerate(ins["top_bet"], 1):
         lines.append(f"- {i}. **{n}** — betweenness={v:.4f}, degree={deg.get(n,0)}, type={safe_node_type(n)}\n")
 
     lines.append("\n### 6.2 PageRank (Top 10)\n")
-    for i, (n, v) in enumerate(top_pr, 1):
+    for i, (n, v) in enumerate(ins["top_pr"], 1):
         lines.append(f"- {i}. **{n}** — pagerank={v:.4f}, degree={deg.get(n,0)}, type={safe_node_type(n)}\n")
 
-            
     content = "".join(lines)
 
     with open(md_path, "w", encoding="utf-8") as f:
@@ -240,12 +284,34 @@ def main():
 
     print(f"[INSIGHTS] saved -> {md_path}")
     print(f"[INSIGHTS] saved -> {md_latest}")
-    # =========================
+    return md_path, md_latest
+
+
+def layout(G, prev: dict | None = None):
+    # prev: 이전 실행의 좌표 (graph_export 파일) — 프로세스 캐시에 없는 노드만 채움
+    cache = {**(prev or {}), **_LAYOUT_CACHE}
+    init = {n: cache[n] for n in G if n in cache}
+    warm = len(init) >= WARM_LAYOUT_MIN_SHARE * max(1, G.number_of_nodes())
+    pos = nx.spring_layout(
+        G, k=0.8, seed=42, pos=init or None,
+        iterations=WARM_LAYOUT_ITERATIONS if warm else LAYOUT_ITERATIONS,
+    )
+    _LAYOUT_CACHE.update(pos)
+    return pos
+
+
+def render_graph(G, ins: dict, today: str, show: bool = True, pos: dict | None = None):
+    """pos: 미리 계산한 좌표 (graph_export) — 없으면 여기서 layout"""
+    deg = ins["deg"]
+    risk_nodes = ins["risk_nodes"]
+    impact_top_nodes = [n for (n, score) in ins["impact_top"]]
+    UG = G.to_undirected()
 
     # 레이아웃
     plt.figure(figsize=(12, 8))
-    pos = nx.spring_layout(G, k=0.8, seed=42)
-    
+    if pos is None or any(n not in pos for n in G):
+        pos = layout(G, prev=pos)
+
     # =========================
 # ✅ STEP 6) Risk propagation edge highlight (1-hop / 2-hop)
 # =========================
@@ -386,7 +452,25 @@ def main():
     print(f"📸 Graph saved -> {filename}")
     print(f"📸 Graph saved -> {latest_png}")
 
-    plt.show()
+    if show:
+        plt.show()
+    else:
+        plt.close()
+    return filename, latest_png
+
+
+def main():
+    from app.presentation import graph_delta, graph_export
+
+    G = graph_from_csv(PATH)
+    ins = graph_delta.update_insights(G)
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    write_insights_report(ins, today)
+    export, out = graph_export.export_graph(G, ins, today=today)
+    for path in out:
+        print(f"[OK] Graph export -> {path}")
+    render_graph(G, ins, today, pos=graph_export.positions(export))
 
 
 if __name__ == "__main__":
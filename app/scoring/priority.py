@@ -1,28 +1,60 @@
 import math
+from dataclasses import asdict, dataclass, fields
 from typing import List
 
 def clamp(x: float, lo: float = 0.0, hi: float = 1.0) -> float:
     return max(lo, min(hi, x))
 
+@dataclass(frozen=True)
+class WeightProfile:
+    """
+    compute_raw_priority 의 가중치 묶음 (기본값 = 기존 하드코딩 값).
+    raw = (가중합) * (conf_floor + conf_gain * c), evidence < low_evidence 이면 * low_evidence_penalty
+    """
+    feasibility: float = 0.50
+    momentum: float = 0.20
+    evidence: float = 0.15
+    novelty: float = 0.10
+    confidence: float = 0.05
+    conf_floor: float = 0.6
+    conf_gain: float = 0.4
+    low_evidence: float = 0.2
+    low_evidence_penalty: float = 0.7
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "WeightProfile":
+        known = {f.name for f in fields(cls)}
+        unknown = set(d) - known - {"name"}
+        if unknown:
+            raise ValueError(f"unknown weight(s): {', '.join(sorted(unknown))}")
+        return cls(**{k: float(v) for k, v in d.items() if k in known})
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+DEFAULT_PROFILE = WeightProfile()
+
 def compute_raw_priority(
     feasibility: float,
     evidence: float,
     momentum: float,
     novelty: float,
     confidence: float,
+    profile: WeightProfile = DEFAULT_PROFILE,
 ) -> float:
+    w = profile
     f = clamp(feasibility)
     e = clamp(evidence)
     m = clamp(momentum)
     n = clamp(novelty)
     c = clamp(confidence)
 
-    base = (0.50 * f + 0.20 * m + 0.15 * e + 0.10 * n + 0.05 * c)
+    base = (w.feasibility * f + w.momentum * m + w.evidence * e + w.novelty * n + w.confidence * c)
 
-    raw = base * (0.6 + 0.4 * c)
+    raw = base * (w.conf_floor + w.conf_gain * c)
 
-    if e < 0.2:
-        raw *= 0.7
+    if e < w.low_evidence:
+        raw *= w.low_evidence_penalty
 
     return clamp(raw)
 
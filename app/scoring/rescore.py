@@ -0,0 +1,240 @@
+"""
+가중치 what-if: 저장된 점수 행렬만으로 raw priority → 정규화 → top-K 를 다시 계산.
+
+    python -m app.scoring.rescore                                   # 기본 가중치, top 20
+    python -m app.scoring.rescore --profile momentum=0.35,novelty=0.2
+    python -m app.scoring.rescore --profile default --profile weights/aggressive.json --top 50
+
+- export 스테이지가 카드별 입력 점수(feasibility/evidence/momentum/novelty/confidence)를
+  data/reports/score_matrix.npz 에 (n, 5) float32 로 저장 → fetch/태깅 없이 재채점
+- 계산은 numpy 벡터 연산 (100k 카드 × 여러 프로필도 1초 안쪽)
+- 여러 프로필을 주면 첫 번째 프로필 기준으로 top-K 겹침/순위 변화를 같이 출력
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.scoring.priority import DEFAULT_PROFILE, WeightProfile
+
+MATRIX_PATH = Path("data/reports/score_matrix.npz")
+MATRIX_VERSION = 1
+FEATURES = ("feasibility", "evidence", "momentum", "novelty", "confidence")
+
+
+# -------------------------
+# 행렬 저장/로드
+# -------------------------
+
+def _pack(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    # 가변 길이 문자열은 utf-8 blob + offset 으로 (고정폭 유니코드 배열보다 훨씬 작음)
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+class ScoreMatrix:
+    def __init__(self, X: np.ndarray, ids: tuple, titles: tuple):
+        self.X = X                  # (n, len(FEATURES))
+        self._ids = ids             # (blob, offsets)
+        self._titles = titles
+
+    def __len__(self):
+        return self.X.shape[0]
+
+    @staticmethod
+    def _at(packed: tuple, i: int) -> str:
+        blob, off = packed
+        return blob[off[i]:off[i + 1]].tobytes().decode("utf-8")
+
+    def idea_id(self, i: int) -> str:
+        return self._at(self._ids, i)
+
+    def title(self, i: int) -> str:
+        return self._at(self._titles, i)
+
+
+def build_matrix(cards: list[dict]) -> ScoreMatrix:
+    X = np.zeros((len(cards), len(FEATURES)), dtype=np.float32)
+    for i, c in enumerate(cards):
+        scores = c.get("scores") or {}
+        X[i] = [float(scores.get(k) or 0.0) for k in FEATURES]
+    ids = _pack([str(c.get("idea_id") or "") for c in cards])
+    titles = _pack([str(c.get("title") or "") for c in cards])
+    return ScoreMatrix(X, ids, titles)
+
+
+def write_score_matrix(cards: list[dict], out_path: str | Path = MATRIX_PATH) -> str:
+    m = build_matrix(cards)
+    path = Path(out_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("wb") as f:   # 파일 객체로 넘겨야 np.savez 가 .npz 를 덧붙이지 않음
+        np.savez(
+            f,
+            version=np.int32(MATRIX_VERSION),
+            features=np.array(FEATURES),
+            X=m.X,
+            ids_blob=m._ids[0], ids_off=m._ids[1],
+            titles_blob=m._titles[0], titles_off=m._titles[1],
+        )
+    os.replace(tmp, path)
+    return str(path)
+
+
+def load_matrix(path: str | Path = MATRIX_PATH) -> ScoreMatrix:
+    with np.load(Path(path)) as z:
+        if int(z["version"]) != MATRIX_VERSION or tuple(z["features"]) != FEATURES:
+            raise ValueError(f"score matrix format mismatch: {path} (re-run the export stage)")
+        return ScoreMatrix(
+            z["X"],
+            (z["ids_blob"], z["ids_off"]),
+            (z["titles_blob"], z["titles_off"]),
+        )
+
+
+# -------------------------
+# 재채점 (priority.py 의 벡터 버전)
+# -------------------------
+
+def raw_priorities(X: np.ndarray, profile: WeightProfile = DEFAULT_PROFILE) -> np.ndarray:
+    w = profile
+    f, e, m, n, c = np.clip(X.astype(np.float64), 0.0, 1.0).T
+    base = w.feasibility * f + w.momentum * m + w.evidence * e + w.novelty * n + w.confidence * c
+    raw = base * (w.conf_floor + w.conf_gain * c)
+    raw = np.where(e < w.low_evidence, raw * w.low_evidence_penalty, raw)
+    return np.clip(raw, 0.0, 1.0)
+
+
+def percentile_ranks(values: np.ndarray) -> np.ndarray:
+    """priority.percentile_ranks 와 같은 결과 (동점은 평균 순위)"""
+    n = len(values)
+    if n == 0:
+        return np.zeros(0)
+    if n == 1:
+        return np.ones(1)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    starts = np.cumsum(counts) - counts
+    avg_rank = starts + (counts - 1) / 2.0
+    return avg_rank[inverse] / (n - 1)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 내림차순 상위 k개의 행 번호 (동점은 행 번호 순)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.lexsort((idx, -scores[idx]))]
+
+
+def rescore(matrix: ScoreMatrix, profile: WeightProfile = DEFAULT_PROFILE, k: int = 20) -> dict:
+    raw = raw_priorities(matrix.X, profile)
+    priority = percentile_ranks(raw)
+    top = top_k(raw, k)   # 정규화는 단조 변환이므로 raw 기준 순서와 같음
+    return {"raw": raw, "priority": priority, "top": top}
+
+
+def compare_profiles(matrix: ScoreMatrix, profiles: dict, k: int = 20) -> list[dict]:
+    """
+    프로필별 top-K. 두 번째 프로필부터는 첫 번째 대비
+    overlap(겹치는 카드 수), entered/left(새로 들어온/빠진 카드), moves(공통 카드의 순위 변화)
+    """
+    out, base_rank = [], None
+    for name, profile in profiles.items():
+        r = rescore(matrix, profile, k)
+        rank = {int(i): pos for pos, i in enumerate(r["top"])}
+        items = [
+            {
+                "rank": pos + 1,
+                "idea_id": matrix.idea_id(int(i)),
+                "title": matrix.title(int(i)),
+                "raw_priority": round(float(r["raw"][i]), 6),
+                "priority": round(float(r["priority"][i]), 6),
+            }
+            for pos, i in enumerate(r["top"])
+        ]
+        entry = {"name": name, "weights": profile.to_dict(), "items": items}
+        if base_rank is None:
+            base_rank = rank
+        else:
+            common = rank.keys() & base_rank.keys()
+            entry["overlap"] = len(common)
+            entry["entered"] = [matrix.idea_id(i) for i in rank if i not in base_rank]
+            entry["left"] = [matrix.idea_id(i) for i in base_rank if i not in rank]
+            for it, i in zip(items, r["top"]):
+                if int(i) in base_rank:
+                    it["move"] = base_rank[int(i)] - rank[int(i)]   # +면 순위 상승
+        out.append(entry)
+    return out
+
+
+# -------------------------
+# CLI
+# -------------------------
+
+def parse_profile(spec: str) -> tuple[str, WeightProfile]:
+    """'default' | 프로필 JSON 파일 경로 | 'momentum=0.3,novelty=0.2' (기본값 위에 덮어쓰기)"""
+    if spec == "default":
+        return spec, DEFAULT_PROFILE
+    path = Path(spec)
+    if path.suffix == ".json" or path.exists():
+        d = json.loads(path.read_text(encoding="utf-8"))
+        return str(d.get("name") or path.stem), WeightProfile.from_dict({**DEFAULT_PROFILE.to_dict(), **d})
+    overrides = {}
+    for part in spec.split(","):
+        k, sep, v = part.partition("=")
+        if not sep:
+            raise ValueError(f"bad profile spec: {spec!r} (expected key=value[,key=value])")
+        overrides[k.strip()] = v
+    return spec, WeightProfile.from_dict({**DEFAULT_PROFILE.to_dict(), **overrides})
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m app.scoring.rescore", description="what-if re-scoring")
+    ap.add_argument("--matrix", default=str(MATRIX_PATH))
+    ap.add_argument("--profile", action="append", default=[], metavar="SPEC",
+                    help="default | weights.json | key=value,... (여러 번 지정하면 첫 번째와 비교)")
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = ap.parse_args(argv)
+
+    try:
+        profiles = dict(parse_profile(s) for s in (args.profile or ["default"]))
+    except ValueError as e:
+        print(f"[rescore] {e}")
+        return 2
+    if not Path(args.matrix).exists():
+        print(f"[rescore] no score matrix at {args.matrix} (run `python -m app.main` first)")
+        return 1
+
+    t0 = time.perf_counter()
+    matrix = load_matrix(args.matrix)
+    t1 = time.perf_counter()
+    results = compare_profiles(matrix, profiles, args.top)
+    t2 = time.perf_counter()
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"[rescore] {len(matrix)} cards, load {t1 - t0:.3f}s, {len(profiles)} profile(s) {t2 - t1:.3f}s")
+    for res in results:
+        print(f"\n== {res['name']}")
+        if "overlap" in res:
+            print(f"   overlap {res['overlap']}/{len(res['items'])} with {results[0]['name']}")
+        for it in res["items"]:
+            move = it.get("move")
+            mark = "new" if move is None and "overlap" in res else (f"{move:+d}" if move else "")
+            print(f"{it['rank']:>4}. {it['raw_priority']:.4f}  {mark:>4}  {it['title'][:70]}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,436 @@
+"""
+읽기 전용 HTTP API (Flask).
+
+    python -m app.ui.api --port 8000
+
+GET /api/v1/health
+GET /api/v1/cards?page=1&per_page=50[&cluster_id=c00001]
+GET /api/v1/cards?tag=action_items&risk=privacy&min_priority=0.7&since=YYYY-MM-DD[&until=...&by=priority]
+    (tag/risk 는 여러 번 줄 수 있음, 모두 만족) → card_store SQLite 인덱스로 조회
+GET /api/v1/cards/<idea_id>
+GET /api/v1/top?k=10[&by=priority|novelty|momentum|evidence]
+GET /api/v1/clusters?k=20
+GET /api/v1/rescore?k=20[&momentum=0.3&novelty=0.2...]   (가중치 what-if, 기본 가중치 top-K 와 비교)
+GET /api/v1/graph/neighbors?node=Agent[&hops=1]
+GET /api/v1/graph/ego?node=Agent[&k=1]   (graph_export 좌표/지표 포함 k-hop ego subgraph, 노드 없으면 지표 1위 노드)
+GET /api/v1/metrics/daily[?start=YYYY-MM-DD&end=YYYY-MM-DD&resolution=daily|weekly|monthly]
+
+- 파이프라인이 publish 한 data/reports/manifest.json 의 generation 이 바뀌면 스냅샷을 통째로 다시 로드
+- 응답 본문은 (JSON → gzip → ETag) 으로 한 번만 만들어 스냅샷에 메모해 두고 재사용
+- If-None-Match 가 맞으면 304, 본문 없이 응답
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from flask import Flask, Response, abort, request
+
+ROOT = Path(__file__).resolve().parents[2]  # 프로젝트 루트
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.knowledge import card_store, rollup
+from app.presentation import graph_export
+from app.scoring.priority import DEFAULT_PROFILE, WeightProfile
+
+MANIFEST_PATH = ROOT / "data" / "reports" / "manifest.json"
+ROLLUP_DIR = ROOT / rollup.ROLLUP_DIR
+
+RELOAD_CHECK_SEC = 2.0    # manifest stat 주기 (요청마다 stat 하지 않게)
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+MAX_TOP_K = 200
+MAX_HOPS = 2
+MAX_MEMO = 512            # 파라미터 조합별 응답 메모 상한 (스냅샷마다 초기화)
+GZIP_LEVEL = 6
+SCORE_KEYS = ("priority", "novelty", "momentum", "evidence", "feasibility", "confidence")
+
+
+class Body:
+    """미리 만든 응답: 원문 + gzip + ETag"""
+
+    __slots__ = ("raw", "gz", "etag")
+
+    def __init__(self, payload):
+        self.raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.gz = gzip.compress(self.raw, compresslevel=GZIP_LEVEL, mtime=0)
+        self.etag = hashlib.sha1(self.raw).hexdigest()[:20]   # 따옴표 없는 값 (헤더에서 감쌈)
+
+
+def _resolve(entry: dict | None) -> Path | None:
+    if not entry:
+        return None
+    p = Path(entry["path"])
+    return p if p.is_absolute() else ROOT / p
+
+
+def _score(card: dict, key: str) -> float:
+    try:
+        return float((card.get("scores") or {}).get(key) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class Snapshot:
+    """manifest 한 generation 에 해당하는 메모리 스냅샷"""
+
+    def __init__(self, manifest: dict):
+        self.manifest = manifest
+        self.generation = manifest.get("generation", "")
+        files = manifest.get("files", {})
+
+        cards_path = _resolve(files.get("cards"))
+        cards = json.loads(cards_path.read_text(encoding="utf-8")) if cards_path and cards_path.exists() else []
+        self.cards = sorted(cards, key=lambda c: _score(c, "priority"), reverse=True)
+        self.by_id = {str(c.get("idea_id")): c for c in self.cards}
+        self.by_cluster = defaultdict(list)
+        for c in self.cards:
+            if c.get("cluster_id"):
+                self.by_cluster[c["cluster_id"]].append(c)
+        # 정렬 기준별 순서를 한 번만 계산 → top-K 는 slice
+        self.ranked = {"priority": self.cards}
+        for key in SCORE_KEYS[1:]:
+            self.ranked[key] = sorted(self.cards, key=lambda c, k=key: _score(c, k), reverse=True)
+
+        summary_path = _resolve(files.get("cluster_summary"))
+        self.clusters = []
+        if summary_path and summary_path.exists():
+            self.clusters = json.loads(summary_path.read_text(encoding="utf-8")).get("clusters", [])
+
+        self.adj = defaultdict(dict)   # node -> {neighbor: [{relation, weight, direction}]}
+        edges_path = _resolve(files.get("edges"))
+        if edges_path and edges_path.exists():
+            with edges_path.open("r", encoding="utf-8") as f:
+                for r in csv.DictReader(f):
+                    w = int(float(r.get("weight") or 1))
+                    self.adj[r["from"]].setdefault(r["to"], []).append(
+                        {"relation": r["relation"], "weight": w, "direction": "out"})
+                    self.adj[r["to"]].setdefault(r["from"], []).append(
+                        {"relation": r["relation"], "weight": w, "direction": "in"})
+
+        # 대화형 그래프: 좌표/지표 export + 인접 목록 (ego 요청마다 전체를 훑지 않게)
+        graph_path = _resolve(files.get("graph"))
+        self.graph = graph_export.load_export(graph_path) if graph_path else None
+        self.graph_index = graph_export.adjacency(self.graph) if self.graph else None
+
+        self._store_path = _resolve(files.get("card_store"))
+        self._matrix_path = _resolve(files.get("score_matrix"))
+        self._matrix = None
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def body(self, key: tuple, build) -> Body:
+        b = self._memo.get(key)
+        if b is None:
+            b = Body(build())
+            with self._lock:
+                if len(self._memo) >= MAX_MEMO:
+                    self._memo.clear()
+                self._memo[key] = b
+        return b
+
+    def warm(self):
+        # 폴링이 잦은 기본 요청은 로드 시점에 미리 만들어 둠
+        self.body(("cards", 1, DEFAULT_PER_PAGE, None), lambda: self.cards_page(1, DEFAULT_PER_PAGE, None))
+        self.body(("top", 10, "priority"), lambda: self.top(10, "priority"))
+        self.body(("daily", None, None, None), lambda: self.daily(None, None, None))
+
+    # -------------------------
+    # payload 빌더
+    # -------------------------
+
+    def cards_page(self, page: int, per_page: int, cluster_id: str | None) -> dict:
+        items = self.by_cluster.get(cluster_id, []) if cluster_id else self.cards
+        start = (page - 1) * per_page
+        return {
+            "generation": self.generation,
+            "page": page,
+            "per_page": per_page,
+            "total": len(items),
+            "items": items[start:start + per_page],
+        }
+
+    def has_card_store(self) -> bool:
+        return bool(self._store_path and self._store_path.exists())
+
+    def filtered_page(self, page: int, per_page: int, filters: dict, by: str) -> dict:
+        # 스냅샷 메모리 대신 SQLite 인덱스 (카드가 많아도 조건에 맞는 행만 읽음)
+        return {
+            "generation": self.generation,
+            "page": page,
+            "per_page": per_page,
+            "filters": filters,
+            "total": card_store.count_cards(self._store_path, **filters),
+            "items": card_store.query_cards(self._store_path, **filters, order=by,
+                                            limit=per_page, offset=(page - 1) * per_page),
+        }
+
+    def top(self, k: int, by: str) -> dict:
+        return {"generation": self.generation, "by": by, "items": self.ranked[by][:k]}
+
+    def neighbors(self, node: str, hops: int) -> dict:
+        visited, frontier = {node}, {node}
+        for _ in range(hops):
+            nxt = set()
+            for u in frontier:
+                nxt.update(self.adj.get(u, {}))
+            nxt -= visited
+            visited |= nxt
+            frontier = nxt
+        edges = [
+            {"from": u if e["direction"] == "out" else v, "to": v if e["direction"] == "out" else u,
+             "relation": e["relation"], "weight": e["weight"]}
+            for u in visited for v, es in self.adj.get(u, {}).items() if v in visited
+            for e in es if e["direction"] == "out"
+        ]
+        return {
+            "generation": self.generation,
+            "node": node,
+            "hops": hops,
+            "nodes": sorted(visited),
+            "edges": edges,
+        }
+
+    def ego(self, node: str, k: int) -> dict | None:
+        sub = graph_export.ego_subgraph(self.graph, node, k, self.graph_index)
+        return sub and {"generation": self.generation, **sub}
+
+    def has_score_matrix(self) -> bool:
+        return bool(self._matrix_path and self._matrix_path.exists())
+
+    def rescore(self, profile: WeightProfile, k: int) -> dict:
+        # numpy 는 이 엔드포인트를 처음 쓸 때만 로드
+        from app.scoring import rescore
+
+        if self._matrix is None:
+            self._matrix = rescore.load_matrix(self._matrix_path)
+        _, custom = rescore.compare_profiles(self._matrix, {"default": DEFAULT_PROFILE, "custom": profile}, k)
+        return {
+            "generation": self.generation,
+            "weights": custom["weights"],
+            "overlap": custom["overlap"],
+            "entered": custom["entered"],
+            "left": custom["left"],
+            "items": custom["items"],
+        }
+
+    def daily(self, start, end, resolution) -> dict:
+        res, rows = rollup.load_series(start, end, resolution, root=ROLLUP_DIR)
+        return {"generation": self.generation, "resolution": res, "rows": rows}
+
+
+class SnapshotHolder:
+    def __init__(self, manifest_path: Path = MANIFEST_PATH):
+        self.manifest_path = Path(manifest_path)
+        self._snap: Snapshot | None = None
+        self._mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Snapshot | None:
+        now = time.monotonic()
+        if self._snap is None or now - self._checked >= RELOAD_CHECK_SEC:
+            self._maybe_reload(now)
+        return self._snap
+
+    def _maybe_reload(self, now: float):
+        with self._lock:
+            self._checked = now
+            try:
+                mtime = self.manifest_path.stat().st_mtime
+            except FileNotFoundError:
+                return
+            if mtime == self._mtime:
+                return
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if self._snap is not None and manifest.get("generation") == self._snap.generation:
+                self._mtime = mtime
+                return
+            snap = Snapshot(manifest)
+            snap.warm()
+            # 참조 교체만 하므로 처리 중인 요청은 이전 스냅샷을 끝까지 사용
+            self._snap, self._mtime = snap, mtime
+            print(f"[api] loaded generation {snap.generation} ({len(snap.cards)} cards)")
+
+
+def _int_arg(name: str, default: int, lo: int, hi: int) -> int:
+    try:
+        v = int(request.args.get(name, default))
+    except ValueError:
+        abort(400, f"{name} must be an integer")
+    return max(lo, min(hi, v))
+
+
+def _card_filters() -> dict:
+    """card_store 조회 조건 (없으면 빈 dict → 메모리 스냅샷 페이지)"""
+    filters = {}
+    tags, risks = request.args.getlist("tag"), request.args.getlist("risk")
+    if tags:
+        filters["tags"] = tuple(sorted(set(tags)))
+    if risks:
+        filters["risks"] = tuple(sorted(set(risks)))
+    if "min_priority" in request.args:
+        try:
+            filters["min_priority"] = float(request.args["min_priority"])
+        except ValueError:
+            abort(400, "min_priority must be a number")
+    for name in ("since", "until"):
+        v = request.args.get(name)
+        if v:
+            try:
+                datetime.strptime(v, "%Y-%m-%d")
+            except ValueError:
+                abort(400, f"{name} must be YYYY-MM-DD")
+            filters[name] = v
+    return filters
+
+
+def create_app(manifest_path: Path = MANIFEST_PATH) -> Flask:
+    app = Flask(__name__)
+    holder = SnapshotHolder(manifest_path)
+
+    def snapshot() -> Snapshot:
+        snap = holder.get()
+        if snap is None:
+            abort(503, "no published snapshot yet (run `python -m app.main`)")
+        return snap
+
+    def respond(body: Body) -> Response:
+        headers = {
+            "ETag": f'"{body.etag}"',
+            "Cache-Control": "no-cache",   # 항상 재검증 → 바뀌지 않았으면 304
+            "Vary": "Accept-Encoding",
+        }
+        if request.if_none_match.contains_weak(body.etag):
+            return Response(status=304, headers=headers)
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            data = body.gz
+        else:
+            data = body.raw
+        return Response(data, status=200, headers=headers, mimetype="application/json")
+
+    @app.get("/api/v1/health")
+    def health():
+        snap = holder.get()
+        payload = {
+            "ok": snap is not None,
+            "generation": snap.generation if snap else None,
+            "published_at": snap.manifest.get("published_at") if snap else None,
+            "cards": len(snap.cards) if snap else 0,
+        }
+        return respond(Body(payload))
+
+    @app.get("/api/v1/cards")
+    def cards():
+        snap = snapshot()
+        page = _int_arg("page", 1, 1, 10 ** 6)
+        per_page = _int_arg("per_page", DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+        cluster_id = request.args.get("cluster_id") or None
+        filters = _card_filters()
+        if filters:
+            if not snap.has_card_store():
+                abort(404, "no card store in this snapshot")
+            by = request.args.get("by", "priority")
+            if by not in SCORE_KEYS:
+                abort(400, f"by must be one of {', '.join(SCORE_KEYS)}")
+            filters["cluster_id"] = cluster_id
+            key = ("filtered", page, per_page, by, tuple(sorted((k, str(v)) for k, v in filters.items())))
+            return respond(snap.body(key, lambda: snap.filtered_page(page, per_page, filters, by)))
+        key = ("cards", page, per_page, cluster_id)
+        return respond(snap.body(key, lambda: snap.cards_page(page, per_page, cluster_id)))
+
+    @app.get("/api/v1/cards/<idea_id>")
+    def card(idea_id):
+        snap = snapshot()
+        if idea_id not in snap.by_id:
+            abort(404)
+        return respond(snap.body(("card", idea_id), lambda: snap.by_id[idea_id]))
+
+    @app.get("/api/v1/top")
+    def top():
+        snap = snapshot()
+        k = _int_arg("k", 10, 1, MAX_TOP_K)
+        by = request.args.get("by", "priority")
+        if by not in snap.ranked:
+            abort(400, f"by must be one of {', '.join(SCORE_KEYS)}")
+        return respond(snap.body(("top", k, by), lambda: snap.top(k, by)))
+
+    @app.get("/api/v1/clusters")
+    def clusters():
+        snap = snapshot()
+        k = _int_arg("k", 20, 1, MAX_TOP_K)
+        return respond(snap.body(("clusters", k), lambda: {"generation": snap.generation,
+                                                           "items": snap.clusters[:k]}))
+
+    @app.get("/api/v1/rescore")
+    def rescore():
+        snap = snapshot()
+        if not snap.has_score_matrix():
+            abort(404, "no score matrix in this snapshot")
+        k = _int_arg("k", 20, 1, MAX_TOP_K)
+        weights = {key: v for key, v in request.args.items() if key != "k"}
+        try:
+            profile = WeightProfile.from_dict({**DEFAULT_PROFILE.to_dict(), **weights})
+        except (TypeError, ValueError) as e:
+            abort(400, str(e))
+        key = ("rescore", k, tuple(sorted(profile.to_dict().items())))
+        return respond(snap.body(key, lambda: snap.rescore(profile, k)))
+
+    @app.get("/api/v1/graph/neighbors")
+    def neighbors():
+        snap = snapshot()
+        node = request.args.get("node", "")
+        if node not in snap.adj:
+            abort(404, f"unknown node: {node}")
+        hops = _int_arg("hops", 1, 1, MAX_HOPS)
+        return respond(snap.body(("neighbors", node, hops), lambda: snap.neighbors(node, hops)))
+
+    @app.get("/api/v1/graph/ego")
+    def ego():
+        snap = snapshot()
+        if not snap.graph:
+            abort(404, "no graph export in this snapshot")
+        node = request.args.get("node") or graph_export.default_center(snap.graph)
+        if node not in snap.graph_index[0]:
+            abort(404, f"unknown node: {node}")
+        k = _int_arg("k", 1, 0, graph_export.MAX_EGO_HOPS)
+        return respond(snap.body(("ego", node, k), lambda: snap.ego(node, k)))
+
+    @app.get("/api/v1/metrics/daily")
+    def daily():
+        snap = snapshot()
+        start, end = request.args.get("start"), request.args.get("end")
+        resolution = request.args.get("resolution")
+        if resolution not in (None, "daily", "weekly", "monthly"):
+            abort(400, "resolution must be daily, weekly or monthly")
+        try:
+            body = snap.body(("daily", start, end, resolution), lambda: snap.daily(start, end, resolution))
+        except ValueError:
+            abort(400, "start/end must be YYYY-MM-DD")
+        return respond(body)
+
+    return app
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m app.ui.api", description="read-only cards/graph API")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--manifest", default=str(MANIFEST_PATH))
+    args = ap.parse_args(argv)
+    create_app(Path(args.manifest)).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,29 @@
 from __future__ import annotations
 
 import json
+import sys
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
+import altair as alt
 import streamlit as st
 
 ROOT = Path(__file__).resolve().parents[2]  # 프로젝트 루트
+if str(ROOT) not in sys.path:
+    # `streamlit run app/ui/dashboard.py` 는 app/ui 만 path에 넣음
+    sys.path.insert(0, str(ROOT))
+
+from app.knowledge.search_index import SearchIndex
+from app.knowledge import card_store, rollup
+from app.presentation import graph_export
+
 REPORT_PATH = ROOT / "data" / "reports" / "idea_cards.json"
+SEARCH_INDEX_PATH = ROOT / "data" / "reports" / "search_index.json"
+CLUSTER_SUMMARY_PATH = ROOT / "data" / "reports" / "cluster_summary.json"
+CARD_STORE_PATH = ROOT / "data" / "reports" / "card_store.sqlite"
+GRAPH_EXPORT_PATH = ROOT / "data" / "reports" / "graph.json"
 SNAPSHOTS_DIR = ROOT / "snapshots"
+ROLLUP_DIR = ROOT / rollup.ROLLUP_DIR
 
 
 def load_cards() -> list[dict]:
@@ -17,6 +32,28 @@ def load_cards() -> list[dict]:
     return json.loads(REPORT_PATH.read_text(encoding="utf-8"))
 
 
+@st.cache_resource
+def _load_search_index(mtime: float) -> SearchIndex | None:
+    # mtime이 바뀔 때만 다시 로드 (파이프라인이 새로 export 했을 때)
+    return SearchIndex.load(SEARCH_INDEX_PATH)
+
+
+def load_search_index() -> SearchIndex | None:
+    if not SEARCH_INDEX_PATH.exists():
+        return None
+    return _load_search_index(SEARCH_INDEX_PATH.stat().st_mtime)
+
+
+def load_cluster_summary() -> list[dict]:
+    if not CLUSTER_SUMMARY_PATH.exists():
+        return []
+    return json.loads(CLUSTER_SUMMARY_PATH.read_text(encoding="utf-8")).get("clusters", [])
+
+
+def as_text(v) -> str:
+    return ", ".join(v) if isinstance(v, list) else str(v)
+
+
 def score_of(card: dict) -> float:
     s = card.get("scores") or {}
     try:
@@ -25,6 +62,44 @@ def score_of(card: dict) -> float:
         return 0.0
 
 
+@st.cache_resource
+def _load_graph(mtime: float):
+    # mtime이 바뀔 때만 다시 로드 (graph_export 스테이지가 새로 썼을 때)
+    export = graph_export.load_export(GRAPH_EXPORT_PATH)
+    return export, (graph_export.adjacency(export) if export else None)
+
+
+def load_graph():
+    if not GRAPH_EXPORT_PATH.exists():
+        return None, None
+    return _load_graph(GRAPH_EXPORT_PATH.stat().st_mtime)
+
+
+def ego_chart(sub: dict):
+    """ego subgraph → Altair (엣지 선 + 노드 원, 크기 = pagerank, 색 = 노드 타입). 좌표는 export 값 그대로"""
+    at = {n["id"]: n for n in sub["nodes"]}
+    edge_rows = [
+        {"x": at[e["source"]]["x"], "y": at[e["source"]]["y"], "x2": at[e["target"]]["x"],
+         "y2": at[e["target"]]["y"], "relation": e["relation"], "weight": e["weight"]}
+        for e in sub["edges"]
+    ]
+    axis = {"axis": None}
+    edges = alt.Chart(alt.Data(values=edge_rows)).mark_rule(opacity=0.35).encode(
+        x=alt.X("x:Q", **axis), y=alt.Y("y:Q", **axis), x2="x2:Q", y2="y2:Q",
+        tooltip=["relation:N", "weight:Q"],
+    )
+    nodes = alt.Chart(alt.Data(values=sub["nodes"])).mark_circle(opacity=0.9).encode(
+        x=alt.X("x:Q", **axis), y=alt.Y("y:Q", **axis),
+        size=alt.Size("pagerank:Q", legend=None, scale=alt.Scale(range=[40, 800])),
+        color=alt.Color("type:N"),
+        tooltip=["id:N", "type:N", "degree:Q", "betweenness:Q", "pagerank:Q", "impact:Q", "hop:Q"],
+    )
+    # 라벨은 중심과 1-hop 만 (2~3 hop 까지 붙이면 겹쳐서 안 보임)
+    labels = nodes.mark_text(dy=-12, fontSize=10).encode(text="id:N", size=alt.value(10)).transform_filter(
+        "datum.hop <= 1")
+    return (edges + nodes + labels).properties(height=420).interactive()
+
+
 def latest_graph_image() -> Path | None:
     # 1) latest 우선
     p = SNAPSHOTS_DIR / "reference_graph_latest.png"
@@ -38,6 +113,23 @@ def latest_graph_image() -> Path | None:
     return pngs[0] if pngs else None
 
 
+def render_card(i: int, c: dict, expanded: bool):
+    title = c.get("title") or c.get("idea") or f"idea_{i}"
+    summary = c.get("summary") or c.get("one_liner") or ""
+    url = c.get("url") or ""
+    tags = c.get("tags") or []
+    risks = c.get("risks") or []
+
+    with st.expander(f"#{i} {title}  (priority={score_of(c):.2f})", expanded=expanded):
+        if summary:
+            st.write(summary)
+        if url:
+            st.write(url)
+        st.write("**tags**:", as_text(tags))
+        st.write("**risks**:", as_text(risks))
+        st.json(c)
+
+
 st.set_page_config(page_title="Idea Decision Dashboard", layout="wide")
 
 st.title("Idea Decision Dashboard")
@@ -54,63 +146,131 @@ if not cards:
 st.sidebar.header("Filters")
 top_n = st.sidebar.slider("Top N", 5, 50, 10)
 min_priority = st.sidebar.slider("Min Priority", 0.0, 1.0, 0.0, 0.05)
-q = st.sidebar.text_input("Search (title/summary/features/risks)", "")
+q = st.sidebar.text_input("Search (title/summary/tags/risks)", "")
+group_clusters = st.sidebar.checkbox("Group by cluster", value=False)
+
+# 태그/리스크/기간 조건은 card_store(SQLite 인덱스)로 조회 — 지난 실행의 카드까지 포함
+store_filters = {}
+if CARD_STORE_PATH.exists():
+    pick_tags = st.sidebar.multiselect("Tags (all of)", [v for v, _ in card_store.facets("tags", CARD_STORE_PATH)])
+    pick_risks = st.sidebar.multiselect("Risks (all of)", [v for v, _ in card_store.facets("risks", CARD_STORE_PATH)])
+    days = st.sidebar.selectbox("Created", [0, 7, 30, 90, 365],
+                                format_func=lambda d: "any time" if d == 0 else f"last {d} days")
+    if pick_tags:
+        store_filters["tags"] = pick_tags
+    if pick_risks:
+        store_filters["risks"] = pick_risks
+    if days:
+        store_filters["since"] = (date.today() - timedelta(days=days)).isoformat()
 
 # Filter + sort
-filtered = []
-for c in cards:
-    pri = score_of(c)
-    if pri < min_priority:
-        continue
-
-    title = (c.get("title") or c.get("idea") or "").lower()
-    summary = (c.get("summary") or c.get("one_liner") or "").lower()
-    features = c.get("features") or []
-    risks = c.get("risks") or []
+by_id = {str(c.get("idea_id")): c for c in cards}
+index = load_search_index()
 
-    hay = " ".join([
-        title,
-        summary,
-        " ".join(features) if isinstance(features, list) else str(features),
-        " ".join(risks) if isinstance(risks, list) else str(risks),
-    ])
+if store_filters:
+    stored = card_store.query_cards(CARD_STORE_PATH, **store_filters, min_priority=min_priority,
+                                    limit=card_store.MAX_LIMIT)
+    if q.strip() and index is not None:
+        # 조건에 맞는 카드 안에서 검색 순위
+        stored_by_id = {str(c.get("idea_id")): c for c in stored}
+        filtered = [stored_by_id[i] for i, _ in index.search(q) if i in stored_by_id]
+    else:
+        filtered = stored
+    by_id.update({str(c.get("idea_id")): c for c in stored})
+elif q.strip() and index is not None:
+    # 역색인 검색: 매치된 posting만 보고 랭킹 순서 유지
+    ranked = [by_id[i] for i, _ in index.search(q) if i in by_id]
+    filtered = [c for c in ranked if score_of(c) >= min_priority]
+else:
+    filtered = []
+    for c in cards:
+        if score_of(c) < min_priority:
+            continue
 
-    if q.strip() and q.strip().lower() not in hay:
-        continue
+        if q.strip():
+            # 인덱스가 아직 없을 때만 선형 스캔
+            hay = " ".join([
+                (c.get("title") or "").lower(),
+                (c.get("summary") or "").lower(),
+                as_text(c.get("tags") or []).lower(),
+                as_text(c.get("risks") or []).lower(),
+            ])
+            if q.strip().lower() not in hay:
+                continue
 
-    filtered.append(c)
+        filtered.append(c)
+    filtered = sorted(filtered, key=score_of, reverse=True)
 
-filtered = sorted(filtered, key=score_of, reverse=True)
 top = filtered[:top_n]
 
 colA, colB = st.columns([2, 1])
 
 with colA:
-    st.subheader("Top Cards")
-    for i, c in enumerate(top, start=1):
-        title = c.get("title") or c.get("idea") or f"idea_{i}"
-        summary = c.get("summary") or c.get("one_liner") or ""
-        url = c.get("url") or ""
-        features = c.get("features") or []
-        risks = c.get("risks") or []
-
-        with st.expander(f"#{i} {title}  (priority={score_of(c):.2f})", expanded=(i <= 3)):
-            if summary:
-                st.write(summary)
-            if url:
-                st.write(url)
-            st.write("**features**:", ", ".join(features) if isinstance(features, list) else str(features))
-            st.write("**risks**:", ", ".join(risks) if isinstance(risks, list) else str(risks))
-            st.json(c)
+    clusters = load_cluster_summary() if group_clusters else []
+    if group_clusters and not clusters:
+        st.info("`cluster_summary.json`이 없어요. 파이프라인을 한 번 돌리면 생성됩니다.")
+    if clusters:
+        # 클러스터 단위 랭킹: 필터를 통과한 카드가 있는 클러스터만
+        st.subheader("Top Clusters")
+        passed = {str(c.get("idea_id")) for c in filtered}
+        shown = [cl for cl in clusters if passed.intersection(map(str, cl["idea_ids"]))][:top_n]
+        for i, cl in enumerate(shown, start=1):
+            members = sorted(
+                (by_id[str(x)] for x in cl["idea_ids"] if str(x) in passed),
+                key=score_of, reverse=True,
+            )
+            st.markdown(
+                f"**#{i} {cl['representative']['title']}** — `{cl['label']}` "
+                f"(priority={cl['priority']:.2f}, cards={len(members)}, total={cl['size_total']})"
+            )
+            for j, c in enumerate(members, start=1):
+                render_card(j, c, expanded=False)
+    else:
+        st.subheader("Top Cards")
+        for i, c in enumerate(top, start=1):
+            render_card(i, c, expanded=(i <= 3))
 
 with colB:
-    st.subheader("Latest Graph")
-    img = latest_graph_image()
-    if img:
-        st.image(str(img), use_container_width=True)
-        st.caption(str(img.relative_to(ROOT)))
+    st.subheader("Graph")
+    graph, graph_index = load_graph()
+    if graph and graph["nodes"]["id"]:
+        # 고른 노드 주변만 그림 (좌표/지표는 graph_export 가 미리 계산)
+        ids = graph["nodes"]["id"]
+        degree = dict(zip(ids, graph["nodes"]["degree"]))
+        options = sorted(ids, key=lambda n: (-degree[n], n))
+        center = graph_export.default_center(graph)
+        node = st.selectbox("Node", options, index=options.index(center) if center in options else 0)
+        hops = st.slider("Hops", 1, graph_export.MAX_EGO_HOPS, 1)
+        sub = graph_export.ego_subgraph(graph, node, hops, graph_index)
+        st.altair_chart(ego_chart(sub), use_container_width=True)
+        st.caption(f"{len(sub['nodes'])} nodes / {len(sub['edges'])} edges of {len(ids)} nodes"
+                   + (" (truncated)" if sub["truncated"] else "") + f" · {graph.get('date') or ''}")
+    else:
+        img = latest_graph_image()
+        if img:
+            st.image(str(img), use_container_width=True)
+            st.caption(str(img.relative_to(ROOT)))
+        else:
+            st.info("`data/reports/graph.json`도 `snapshots/` 그래프 이미지도 없어요.")
+
+    st.subheader("Daily Trend")
+    state = rollup.load_state(ROLLUP_DIR)
+    if state["max_date"]:
+        lo = datetime.strptime(state["min_date"], "%Y-%m-%d").date()
+        hi = datetime.strptime(state["max_date"], "%Y-%m-%d").date()
+        picked = st.date_input("Range", (lo, hi), min_value=lo, max_value=hi)
+        start, end = picked if isinstance(picked, tuple) and len(picked) == 2 else (lo, hi)
+        # 범위에 맞춰 daily/weekly/monthly 롤업 선택 → 포인트 수 상한 고정
+        resolution, rows = rollup.load_series(start, end, root=ROLLUP_DIR)
+        st.caption(f"resolution: {resolution} ({len(rows)} points)")
+        if rows:
+            series = {
+                r["date"]: float(r["interest_score"])
+                for r in rows if r.get("interest_score") not in (None, "")
+            }
+            st.line_chart(series)
     else:
-        st.info("`snapshots/`에 그래프 이미지가 없어요.")
+        st.info("롤업이 아직 없어요. 파이프라인을 한 번 돌리면 생성됩니다.")
 
     st.subheader("Quick Commands")
     st.code("python -m app.main", language="bash")
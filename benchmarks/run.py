@@ -0,0 +1,311 @@
+"""
+오프라인 벤치마크: 스테이지별 시간을 규모별로 재고 baseline과 비교한다.
+
+    python -m benchmarks.run                                   # 30,1k,100k,1M 전부
+    python -m benchmarks.run --scales 30,1k --stages tag,score
+    python -m benchmarks.run --save-baseline                   # 현재 결과를 baseline으로 저장
+    python -m benchmarks.run --scales 30,1k --check            # regression/처리량 미달이면 exit 1 (CI 용)
+    python -m benchmarks.run --latency-ms 40 --thread-sizes pareto:1.3,2
+
+fetch 는 로컬 stub 서버(benchmarks.stub_algolia)를 상대로 측정한다. 네트워크는 쓰지 않는다.
+baseline(benchmarks/baseline.json, 커밋됨)과 비교해 regression(threshold 이상 느려짐)과 tag 처리량 미달을 출력.
+--check 일 때만 그 경우 exit code 1 (기계가 다르면 숫자도 다르므로 기본 실행은 보고만).
+baseline 에 없는 (스테이지, 규모)를 잰 경우도 --check 는 실패 → 먼저 --save-baseline 으로 채울 것
+(--save-baseline 은 이번에 잰 항목만 교체하고 나머지 항목은 남김).
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.synthetic import SyntheticCorpus, parse_scale
+
+ROOT = Path(__file__).resolve().parent
+RESULTS_DIR = ROOT / "results"
+BASELINE_PATH = ROOT / "baseline.json"
+
+DEFAULT_SCALES = "30,1k,100k,1M"
+STAGES = ["fetch", "tag", "aggregate", "graph", "score", "rescore"]
+
+# 기본 상한: fetch는 요청 수 = 케이스 수, graph는 betweenness가 O(VE)라 큰 규모는 의미 없이 오래 걸림
+# (--no-caps 또는 --max-scale graph=100k 로 해제)
+DEFAULT_CAPS = {"fetch": 1_000, "graph": 1_000}
+
+MIN_DELTA_SEC = 0.005   # 이보다 작은 차이는 노이즈로 취급
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+def _time(fn, repeat: int):
+    runs, out = [], None
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        out = fn()
+        runs.append(time.perf_counter() - t0)
+    return out, runs
+
+
+# -------------------------
+# 스테이지 구현 (실제 파이프라인 함수 호출)
+# -------------------------
+
+def bench_fetch(n: int, args):
+    from app.ingestion import hn_fetch
+    from benchmarks.stub_algolia import StubConfig, StubServer
+
+    cfg = StubConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, thread_sizes=args.thread_sizes)
+    with StubServer(cfg) as base:
+        saved = (hn_fetch.ALGOLIA_SEARCH, hn_fetch.ALGOLIA_ITEM, hn_fetch.SOURCE_BUDGETS)
+        hn_fetch.ALGOLIA_SEARCH = f"{base}/search"
+        hn_fetch.ALGOLIA_ITEM = f"{base}/items"
+        hn_fetch.SOURCE_BUDGETS = {"algolia": {"rate": 0}}   # stub 상대로는 속도 제한 없이
+        try:
+            per_query = min(1000, math.ceil(n / len(hn_fetch.QUERIES)) + 5)
+
+            def run():
+                hits = hn_fetch.search_hits(max_results=n, hits_per_query=per_query)
+                return hits, hn_fetch.fetch_threads(hits)
+
+            return _time(run, args.repeat_for(n))
+        finally:
+            hn_fetch.ALGOLIA_SEARCH, hn_fetch.ALGOLIA_ITEM, hn_fetch.SOURCE_BUDGETS = saved
+
+
+def bench_tag(data, args):
+    from app.ingestion import hn_fetch
+
+    hits, threads = data
+    return _time(lambda: hn_fetch.tag_cases(hits, threads), args.repeat_for(len(hits)))
+
+
+def bench_aggregate(cases, args):
+    from app.ingestion import hn_fetch
+
+    def run():
+        counter = hn_fetch.build_edge_counter(cases)
+        rows = hn_fetch.edge_rows(counter, "2026-01-01")
+        return rows, hn_fetch.compute_daily_row(cases, "2026-01-01")
+
+    return _time(run, args.repeat_for(len(cases)))
+
+
+def bench_graph(edge_rows, n: int, args):
+    from app.presentation import plot_graph
+
+    def run():
+        G = plot_graph.build_graph((r["from"], r["to"]) for r in edge_rows)
+        return plot_graph.compute_insights(G)
+
+    return _time(run, args.repeat_for(n))
+
+
+def bench_score(cases, args):
+    from app.main import finalize_priorities, to_cards
+
+    return _time(lambda: finalize_priorities(to_cards(cases)), args.repeat_for(len(cases)))
+
+
+def bench_rescore(cards, args):
+    # 저장된 점수 행렬만으로 여러 가중치 프로필 비교 (카드 생성/행렬 저장은 측정 제외)
+    from app.scoring import rescore
+    from app.scoring.priority import WeightProfile
+
+    matrix = rescore.build_matrix(cards)
+    profiles = {
+        "default": WeightProfile(),
+        "momentum": WeightProfile(momentum=0.35, feasibility=0.35),
+        "novelty": WeightProfile(novelty=0.30, feasibility=0.30),
+    }
+    return _time(lambda: rescore.compare_profiles(matrix, profiles, k=50), args.repeat_for(len(cards)))
+
+
+# -------------------------
+# 비교
+# -------------------------
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[dict]:
+    base = {(r["stage"], r["scale"]): r for r in baseline.get("results", [])}
+    report = []
+    for r in results:
+        b = base.get((r["stage"], r["scale"]))
+        if not b:
+            # 비교할 기준이 없으면 regression 을 잡을 수 없음 → --check 에서 실패로 봄
+            report.append({"stage": r["stage"], "scale": r["scale"], "baseline": None, "current": r["seconds"],
+                           "ratio": None, "regressed": False, "missing": True})
+            continue
+        ratio = r["seconds"] / b["seconds"] if b["seconds"] > 0 else float("inf")
+        regressed = ratio > 1 + threshold and (r["seconds"] - b["seconds"]) > MIN_DELTA_SEC
+        report.append({
+            "stage": r["stage"], "scale": r["scale"],
+            "baseline": b["seconds"], "current": r["seconds"],
+            "ratio": round(ratio, 3), "regressed": regressed,
+        })
+    return report
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.run", description="offline stage benchmarks")
+    ap.add_argument("--scales", default=DEFAULT_SCALES)
+    ap.add_argument("--stages", default=",".join(STAGES))
+    ap.add_argument("--latency-ms", type=float, default=5.0, help="stub 응답 지연 평균")
+    ap.add_argument("--jitter-ms", type=float, default=2.0)
+    ap.add_argument("--thread-sizes", default="lognormal:1.2,1.1", help="fixed:N | lognormal:mu,sigma | pareto:a,s")
+    ap.add_argument("--repeat", type=int, default=3, help="1k 이하 규모의 반복 횟수 (큰 규모는 1회)")
+    ap.add_argument("--max-scale", action="append", default=[], metavar="STAGE=N")
+    ap.add_argument("--no-caps", action="store_true")
+    ap.add_argument("--baseline", default=str(BASELINE_PATH))
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--threshold", type=float, default=0.20, help="regression 판정 비율 (0.2 = 20%% 느려짐)")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--check", action="store_true", help="regression/처리량 미달이면 exit 1")
+    args = ap.parse_args(argv)
+    args.repeat_for = lambda n: args.repeat if n <= 1_000 else 1
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scales = [parse_scale(s) for s in args.scales.split(",") if s.strip()]
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    caps = {} if args.no_caps else dict(DEFAULT_CAPS)
+    for spec in args.max_scale:
+        k, _, v = spec.partition("=")
+        caps[k] = parse_scale(v)
+
+    corpus = SyntheticCorpus(seed=args.seed, thread_sizes=args.thread_sizes)
+    results, skipped, below_target = [], [], []
+
+    def record(stage, n, runs):
+        med = statistics.median(runs)
+        results.append({
+            "stage": stage, "scale": n, "seconds": round(med, 6),
+            "runs": [round(x, 6) for x in runs],
+            "per_item_us": round(med / max(1, n) * 1e6, 3),
+        })
+        print(f"[bench] {stage:<9} n={n:<8} {med:9.4f}s  ({med / max(1, n) * 1e6:.1f} µs/case)")
+
+    for n in scales:
+        print(f"\n[bench] scale={n}")
+        # 입력 데이터 생성은 측정에서 제외
+        data = corpus.hits_and_threads(n)
+        cases = edges = scored = None
+
+        for stage in STAGES:
+            if stage not in stages:
+                continue
+            if n > caps.get(stage, n):
+                skipped.append({"stage": stage, "scale": n, "reason": f"cap {caps[stage]}"})
+                print(f"[bench] {stage:<9} n={n:<8} skipped (cap {caps[stage]})")
+                continue
+
+            if stage == "fetch":
+                _, runs = bench_fetch(n, args)
+            elif stage == "tag":
+                cases, runs = bench_tag(data, args)
+            else:
+                if cases is None:
+                    from app.ingestion import hn_fetch
+                    cases = hn_fetch.tag_cases(*data)
+                if stage == "aggregate":
+                    (edges, _), runs = bench_aggregate(cases, args)
+                elif stage == "graph":
+                    if edges is None:
+                        from app.ingestion import hn_fetch
+                        edges = hn_fetch.edge_rows(hn_fetch.build_edge_counter(cases), "2026-01-01")
+                    _, runs = bench_graph(edges, n, args)
+                elif stage == "score":
+                    scored, runs = bench_score(cases, args)
+                elif stage == "rescore":
+                    if scored is None:
+                        from app.main import finalize_priorities, to_cards
+                        scored = finalize_priorities(to_cards(cases))
+                    _, runs = bench_rescore([c.model_dump() for c in scored], args)
+                else:
+                    continue
+            record(stage, n, runs)
+            if stage == "tag":
+                # 댓글 단위 태깅은 스레드를 자르지 않으므로 처리량(댓글/초)을 목표치와 비교
+                from app.ingestion.comment_tagging import TARGET_COMMENTS_PER_SEC
+                n_comments = sum(len(t) for t in data[1].values())
+                rate = n_comments / max(1e-9, results[-1]["seconds"])
+                results[-1]["comments_per_sec"] = round(rate)
+                ok = n_comments < 1_000 or rate >= TARGET_COMMENTS_PER_SEC
+                if not ok:
+                    below_target.append(f"tag n={n}")
+                print(f"[bench] tag       {n_comments} comments, {rate:,.0f}/s "
+                      f"(target {TARGET_COMMENTS_PER_SEC:,}/s{'' if ok else ' BELOW TARGET'})")
+
+        del data, cases, edges, scored
+        gc.collect()
+
+    payload = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_rev": _git_rev(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "latency_ms": args.latency_ms,
+            "thread_sizes": args.thread_sizes,
+            "seed": args.seed,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out = RESULTS_DIR / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    baseline_path = Path(args.baseline)
+    if baseline_path.exists():
+        payload["comparison"] = compare(results, json.loads(baseline_path.read_text(encoding="utf-8")), args.threshold)
+    out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"\n[bench] saved -> {out}")
+
+    if args.save_baseline:
+        # 이번에 잰 (스테이지, 규모)만 교체 — 이 기계에서 못 돌린 스테이지의 기존 항목은 남김
+        measured = {(r["stage"], r["scale"]) for r in results}
+        old = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+        kept = [r for r in old.get("results", []) if (r["stage"], r["scale"]) not in measured]
+        merged = sorted(kept + results, key=lambda r: (STAGES.index(r["stage"]) if r["stage"] in STAGES else 99,
+                                                       r["scale"]))
+        baseline_path.write_text(json.dumps({"meta": payload["meta"], "results": merged}, indent=2), encoding="utf-8")
+        print(f"[bench] baseline -> {baseline_path}")
+        return 0
+
+    comparison = payload.get("comparison", [])
+    if not baseline_path.exists():
+        comparison = [{"stage": r["stage"], "scale": r["scale"], "missing": True} for r in results]
+    regressions = [c for c in comparison if c["regressed"]] if baseline_path.exists() else []
+    missing = [c for c in comparison if c.get("missing")]
+    if below_target:
+        print(f"[bench] below throughput target: {', '.join(below_target)}")
+    for c in comparison:
+        if c.get("missing"):
+            print(f"[bench] {c['stage']:<9} n={c['scale']:<8} no baseline entry")
+            continue
+        flag = "REGRESSION" if c["regressed"] else "ok"
+        print(f"[bench] {c['stage']:<9} n={c['scale']:<8} {c['baseline']:.4f}s -> {c['current']:.4f}s x{c['ratio']:.2f} {flag}")
+    if regressions:
+        print(f"[bench] {len(regressions)} regression(s) over {args.threshold:.0%}")
+    if missing:
+        print(f"[bench] {len(missing)} measurement(s) without a baseline (run --save-baseline on the reference machine)")
+    return 1 if args.check and (regressions or below_target or missing) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
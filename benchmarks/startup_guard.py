@@ -0,0 +1,202 @@
+"""
+CLI 시작 시간 가드: 엔트리 포인트가 무거운 의존성을 끌어오지 않는지, 시작 시간이 늘지 않았는지 확인.
+
+    python -m benchmarks.startup_guard                  # 절대 예산(BUDGET_SEC) 확인 + baseline 이 있으면 비교
+    python -m benchmarks.startup_guard --save-baseline
+    python -m benchmarks.startup_guard --importtime     # 대상별 import 비용 상위 모듈 출력
+
+대상마다 새 인터프리터를 띄워 (1) 전체 wall time 의 중앙값을 재고 (2) 끝난 뒤 sys.modules 를 확인한다.
+금지 모듈(FORBIDDEN)이 로드되거나 BUDGET_SEC 를 넘으면 baseline 과 무관하게 실패.
+baseline(startup_baseline.json)은 기계마다 다르므로 커밋하지 않음 — 같은 기계에서 전후 비교할 때만 --save-baseline.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+REPO = ROOT.parent
+RESULTS_DIR = ROOT / "results"
+BASELINE_PATH = ROOT / "startup_baseline.json"
+
+MIN_DELTA_SEC = 0.03    # 프로세스 기동 노이즈보다 작은 차이는 무시
+
+# 대상별 절대 예산 (초, 중앙값). 측정값 main 0.14s / fetch 0.26s / scoring 0.09s 의 2~3배
+# → 무거운 의존성이 시작 경로에 들어오면 baseline 없이도 걸림
+BUDGET_SEC = {"main_help": 0.4, "main_import": 0.4, "fetch_import": 0.6, "scoring_import": 0.3}
+
+# 시작할 때 로드되면 안 되는 모듈 (해당 스테이지 안에서만 import)
+FORBIDDEN = ("pandas", "networkx", "matplotlib", "numpy", "scipy", "pydantic",
+             "bs4", "feedparser", "flask", "streamlit")
+
+# name -> (kind, module, argv)
+#   run    : python -m module argv  (argparse --help 의 SystemExit 까지 포함)
+#   import : import module          (fetch/scoring 만 쓰는 코드가 치르는 비용)
+TARGETS = {
+    "main_help": ("run", "app.main", ["--help"]),
+    "main_import": ("import", "app.main", []),
+    "fetch_import": ("import", "app.ingestion.hn_fetch", []),
+    "scoring_import": ("import", "app.scoring.priority", []),
+}
+
+_PROBE = r"""
+import io, json, runpy, sys, contextlib
+kind, mod, argv = json.loads(sys.argv[1])
+err = None
+try:
+    if kind == "run":
+        sys.argv = [mod] + argv
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_module(mod, run_name="__main__", alter_sys=True)
+    else:
+        __import__(mod)
+except SystemExit:
+    pass
+except Exception as e:
+    err = f"{type(e).__name__}: {e}"
+print(json.dumps({"modules": sorted(sys.modules), "error": err}))
+"""
+
+
+def probe(kind: str, module: str, argv: list[str]) -> tuple[float, dict]:
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE, json.dumps([kind, module, argv])],
+        cwd=REPO, capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    wall = time.perf_counter() - t0
+    try:
+        info = json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        info = {"modules": [], "error": (proc.stderr.strip().splitlines() or ["probe failed"])[-1]}
+    return wall, info
+
+
+def importtime(module: str, top: int = 10) -> list[tuple[int, str]]:
+    """-X importtime 의 cumulative(µs) 기준 상위 모듈 (run 대상도 비용 대부분이 import 라 같은 방식)"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=REPO, capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cum), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def heavy_loaded(modules: list[str]) -> list[str]:
+    return sorted({m.split(".")[0] for m in modules} & set(FORBIDDEN))
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[dict]:
+    base = {r["target"]: r for r in baseline.get("results", [])}
+    report = []
+    for r in results:
+        b = base.get(r["target"])
+        if not b:
+            continue
+        ratio = r["seconds"] / b["seconds"] if b["seconds"] > 0 else float("inf")
+        regressed = ratio > 1 + threshold and (r["seconds"] - b["seconds"]) > MIN_DELTA_SEC
+        report.append({
+            "target": r["target"], "baseline": b["seconds"], "current": r["seconds"],
+            "ratio": round(ratio, 3), "regressed": regressed,
+        })
+    return report
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.startup_guard", description="CLI startup time guard")
+    ap.add_argument("--targets", default=",".join(TARGETS))
+    ap.add_argument("--repeat", type=int, default=7, help="대상별 실행 횟수 (중앙값 사용)")
+    ap.add_argument("--baseline", default=str(BASELINE_PATH))
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--threshold", type=float, default=0.25, help="regression 판정 비율 (0.25 = 25%% 느려짐)")
+    ap.add_argument("--importtime", action="store_true", help="대상별 import 비용 상위 모듈 출력")
+    return ap.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = [t for t in names if t not in TARGETS]
+    if unknown:
+        print(f"[startup] unknown target(s): {', '.join(unknown)}")
+        return 2
+
+    results, failures = [], []
+    for name in names:
+        kind, module, targv = TARGETS[name]
+        probe(kind, module, targv)   # 첫 실행은 .pyc/파일 캐시 워밍업으로 버림
+        runs, info = [], {}
+        for _ in range(args.repeat):
+            wall, info = probe(kind, module, targv)
+            runs.append(wall)
+        med = statistics.median(runs)
+        heavy = heavy_loaded(info.get("modules", []))
+        results.append({
+            "target": name, "seconds": round(med, 6), "runs": [round(x, 6) for x in runs],
+            "modules": len(info.get("modules", [])), "heavy": heavy, "error": info.get("error"),
+        })
+        budget = BUDGET_SEC.get(name)
+        print(f"[startup] {name:<15} {med:8.3f}s  modules={len(info.get('modules', [])):<4}"
+              f" heavy={','.join(heavy) or '-'}  budget={budget if budget else '-'}")
+        if info.get("error"):
+            failures.append(f"{name}: {info['error']}")
+        if heavy:
+            failures.append(f"{name}: loads {', '.join(heavy)} at startup")
+        if budget and med > budget:
+            failures.append(f"{name}: {med:.3f}s over budget {budget:.3f}s")
+        if args.importtime:
+            for cum, mod in importtime(module):
+                print(f"[startup]   {cum / 1000:8.1f} ms  {mod}")
+
+    payload = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out = RESULTS_DIR / f"startup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    baseline_path = Path(args.baseline)
+    if baseline_path.exists():
+        payload["comparison"] = compare(results, json.loads(baseline_path.read_text(encoding="utf-8")), args.threshold)
+    out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"\n[startup] saved -> {out}")
+
+    for f in failures:
+        print(f"[startup] FAIL {f}")
+
+    if args.save_baseline:
+        if failures:
+            print("[startup] baseline not saved (fix failures first)")
+            return 1
+        baseline_path.write_text(json.dumps({k: payload[k] for k in ("meta", "results")}, indent=2), encoding="utf-8")
+        print(f"[startup] baseline -> {baseline_path}")
+        return 0
+
+    regressions = [c for c in payload.get("comparison", []) if c["regressed"]]
+    for c in payload.get("comparison", []):
+        flag = "REGRESSION" if c["regressed"] else "ok"
+        print(f"[startup] {c['target']:<15} {c['baseline']:.3f}s -> {c['current']:.3f}s x{c['ratio']:.2f} {flag}")
+    if regressions:
+        print(f"[startup] {len(regressions)} regression(s) over {args.threshold:.0%}")
+    return 1 if failures or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+로컬 Algolia(HN Search API) 대역 서버.
+
+    python -m benchmarks.stub_algolia --port 8765 --latency-ms 40 --thread-sizes lognormal:1.2,1.1
+    python -m benchmarks.stub_algolia --fixture benchmarks/fixtures/algolia_sample.json
+
+fixture 파일 형식: {"search": {"<query>": [hit, ...]}, "items": {"<objectID>": tree}}
+fixture에 없는 요청은 합성 코퍼스로 채운다.
+"""
+from __future__ import annotations
+
+import argparse
+import calendar
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.synthetic import SyntheticCorpus
+
+API_PREFIX = "/api/v1"
+
+
+class StubConfig:
+    def __init__(self, universe: int = 1_000_000, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 thread_sizes: str = "lognormal:1.2,1.1", fixture: dict | None = None, seed: int = 7):
+        self.universe = universe
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.corpus = SyntheticCorpus(seed=seed, thread_sizes=thread_sizes)
+        self.fixture = fixture or {"search": {}, "items": {}}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def delay(self):
+        with self._lock:
+            self.requests += 1
+        if self.latency_ms or self.jitter_ms:
+            ms = max(0.0, random.gauss(self.latency_ms, self.jitter_ms))
+            time.sleep(ms / 1000.0)
+
+    def search(self, query: str, hits_per_page: int, page: int, numeric_filters: str = "") -> dict:
+        recorded = self.fixture["search"].get(query)
+        if recorded is not None:
+            chunk = recorded[page * hits_per_page:(page + 1) * hits_per_page]
+            return {"hits": chunk, "page": page, "nbHits": len(recorded),
+                    "nbPages": -(-len(recorded) // max(1, hits_per_page)), "hitsPerPage": hits_per_page}
+
+        # 쿼리마다 시작점이 다른 창 → 쿼리 간 일부 중복이 생김
+        start = zlib.crc32(query.encode()) % self.universe
+        lo, hi = _created_range(numeric_filters)
+        if lo is not None:
+            # 날짜 창마다 다른 글 (백필이 창끼리 같은 objectID 만 받지 않게)
+            start = (start + lo // 3600) % self.universe
+        hits = []
+        i = page * hits_per_page
+        while len(hits) < hits_per_page and i < self.universe:
+            h = self.corpus.hit((start + i) % self.universe)
+            i += 1
+            ts = _ts(h["created_at"])
+            if lo is not None and not (lo <= ts < hi):
+                # 날짜 필터: 해당 범위의 가짜 글이 되도록 시각만 옮김
+                h["created_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(lo + (ts % max(1, hi - lo))))
+            hits.append(h)
+        return {"hits": hits, "page": page, "nbHits": self.universe,
+                "nbPages": self.universe // max(1, hits_per_page), "hitsPerPage": hits_per_page}
+
+    def item(self, object_id: str) -> dict | None:
+        recorded = self.fixture["items"].get(object_id)
+        if recorded is not None:
+            return recorded
+        try:
+            i = int(object_id) - 40_000_000
+        except ValueError:
+            return None
+        if not (0 <= i < self.universe):
+            i = i % self.universe
+        return self.corpus.item_tree(i)
+
+
+def _ts(created_at: str) -> int:
+    return calendar.timegm(time.strptime(created_at, "%Y-%m-%dT%H:%M:%SZ"))
+
+
+def _created_range(numeric_filters: str):
+    # "created_at_i>=1700000000,created_at_i<1700086400"
+    lo = hi = None
+    for part in numeric_filters.split(","):
+        part = part.strip()
+        if part.startswith("created_at_i>="):
+            lo = int(part.split(">=")[1])
+        elif part.startswith("created_at_i<"):
+            hi = int(part.split("<")[1])
+    if lo is None or hi is None:
+        return None, None
+    return lo, hi
+
+
+def make_handler(cfg: StubConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, code: int, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            cfg.delay()
+            parts = urlsplit(self.path)
+            qs = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            path = parts.path
+            if path in (f"{API_PREFIX}/search", f"{API_PREFIX}/search_by_date"):
+                self._send(200, cfg.search(
+                    qs.get("query", ""),
+                    int(qs.get("hitsPerPage", 20)),
+                    int(qs.get("page", 0)),
+                    qs.get("numericFilters", ""),
+                ))
+            elif path.startswith(f"{API_PREFIX}/items/"):
+                tree = cfg.item(path.rsplit("/", 1)[1])
+                if tree is None:
+                    self._send(404, {"error": "not found"})
+                else:
+                    self._send(200, tree)
+            else:
+                self._send(404, {"error": "unknown path"})
+
+    return Handler
+
+
+class StubServer:
+    """with StubServer(cfg) as base_url: ...  (base_url = http://127.0.0.1:<port>/api/v1)"""
+
+    def __init__(self, cfg: StubConfig, host: str = "127.0.0.1", port: int = 0):
+        self.cfg = cfg
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(cfg))
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def __enter__(self) -> str:
+        self.thread.start()
+        return self.base_url
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def record_fixture(out_path: str, queries=None, hits_per_query: int = 20):
+    """실제 Algolia 응답을 fixture로 저장 (네트워크 필요)"""
+    from app.ingestion import hn_fetch
+
+    queries = queries or hn_fetch.QUERIES
+    fixture = {"search": {}, "items": {}}
+    for q in queries:
+        hits = hn_fetch.fetch_search(q, hits_per_page=hits_per_query)
+        fixture["search"][q] = hits
+        for h in hits:
+            oid = h.get("objectID")
+            if oid and oid not in fixture["items"]:
+                try:
+                    fixture["items"][oid] = hn_fetch.fetch_item_tree(oid)
+                except Exception:
+                    pass
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(out_path).write_text(json.dumps(fixture), encoding="utf-8")
+    return out_path
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Algolia HN API stub server")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--thread-sizes", default="lognormal:1.2,1.1")
+    ap.add_argument("--universe", type=int, default=1_000_000)
+    ap.add_argument("--fixture", help="recorded fixture json")
+    ap.add_argument("--record", metavar="PATH", help="실제 API에서 fixture를 녹화하고 종료")
+    args = ap.parse_args(argv)
+
+    if args.record:
+        print(f"[stub] recorded -> {record_fixture(args.record)}")
+        return
+
+    fixture = json.loads(Path(args.fixture).read_text(encoding="utf-8")) if args.fixture else None
+    cfg = StubConfig(args.universe, args.latency_ms, args.jitter_ms, args.thread_sizes, fixture)
+    server = StubServer(cfg, port=args.port)
+    print(f"[stub] serving {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+
+# 태깅 규칙에 걸리는 단어 + 잡음 단어를 섞어서 실제 댓글과 비슷한 히트율을 만든다
+SIGNAL_WORDS = [
+    "timestamp", "action item", "next steps", "speaker", "diarization", "json", "schema",
+    "citation", "verbatim", "multilingual", "korean", "translation", "pii", "gdpr",
+    "memory", "glossary", "cost", "expensive", "tokens", "latency", "slow", "hallucinate",
+    "wrong", "privacy", "confidential", "agent", "workflow", "rag", "embedding", "vector",
+]
+NOISE_WORDS = (
+    "the meeting was long and we needed a quick recap for the team so I tried this tool "
+    "and it worked fine on zoom recordings but the summary missed some details about the "
+    "project deadline and owners which matters for our weekly sync"
+).split()
+
+TITLE_TEMPLATES = [
+    "Show HN: {} – turn meeting recordings into notes",
+    "Show HN: {} – AI call summaries for sales teams",
+    "{}: transcript summarization with action items",
+    "Ask HN: is {} good for meeting minutes?",
+    "Launch HN: {} (YC) – AI meeting assistant",
+]
+
+
+def parse_scale(s: str) -> int:
+    s = s.strip().lower()
+    mult = 1
+    if s.endswith("k"):
+        mult, s = 1_000, s[:-1]
+    elif s.endswith("m"):
+        mult, s = 1_000_000, s[:-1]
+    return int(float(s) * mult)
+
+
+def thread_size_sampler(spec: str):
+    """
+    댓글 수 분포: "fixed:N" | "lognormal:mu,sigma" | "pareto:alpha,scale"
+    HN 스레드는 대부분 0~5개, 가끔 수백 개라 기본은 lognormal
+    반환: rng -> int
+    """
+    kind, _, args = spec.partition(":")
+    vals = [float(x) for x in args.split(",") if x]
+    if kind == "fixed":
+        n = int(vals[0]) if vals else 5
+        return lambda rng: n
+    if kind == "pareto":
+        alpha = vals[0] if vals else 1.5
+        scale = vals[1] if len(vals) > 1 else 1.0
+        return lambda rng: min(2000, int(scale * rng.paretovariate(alpha)) - 1)
+    mu = vals[0] if vals else 1.2
+    sigma = vals[1] if len(vals) > 1 else 1.1
+    return lambda rng: min(2000, int(rng.lognormvariate(mu, sigma)))
+
+
+def make_comment(rng: random.Random, words: int = 40) -> str:
+    out = []
+    for _ in range(words):
+        if rng.random() < 0.06:
+            out.append(rng.choice(SIGNAL_WORDS))
+        else:
+            out.append(rng.choice(NOISE_WORDS))
+    return " ".join(out)
+
+
+class SyntheticCorpus:
+    """
+    결정적(seed 고정) 가짜 Algolia 코퍼스.
+    댓글 문자열은 풀에서 재사용해서 1M 케이스에서도 메모리가 크게 늘지 않음.
+    """
+
+    def __init__(self, seed: int = 7, thread_sizes: str = "lognormal:1.2,1.1", comment_pool: int = 2000):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.sizes = thread_size_sampler(thread_sizes)
+        self.comments = [make_comment(self.rng) for _ in range(comment_pool)]
+        self.base_time = datetime(2026, 1, 1)
+
+    def hit(self, i: int) -> dict:
+        r = random.Random(self.seed * 1_000_003 + i)
+        name = f"Notes{i % 997}"
+        created = self.base_time - timedelta(hours=i % 8760)
+        return {
+            "objectID": str(40_000_000 + i),
+            "title": r.choice(TITLE_TEMPLATES).format(name),
+            "url": f"https://example{i % 5000}.com/{'p' if i % 3 else ''}",
+            "author": f"user{i % 3000}",
+            "points": int(r.paretovariate(1.3)),
+            "num_comments": 0,
+            "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "story_text": make_comment(r, 20) if i % 4 == 0 else None,
+        }
+
+    def thread(self, i: int) -> list[str]:
+        r = random.Random(self.seed * 7_000_003 + i)
+        n = max(0, self.sizes(r))
+        return [self.comments[r.randrange(len(self.comments))] for _ in range(n)]
+
+    def item_tree(self, i: int) -> dict:
+        # Algolia items/<id> 형태 (깊이 2~3 정도로 매달기)
+        texts = self.thread(i)
+        root = {"id": 40_000_000 + i, "text": None, "children": []}
+        parents = [root]
+        for j, t in enumerate(texts):
+            node = {"id": j, "text": f"<p>{t}</p>", "children": []}
+            parent = parents[j % len(parents)] if j % 3 else root
+            parent["children"].append(node)
+            if len(parents) < 8:
+                parents.append(node)
+        return root
+
+    def hits_and_threads(self, n: int):
+        hits = [self.hit(i) for i in range(n)]
+        threads = {}
+        for i, h in enumerate(hits):
+            t = self.thread(i)
+            h["num_comments"] = len(t)
+            threads[h["objectID"]] = t
+        return hits, threads
@@ -0,0 +1,89 @@
+import gzip
+import json
+import os
+
+import pytest
+
+pytest.importorskip("flask")
+
+from app.presentation.export import publish_manifest  # noqa: E402
+from app.ui import api  # noqa: E402
+
+
+def _card(idea_id, priority, novelty=0.0, cluster_id=None):
+    return {"idea_id": idea_id, "title": idea_id, "cluster_id": cluster_id,
+            "scores": {"priority": priority, "novelty": novelty}}
+
+
+def _publish(tmp_path, cards, bump=0):
+    cards_path = tmp_path / "cards.json"
+    cards_path.write_text(json.dumps(cards), encoding="utf-8")
+    edges_path = tmp_path / "edges.csv"
+    edges_path.write_text("from,to,relation,weight\nA,B,uses,2\nB,C,uses,1\n", encoding="utf-8")
+    manifest = tmp_path / "manifest.json"
+    publish_manifest({"cards": cards_path, "edges": edges_path}, manifest)
+    if bump:
+        # mtime 해상도와 무관하게 새 manifest 로 보이게
+        st = manifest.stat()
+        os.utime(manifest, (st.st_atime, st.st_mtime + bump))
+    return manifest
+
+
+@pytest.fixture
+def client_for(tmp_path, monkeypatch):
+    monkeypatch.setattr(api, "RELOAD_CHECK_SEC", 0.0)
+    monkeypatch.setattr(api, "ROLLUP_DIR", tmp_path / "rollup")
+    return lambda manifest: api.create_app(manifest).test_client()
+
+
+def test_no_snapshot_is_503(tmp_path, client_for):
+    client = client_for(tmp_path / "manifest.json")
+    assert client.get("/api/v1/cards").status_code == 503
+    assert client.get("/api/v1/health").get_json()["ok"] is False
+
+
+def test_etag_304_and_gzip(tmp_path, client_for):
+    manifest = _publish(tmp_path, [_card("a", 0.2, 0.9), _card("b", 0.8, 0.1)])
+    client = client_for(manifest)
+
+    r = client.get("/api/v1/top?k=1")
+    assert r.status_code == 200
+    assert [c["idea_id"] for c in r.get_json()["items"]] == ["b"]
+    etag = r.headers["ETag"]
+    again = client.get("/api/v1/top?k=1", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.data == b""
+
+    gz = client.get("/api/v1/top?k=1", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(gz.data) == r.data
+    assert client.get("/api/v1/top?by=novelty&k=1").get_json()["items"][0]["idea_id"] == "a"
+
+
+def test_new_generation_reloads_and_changes_etag(tmp_path, client_for):
+    manifest = _publish(tmp_path, [_card("a", 0.5)])
+    client = client_for(manifest)
+    first = client.get("/api/v1/cards")
+    assert first.get_json()["total"] == 1
+
+    _publish(tmp_path, [_card("a", 0.5), _card("b", 0.9, cluster_id="c1")], bump=10)
+    r = client.get("/api/v1/cards", headers={"If-None-Match": first.headers["ETag"]})
+    assert r.status_code == 200
+    body = r.get_json()
+    assert body["total"] == 2 and body["generation"] != first.get_json()["generation"]
+    assert client.get("/api/v1/cards?cluster_id=c1").get_json()["total"] == 1
+
+
+def test_lookups_and_bad_arguments(tmp_path, client_for):
+    client = client_for(_publish(tmp_path, [_card("a", 0.5)]))
+    assert client.get("/api/v1/cards/a").get_json()["idea_id"] == "a"
+    assert client.get("/api/v1/cards/zzz").status_code == 404
+    assert client.get("/api/v1/top?by=nope").status_code == 400
+    assert client.get("/api/v1/cards?page=x").status_code == 400
+    assert client.get("/api/v1/cards?since=2026-13-01").status_code == 400
+    # 필터가 있는데 card_store 가 publish 되지 않은 스냅샷
+    assert client.get("/api/v1/cards?tag=ai").status_code == 404
+
+    nb = client.get("/api/v1/graph/neighbors?node=A&hops=2").get_json()
+    assert nb["nodes"] == ["A", "B", "C"]
+    assert {(e["from"], e["to"]) for e in nb["edges"]} == {("A", "B"), ("B", "C")}
+    assert client.get("/api/v1/graph/neighbors?node=Z").status_code == 404
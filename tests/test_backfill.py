@@ -0,0 +1,73 @@
+import csv
+from datetime import date
+
+import pytest
+
+from app.ingestion import backfill, hn_fetch
+from benchmarks.stub_algolia import StubConfig, StubServer
+
+
+def _hit(oid, day, points, title=None):
+    return {"objectID": oid, "created_at": f"{day}T12:00:00Z", "points": points,
+            "title": title or f"story {oid}", "url": f"https://example.com/{oid}"}
+
+
+def test_windows_cover_range_without_gaps():
+    wins = backfill.windows(date(2026, 1, 1), date(2026, 1, 17), days=7)
+    assert len(wins) == 3
+    assert all(a[1] == b[0] for a, b in zip(wins, wins[1:]))
+    days = [d for lo, hi in wins for d in backfill._days_in(lo, hi)]
+    assert days[0] == "2026-01-01" and days[-1] == "2026-01-17" and len(days) == len(set(days)) == 17
+
+
+def test_full_window_is_split_down_to_days():
+    class FakeSource:
+        def __init__(self):
+            self.calls = []
+
+        def search_range(self, query, lo, hi, page_size, max_pages):
+            self.calls.append((lo, hi))
+            # 창이 넓으면 항상 가득 찬 척
+            n = page_size * max_pages if hi - lo > backfill.DAY_SEC else 1
+            return [{"objectID": f"{lo}-{i}"} for i in range(n)]
+
+    src = FakeSource()
+    lo, hi = backfill.windows(date(2026, 1, 1), date(2026, 1, 4), days=7)[0]
+    hits = backfill.crawl(src, "q", lo, hi, page_size=2, max_pages=1)
+    # 하루짜리 창 4개까지 내려감
+    leaves = [c for c in src.calls if c[1] - c[0] == backfill.DAY_SEC]
+    assert len(leaves) == 4 and len(hits) == 4
+
+
+def test_group_by_day_dedupes_and_keeps_top_points():
+    hits = [_hit("1", "2026-01-01", 5), _hit("2", "2026-01-01", 50), _hit("1", "2026-01-01", 5),
+            _hit("3", "2026-01-01", 10), _hit("4", "2026-01-02", 1), _hit("5", "2025-12-31", 99)]
+    out = backfill.group_by_day(hits, {"2026-01-01", "2026-01-02"}, per_day=2, dedupe=False)
+    assert [h["objectID"] for h in out["2026-01-01"]] == ["2", "3"]
+    assert [h["objectID"] for h in out["2026-01-02"]] == ["4"]
+
+
+@pytest.fixture
+def algolia(monkeypatch):
+    with StubServer(StubConfig(universe=2_000)) as base:
+        monkeypatch.setattr(hn_fetch, "ALGOLIA_SEARCH", f"{base}/search")
+        monkeypatch.setattr(hn_fetch, "ALGOLIA_ITEM", f"{base}/items")
+        yield base
+
+
+def test_run_backfill_writes_partitions_and_resumes(algolia, tmp_path):
+    root, daily = tmp_path / "partitions", str(tmp_path / "daily.csv")
+    kw = dict(queries=["ai notes"], workers=2, rate=1000.0, per_day=5, root=root, daily_path=daily)
+    got = backfill.run_backfill(date(2026, 2, 1), date(2026, 2, 3), **kw)
+    assert got["days"] == 3
+    for day in ("2026-02-01", "2026-02-02", "2026-02-03"):
+        assert (backfill.partition_dir(day, root) / "metrics.json").exists()
+    with open(daily, newline="", encoding="utf-8") as f:
+        assert [r["date"] for r in csv.DictReader(f)] == ["2026-02-01", "2026-02-02", "2026-02-03"]
+
+    # 이미 있는 날짜는 건너뛰고, 하루를 지우면 그 날짜만 다시
+    assert backfill.run_backfill(date(2026, 2, 1), date(2026, 2, 3), **kw)["days"] == 0
+    (backfill.partition_dir("2026-02-02", root) / "metrics.json").unlink()
+    assert backfill.run_backfill(date(2026, 2, 1), date(2026, 2, 3), **kw)["days"] == 1
+    with open(daily, newline="", encoding="utf-8") as f:
+        assert [r["date"] for r in csv.DictReader(f)] == ["2026-02-01", "2026-02-02", "2026-02-03"]
@@ -0,0 +1,94 @@
+import pytest
+
+from app.knowledge import card_store
+
+TAGS = ["agent", "rag", "voice"]
+RISKS = ["privacy", "cost"]
+CLUSTERS = ["c1", "c2", None]
+
+
+def _cards():
+    out = []
+    for i in range(40):
+        out.append({
+            "idea_id": f"idea-{i:02d}",
+            "title": f"idea {i}",
+            "cluster_id": CLUSTERS[i % 3],
+            "tags": [t for j, t in enumerate(TAGS) if (i >> j) & 1],
+            "risks": ",".join(r for j, r in enumerate(RISKS) if (i >> (j + 2)) & 1) or "-",
+            "scores": {"priority": round((i * 37 % 41) / 41, 3), "novelty": (i % 7) / 7},
+            "meta": {"date": f"2026-01-{1 + i % 28:02d}"},
+        })
+    return out
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "s.sqlite"
+    cards = _cards()
+    card_store.upsert_cards(cards, path)
+    return path, cards
+
+
+def _expected(cards, tags=(), risks=(), min_priority=None, since=None, until=None, cluster_id=None):
+    out = []
+    for c in cards:
+        if not set(tags) <= set(card_store._values(c, "tags")):
+            continue
+        if not set(risks) <= set(card_store._values(c, "risks")):
+            continue
+        p, d = c["scores"]["priority"], c["meta"]["date"]
+        if min_priority is not None and p < min_priority:
+            continue
+        if (since and d < since) or (until and d > until):
+            continue
+        if cluster_id and c["cluster_id"] != cluster_id:
+            continue
+        out.append(c)
+    out.sort(key=lambda c: (-c["scores"]["priority"], c["idea_id"]))
+    return [c["idea_id"] for c in out]
+
+
+@pytest.mark.parametrize("kw", [
+    {},
+    {"tags": ["agent"]},
+    {"tags": ["agent", "rag"]},
+    {"risks": ["privacy"], "min_priority": 0.5},
+    {"tags": ["voice"], "risks": ["privacy", "cost"]},
+    {"since": "2026-01-05", "until": "2026-01-15"},
+    {"risks": ["cost"], "since": "2026-01-10"},
+    {"cluster_id": "c1", "tags": ["rag"]},
+    {"cluster_id": "c2", "min_priority": 0.3, "until": "2026-01-20"},
+    {"tags": ["nope"]},
+])
+def test_query_matches_brute_force(store, kw):
+    path, cards = store
+    want = _expected(cards, **kw)
+    got = card_store.query_cards(path, limit=1000, **kw)
+    assert [c["idea_id"] for c in got] == want
+    assert card_store.count_cards(path, **kw) == len(want)
+
+
+def test_limit_offset_and_other_order(store):
+    path, cards = store
+    want = _expected(cards, tags=["agent"])
+    got = card_store.query_cards(path, tags=["agent"], limit=3, offset=2)
+    assert [c["idea_id"] for c in got] == want[2:5]
+
+    by_novelty = card_store.query_cards(path, order="novelty", limit=1000)
+    keys = [(-c["scores"]["novelty"], c["idea_id"]) for c in by_novelty]
+    assert keys == sorted(keys) and len(keys) == len(cards)
+
+    with pytest.raises(ValueError):
+        card_store.query_cards(path, order="title")
+
+
+def test_upsert_replaces_card_and_junctions(store):
+    path, cards = store
+    card = dict(cards[7], tags=["rag"], risks="-", scores={"priority": 0.99})
+    card_store.upsert_cards([card], path)
+    assert card_store.count_cards(path) == len(cards)
+    assert card_store.query_cards(path, limit=1)[0]["idea_id"] == card["idea_id"]
+    assert card["idea_id"] not in [c["idea_id"] for c in card_store.query_cards(path, tags=["agent"], limit=1000)]
+    assert card_store.count_cards(path, risks=["privacy"]) == len(_expected(
+        [c for c in cards if c["idea_id"] != card["idea_id"]], risks=["privacy"]))
@@ -0,0 +1,63 @@
+from app.ingestion import checkpoint
+from app.ingestion.sources import Comment, comment_depth, comment_id
+
+
+def test_resume_skips_partial_last_line(tmp_path):
+    j = checkpoint.open_journal("2026-01-01", {"q": 1}, tmp_path)
+    j.record_search("ai notes", "algolia", [{"objectID": "1"}])
+    j.record_thread("1", [Comment("hello", 2, "11")])
+    j.close()
+    path = checkpoint.journal_path("2026-01-01", tmp_path)
+    good = path.stat().st_size
+    with path.open("ab") as f:
+        f.write(b'{"kind":"search","query":"cut')   # 쓰다 죽은 줄
+
+    j = checkpoint.open_journal("2026-01-01", {"q": 1}, tmp_path)
+    assert j.resumed == 2
+    assert j.search_hits("ai notes", "algolia") == [{"objectID": "1"}]
+    (c,) = j.threads["1"]
+    assert str(c) == "hello" and comment_depth(c) == 2 and comment_id(c) == "11"
+    # 잘린 줄은 잘라내고 그 자리부터 이어 씀
+    assert path.stat().st_size == good
+    j.record_search("meeting", "algolia", [])
+    j.close()
+    assert checkpoint.open_journal("2026-01-01", {"q": 1}, tmp_path).search_hits("meeting", "algolia") == []
+
+
+def test_changed_params_start_fresh(tmp_path):
+    with checkpoint.open_journal("2026-01-01", {"q": 1}, tmp_path) as j:
+        j.record_search("ai", "algolia", [])
+    with checkpoint.open_journal("2026-01-01", {"q": 2}, tmp_path) as j:
+        assert j.resumed == 0 and j.search_hits("ai", "algolia") is None
+
+
+def test_cases_are_reused_only_for_same_tagger(tmp_path):
+    with checkpoint.open_journal("2026-01-01", {}, tmp_path) as j:
+        j.record_case({"object_id": "1", "risks": "privacy"}, {"risk:privacy": [[0, "11", 0, 7, 1]]}, "k1")
+    with checkpoint.open_journal("2026-01-01", {}, tmp_path) as j:
+        assert set(j.cases_for("k1")) == {"1"}
+        assert j.cases_for("k2") == {}
+        j.record_case({"object_id": "1", "risks": "-"}, None, "k2")
+        assert j.cases_for("k2")["1"]["risks"] == "-"
+        assert "1" not in j.case_hits
+
+
+def test_complete_moves_journal(tmp_path):
+    j = checkpoint.open_journal("2026-01-01", {}, tmp_path)
+    done = j.complete()
+    assert done.name == "2026-01-01.done.jsonl"
+    assert not checkpoint.journal_path("2026-01-01", tmp_path).exists()
+
+
+def test_resume_stops_at_corrupt_line(tmp_path):
+    with checkpoint.open_journal("2026-01-01", {}, tmp_path) as j:
+        j.record_search("a", "algolia", [{"objectID": "1"}])
+    path = checkpoint.journal_path("2026-01-01", tmp_path)
+    good = path.stat().st_size
+    with path.open("ab") as f:
+        f.write(b'{"kind":"sea\x00\x00\n{"kind":"search","query":"b","source":"algolia","hits":[]}\n')
+
+    with checkpoint.open_journal("2026-01-01", {}, tmp_path) as j:
+        # 깨진 줄 뒤는 믿을 수 없으므로 버림
+        assert j.resumed == 1 and j.search_hits("b", "algolia") is None
+    assert path.stat().st_size == good
@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from app.knowledge.clustering import ClusterState, summarize_clusters  # noqa: E402
+
+ZOOM = {"zoom": 0.8, "meeting": 0.5, "notes": 0.3}
+ZOOM2 = {"zoom": 0.7, "meeting": 0.6, "recorder": 0.2}
+TAX = {"tax": 0.9, "invoice": 0.4}
+
+
+def test_similar_cases_join_and_others_open_a_cluster():
+    st = ClusterState()
+    a = st.assign("1", ZOOM)
+    b = st.assign("2", ZOOM2)
+    c = st.assign("3", TAX)
+    assert a == b != c
+    assert st.clusters[a]["size"] == 2
+    # 이미 할당된 케이스는 벡터가 달라도 그대로
+    assert st.assign("1", TAX) == a
+    assert st.clusters[a]["size"] == 2
+    # 빈 벡터는 어디에도 붙지 않음
+    assert st.assign("4", {}) not in (a, c)
+
+
+def test_save_load_keeps_candidates(tmp_path):
+    st = ClusterState()
+    a = st.assign("1", ZOOM)
+    st.assign("2", TAX)
+    path = tmp_path / "clusters.json"
+    st.save(path)
+
+    back = ClusterState.load(path)
+    assert back.assignments == st.assignments
+    assert back.next_id == st.next_id
+    # 역색인이 복구돼야 저장 후에도 같은 클러스터를 찾음
+    cid, sim = back.nearest(ZOOM2)
+    assert cid == a and sim > 0.3
+    assert back.assign("5", ZOOM2) == a
+
+
+def test_summary_ranks_clusters_by_max_and_mean(tmp_path):
+    st = ClusterState()
+    a = st.assign("1", ZOOM)
+    st.assign("2", ZOOM2)
+    b = st.assign("3", TAX)
+    path = tmp_path / "clusters.json"
+    st.save(path)
+
+    def card(idea, cid, prio, tags=()):
+        return {"idea_id": idea, "cluster_id": cid, "title": idea,
+                "scores": {"priority": prio, "novelty": 0.5}, "tags": list(tags),
+                "meta": {"points": 10, "comments": 2}}
+
+    cards = [card("i1", a, 0.2, ["ai"]), card("i2", a, 0.6, ["ai", "saas"]),
+             card("i3", b, 0.5), {"idea_id": "i4", "cluster_id": None}]
+    out = summarize_clusters(cards, path)
+    assert [c["cluster_id"] for c in out] == [a, b]
+    top = out[0]
+    assert top["priority"] == round(0.7 * 0.6 + 0.3 * 0.4, 4)
+    assert top["representative"]["idea_id"] == "i2"
+    assert top["size_today"] == 2 and top["points"] == 20
+    assert top["top_tags"][0] == "ai"
+    assert "zoom" in top["label"]
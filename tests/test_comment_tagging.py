@@ -0,0 +1,72 @@
+import math
+import random
+
+from app.ingestion import comment_tagging
+from app.ingestion.comment_tagging import LabelMatcher, count_hits, format_signals, parse_signals, tag_threads
+from app.ingestion.hn_fetch import LABEL_RULES
+from app.ingestion.sources import Comment
+from benchmarks.synthetic import make_comment
+
+TRICKY = [
+    "Speaker labels and SPEAKER separation; speakerphone is not a speaker",
+    "Follow-up, followup, follow up and FOLLOW-UPS",
+    "rag/RAG,rag.ragged retrieval retriever vector-db embeddings",
+    "Don't make up facts — don’t make up citations, cite sources",
+    "İstanbul meeting with a Japanese translation of the agenda todo",
+    "json schema structured output; JSON-schema",
+    "",
+]
+
+
+def _reference(text):
+    return sorted((label, m.start(), m.end()) for label, rx in LABEL_RULES.items() for m in rx.finditer(text))
+
+
+def test_fast_path_matches_finditer():
+    matcher = LabelMatcher(LABEL_RULES)
+    # 대부분의 규칙이 리터럴 후보 경로를 타야 의미가 있음
+    assert len(matcher._lower) >= len(LABEL_RULES) // 2
+    rng = random.Random(3)
+    texts = TRICKY + [make_comment(rng) for _ in range(300)]
+    for t in texts + [t.upper() for t in texts]:
+        assert sorted(matcher.find(t)) == _reference(t), t
+
+
+def test_count_hits_caps_per_comment_and_maps_offsets():
+    matcher = LabelMatcher(LABEL_RULES)
+    texts = ["todo " * 5, "nothing here", "json and a TODO"]
+    spans = []
+    counts = count_hits(texts, matcher, spans)
+    label = "feature:action_items"
+    assert counts[0][label] == comment_tagging.HIT_CAP
+    assert counts[1] == {}
+    assert counts[2] == {label: 1, "feature:structured_output": 1}
+    # 위치는 댓글 안 오프셋 → 잘라 보면 매치 원문
+    for lab, i, start, end in spans:
+        assert LABEL_RULES[lab].fullmatch(texts[i][start:end])
+    assert sum(1 for s in spans if s[0] == label) == comment_tagging.HIT_CAP + 1
+
+
+def test_tag_threads_weights_depth_and_records_positions(monkeypatch):
+    header = "An agent for meeting notes"
+    comments = [Comment("agent agent", depth=1), Comment("nested agent reply", depth=3)]
+    got = tag_threads([(header, comments), ("", [])], LABEL_RULES)[0]["pattern:Agent"]
+    assert got["hits"] == 4 and got["comments"] == 3
+    weight = 1.0 + 2 * 1.0 + comment_tagging.depth_weight(3)
+    assert got["strength"] == round(1 - math.exp(-weight / comment_tagging.STRENGTH_SCALE), 4)
+    # 본문(-1) 과 최상위 댓글이 깊은 답글보다 앞
+    assert got["at"] == [[-1, 3, 8], [0, 0, 5], [0, 6, 11]]
+
+    # 청크가 나뉘어도 결과는 같음
+    many = [Comment("todo", depth=1 + i % 4) for i in range(comment_tagging.CHUNK_SIZE * 2 + 5)]
+    whole = tag_threads([("", many)], LABEL_RULES)
+    monkeypatch.setattr(comment_tagging, "CHUNK_SIZE", 7)
+    assert tag_threads([("", many)], LABEL_RULES) == whole
+
+
+def test_signals_round_trip():
+    signals = {"risk:latency": {"strength": 0.4}, "feature:json": {"strength": 0.82}}
+    s = format_signals(signals)
+    assert s == "feature:json=0.82;risk:latency=0.40"
+    assert parse_signals(s) == {"feature:json": 0.82, "risk:latency": 0.4}
+    assert format_signals({}) == "-" and parse_signals("-") == {}
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import pytest
+
+from app.daemon import CronSchedule
+
+
+def test_daily_at_nine():
+    s = CronSchedule("0 9 * * *")
+    assert s.next_after(datetime(2026, 1, 1, 8, 59, 30)) == datetime(2026, 1, 1, 9, 0)
+    assert s.next_after(datetime(2026, 1, 1, 9, 0)) == datetime(2026, 1, 2, 9, 0)
+
+
+def test_steps_ranges_and_lists():
+    s = CronSchedule("*/15 8-10 * * *")
+    assert s.minutes == {0, 15, 30, 45} and s.hours == {8, 9, 10}
+    assert s.next_after(datetime(2026, 1, 1, 10, 50)) == datetime(2026, 1, 2, 8, 0)
+    assert CronSchedule("5,35 * * * *").minutes == {5, 35}
+    assert CronSchedule("10/20 * * * *").minutes == {10, 30, 50}
+
+
+def test_weekday_sunday_is_0_or_7():
+    assert CronSchedule("0 0 * * 7").weekdays == {0}
+    # 2026-01-04 는 일요일
+    assert CronSchedule("0 0 * * 0").next_after(datetime(2026, 1, 1)) == datetime(2026, 1, 4)
+
+
+def test_day_and_weekday_are_or():
+    # 매월 15일 또는 월요일 (vixie cron)
+    s = CronSchedule("0 12 15 * 1")
+    assert s.next_after(datetime(2026, 1, 1)) == datetime(2026, 1, 5, 12, 0)
+    assert s.next_after(datetime(2026, 1, 13)) == datetime(2026, 1, 15, 12, 0)
+
+
+def test_month_rollover_and_leap_day():
+    assert CronSchedule("0 0 1 3 *").next_after(datetime(2026, 3, 2)) == datetime(2027, 3, 1)
+    assert CronSchedule("0 0 29 2 *").next_after(datetime(2026, 1, 1)) == datetime(2028, 2, 29)
+
+
+@pytest.mark.parametrize("expr", ["0 9 * *", "60 * * * *", "0 24 * * *", "*/0 * * * *", "5-1 * * * *"])
+def test_invalid_expressions(expr):
+    with pytest.raises(ValueError):
+        CronSchedule(expr)
+
+
+def test_never_fires():
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 31 2 *").next_after(datetime(2026, 1, 1))
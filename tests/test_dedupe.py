@@ -0,0 +1,49 @@
+from app.ingestion.dedupe import HitDeduper, canonicalize_url, collapse_hits, merge_cluster
+
+
+def _hit(oid, title, url=None, points=0, comments=0):
+    return {"objectID": oid, "title": title, "url": url, "points": points, "num_comments": comments}
+
+
+def test_canonicalize_url():
+    assert canonicalize_url("https://www.example.com/app/?utm_source=hn&b=2&a=1#top") == "example.com/app?a=1&b=2"
+    assert canonicalize_url("http://example.com/index.html") == canonicalize_url("https://example.com/")
+    assert canonicalize_url("https://news.ycombinator.com/item?id=1") is None
+    assert canonicalize_url("") is None
+
+
+def test_reposts_merge_with_summed_credit():
+    hits = [
+        _hit("1", "Show HN: Notetaker, an AI meeting summary tool", "https://notetaker.io/?ref=hn", 10, 3),
+        _hit("2", "Notetaker – AI meeting summaries", "https://www.notetaker.io/", 40, 20),
+        _hit("3", "Something else entirely about databases", "https://db.dev", 5, 1),
+    ]
+    merged = collapse_hits(hits)
+    assert len(merged) == 2
+    first = merged[0]
+    assert first["objectID"] == "2"           # 댓글이 가장 많은 글이 대표
+    assert first["points"] == 50 and first["num_comments"] == 23
+    assert first["dup_object_ids"] == ["1"]
+
+
+def test_similar_titles_merge_without_url():
+    d = HitDeduper()
+    assert d.add(_hit("1", "Open source AI meeting notes with speaker labels"))
+    assert not d.add(_hit("2", "Show HN: Open source AI meeting notes with speaker labels"))
+    assert d.num_clusters == 1
+
+
+def test_bridge_hit_joins_two_clusters():
+    d = HitDeduper()
+    d.add(_hit("1", "a", "https://x.io/a"))
+    d.add(_hit("2", "Open source AI meeting notes with speaker labels", "https://y.io/b"))
+    assert d.num_clusters == 2
+    # URL 은 1 과, 제목은 2 와 같음 → 두 클러스터가 하나로 (먼저 들어온 1 이 루트)
+    d.add(_hit("3", "Show HN: Open source AI meeting notes with speaker labels", "https://x.io/a"))
+    assert d.num_clusters == 1
+    assert [[h["objectID"] for h in c] for c in d.clusters()] == [["1", "2", "3"]]
+
+
+def test_merge_cluster_tie_breaks_on_points():
+    rep = merge_cluster([_hit("1", "t", points=5, comments=2), _hit("2", "t", points=9, comments=2)])
+    assert rep["objectID"] == "2" and rep["dup_object_ids"] == ["1"]
@@ -0,0 +1,108 @@
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("matplotlib")
+nx = pytest.importorskip("networkx")
+
+from app.ingestion.hn_fetch import case_edges  # noqa: E402
+from app.presentation import graph_delta, plot_graph  # noqa: E402
+
+DAY1 = [
+    ("case_1", "agent"), ("case_1", "summarization"), ("summarization", "privacy"),
+    ("case_2", "agent"), ("case_2", "search"), ("search", "hallucination"),
+    ("case_3", "hybrid/rag"), ("case_3", "search"),
+    ("case_4", "code generator"), ("case_4", "autocomplete"), ("autocomplete", "security"),
+    ("case_5", "transcription"), ("transcription", "cost"),
+]
+# 하루 뒤: 한 컴포넌트에 엣지 추가, 다른 컴포넌트는 엣지 삭제, 새 컴포넌트 하나
+DAY2 = [e for e in DAY1 if e != ("case_3", "search")] + [
+    ("case_6", "autocomplete"), ("case_6", "privacy"), ("case_7", "translation"),
+]
+
+
+def _assert_same(ins, full):
+    assert set(ins["bet"]) == set(full["bet"])
+    for n in full["bet"]:
+        assert ins["bet"][n] == pytest.approx(full["bet"][n], abs=1e-9)
+        assert ins["pr"][n] == pytest.approx(full["pr"][n], abs=1e-4)
+    assert ins["impact_scores"] == full["impact_scores"]
+    assert ins["deg"] == full["deg"]
+
+
+def test_incremental_matches_full_compute(tmp_path, capsys):
+    path = tmp_path / "gs.json"
+    G1 = plot_graph.build_graph(DAY1)
+    ins = graph_delta.update_insights(G1, "2026-01-01", path)
+    assert ins["delta"]["mode"] == "full"
+    _assert_same(ins, plot_graph.compute_insights(G1))
+
+    G2 = plot_graph.build_graph(DAY2)
+    ins = graph_delta.update_insights(G2, "2026-01-02", path)
+    d = ins["delta"]
+    assert d["mode"] == "incremental"
+    assert d["recomputed_sources"] < d["nodes"]       # transcription/cost 쪽 출발 노드는 그대로
+    assert ("case_3", "search") in d["removed_edges"]
+    assert "case_7" in d["added_nodes"] and d["base_date"] == "2026-01-01"
+    _assert_same(ins, plot_graph.compute_insights(G2))
+
+
+def test_same_day_rerun_keeps_previous_base(tmp_path, capsys):
+    path = tmp_path / "gs.json"
+    graph_delta.update_insights(plot_graph.build_graph(DAY1), "2026-01-01", path)
+    G2 = plot_graph.build_graph(DAY2)
+    graph_delta.update_insights(G2, "2026-01-02", path)
+    ins = graph_delta.update_insights(G2, "2026-01-02", path)
+    assert ins["delta"]["mode"] == "unchanged" and ins["delta"]["recomputed_sources"] == 0
+    assert ins["delta"]["base_date"] == "2026-01-01" and ins["delta"]["added_edges"]
+    _assert_same(ins, plot_graph.compute_insights(G2))
+
+
+PATTERNS = ["Generator(Prompt-only)", "Hybrid/RAG", "Agent"]
+FEATURES = ["summarization", "action_items", "transcription", "search", "translation", "diarization"]
+RISKS = ["privacy", "hallucination", "cost", "latency"]
+
+
+def _case(i: int) -> dict:
+    feats = [f for j, f in enumerate(FEATURES) if (i * 7 + j) % 4 == 0] or ["-"]
+    risks = [r for j, r in enumerate(RISKS) if (i * 5 + j) % 6 == 0] or ["-"]
+    return {"object_id": str(i), "pattern": PATTERNS[i % 3],
+            "core_ai_features": ",".join(feats), "risks": ",".join(risks)}
+
+
+def _pipeline_graph(ids) -> "nx.DiGraph":
+    # 파이프라인과 같은 모양: case → pattern → feature/risk, case → feature/risk (pattern 허브로 한 컴포넌트)
+    return plot_graph.build_graph((f, t) for i in ids for f, _, t in case_edges(_case(i)))
+
+
+def test_pipeline_shaped_graph_recomputes_only_touched_sources(tmp_path, capsys):
+    path = tmp_path / "gs.json"
+    G1 = _pipeline_graph(range(300))
+    assert nx.number_connected_components(G1.to_undirected()) == 1
+    graph_delta.update_insights(G1, "2026-01-01", path)
+
+    # 다음 날: 오래된 케이스 30개가 빠지고 새 케이스 30개 (대부분의 케이스는 그대로)
+    G2 = _pipeline_graph(range(30, 330))
+    ins = graph_delta.update_insights(G2, "2026-01-02", path)
+    d = ins["delta"]
+    assert d["mode"] == "incremental"
+    assert d["recomputed_sources"] < d["nodes"] / 4
+    _assert_same(ins, plot_graph.compute_insights(G2))
+
+    # pattern 에 새 feature 가 붙으면 그 pattern 에 닿는 케이스는 다시 계산
+    G3 = G2.copy()
+    G3.add_edge("Agent", "voice_cloning")
+    ins = graph_delta.update_insights(G3, "2026-01-03", path)
+    agent_cases = sum(1 for n in G3.predecessors("Agent"))
+    assert ins["delta"]["recomputed_sources"] >= agent_cases
+    _assert_same(ins, plot_graph.compute_insights(G3))
+
+
+def test_source_dependencies_sum_to_betweenness():
+    G = _pipeline_graph(range(60))
+    G.add_edges_from([("search", "case_1"), ("summarization", "search")])   # 사이클/긴 경로도
+    raw = dict.fromkeys(G, 0.0)
+    for s in G:
+        for v, dv in graph_delta.source_dependencies(G, s).items():
+            raw[v] += dv
+    want = nx.betweenness_centrality(G, normalized=False)
+    assert raw == pytest.approx(want, abs=1e-9)
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from app.presentation import graph_export
+from app.presentation.graph_export import adjacency, default_center, ego_subgraph
+
+
+def _export():
+    # A -> B -> C -> D, A -> E (번호는 id 정렬 순)
+    ids = ["A", "B", "C", "D", "E"]
+    n = len(ids)
+    return {
+        "version": graph_export.EXPORT_VERSION,
+        "nodes": {"id": ids, "type": ["x"] * n, "x": [0.0] * n, "y": [0.0] * n,
+                  "degree": [2, 2, 2, 1, 1], "betweenness": [0.0] * n, "pagerank": [0.2] * n,
+                  "impact": [0, 3, 0, 3, 0]},
+        "edges": {"source": [0, 1, 2, 0], "target": [1, 2, 3, 4],
+                  "relation": ["r1", "r2", "r3", "r4"], "weight": [1, 2, 3, 4]},
+    }
+
+
+def test_ego_subgraph_hops_and_edge_direction():
+    ex = _export()
+    sub = ego_subgraph(ex, "B", 1)
+    assert [(n["id"], n["hop"]) for n in sub["nodes"]] == [("B", 0), ("A", 1), ("C", 1)]
+    assert {(e["source"], e["target"], e["relation"]) for e in sub["edges"]} == {("A", "B", "r1"), ("B", "C", "r2")}
+    assert not sub["truncated"]
+
+    # 방향을 무시하고 탐색, 한 번 만든 인접 목록 재사용
+    index = adjacency(ex)
+    sub2 = ego_subgraph(ex, "C", 2, index)
+    assert {n["id"] for n in sub2["nodes"]} == {"A", "B", "C", "D"}
+    assert ego_subgraph(ex, "A", 0, index)["nodes"][0]["id"] == "A"
+    assert ego_subgraph(ex, "Z", 1, index) is None
+    # hop 상한
+    assert ego_subgraph(ex, "A", 99)["hops"] == graph_export.MAX_EGO_HOPS
+
+
+def test_ego_subgraph_truncates_nearest_first():
+    sub = ego_subgraph(_export(), "A", 3, max_nodes=3)
+    assert sub["truncated"]
+    assert [(n["id"], n["hop"]) for n in sub["nodes"]] == [("A", 0), ("B", 1), ("E", 1)]
+
+
+def test_default_center_prefers_impact_then_degree():
+    ex = _export()
+    assert default_center(ex) == "B"
+    ex["nodes"]["impact"] = [0] * 5
+    assert default_center(ex) == "A"
+    empty = {k: [] for k in ex["nodes"]}
+    assert default_center({"nodes": empty}) is None
+
+
+def test_build_export_uses_edge_rows_and_reloads(tmp_path):
+    nx = pytest.importorskip("networkx")
+    pytest.importorskip("pandas")
+    pytest.importorskip("matplotlib")
+
+    G = nx.DiGraph([("Agent", "latency"), ("Agent", "rag")])
+    ins = {"deg": {"Agent": 2, "latency": 1, "rag": 1}, "bet": {}, "pr": {"Agent": 0.5},
+           "impact_scores": {"latency": 4}}
+    pos = {n: (i, -i) for i, n in enumerate(G)}
+    rows = [{"from": "Agent", "to": "rag", "relation": "uses", "weight": "3"}]
+    ex = graph_export.build_export(G, ins, pos, rows, "2026-03-01")
+    assert ex["nodes"]["id"] == ["Agent", "latency", "rag"]
+    assert ex["edges"]["relation"] == ["", "uses"] and ex["edges"]["weight"] == [1, 3]
+    assert default_center(ex) == "latency"
+    assert graph_export.positions(ex)["rag"] == (2.0, -2.0)
+
+    path = tmp_path / "graph.json"
+    path.write_text(json.dumps(ex), encoding="utf-8")
+    assert graph_export.load_export(path) == ex
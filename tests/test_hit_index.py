@@ -0,0 +1,68 @@
+from app.ingestion.comment_tagging import tag_threads
+from app.ingestion.hn_fetch import LABEL_RULES
+from app.ingestion.sources import Comment
+from app.knowledge import hit_index
+from app.knowledge.hit_index import entry_from_signals, evidence, load_hit_index, snippet, write_hit_index
+
+HEADER = "An agent that turns meetings into action items"
+COMMENTS = [
+    Comment("I want a todo list after every call", depth=1, cid="101"),
+    Comment("speaker diarization matters more than the agent", depth=2, cid="102"),
+]
+CASE = {"pattern": "Agent", "core_ai_features": "action_items,speaker_labels", "risks": "-",
+        "title": "Meeting agent", "date": "2026-03-01", "url": "https://example.com/x"}
+
+
+def _entry():
+    signals = tag_threads([(HEADER, COMMENTS)], LABEL_RULES)[0]
+    return signals, entry_from_signals(signals, COMMENTS, HEADER)
+
+
+def test_positions_round_trip_to_matched_text(tmp_path):
+    signals, entry = _entry()
+    assert set(entry) == set(signals)
+    for label, rows in entry.items():
+        for ci, cid, start, end, crc in rows:
+            text = HEADER if ci < 0 else str(COMMENTS[ci])
+            assert LABEL_RULES[label].fullmatch(text[start:end])
+            assert crc == hit_index.text_crc(text)
+            assert cid == (None if ci < 0 else COMMENTS[ci].cid)
+    path = tmp_path / "hit_index.json"
+    write_hit_index({"1": entry}, path)
+    # JSON 왕복 후 튜플/리스트 차이 없이 그대로
+    assert load_hit_index(path) == {"1": entry}
+
+
+def test_evidence_links_comments_and_labels_source():
+    signals, entry = _entry()
+    strengths = {label: s["strength"] for label, s in signals.items()}
+    items = evidence(CASE, entry, HEADER, COMMENTS, strengths, source="algolia")
+    assert items and len(items) <= hit_index.MAX_EVIDENCE
+    by_source = {i["source"] for i in items}
+    assert by_source <= {"algolia:story", "algolia:comment"} and "algolia:comment" in by_source
+    for it in items:
+        if it["source"] == "algolia:comment":
+            assert it["url"].startswith("https://news.ycombinator.com/item?id=10")
+        else:
+            assert it["url"] == CASE["url"]
+    # 케이스가 달지 않은 라벨은 evidence 에 안 나옴
+    assert all(not it["title"].startswith("[feature:structured_output]") for it in items)
+    assert evidence(CASE, entry, HEADER, COMMENTS)[0]["source"].startswith("hn:")
+
+
+def test_changed_text_drops_stale_positions():
+    _, entry = _entry()
+    other = [Comment("completely different thread", cid="9"), Comment("x", cid="8")]
+    items = evidence(CASE, entry, HEADER, other)
+    # 본문은 그대로라 본문 매치만 남음
+    assert items and all(it["source"] == "hn:story" for it in items)
+    assert evidence(CASE, entry, "edited header", other) == []
+
+
+def test_snippet_cuts_at_word_boundaries():
+    text = " ".join(f"w{i}" for i in range(100))
+    start = text.index("w50")
+    cut = snippet(text, start, start + 3, context=10)
+    assert cut.startswith("…") and cut.endswith("…") and "w50" in cut
+    assert all(tok.startswith("w") for tok in cut.strip("…").split())
+    assert snippet("short todo", 6, 10) == "short todo"
@@ -0,0 +1,79 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.ingestion import linked_content as lc
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.strip("/")
+        if path == "slow":
+            time.sleep(1.5)
+        status = {"gone": 404, "down": 503, "busy": 429}.get(path, 200)
+        ctype = "application/pdf" if path == "bin" else "text/html"
+        body = f"<html><title>{path}</title><p>page {path}</p></html>".encode()
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_port}"
+    srv.shutdown()
+
+
+def _hits(base, *paths):
+    return [{"objectID": p, "url": f"{base}/{p}"} for p in paths]
+
+
+def test_only_definitive_failures_are_cached(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(lc, "extract_text", lambda html: html)   # bs4 없이 캐시 동작만 확인
+    cache = lc.ContentCache(tmp_path)
+    texts = lc.fetch_linked(_hits(server, "ok", "gone", "bin", "down", "busy"), budget_sec=10, cache=cache)
+    assert "page ok" in texts["ok"] and set(texts) == {"ok"}
+
+    index = {url.rsplit("/", 1)[1]: e for url, e in lc.ContentCache(tmp_path).index.items()}
+    assert index["ok"].get("hash")
+    assert index["gone"]["error"] == "http_404" and index["bin"]["error"] == "not_html"
+    assert "down" not in index and "busy" not in index    # 5xx/429 는 다음 실행에서 다시
+
+
+def test_budget_cut_requests_are_not_cached(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(lc, "extract_text", lambda html: html)
+    cache = lc.ContentCache(tmp_path)
+    lc.fetch_linked(_hits(server, "slow"), budget_sec=0.5, cache=cache)
+    assert cache.index == {}
+    assert cache.lookup(f"{server}/slow") == (False, None)
+
+    # 남은 예산으로 줄인 timeout 에 걸림 → 실패가 아니라 예산 초과
+    deadline = time.monotonic() + 0.3
+    with pytest.raises(lc.requests.Timeout) as e:
+        lc.fetch_page(f"{server}/slow", deadline)
+    assert lc.fetch_error(e.value, deadline) == (lc.BUDGET, False)
+    assert lc.fetch_error(e.value, time.monotonic() + 60) == ("ReadTimeout", False)
+
+    deadline = time.monotonic() - 1
+    with pytest.raises(lc.BudgetExceeded):
+        lc.fetch_page(f"{server}/ok", deadline)
+    assert lc.fetch_error(lc.BudgetExceeded("x"), deadline) == (lc.BUDGET, False)
+
+
+@pytest.mark.parametrize("ctype, data, want", [
+    ("text/html; charset=euc-kr", "한국어".encode("euc-kr"), "euc_kr"),
+    ("text/html", b'<meta charset="shift_jis"><p>x</p>', "shift_jis"),
+    ("text/html", "naïve café".encode("utf-8"), "utf-8"),
+    ("text/html", "한".encode("utf-8")[:2], "utf-8"),     # 상한에서 잘린 마지막 글자
+])
+def test_page_encoding(ctype, data, want):
+    assert lc.page_encoding(ctype, data) == want
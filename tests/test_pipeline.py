@@ -0,0 +1,77 @@
+import pytest
+
+from app.common.pipeline import Pipeline, Stage
+
+
+def _stages(calls, params=None, files=()):
+    params = params or {}
+
+    def fetch():
+        calls.append("fetch")
+        return [3, 1, 2]
+
+    def tag(fetch):
+        calls.append("tag")
+        return sorted(fetch)
+
+    def score(tag):
+        calls.append("score")
+        return sum(tag) * params.get("weight", 1)
+
+    return [
+        Stage("fetch", fetch, params={"day": params.get("day", "2026-01-01")}),
+        Stage("tag", tag, inputs=("fetch",), params={"rules": params.get("rules", 1)}),
+        Stage("score", score, inputs=("tag",), params={"weight": params.get("weight", 1)}, files=files),
+    ]
+
+
+def test_second_run_skips_everything(tmp_path, capsys):
+    calls = []
+    out = Pipeline(_stages(calls), tmp_path).run()
+    assert out["score"] == 6 and calls == ["fetch", "tag", "score"]
+    calls.clear()
+    p = Pipeline(_stages(calls), tmp_path)
+    assert p.run(["score"]) == {"score": 6}
+    assert calls == [] and set(p.last_status.values()) == {"skipped"}
+
+
+def test_param_change_reruns_stage_and_cuts_off_unchanged_output(tmp_path, capsys):
+    Pipeline(_stages([]), tmp_path).run()
+    calls = []
+    Pipeline(_stages(calls, {"rules": 2}), tmp_path).run()
+    assert calls == ["tag"]            # tag 출력이 그대로면 score 는 다시 돌지 않음
+    calls.clear()
+    assert Pipeline(_stages(calls, {"rules": 2, "weight": 10}), tmp_path).run()["score"] == 60
+    assert calls == ["score"]
+
+
+def test_force_missing_files_and_pinned_upstream(tmp_path, capsys):
+    report = tmp_path / "report.md"
+    Pipeline(_stages([], files=(str(report),)), tmp_path / "c").run()
+    calls = []
+    Pipeline(_stages(calls, files=(str(report),)), tmp_path / "c").run()
+    assert calls == ["score"]          # 산출 파일이 없으면 다시
+    calls.clear()
+    Pipeline(_stages(calls), tmp_path / "c").run(force=["tag"])
+    assert calls == ["tag"]
+    calls.clear()
+    # 상류 설정이 바뀌어도 pinned 면 캐시를 그대로 씀
+    Pipeline(_stages(calls, {"day": "2026-01-02", "weight": 2}), tmp_path / "c").run(["score"], pinned_upstream=True)
+    assert calls == ["score"]
+
+
+def test_memo_avoids_reloading_outputs(tmp_path, capsys):
+    memo = {}
+    Pipeline(_stages([]), tmp_path, memo=memo).run()
+    (tmp_path / "score.pkl").write_bytes(b"not a pickle")     # memo 가 있으면 pickle 을 읽지 않음
+    (tmp_path / "fetch.pkl").write_bytes(b"not a pickle")
+    assert Pipeline(_stages([]), tmp_path, memo=memo).run(["score"])["score"] == 6
+
+
+def test_graph_validation():
+    with pytest.raises(ValueError, match="unknown stage"):
+        Pipeline([Stage("a", lambda b: b, inputs=("b",))])
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline([Stage("a", lambda b: b, inputs=("b",)), Stage("b", lambda a: a, inputs=("a",))])
+    with pytest.raises(ValueError, match="unknown stages"):
+        Pipeline([Stage("a", lambda: 1)]).run(["nope"])
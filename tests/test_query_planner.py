@@ -0,0 +1,110 @@
+import pytest
+
+from app.ingestion import query_planner as qp
+
+
+def _rec(new_rate, tag_rate=1.0, **kw):
+    return {"new_rate": new_rate, "tag_rate": tag_rate, "runs": 3, **kw}
+
+
+def _state(**recs):
+    st = qp._empty_state()
+    st["queries"] = recs
+    return st
+
+
+def test_first_run_splits_budget_evenly():
+    plan = qp.plan(["a", "b", "c", "d"], 80, _state())
+    assert plan["limits"] == {"a": 20, "b": 20, "c": 20, "d": 20}
+    assert plan["queries"] == ["a", "b", "c", "d"]
+
+
+def test_budget_follows_yield_with_floor():
+    plan = qp.plan(["a", "b", "c"], 60, _state(a=_rec(0.9), b=_rec(0.1), c=_rec(0.0)))
+    limits = plan["limits"]
+    assert sum(limits.values()) <= 60
+    assert min(limits.values()) >= qp.EXPLORE_FLOOR
+    assert limits["a"] > limits["b"] >= limits["c"] == qp.EXPLORE_FLOOR
+    assert plan["queries"] == ["a", "b", "c"]
+
+
+def test_unknown_query_goes_first_at_best_score():
+    plan = qp.plan(["a", "new"], 40, _state(a=_rec(0.5)))
+    assert plan["queries"][0] == "new"
+    assert plan["limits"]["new"] == plan["limits"]["a"]
+
+
+def test_exhausted_query_is_capped_and_rest_redistributed():
+    st = _state(a=_rec(0.9, last_hits=4, last_limit=50), b=_rec(0.3))
+    plan = qp.plan(["a", "b"], 100, st)
+    assert plan["limits"]["a"] == 7                      # 4 * 1.5 + 1
+    assert plan["limits"]["b"] == 93                     # 남은 몫은 b 로
+
+
+def test_zero_streak_skips_then_probes():
+    dead = _rec(0.0, zero_streak=qp.DEMOTE_AFTER, skipped=0)
+    plan = qp.plan(["a", "dead"], 40, _state(a=_rec(0.5), dead=dead))
+    assert plan["skipped"] == ["dead"] and "dead" not in plan["limits"]
+
+    dead["skipped"] = qp.PROBE_EVERY - 1
+    plan = qp.plan(["a", "dead"], 40, _state(a=_rec(0.5), dead=dead))
+    assert plan["probed"] == ["dead"]
+    assert plan["queries"][0] == "dead" and plan["limits"]["dead"] == qp.EXPLORE_FLOOR
+
+
+def test_record_updates_rates_once_per_run(tmp_path):
+    path = tmp_path / "yield.json"
+    plan = qp.plan(["a", "b"], 40, qp.load_state(path))
+    stats = {
+        "a": {"requests": 1, "hits": 10, "new_ids": ["1", "2", "3", "4"]},
+        "b": {"requests": 1, "hits": 10, "new_ids": []},
+    }
+    cases = [
+        {"object_id": "1", "core_ai_features": "action_items", "risks": "-", "dup_object_ids": "2"},
+        {"object_id": "3", "core_ai_features": "-", "risks": "-", "dup_object_ids": "-"},
+    ]
+    st = qp.record(plan, stats, cases, "run1", path)
+    a, b = st["queries"]["a"], st["queries"]["b"]
+    assert a["new_rate"] == 0.4 and a["tag_rate"] == round(2 / 3, 4)   # 1, 2(dup) 는 라벨, 3 은 없음, 4 는 케이스 아님
+    assert b["new_rate"] == 0.0 and b["zero_streak"] == 1
+    # 같은 run_id 는 다시 기록하지 않음
+    assert qp.record(plan, stats, cases, "run1", path)["queries"]["a"]["runs"] == 1
+    st = qp.record(plan, {"a": {"requests": 1, "hits": 10, "new_ids": []}}, cases, "run2", path)
+    assert st["queries"]["a"]["new_rate"] == round(0.4 + qp.ALPHA * (0.0 - 0.4), 4)
+
+
+def test_all_demoted_never_plans_an_empty_run(tmp_path):
+    # 새 objectID 가 하나도 없는 실행이 계속돼도 매번 무언가는 검색하고, 결국 전부 재확인됨
+    path = tmp_path / "yield.json"
+    queries = [f"q{i}" for i in range(10)]
+    probed = set()
+    for run in range(12):
+        plan = qp.plan(queries, 200, qp.load_state(path))
+        assert plan["queries"] and sum(plan["limits"].values()) > 0
+        probed.update(plan["probed"])
+        stats = {q: {"requests": 1, "hits": plan["limits"][q], "new_ids": []} for q in plan["queries"]}
+        qp.record(plan, stats, [], f"run{run}", path)
+    assert probed == set(queries)
+
+
+def test_skips_are_counted_without_stats(tmp_path):
+    path = tmp_path / "yield.json"
+    dead = _rec(0.0, zero_streak=qp.DEMOTE_AFTER, skipped=0)
+    qp.save_state(_state(a=_rec(0.5), dead=dead), path)
+    plan = qp.plan(["a", "dead"], 40, qp.load_state(path))
+    assert plan["skipped"] == ["dead"]
+    st = qp.record(plan, {}, [], "run1", path)      # 검색이 전부 저널 재사용/취소
+    assert st["queries"]["dead"]["skipped"] == 1
+
+
+def test_known_ids_exclude_cases_first_indexed_today(tmp_path):
+    pytest.importorskip("scipy")
+    from app.knowledge import similarity
+
+    idx = similarity.SimilarityIndex()
+    idx.add("old", "voice notes summarizer", "2026-01-01", added="2026-01-01")
+    idx.add("new", "meeting transcript agent", "2026-01-02", added="2026-01-02")
+    idx.save(tmp_path)
+    assert similarity.known_doc_ids(tmp_path, before="2026-01-02") == {"old"}
+    assert similarity.known_doc_ids(tmp_path, before="2026-01-03") == {"old", "new"}
+    assert similarity.SimilarityIndex.load(tmp_path).doc_added == idx.doc_added
@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.scoring import rescore
+from app.scoring.priority import WeightProfile, compute_raw_priority, percentile_ranks
+
+
+def _cards(n, seed=3):
+    rng = random.Random(seed)
+    cards = []
+    for i in range(n):
+        # 동점이 생기도록 일부 점수는 거친 값으로
+        scores = {k: round(rng.random(), 1 if i % 3 == 0 else 6) for k in rescore.FEATURES}
+        cards.append({"idea_id": f"id{i}", "title": f"카드 {i}", "scores": scores})
+    return cards
+
+
+@pytest.mark.parametrize("profile", [WeightProfile(), WeightProfile(momentum=0.35, feasibility=0.35, low_evidence=0.4)])
+def test_matches_scalar_priority(profile):
+    cards = _cards(300)
+    m = rescore.build_matrix(cards)
+    out = rescore.rescore(m, profile, k=10)
+
+    # 행렬은 float32 로 저장되므로 스칼라 버전도 같은 입력으로 (FEATURES 순서 = compute_raw_priority 인자 순서)
+    raw = [compute_raw_priority(*(float(x) for x in row), profile=profile) for row in m.X]
+    assert np.allclose(out["raw"], raw, atol=1e-12)
+    assert np.allclose(out["priority"], percentile_ranks(list(out["raw"])))
+    expected_top = sorted(range(len(raw)), key=lambda i: (-out["raw"][i], i))[:10]
+    assert list(out["top"]) == expected_top
+
+
+def test_percentile_ranks_edge_cases():
+    for values in ([], [0.5], [0.2, 0.2, 0.2], [0.3, 0.1, 0.3, 0.9]):
+        assert list(rescore.percentile_ranks(np.asarray(values, dtype=float))) == percentile_ranks(values)
+
+
+def test_matrix_roundtrip(tmp_path):
+    cards = _cards(20)
+    path = rescore.write_score_matrix(cards, tmp_path / "m.npz")
+    m = rescore.load_matrix(path)
+    assert len(m) == 20 and m.idea_id(7) == "id7" and m.title(7) == "카드 7"
@@ -0,0 +1,63 @@
+import csv
+from datetime import date, timedelta
+
+from app.ingestion import hn_fetch
+from app.knowledge import rollup
+
+
+def _row(day: str, mentions: int, points: int = 10) -> dict:
+    return {"date": day, "usecase": "x", "mentions": mentions, "total_points": points,
+            "interest_score": mentions * 2.5, "share_agent": 0.5, "top_feature": "-"}
+
+
+def _daily(path) -> list[dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_append_daily_row_replaces_same_date(tmp_path):
+    daily = str(tmp_path / "daily.csv")
+    hn_fetch.append_daily_row(_row("2026-10-18", 3), daily)
+    hn_fetch.append_daily_row(_row("2026-10-19", 4), daily)
+    hn_fetch.append_daily_row(_row("2026-10-19", 7), daily)   # 같은 날 재실행
+    rows = _daily(daily)
+    assert [(r["date"], r["mentions"]) for r in rows] == [("2026-10-18", "3"), ("2026-10-19", "7")]
+
+    # 롤업은 daily 파일 옆 디렉터리에, 원본 CSV 와 같은 값
+    root = rollup.root_for(daily)
+    _, series = rollup.load_series(root=root, resolution="daily")
+    assert [(r["date"], r["mentions"]) for r in series] == [("2026-10-18", 3.0), ("2026-10-19", 7.0)]
+
+
+def test_incremental_rollups_match_rebuild(tmp_path):
+    daily = str(tmp_path / "daily.csv")
+    start = date(2026, 1, 20)
+    for i in range(60):
+        day = (start + timedelta(days=i)).isoformat()
+        hn_fetch.append_daily_row(_row(day, i % 9, 10 + i), daily)
+    hn_fetch.append_daily_row(_row("2026-02-02", 100), daily)   # 지난 날짜 교체 (주/월 버킷이 바뀜)
+
+    inc = rollup.load_state(rollup.root_for(daily))
+    full = rollup.rebuild_rollups(daily, tmp_path / "rebuilt")
+    for key in ("weekly", "monthly", "recent", "rolling", "min_date", "max_date"):
+        assert inc[key] == full[key], key
+    feb = inc["monthly"]["2026-02"]
+    assert feb["days"] == 28 and feb["mentions_sum"] == sum(
+        100 if i == 13 else i % 9 for i in range(12, 40))
+
+
+def test_load_series_picks_resolution_and_types(tmp_path):
+    root = tmp_path / "r"
+    start = date(2025, 1, 1)
+    for i in range(400):
+        rollup.update_rollups(_row((start + timedelta(days=i)).isoformat(), 1), root, write_csv=False)
+    rollup.write_rollup_csvs(rollup.load_state(root), root)
+
+    res, rows = rollup.load_series("2025-01-01", "2025-12-31", root=root)
+    assert res == "weekly" and all(isinstance(r["mentions"], float) for r in rows)
+    res, rows = rollup.load_series("2025-03-01", "2025-03-31", root=root)   # 최근 윈도우 밖 → 월 파티션
+    assert res == "daily" and len(rows) == 31 and rows[0]["date"] == "2025-03-01"
+    assert all(isinstance(r["mentions"], float) for r in rows)
+    res, rows = rollup.load_series("2026-01-01", "2026-02-04", root=root)   # 최근 윈도우 → daily_recent.csv
+    assert res == "daily" and len(rows) == 35 and rows[-1]["mentions_r7"] == 1.0
+    assert rollup.load_series("2025-01-01", "2026-02-04", resolution="monthly", root=root)[0] == "monthly"
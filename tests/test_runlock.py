@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app.common import runlock
+from app.common.runlock import RunLock, RunLockBusy
+
+
+def _write(path, pid, started):
+    path.write_text(json.dumps({"pid": pid, "started": started}), encoding="utf-8")
+
+
+def test_second_holder_is_busy_until_release(tmp_path):
+    path = tmp_path / "pipeline.lock"
+    with RunLock(path):
+        info = json.loads(path.read_text(encoding="utf-8"))
+        assert info["pid"] == os.getpid()
+        with pytest.raises(RunLockBusy):
+            RunLock(path).acquire()
+    assert not path.exists()
+    # 임시 파일이 남지 않음
+    assert list(tmp_path.iterdir()) == []
+    with RunLock(path):
+        pass
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows 는 pid 확인 없이 나이로만 판단")
+def test_dead_owner_is_taken_over(tmp_path):
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    path = tmp_path / "pipeline.lock"
+    _write(path, proc.pid, time.time())
+    with RunLock(path):
+        assert json.loads(path.read_text(encoding="utf-8"))["pid"] == os.getpid()
+
+
+def test_old_lock_is_stale_even_if_pid_is_alive(tmp_path):
+    path = tmp_path / "pipeline.lock"
+    _write(path, os.getpid(), time.time() - runlock.STALE_LOCK_SEC - 1)
+    with RunLock(path):
+        pass
+    _write(path, os.getpid(), time.time())
+    with pytest.raises(RunLockBusy):
+        RunLock(path).acquire()
+
+
+def test_unreadable_lock_is_busy_until_old(tmp_path):
+    path = tmp_path / "pipeline.lock"
+    path.write_text("", encoding="utf-8")
+    # 주인이 아직 쓰는 중일 수 있음 → 지우지 않음
+    with pytest.raises(RunLockBusy):
+        RunLock(path).acquire()
+    assert path.exists()
+
+    old = time.time() - runlock.STALE_LOCK_SEC - 1
+    os.utime(path, (old, old))
+    with RunLock(path):
+        assert json.loads(path.read_text(encoding="utf-8"))["pid"] == os.getpid()
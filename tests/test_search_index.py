@@ -0,0 +1,50 @@
+from app.knowledge.search_index import SearchIndex, tokenize, write_index
+
+CARDS = [
+    {"idea_id": "a", "title": "Meeting summarizer", "tags": ["action_items"], "summary": "notes after calls",
+     "scores": {"priority": 0.4}},
+    {"idea_id": "b", "title": "Call transcription", "tags": ["transcription"], "risks": ["privacy"],
+     "summary": "meeting audio to text", "scores": {"priority": 0.9}},
+    {"idea_id": "c", "title": "Sales notes", "summary": "meeting prep", "scores": {"priority": 0.7}},
+]
+
+
+def _index(tmp_path):
+    path = write_index(CARDS, tmp_path / "idx.json")
+    return SearchIndex.load(path)
+
+
+def test_tokenize_splits_underscores_and_lowercases():
+    assert tokenize("Action_Items, GPT-4o!") == ["action", "items", "gpt", "4o"]
+
+
+def test_and_semantics_and_field_weights(tmp_path):
+    idx = _index(tmp_path)
+    assert [d for d, _ in idx.search("meeting")] == ["a", "b", "c"]    # 제목 매치가 요약 매치보다 위
+    assert [d for d, _ in idx.search("meeting privacy")] == ["b"]
+    assert idx.search("meeting nothing") == []
+    assert idx.search("   ") == []
+
+
+def test_prefix_on_last_token_and_star(tmp_path):
+    idx = _index(tmp_path)
+    assert {d for d, _ in idx.search("transcri")} == {"b"}
+    assert idx.search("transcri notes") == []                          # 접두어는 마지막 토큰만
+    assert {d for d, _ in idx.search("summ* notes")} == {"a"}
+    assert [d for d, _ in idx.search("note", limit=1)] == ["c"]               # c 는 제목에 "notes"
+
+
+def test_ties_break_on_priority(tmp_path):
+    idx = _index(tmp_path)
+    assert [d for d, _ in idx.search("notes")] == ["c", "a"]           # 같은 필드(제목 vs 요약)면 점수순
+    tied = SearchIndex.load(write_index(
+        [{"idea_id": "x", "title": "voice", "scores": {"priority": 0.1}},
+         {"idea_id": "y", "title": "voice", "scores": {"priority": 0.8}}], tmp_path / "t.json"))
+    assert [d for d, _ in tied.search("voice")] == ["y", "x"]
+
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / "old.json"
+    path.write_text('{"version": 0}', encoding="utf-8")
+    assert SearchIndex.load(path) is None
+    assert SearchIndex.load(tmp_path / "missing.json") is None
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from app.knowledge import similarity  # noqa: E402
+from app.knowledge.similarity import SimilarityIndex  # noqa: E402
+
+TEXTS = [
+    "meeting notes summarizer for zoom calls",
+    "zoom call transcription with speaker diarization",
+    "privacy first meeting recorder runs locally",
+    "sales call coaching with action items",
+    "open source whisper transcription server",
+    "local llm notes app with privacy focus",
+    "calendar assistant that books meetings",
+]
+
+
+def _index(n=len(TEXTS)):
+    idx = SimilarityIndex()
+    for i, t in enumerate(TEXTS[:n]):
+        idx.add(str(i), t, f"2026-01-{i + 1:02d}")
+    return idx
+
+
+def test_top_k_matches_dense_cosine():
+    idx = _index()
+    queries = ["zoom meeting notes", "privacy transcription", "nothing in common"]
+    got = idx.top_k_many(queries, k=3, exclude=[None, "4", None], max_days=[None, None, None])
+    W = idx._weighted.toarray()
+    Q = idx._query_matrix(queries).toarray()
+    for qi, row in enumerate(got):
+        sims = Q[qi] @ W.T
+        allowed = [d for d in range(len(TEXTS)) if not (qi == 1 and d == 4)]
+        want = sorted((sims[d] for d in allowed), reverse=True)[:3]
+        # 동점은 어느 쪽이 와도 됨 → 값과 각 문서의 실제 유사도만 비교
+        assert [s for _, s in row] == pytest.approx(want, abs=1e-6)
+        assert all(sims[int(d)] == pytest.approx(s, abs=1e-6) and int(d) in allowed for d, s in row)
+    assert [s for _, s in got[2]] == [0.0, 0.0, 0.0]       # 겹치는 토큰이 없으면 0 으로 채움
+
+
+def test_max_days_and_exclude_filter():
+    idx = _index()
+    (row,) = idx.top_k_many(["zoom call transcription"], k=5, exclude=["1"],
+                            max_days=[similarity._day("2026-01-03")])
+    assert {d for d, _ in row} == {"0", "2"}
+
+
+def test_novelty_is_stable_across_same_day_reruns(tmp_path):
+    hits = [{"objectID": str(i), "title": t, "created_at": f"2026-01-{i + 1:02d}T00:00:00Z"}
+            for i, t in enumerate(TEXTS)]
+    hits.append({"objectID": "dup", "title": TEXTS[1], "created_at": "2026-01-20T00:00:00Z"})
+    first = similarity.score_novelty(hits, root=tmp_path)
+    assert first["0"] == 1.0                               # 먼저 올라온 케이스가 없음
+    assert first["dup"] < first["1"]                       # 같은 제목이 이미 있음
+    similarity._CACHED.clear()
+    assert similarity.score_novelty(hits, root=tmp_path) == first
+    assert len(SimilarityIndex.load(tmp_path)) == len(hits)
+
+
+def test_saves_append_segments_and_reload(tmp_path, monkeypatch):
+    idx = _index(3)
+    idx.save(tmp_path)
+    for i in range(3, len(TEXTS)):
+        idx.add(str(i), TEXTS[i], "2026-02-01")
+        idx.save(tmp_path)
+    meta = json.loads((tmp_path / similarity.META_FILE).read_text())
+    assert [s[1:] for s in meta["segments"]] == [[0, 3], [3, 4], [4, 5], [5, 6], [6, 7]]
+    idx.save(tmp_path)                                      # 추가 없음 → 세그먼트 그대로
+    assert len(json.loads((tmp_path / similarity.META_FILE).read_text())["segments"]) == 5
+
+    loaded = SimilarityIndex.load(tmp_path)
+    assert loaded.doc_ids == idx.doc_ids and loaded.vocab == idx.vocab
+    assert (loaded._tf != idx._tf).nnz == 0
+    q = ["privacy notes"]
+    assert loaded.top_k_many(q, 3) == _index().top_k_many(q, 3)
+
+    # 세그먼트가 많으면 하나로 합치고 옛 파일은 지움
+    monkeypatch.setattr(similarity, "MAX_SEGMENTS", 5)
+    loaded.add("new", "brand new text", "2026-03-01")
+    loaded.save(tmp_path)
+    meta = json.loads((tmp_path / similarity.META_FILE).read_text())
+    assert [s[1:] for s in meta["segments"]] == [[0, 8]]
+    assert sorted(p.name for p in tmp_path.glob("similarity_tf.*.npz")) == [meta["segments"][0][0]]
+    assert len(SimilarityIndex.load(tmp_path)) == 8
@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from app.common.ratelimit import TokenBucket
+from app.ingestion.sources import AlgoliaSource, FirebaseSource, comment_depth, matches
+
+ITEMS = {
+    "1": {"id": 1, "type": "story", "title": "Meeting notes AI", "score": 12, "descendants": 2,
+          "time": 1767225600, "kids": [10, 11]},
+    "4": {"id": 4, "type": "story", "title": "Unrelated", "dead": True},
+    "10": {"id": 10, "type": "comment", "text": "<p>privacy worries</p>", "kids": [12]},
+    "11": {"id": 11, "type": "comment", "deleted": True},
+    "12": {"id": 12, "type": "comment", "text": "agreed"},
+}
+LISTS = {"newstories": [1, 2, 3, 4], "showstories": [3, 1]}
+
+
+class _Firebase(BaseHTTPRequestHandler):
+    def do_GET(self):
+        name = self.path.rsplit("/", 1)[1].removesuffix(".json")
+        if self.path.startswith("/item/"):
+            status, body = (500, None) if name == "2" else (404, None) if name not in ITEMS else (200, ITEMS[name])
+        else:
+            status, body = 200, LISTS.get(name, [])
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def firebase():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Firebase)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    src = FirebaseSource(f"http://127.0.0.1:{srv.server_port}", rate=0)
+    yield src
+    src.close()
+    srv.shutdown()
+
+
+def test_firebase_skips_failed_and_missing_stories(firebase, capsys):
+    firebase.prepare(["meeting notes"])
+    assert "skipped 1/4 stories" in capsys.readouterr().out     # item 2 는 500, 3 은 404 (건너뜀만), 4 는 dead
+    (hit,) = firebase.search("meeting notes", 10)
+    assert hit["objectID"] == "1" and hit["source"] == "firebase" and hit["points"] == 12
+    comments = firebase.comments(hit)
+    assert comments == ["privacy worries", "agreed"]
+    assert [comment_depth(c) for c in comments] == [1, 2]
+
+
+def test_firebase_item_errors_propagate(firebase):
+    assert firebase._item(3) is None
+    with pytest.raises(requests.HTTPError):
+        firebase._item(2)
+
+
+def test_token_bucket_burst_then_rate():
+    bucket = TokenBucket(rate=20, burst=5)
+    assert all(bucket.try_acquire() for _ in range(5))
+    assert not bucket.try_acquire()
+    t0 = time.monotonic()
+    assert bucket.acquire(timeout=1)
+    assert 0.02 <= time.monotonic() - t0 < 0.5
+    assert not TokenBucket(rate=1, burst=1).acquire(tokens=5, timeout=0.05)
+    assert TokenBucket(rate=0).try_acquire(1000)          # 0 = 제한 없음
+
+
+def test_algolia_default_budget_stays_under_hourly_limit():
+    src = AlgoliaSource()
+    assert src.burst + src.rate * 3600 < 10_000           # Algolia HN API: IP 당 시간당 10,000 요청
+    assert src.burst >= 36                                # 하루 실행(30건)은 기다리지 않음
+
+
+def test_matches_needs_every_query_word():
+    assert matches("meeting notes", "AI Meeting-notes app")
+    assert not matches("meeting notes", "AI meeting recorder")
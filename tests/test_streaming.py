@@ -0,0 +1,49 @@
+import csv
+
+import pytest
+
+from app.ingestion import hn_fetch, streaming
+from benchmarks.stub_algolia import StubConfig, StubServer
+
+
+@pytest.fixture
+def algolia(monkeypatch):
+    with StubServer(StubConfig(universe=5_000)) as base:
+        monkeypatch.setattr(hn_fetch, "ALGOLIA_SEARCH", f"{base}/search")
+        monkeypatch.setattr(hn_fetch, "ALGOLIA_ITEM", f"{base}/items")
+        monkeypatch.setattr(hn_fetch, "REQUEST_SLEEP_SEC", 0)
+        yield base
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_iter_hits_dedupes_and_stops_at_max(algolia):
+    hits = list(streaming.iter_hits(["ai notes", "meeting"], max_results=150, page_size=40, max_pages=3))
+    ids = [h["objectID"] for h in hits]
+    assert len(ids) == len(set(ids)) == 150
+    assert set(hits[0]) == set(hn_fetch.HIT_FIELDS)
+
+
+def test_streaming_outputs_match_batch_aggregation(algolia, tmp_path, capsys):
+    paths = {k: str(tmp_path / f"{k}.csv") for k in ("cases", "edges", "daily")}
+    row = streaming.run_streaming(max_results=15, queries=["ai notes", "meeting"], cases_path=paths["cases"],
+                                  edges_path=paths["edges"], daily_path=paths["daily"])
+
+    # 일괄 모드와 같은 방법으로 다시 태깅해서 비교
+    cases = [hn_fetch.tag_case(h, hn_fetch.fetch_thread_texts(h["objectID"]))
+             for h in streaming.iter_hits(["ai notes", "meeting"], 15)]
+    assert [c["object_id"] for c in _read(paths["cases"])] == [c["object_id"] for c in cases]
+
+    edges = {}
+    for r in _read(paths["edges"]):
+        key = (r["from"], r["relation"], r["to"])
+        assert key not in edges               # case 엣지도, 패턴 엣지도 한 줄씩
+        edges[key] = int(r["weight"])
+    assert edges == dict(hn_fetch.build_edge_counter(cases))
+
+    assert row == hn_fetch.compute_daily_row(cases, row["date"])
+    assert [r["date"] for r in _read(paths["daily"])] == [row["date"]]
+    assert not list(tmp_path.glob("*.partial"))
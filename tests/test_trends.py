@@ -0,0 +1,51 @@
+from app.knowledge import trends
+from app.knowledge.trends import card_trend, case_counts, update_trends
+
+
+def test_same_day_rerun_replaces_today(tmp_path):
+    once, twice = tmp_path / "once.json", tmp_path / "twice.json"
+    for p in (once, twice):
+        update_trends({"feature:rag": 2}, "2026-03-01", p)
+    update_trends({"feature:rag": 5}, "2026-03-02", once)
+
+    # 같은 날 여러 번 돌려도 마지막 값으로 한 번 돈 것과 같아야 함
+    update_trends({"feature:rag": 1, "risk:privacy": 3}, "2026-03-02", twice)
+    update_trends({"feature:rag": 9}, "2026-03-02", twice)
+    got = update_trends({"feature:rag": 5}, "2026-03-02", twice)
+    assert got == trends.load_state(once)["series"]
+    assert got["feature:rag"]["spark"] == [2.0, 5.0]
+    assert got["feature:rag"]["delta"] == 3.0
+    assert "risk:privacy" not in got
+
+
+def test_first_snapshot_is_neutral_and_backfill_is_ignored(tmp_path):
+    path = tmp_path / "trends.json"
+    first = update_trends({"pattern:copilot": 4}, "2026-03-10", path)
+    assert first["pattern:copilot"]["momentum"] == 0.5
+    # 더 이전 날짜는 상태를 건드리지 않음
+    assert update_trends({"pattern:copilot": 40}, "2026-03-01", path) == first
+    assert trends.load_state(path)["date"] == "2026-03-10"
+
+
+def test_gap_days_decay_and_fill_spark(tmp_path):
+    path = tmp_path / "trends.json"
+    update_trends({"feature:agents": 3}, "2026-03-01", path)
+    got = update_trends({"feature:agents": 3}, "2026-03-04", path)["feature:agents"]
+    assert got["spark"] == [3.0, 0.0, 0.0, 3.0]
+    # 빈 날 뒤에는 전일 값이 0 → delta 는 오늘 값 그대로
+    assert got["delta"] == 3.0
+    assert got["fast"] < 3.0 and got["slow"] < 3.0
+
+
+def test_case_counts_and_card_trend(tmp_path):
+    cases = [
+        {"pattern": "copilot", "core_ai_features": "rag, agents", "risks": "-"},
+        {"pattern": "copilot", "core_ai_features": ["rag"], "risks": "privacy"},
+    ]
+    counts = case_counts(cases)
+    assert counts == {"pattern:copilot": 2, "feature:rag": 2, "feature:agents": 1, "risk:privacy": 1}
+    series = update_trends(counts, "2026-03-01", tmp_path / "trends.json")
+    t = card_trend(series, "copilot", ["rag", "unknown"], [])
+    assert set(t["series"]) == {"pattern:copilot", "feature:rag"}
+    assert t["momentum"] == 0.5
+    assert card_trend(series, None, ["unknown"], []) == {}